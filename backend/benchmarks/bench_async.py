@@ -0,0 +1,192 @@
+"""Vazão e memória do caminho síncrono vs async sob muitas conexões.
+
+Uso (a partir de backend/, com as variáveis JWT_* da aplicação):
+
+    python -m benchmarks.bench_async --concurrency 500 --duration 15
+
+Para cada modo (DATABASE_ASYNC=false/true) sobe um uvicorn com um SQLite
+temporário, cadastra um usuário com algumas tarefas e mantém `concurrency`
+conexões simultâneas alternando GET /api/tasks e GET /api/auth/userinfo
+(e POST /api/tasks conforme --write-ratio). Mede vazão, latência e o RSS do
+servidor (ocioso e pico).
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.common import (
+    free_port,
+    percentiles,
+    rss_kib,
+    start_server,
+    stop_process,
+    wait_ready,
+    write_results,
+)
+
+USER = {'name': 'Bench', 'email': 'bench@example.com', 'password': 'S3nh@F0rte'}
+
+
+def create_schema(database_url: str) -> None:
+    from sqlalchemy import create_engine
+
+    from backend.models.users import table_registry
+
+    engine = create_engine(database_url)
+    table_registry.metadata.create_all(engine)
+    engine.dispose()
+
+
+async def prepare(base_url: str, tasks: int) -> str:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        resp = await client.post('/api/auth/register', json=USER)
+        resp.raise_for_status()
+        headers = {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+        for i in range(tasks):
+            await client.post('/api/tasks', json={'title': f'T{i}'}, headers=headers)
+        return headers['Authorization']
+
+
+async def run_load(
+    base_url: str,
+    authorization: str,
+    *,
+    concurrency: int,
+    duration: float,
+    write_ratio: float,
+    timeout: float,
+    server_pid: int,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    rss_samples: List[int] = []
+    deadline = time.perf_counter() + duration
+
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        limits=limits,
+        timeout=timeout,
+        headers={'Authorization': authorization},
+    ) as client:
+
+        async def worker() -> None:
+            rng = random.Random()
+            while time.perf_counter() < deadline:
+                roll = rng.random()
+                start = time.perf_counter()
+                try:
+                    if roll < write_ratio:
+                        resp = await client.post('/api/tasks', json={'title': 'load'})
+                    elif roll < (1 + write_ratio) / 2:
+                        resp = await client.get('/api/tasks')
+                    else:
+                        resp = await client.get('/api/auth/userinfo')
+                    key = None if resp.status_code < 400 else str(resp.status_code)
+                except httpx.HTTPError as exc:
+                    key = type(exc).__name__
+                if key is None:
+                    latencies.append((time.perf_counter() - start) * 1000)
+                else:
+                    errors[key] = errors.get(key, 0) + 1
+
+        async def sample_rss() -> None:
+            while time.perf_counter() < deadline:
+                rss = rss_kib(server_pid)
+                if rss is not None:
+                    rss_samples.append(rss)
+                await asyncio.sleep(0.1)
+
+        started = time.perf_counter()
+        await asyncio.gather(sample_rss(), *(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        'requests': len(latencies),
+        'throughput_rps': len(latencies) / elapsed,
+        'latency_ms': percentiles(latencies),
+        'errors': errors,
+        'rss_peak_kib': max(rss_samples, default=None),
+    }
+
+
+def bench_mode(is_async: bool, args) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f'sqlite:///{Path(tmp) / "bench.db"}'
+        create_schema(database_url)
+
+        port = free_port()
+        base_url = f'http://127.0.0.1:{port}'
+        server = start_server(
+            {
+                'DATABASE_URL': database_url,
+                'DATABASE_ASYNC': 'true' if is_async else 'false',
+                # Fora do modo async (ver Settings.DATABASE_ASYNC): desligados
+                # nos dois modos, a comparação fica só entre os drivers
+                'TASK_CACHE_ENABLED': 'false',
+                'TASK_EVENTS_ENABLED': 'false',
+            },
+            port,
+        )
+        try:
+            asyncio.run(wait_ready(base_url))
+            authorization = asyncio.run(prepare(base_url, args.tasks))
+            idle = rss_kib(server.pid)
+            result = asyncio.run(
+                run_load(
+                    base_url,
+                    authorization,
+                    concurrency=args.concurrency,
+                    duration=args.duration,
+                    write_ratio=args.write_ratio,
+                    timeout=args.timeout,
+                    server_pid=server.pid,
+                )
+            )
+            result['rss_idle_kib'] = idle
+            return result
+        finally:
+            stop_process(server)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--tasks', type=int, default=20)
+    parser.add_argument('--write-ratio', type=float, default=0.0)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {
+        'concurrency': args.concurrency,
+        'duration_s': args.duration,
+        'write_ratio': args.write_ratio,
+    }
+    for mode in args.modes.split(','):
+        results[mode] = bench_mode(mode == 'async', args)
+        summary = results[mode]
+        print(
+            f'{mode:>5}: {summary["throughput_rps"]:.0f} req/s, '
+            f'p99 {summary["latency_ms"].get("p99", 0):.0f} ms, '
+            f'erros {sum(summary["errors"].values())}, '
+            f'RSS pico {summary["rss_peak_kib"]} KiB'
+        )
+
+    path = write_results('async', results, args.output)
+    print(f'resultados em {path}')
+
+
+if __name__ == '__main__':
+    main()
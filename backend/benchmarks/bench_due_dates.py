@@ -0,0 +1,128 @@
+"""Consultas de atrasadas/vencendo: sem e com o índice parcial.
+
+Uso (a partir de backend/, com as variáveis JWT_* da aplicação):
+
+    python -m benchmarks.bench_due_dates --users 2000 --tasks 100
+
+Uma base SQLite com dados de datagen (≈65% pendentes, 70% com prazo)
+recebe as consultas de /api/tasks/overdue e /api/tasks/due-within para
+usuários sorteados, primeiro sem o índice parcial (migration anterior) e
+depois com ele. Para cada modo grava o plano e a latência (ms) da consulta
+no banco, sem HTTP.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, select, text
+
+from backend.models.users import PENDING_WITH_DUE_DATE, Task
+
+from benchmarks.common import percentiles, write_results
+from benchmarks.datagen import ALEMBIC_INI, migrate, seed
+from benchmarks.query_plans import explain
+
+# Revisão anterior ao índice parcial
+BEFORE_REVISION = 'e1b5d3a7c902'
+
+
+def queries(today: date) -> Dict[str, Any]:
+    def pending_due(condition):
+        return lambda user_id: (
+            select(Task)
+            .where(Task.user_id == user_id, text(PENDING_WITH_DUE_DATE), condition)
+            .order_by(Task.due_date, Task.id)
+            .limit(100)
+        )
+
+    return {
+        'overdue': pending_due(Task.due_date < today),
+        'due_within_7d': pending_due(
+            Task.due_date.between(today, today + timedelta(days=7))
+        ),
+    }
+
+
+def measure(engine: Engine, args) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    results: Dict[str, Any] = {}
+    for name, build in queries(date.today()).items():
+        # SQL já compilado: mede o banco, não a montagem da consulta no ORM
+        compiled = build(1).compile(engine)
+        statement = str(compiled)
+        keys = compiled.positiontup
+        user_key = next(key for key in keys if compiled.params[key] == 1)
+
+        def parameters(user_id: int) -> tuple:
+            values = {**compiled.params, user_key: user_id}
+            return tuple(values[key] for key in keys)
+
+        latencies: List[float] = []
+        rows = 0
+        with engine.connect() as connection:
+            for _ in range(args.requests):
+                values = parameters(rng.randint(1, args.users))
+                start = time.perf_counter()
+                rows += len(connection.exec_driver_sql(statement, values).all())
+                latencies.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            'plan': explain(engine, statement, parameters(1)),
+            'rows_per_query': rows / args.requests,
+            'latency_ms': percentiles(latencies),
+        }
+    return results
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--tasks', type=float, default=100)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {'users': args.users, 'tasks': args.tasks}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f'sqlite:///{Path(tmp) / "due.db"}')
+        migrate(engine)
+        summary = seed(engine, args.users, args.tasks, rng_seed=args.seed)
+        results['tasks_total'] = summary['tasks']
+
+        config = Config(str(ALEMBIC_INI))
+        for mode in ('before', 'after'):
+            with engine.begin() as connection:
+                config.attributes['connection'] = connection
+                if mode == 'before':
+                    command.downgrade(config, BEFORE_REVISION)
+                else:
+                    command.upgrade(config, 'head')
+                connection.exec_driver_sql('ANALYZE')
+            results[mode] = measure(engine, args)
+        engine.dispose()
+
+    for name in queries(date.today()):
+        print(name)
+        for mode in ('before', 'after'):
+            data = results[mode][name]
+            latency = data['latency_ms']
+            print(
+                f'  {mode:>6}: p50 {latency["p50"]:.3f} ms, p99 {latency["p99"]:.3f} ms'
+                f' ({data["rows_per_query"]:.1f} linhas)'
+            )
+            for line in data['plan']:
+                print(f'          {line}')
+
+    path = write_results('due_dates', results, args.output)
+    print(f'resultados em {path}')
+
+
+if __name__ == '__main__':
+    main()
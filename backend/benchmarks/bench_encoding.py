@@ -0,0 +1,133 @@
+"""Listas de tarefas em JSON e em MessagePack: tamanho e tempo.
+
+Uso (a partir de backend/, com as variáveis JWT_* da aplicação):
+
+    python -m benchmarks.bench_encoding --sizes 10 100 1000
+
+Para cada tamanho de lista, um usuário com tarefas de datagen numa base
+SQLite em memória passa pelos dois caminhos de GET /api/tasks: JSON
+(objetos do ORM e o TypeAdapter do response_model) e MessagePack (linhas
+de TASK_COLUMNS e `pack_rows`). Grava bytes (crus e com gzip) e a latência
+(ms) de codificar, de consultar + codificar e de decodificar no cliente.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from backend.models.users import Task, User, table_registry
+from backend.schemas.task import TaskOutSchema
+from backend.services.encoding import TASK_COLUMNS, pack_rows, unpackb
+
+from benchmarks.common import percentiles, write_results
+from benchmarks.datagen import fake_task
+
+_TASK_LIST = TypeAdapter(List[TaskOutSchema])
+
+
+def codecs(session: Session, user_id: int) -> Dict[str, Dict[str, Callable]]:
+    def query(*entities):
+        return select(*entities).where(Task.user_id == user_id).order_by(Task.id.desc())
+
+    def fetch_json():
+        # Objetos novos a cada vez, como numa requisição
+        session.expunge_all()
+        return session.scalars(query(Task)).all()
+
+    return {
+        'json': {
+            'fetch': fetch_json,
+            'encode': lambda tasks: _TASK_LIST.dump_json(
+                _TASK_LIST.validate_python(tasks, from_attributes=True)
+            ),
+            'decode': json.loads,
+        },
+        'msgpack': {
+            'fetch': lambda: session.execute(query(*TASK_COLUMNS)).all(),
+            'encode': pack_rows,
+            'decode': unpackb,
+        },
+    }
+
+
+def timed(function: Callable, *args, repeat: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return percentiles(latencies)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    engine = create_engine(
+        'sqlite://',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool,
+    )
+    table_registry.metadata.create_all(engine)
+    rng = random.Random(args.seed)
+    today = date.today()
+    with engine.begin() as connection:
+        for user_id, size in enumerate(args.sizes, start=1):
+            connection.execute(
+                insert(User).values(
+                    name=f'Usuário {user_id}',
+                    email=f'u{user_id}@example.com',
+                    hashed_password='-',
+                )
+            )
+            connection.execute(
+                insert(Task), [fake_task(rng, user_id, today) for _ in range(size)]
+            )
+
+    results: Dict[str, Any] = {}
+    with Session(engine) as session:
+        for user_id, size in enumerate(args.sizes, start=1):
+            results[str(size)] = {}
+            for name, codec in codecs(session, user_id).items():
+                fetch, encode = codec['fetch'], codec['encode']
+                body = encode(fetch())
+                results[str(size)][name] = {
+                    'bytes': len(body),
+                    'gzip_bytes': len(gzip.compress(body)),
+                    'encode_ms': timed(encode, fetch(), repeat=args.repeat),
+                    'query_encode_ms': timed(
+                        lambda: encode(fetch()), repeat=args.repeat
+                    ),
+                    'decode_ms': timed(codec['decode'], body, repeat=args.repeat),
+                }
+    engine.dispose()
+
+    for size, data in results.items():
+        print(f'{size} tarefas')
+        for name, result in data.items():
+            print(
+                f'  {name:>8}: {result["bytes"]} B ({result["gzip_bytes"]} B gzip),'
+                f' encode p50 {result["encode_ms"]["p50"]:.3f} ms,'
+                f' consulta+encode p50 {result["query_encode_ms"]["p50"]:.3f} ms,'
+                f' decode p50 {result["decode_ms"]["p50"]:.3f} ms'
+            )
+
+    path = write_results('encoding', results, args.output)
+    print(f'resultados em {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+"""Latência e vazão de cada rota de auth e tarefas em várias escalas de dados.
+
+Uso (a partir de backend/, com as variáveis JWT_* da aplicação):
+
+    python -m benchmarks.bench_endpoints --scales 100x10,1000x50 --requests 200
+
+Cada escala `<usuários>x<tarefas por usuário>` ganha uma base SQLite nova
+(migrations + benchmarks.datagen). As rotas são chamadas em processo, pelo
+TestClient, uma a uma: a vazão é a de um único cliente e o número mede o
+custo do backend (framework, auth, ORM e banco) sem ruído de rede. Para
+concorrência, veja bench_async.
+
+Tokens, ids de tarefas e tarefas a apagar são preparados fora da medição.
+Register e login incluem o custo do argon2, como em produção.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, select
+from sqlalchemy.orm import Session
+
+from backend.app import create_app
+from backend.models.database import (
+    create_primary_engine,
+    get_read_session,
+    get_session,
+)
+from backend.models.users import Task
+from backend.services.auth import Auth
+from backend.services.task_events import EventLog
+from backend.settings import get_settings
+
+from benchmarks.common import percentiles, write_results
+from benchmarks.datagen import BENCH_PASSWORD, migrate, seed
+
+# Usuários sorteados (com token) por escala
+SAMPLED_USERS = 50
+
+Call = Callable[[int], Any]
+
+
+def parse_scale(value: str) -> Tuple[int, float]:
+    users, _, tasks = value.lower().partition('x')
+    return int(users), float(tasks or 0)
+
+
+def time_route(call: Call, requests: int, warmup: int) -> Dict[str, Any]:
+    """Executa `call(i)` e devolve percentis (ms) e vazão (req/s)."""
+    for i in range(warmup):
+        call(-1 - i)
+
+    samples: List[float] = []
+    started = time.perf_counter()
+    for i in range(requests):
+        start = time.perf_counter()
+        call(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'latency_ms': percentiles(samples),
+        'requests_per_s': requests / elapsed if elapsed else 0.0,
+    }
+
+
+def _ok(resp, status: int):
+    if resp.status_code != status:
+        raise RuntimeError(
+            f'{resp.request.method} {resp.request.url.path}: '
+            f'esperado {status}, recebido {resp.status_code} ({resp.text})'
+        )
+    return resp
+
+
+def route_calls(
+    client: TestClient, engine: Engine, users: int, rng: random.Random
+) -> Dict[str, Call]:
+    """Uma função por rota; cada chamada já valida o status esperado."""
+    auth = Auth()
+    sampled = rng.sample(range(1, users + 1), min(SAMPLED_USERS, users))
+    tokens = {
+        user_id: auth.generate_token(
+            subject=user_id, extra_claims={'email': f'u{user_id}@example.com'}
+        )['access_token']
+        for user_id in sampled
+    }
+
+    with Session(engine) as session:
+        owned = {
+            user_id: session.scalars(
+                select(Task.id).where(Task.user_id == user_id)
+            ).all()
+            for user_id in sampled
+        }
+    with_tasks = [user_id for user_id in sampled if owned[user_id]]
+    if not with_tasks:
+        # Escala sem tarefas: cria uma para as rotas por id
+        user_id = sampled[0]
+        task = client.post(
+            '/api/tasks',
+            json={'title': 'bench'},
+            headers={'Authorization': f'Bearer {tokens[user_id]}'},
+        )
+        owned[user_id] = [_ok(task, 201).json()['id']]
+        with_tasks = [user_id]
+
+    def headers(user_id: int) -> Dict[str, str]:
+        return {'Authorization': f'Bearer {tokens[user_id]}'}
+
+    def any_user() -> int:
+        return rng.choice(sampled)
+
+    def owned_task() -> Tuple[int, int]:
+        user_id = rng.choice(with_tasks)
+        return user_id, rng.choice(owned[user_id])
+
+    # Tarefas descartáveis para DELETE, criadas fora da medição
+    doomed: List[Tuple[int, int]] = []
+
+    def prepare_delete(count: int) -> None:
+        for _ in range(count):
+            user_id = any_user()
+            resp = client.post(
+                '/api/tasks', json={'title': 'apagar'}, headers=headers(user_id)
+            )
+            doomed.append((user_id, _ok(resp, 201).json()['id']))
+
+    def register(i):
+        email = f'novo{i}-{rng.random()}@example.com'
+        payload = {'name': 'Novo', 'email': email, 'password': BENCH_PASSWORD}
+        _ok(client.post('/api/auth/register', json=payload), 201)
+
+    def login(i):
+        email = f'u{any_user()}@example.com'
+        payload = {'email': email, 'password': BENCH_PASSWORD}
+        _ok(client.post('/api/auth/login', json=payload), 200)
+
+    def userinfo(i):
+        _ok(client.get('/api/auth/userinfo', headers=headers(any_user())), 200)
+
+    def jwks(i):
+        _ok(client.get('/api/auth/jwks'), 200)
+
+    def logout(i):
+        token = auth.generate_token(subject=any_user())['access_token']
+        resp = client.post(
+            '/api/auth/logout', headers={'Authorization': f'Bearer {token}'}
+        )
+        _ok(resp, 204)
+
+    def list_tasks(i):
+        _ok(client.get('/api/tasks', headers=headers(any_user())), 200)
+
+    def create_task(i):
+        payload = {'title': 'bench', 'priority': 'alta', 'due_date': '2030-01-01'}
+        _ok(client.post('/api/tasks', json=payload, headers=headers(any_user())), 201)
+
+    def get_task(i):
+        user_id, task_id = owned_task()
+        _ok(client.get(f'/api/tasks/{task_id}', headers=headers(user_id)), 200)
+
+    def put_task(i):
+        user_id, task_id = owned_task()
+        resp = client.put(
+            f'/api/tasks/{task_id}', json={'title': f't{i}'}, headers=headers(user_id)
+        )
+        _ok(resp, 200)
+
+    def patch_task(i):
+        user_id, task_id = owned_task()
+        resp = client.patch(
+            f'/api/tasks/{task_id}',
+            json={'description': f'd{i}'},
+            headers=headers(user_id),
+        )
+        _ok(resp, 200)
+
+    def patch_status(i):
+        user_id, task_id = owned_task()
+        status = 'concluida' if i % 2 else 'pendente'
+        resp = client.patch(
+            f'/api/tasks/{task_id}/status',
+            json={'status': status},
+            headers=headers(user_id),
+        )
+        _ok(resp, 200)
+
+    def delete_task(i):
+        user_id, task_id = doomed.pop()
+        _ok(client.delete(f'/api/tasks/{task_id}', headers=headers(user_id)), 204)
+
+    delete_task.prepare = prepare_delete  # type: ignore[attr-defined]
+
+    return {
+        'POST /api/auth/register': register,
+        'POST /api/auth/login': login,
+        'GET /api/auth/userinfo': userinfo,
+        'GET /api/auth/jwks': jwks,
+        'POST /api/auth/logout': logout,
+        'GET /api/tasks': list_tasks,
+        'POST /api/tasks': create_task,
+        'GET /api/tasks/{task_id}': get_task,
+        'PUT /api/tasks/{task_id}': put_task,
+        'PATCH /api/tasks/{task_id}': patch_task,
+        'PATCH /api/tasks/{task_id}/status': patch_status,
+        'DELETE /api/tasks/{task_id}': delete_task,
+    }
+
+
+def run_scale(users: int, tasks: float, args) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = get_settings().model_copy(
+            update={'DATABASE_URL': f'sqlite:///{Path(tmp) / "bench.db"}'}
+        )
+        engine = create_primary_engine(settings)
+        migrate(engine)
+        data = seed(engine, users, tasks, rng_seed=args.seed)
+
+        def session_override():
+            with Session(engine) as session:
+                yield session
+
+        app = create_app(settings)
+        app.dependency_overrides[get_session] = session_override
+        app.dependency_overrides[get_read_session] = session_override
+        app.state.task_events = EventLog(lambda: engine)
+
+        routes: Dict[str, Any] = {}
+        rng = random.Random(args.seed)
+        with TestClient(app) as client:
+            calls = route_calls(client, engine, users, rng)
+            for route, call in calls.items():
+                if args.only and args.only not in route:
+                    continue
+                requests = args.requests
+                if route in {'POST /api/auth/register', 'POST /api/auth/login'}:
+                    # argon2 domina: menos amostras bastam
+                    requests = max(1, args.requests // 4)
+                prepare = getattr(call, 'prepare', None)
+                if prepare is not None:
+                    prepare(requests + args.warmup)
+                routes[route] = time_route(call, requests, args.warmup)
+                print(
+                    f'  {route:<36} p50 {routes[route]["latency_ms"]["p50"]:7.2f} ms  '
+                    f'p99 {routes[route]["latency_ms"]["p99"]:7.2f} ms  '
+                    f'{routes[route]["requests_per_s"]:7.0f} req/s'
+                )
+        engine.dispose()
+
+    return {'data': data, 'routes': routes}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--scales',
+        default='100x10,1000x50',
+        help='lista de <usuários>x<tarefas por usuário> separada por vírgula',
+    )
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', help='mede só as rotas que contêm este texto')
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {
+        'requests': args.requests,
+        'warmup': args.warmup,
+        'scales': {},
+    }
+    for scale in args.scales.split(','):
+        users, tasks = parse_scale(scale)
+        print(f'escala {scale}: {users} usuários, ~{tasks:g} tarefas por usuário')
+        results['scales'][scale] = run_scale(users, tasks, args)
+
+    path = write_results('endpoints', results, args.output)
+    print(f'resultados em {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""Escritas pequenas concorrentes: commit por requisição vs group commit.
+
+Uso (a partir de backend/, com as variáveis JWT_* da aplicação):
+
+    python -m benchmarks.bench_group_commit --writers 16 --duration 5
+
+Cada modo recebe um arquivo SQLite novo (perfil SQLITE_TUNED, com
+`--synchronous`, FULL por padrão: um fsync por commit) e alguns usuários e
+tarefas. Threads escritoras criam tarefas ou alternam o status de uma
+tarefa, como create_task e change_task_status. No modo `group`, as
+escritas passam pelo GroupCommitter com a janela `--window-ms`.
+
+Em SSD com cache de escrita o fsync custa décimos de milissegundo e o
+commit pouco pesa; `--commit-delay-ms` soma uma espera a cada COMMIT para
+simular disco de rede ou sem cache (onde o group commit faz diferença).
+"""
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from backend.models.database import create_primary_engine
+from backend.models.users import Task, TaskStatus, table_registry
+from backend.services.group_commit import GroupCommitter
+from backend.settings import get_settings
+
+from benchmarks.common import percentiles, write_results
+from benchmarks.datagen import seed
+
+
+def _operation(rng: random.Random, users: int, tasks: int):
+    user_id = rng.randint(1, users)
+    if rng.random() < 0.5:
+
+        def create(session: Session) -> None:
+            session.add(Task(title='nova', user_id=user_id))
+
+        return create
+
+    task_id = rng.randint(1, users * tasks)
+
+    def toggle(session: Session) -> None:
+        task = session.scalar(select(Task).where(Task.id == task_id))
+        if task is not None:
+            task.status = (
+                TaskStatus.PENDENTE
+                if task.status == TaskStatus.CONCLUIDA
+                else TaskStatus.CONCLUIDA
+            )
+
+    return toggle
+
+
+def run_mode(mode: str, args) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = get_settings().model_copy(
+            update={
+                'DATABASE_URL': f'sqlite:///{Path(tmp) / "bench.db"}',
+                'SQLITE_TUNED': True,
+                'SQLITE_SYNCHRONOUS': args.synchronous,
+                'DATABASE_POOL_TIMEOUT': 60,
+            }
+        )
+        engine = create_primary_engine(settings)
+        table_registry.metadata.create_all(engine)
+        seed(engine, args.users, args.tasks, uniform=True, password_hash='h')
+
+        commits = [0]
+
+        @event.listens_for(engine, 'commit')
+        def _count(connection) -> None:
+            commits[0] += 1
+            if args.commit_delay_ms:
+                time.sleep(args.commit_delay_ms / 1000)
+
+        committer = (
+            GroupCommitter(
+                engine, window=args.window_ms / 1000, max_batch=args.max_batch
+            )
+            if mode == 'group'
+            else None
+        )
+
+        deadline = time.perf_counter() + args.duration
+        latencies: List[float] = []
+        errors: Dict[str, int] = {}
+        lock = threading.Lock()
+
+        def write_loop() -> None:
+            rng = random.Random()
+            while time.perf_counter() < deadline:
+                operation = _operation(rng, args.users, args.tasks)
+                start, error = time.perf_counter(), None
+                try:
+                    if committer is not None:
+                        committer.submit(operation)
+                    else:
+                        with Session(engine) as session:
+                            operation(session)
+                            session.commit()
+                except Exception as exc:
+                    error = exc
+                with lock:
+                    if error is None:
+                        latencies.append((time.perf_counter() - start) * 1000)
+                    else:
+                        key = str(getattr(error, 'orig', error))
+                        errors[key] = errors.get(key, 0) + 1
+
+        commits[0] = 0
+        threads = [threading.Thread(target=write_loop) for _ in range(args.writers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if committer is not None:
+            committer.close()
+        engine.dispose()
+
+    return {
+        'writes_per_s': len(latencies) / elapsed,
+        'commits_per_s': commits[0] / elapsed,
+        'writes_per_commit': len(latencies) / max(commits[0], 1),
+        'latency_ms': percentiles(latencies),
+        'errors': errors,
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--tasks', type=int, default=20)
+    parser.add_argument('--window-ms', type=float, default=2.0)
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--synchronous', default='FULL')
+    parser.add_argument('--commit-delay-ms', type=float, default=0.0)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {
+        'writers': args.writers,
+        'duration_s': args.duration,
+        'window_ms': args.window_ms,
+        'synchronous': args.synchronous,
+        'commit_delay_ms': args.commit_delay_ms,
+    }
+    for mode in ('per_request', 'group'):
+        results[mode] = summary = run_mode(mode, args)
+        latency = summary['latency_ms']
+        print(
+            f'{mode:>11}: {summary["writes_per_s"]:.0f} escritas/s, '
+            f'{summary["commits_per_s"]:.0f} commits/s, '
+            f'p50 {latency.get("p50", 0):.2f} ms, p99 {latency.get("p99", 0):.2f} ms, '
+            f'erros {sum(summary["errors"].values())}'
+        )
+
+    path = write_results('group_commit', results, args.output)
+    print(f'resultados em {path}')
+
+
+if __name__ == '__main__':
+    main()
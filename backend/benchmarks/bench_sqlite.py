@@ -0,0 +1,145 @@
+"""Leitura/escrita concorrentes no SQLite: padrão vs perfil SQLITE_TUNED.
+
+Uso (a partir de backend/, com as variáveis JWT_* da aplicação):
+
+    python -m benchmarks.bench_sqlite --readers 16 --writers 8 --duration 10
+
+Cada perfil recebe um arquivo novo com alguns usuários e tarefas; threads
+leitoras listam as tarefas de um usuário e threads escritoras inserem ou
+alternam o status de tarefas, cada operação na sua própria transação.
+Erros (por exemplo `database is locked`) são contados por tipo.
+"""
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from backend.models.database import create_primary_engine, create_read_engine
+from backend.models.users import Task, TaskStatus, table_registry
+from backend.settings import get_settings
+
+from benchmarks.common import percentiles, write_results
+from benchmarks.datagen import seed
+
+
+def run_profile(tuned: bool, args) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = get_settings().model_copy(
+            update={
+                'DATABASE_URL': f'sqlite:///{Path(tmp) / "bench.db"}',
+                'SQLITE_TUNED': tuned,
+                'SQLITE_READ_POOL_SIZE': args.readers,
+                'DATABASE_POOL_SIZE': args.readers + args.writers,
+            }
+        )
+        writer = create_primary_engine(settings)
+        reader = create_read_engine(settings) or writer
+        table_registry.metadata.create_all(writer)
+        seed(writer, args.users, args.tasks, uniform=True, password_hash='h')
+
+        deadline = time.perf_counter() + args.duration
+        latencies: Dict[str, List[float]] = {'read': [], 'write': []}
+        errors: Dict[str, int] = {}
+        lock = threading.Lock()
+
+        def record(kind: str, start: float, error: Exception | None) -> None:
+            with lock:
+                if error is None:
+                    latencies[kind].append((time.perf_counter() - start) * 1000)
+                else:
+                    key = f'{kind}: {str(error.orig if hasattr(error, "orig") else error)}'
+                    errors[key] = errors.get(key, 0) + 1
+
+        def read_loop() -> None:
+            rng = random.Random()
+            while time.perf_counter() < deadline:
+                start, error = time.perf_counter(), None
+                try:
+                    with Session(reader) as session:
+                        session.scalars(
+                            select(Task).where(
+                                Task.user_id == rng.randint(1, args.users)
+                            )
+                        ).all()
+                except Exception as exc:
+                    error = exc
+                record('read', start, error)
+
+        def write_loop() -> None:
+            rng = random.Random()
+            while time.perf_counter() < deadline:
+                start, error = time.perf_counter(), None
+                try:
+                    with Session(writer) as session:
+                        user_id = rng.randint(1, args.users)
+                        if rng.random() < 0.5:
+                            session.add(Task(title='nova', user_id=user_id))
+                        else:
+                            session.execute(
+                                update(Task)
+                                .where(Task.user_id == user_id)
+                                .values(status=TaskStatus.CONCLUIDA)
+                            )
+                        session.commit()
+                except Exception as exc:
+                    error = exc
+                record('write', start, error)
+
+        threads = [threading.Thread(target=read_loop) for _ in range(args.readers)]
+        threads += [threading.Thread(target=write_loop) for _ in range(args.writers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if reader is not writer:
+            reader.dispose()
+        writer.dispose()
+
+    return {
+        'reads_per_s': len(latencies['read']) / elapsed,
+        'writes_per_s': len(latencies['write']) / elapsed,
+        'read_latency_ms': percentiles(latencies['read']),
+        'write_latency_ms': percentiles(latencies['write']),
+        'errors': errors,
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=16)
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--tasks', type=int, default=50)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {
+        'readers': args.readers,
+        'writers': args.writers,
+        'duration_s': args.duration,
+    }
+    for name, tuned in (('default', False), ('tuned', True)):
+        results[name] = summary = run_profile(tuned, args)
+        print(
+            f'{name:>7}: {summary["reads_per_s"]:.0f} leituras/s, '
+            f'{summary["writes_per_s"]:.0f} escritas/s, '
+            f'erros {sum(summary["errors"].values())}'
+        )
+
+    path = write_results('sqlite', results, args.output)
+    print(f'resultados em {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Cold start do backend: tempo de import e tempo até a primeira resposta.
+
+Uso (a partir de backend/, com as variáveis de ambiente da aplicação):
+
+    python -m benchmarks.bench_startup --runs 5
+
+- import: `python -X importtime -c "import backend.app"`, com o custo
+  acumulado de backend.app e os módulos mais caros;
+- first_response: sobe `uvicorn --factory backend.app:create_app` e mede do
+  spawn até o primeiro 200 em /api/auth/jwks.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Tuple
+
+from benchmarks.common import free_port, percentiles, stop_process, write_results
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def _child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(sys.path)
+    return env
+
+
+def measure_import(module: str) -> Tuple[float, Dict[str, int]]:
+    """Retorna (wall ms do processo, {módulo: us acumulado})."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env=_child_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    cumulative: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return wall_ms, cumulative
+
+
+def measure_first_response(timeout: float = 30.0) -> float:
+    """Milissegundos entre o spawn do uvicorn e a primeira resposta 200."""
+    port = free_port()
+    url = f'http://127.0.0.1:{port}/api/auth/jwks'
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            '--factory',
+            'backend.app:create_app',
+            '--port',
+            str(port),
+            '--log-level',
+            'warning',
+        ],
+        env=_child_env(),
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        raise TimeoutError('servidor não respondeu a tempo')
+    finally:
+        stop_process(proc)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--module', default='backend.app')
+    parser.add_argument('--skip-server', action='store_true')
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    walls, app_cumulative, per_module = [], [], {}
+    for _ in range(args.runs):
+        wall_ms, cumulative = measure_import(args.module)
+        walls.append(wall_ms)
+        app_cumulative.append(cumulative.get(args.module, 0) / 1000)
+        for name, us in cumulative.items():
+            per_module.setdefault(name, []).append(us)
+
+    heaviest = sorted(
+        ((name, statistics.median(v) / 1000) for name, v in per_module.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )[: args.top]
+
+    results = {
+        'import': {
+            'module': args.module,
+            'process_wall_ms': percentiles(walls),
+            'module_cumulative_ms': percentiles(app_cumulative),
+            'heaviest_modules_ms': dict(heaviest),
+        }
+    }
+    if not args.skip_server:
+        results['first_response_ms'] = percentiles(
+            measure_first_response() for _ in range(args.runs)
+        )
+
+    path = write_results('startup', results, args.output)
+    print(
+        f'import {args.module}: p50 {results["import"]["module_cumulative_ms"]["p50"]:.1f} ms'
+    )
+    if 'first_response_ms' in results:
+        print(f'primeira resposta: p50 {results["first_response_ms"]["p50"]:.1f} ms')
+    print(f'resultados em {path}')
+
+
+if __name__ == '__main__':
+    main()
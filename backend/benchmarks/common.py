@@ -0,0 +1,144 @@
+"""Utilitários compartilhados pelos benchmarks.
+
+Todo benchmark grava um JSON com o mesmo envelope (nome, commit, python,
+data) para que resultados de commits diferentes possam ser comparados.
+"""
+
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def percentiles(samples: Iterable[float]) -> Dict[str, float]:
+    """Resumo de latência (mesma unidade das amostras)."""
+    data = sorted(samples)
+    if not data:
+        return {'count': 0}
+
+    def pick(q: float) -> float:
+        return data[min(len(data) - 1, int(round(q * (len(data) - 1))))]
+
+    return {
+        'count': len(data),
+        'min': data[0],
+        'mean': statistics.fmean(data),
+        'p50': pick(0.50),
+        'p95': pick(0.95),
+        'p99': pick(0.99),
+        'max': data[-1],
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def rss_kib(pid: int) -> Optional[int]:
+    """RSS de um processo em KiB (Linux); None onde /proc não existe."""
+    try:
+        for line in Path(f'/proc/{pid}/status').read_text().splitlines():
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def write_results(
+    name: str, results: Dict[str, Any], output: Optional[str] = None
+) -> Path:
+    """Grava `results` no envelope padrão e devolve o caminho do arquivo."""
+    revision = git_revision()
+    document = {
+        'benchmark': name,
+        'revision': revision,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'results': results,
+    }
+
+    path = (
+        Path(output)
+        if output
+        else RESULTS_DIR / f'{name}-{revision or "worktree"}.json'
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, default=str), encoding='utf-8')
+    return path
+
+
+def stop_process(proc: subprocess.Popen, timeout: float = 10.0) -> None:
+    """SIGTERM e, se o servidor não encerrar a tempo, SIGKILL."""
+    proc.terminate()
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def start_server(
+    env_overrides: Dict[str, str], port: int, extra_args: Optional[List[str]] = None
+) -> subprocess.Popen:
+    """Sobe `uvicorn --factory backend.app:create_app` em 127.0.0.1:`port`."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(sys.path)
+    env.update(env_overrides)
+    return subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            '--factory',
+            'backend.app:create_app',
+            '--port',
+            str(port),
+            '--log-level',
+            'warning',
+            '--backlog',
+            '4096',
+            *(extra_args or []),
+        ],
+        env=env,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get('/api/auth/jwks')).status_code == 200:
+                    return
+            except httpx.TransportError:
+                await asyncio.sleep(0.05)
+    raise TimeoutError('servidor não respondeu a tempo')
@@ -0,0 +1,80 @@
+"""Compara dois resultados de benchmark (JSON gravados por write_results).
+
+Uso:
+
+    python -m benchmarks.compare benchmarks/results/endpoints-abc123.json \\
+        benchmarks/results/endpoints-def456.json --threshold 10
+
+Percorre os dois documentos e compara toda métrica numérica presente nos
+dois (p50, p95, p99, requests_per_s...). Variações acima de `--threshold`
+por cento são marcadas; `--fail` faz o comando sair com status 1 se alguma
+latência piorar ou alguma vazão cair além do limite.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Métricas em que maior é melhor; o resto (latências) é menor-melhor
+HIGHER_IS_BETTER = ('per_s',)
+METRICS = ('p50', 'p95', 'p99', 'mean', 'max', 'per_s')
+
+
+def flatten(node: Any, prefix: str = '') -> Iterator[Tuple[str, float]]:
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from flatten(value, f'{prefix}/{key}' if prefix else str(key))
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        if prefix.endswith(METRICS):
+            yield prefix, float(node)
+
+
+def compare(
+    base: Dict[str, Any], head: Dict[str, Any], threshold: float
+) -> List[Dict[str, Any]]:
+    before = dict(flatten(base.get('results', {})))
+    after = dict(flatten(head.get('results', {})))
+    rows = []
+    for metric in sorted(before.keys() & after.keys()):
+        old, new = before[metric], after[metric]
+        change = (new - old) / old * 100 if old else 0.0
+        worse = -change if metric.endswith(HIGHER_IS_BETTER) else change
+        rows.append({
+            'metric': metric,
+            'base': old,
+            'head': new,
+            'change_pct': change,
+            'regression': worse > threshold,
+            'improvement': -worse > threshold,
+        })
+    return rows
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=10.0)
+    parser.add_argument('--fail', action='store_true')
+    args = parser.parse_args(argv)
+
+    base = json.loads(Path(args.base).read_text(encoding='utf-8'))
+    head = json.loads(Path(args.head).read_text(encoding='utf-8'))
+    print(f'{base.get("revision")} -> {head.get("revision")}')
+
+    rows = compare(base, head, args.threshold)
+    for row in rows:
+        mark = 'PIOR ' if row['regression'] else 'MELHOR' if row['improvement'] else ''
+        print(
+            f'{mark:<6} {row["metric"]:<70} {row["base"]:10.2f} -> '
+            f'{row["head"]:10.2f} ({row["change_pct"]:+.1f}%)'
+        )
+
+    if args.fail and any(row['regression'] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
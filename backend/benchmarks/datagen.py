@@ -0,0 +1,166 @@
+"""Gerador de dados sintéticos para benchmarks.
+
+Uso (a partir de backend/, com as variáveis JWT_* da aplicação):
+
+    python -m benchmarks.datagen --url sqlite:///./bench.db --users 10000 --tasks 50
+
+Cria o schema pelas migrations e insere em lote (executemany, em blocos e
+numa única transação). As distribuições imitam uso real:
+
+- tarefas por usuário: exponencial com média `--tasks` (muitos usuários com
+  poucas tarefas, alguns com dezenas de vezes a média), ou `--uniform`;
+- status: ~35% concluídas; prioridade: 30% baixa, 50% média, 20% alta;
+- prazo: 30% sem prazo; os demais entre 30 dias atrás e 60 dias à frente
+  (há tarefas pendentes atrasadas);
+- criação espalhada pelo último ano.
+
+Todos os usuários (`u<i>@example.com`) têm a senha BENCH_PASSWORD, com um
+único hash argon2 calculado uma vez.
+"""
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, insert
+
+from backend.models.users import Task, TaskPriority, TaskStatus, User
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / 'alembic.ini'
+
+BENCH_PASSWORD = 'S3nh@F0rte'
+CHUNK_SIZE = 5000
+# Teto de tarefas de um único usuário, em múltiplos da média
+MAX_TASKS_FACTOR = 20
+
+_VERBS = ('Revisar', 'Enviar', 'Preparar', 'Agendar', 'Corrigir', 'Pagar', 'Ler')
+_NOUNS = ('relatório', 'proposta', 'fatura', 'reunião', 'contrato', 'slides', 'PR')
+_PRIORITIES = (TaskPriority.BAIXA, TaskPriority.MEDIA, TaskPriority.ALTA)
+_PRIORITY_WEIGHTS = (30, 50, 20)
+
+
+def migrate(engine: Engine) -> None:
+    """Aplica as migrations até a head na base de `engine`."""
+    config = Config(str(ALEMBIC_INI))
+    with engine.begin() as connection:
+        config.attributes['connection'] = connection
+        command.upgrade(config, 'head')
+
+
+def tasks_for_user(rng: random.Random, mean: float, uniform: bool) -> int:
+    if uniform or mean <= 0:
+        return int(mean)
+    return min(int(rng.expovariate(1 / mean)), int(mean * MAX_TASKS_FACTOR))
+
+
+def fake_task(rng: random.Random, user_id: int, today: date) -> Dict[str, Any]:
+    created_at = datetime.combine(today, datetime.min.time()) - timedelta(
+        minutes=rng.randrange(365 * 24 * 60)
+    )
+    done = rng.random() < 0.35
+    due_date: Optional[date] = None
+    if rng.random() >= 0.30:
+        due_date = today + timedelta(days=rng.randint(-30, 60))
+    return {
+        'title': f'{rng.choice(_VERBS)} {rng.choice(_NOUNS)}',
+        'user_id': user_id,
+        'description': 'Gerada para benchmark' if rng.random() < 0.5 else None,
+        'status': TaskStatus.CONCLUIDA if done else TaskStatus.PENDENTE,
+        'priority': rng.choices(_PRIORITIES, _PRIORITY_WEIGHTS)[0],
+        'due_date': due_date,
+        'created_at': created_at,
+        'updated_at': created_at + timedelta(minutes=rng.randrange(60 * 24)),
+    }
+
+
+def _chunks(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict]]:
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def seed(
+    engine: Engine,
+    users: int,
+    tasks_per_user: float,
+    *,
+    uniform: bool = False,
+    rng_seed: int = 0,
+    password_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Insere `users` usuários e suas tarefas; devolve um resumo da carga."""
+    if password_hash is None:
+        from backend.services.auth import Auth
+
+        password_hash = Auth().hash_password(BENCH_PASSWORD)
+
+    rng = random.Random(rng_seed)
+    today = date.today()
+    counts = [tasks_for_user(rng, tasks_per_user, uniform) for _ in range(users)]
+
+    def user_rows():
+        for i in range(1, users + 1):
+            yield {
+                'name': f'Usuário {i}',
+                'email': f'u{i}@example.com',
+                'hashed_password': password_hash,
+            }
+
+    def task_rows():
+        for user_id, count in enumerate(counts, start=1):
+            for _ in range(count):
+                yield fake_task(rng, user_id, today)
+
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        for chunk in _chunks(user_rows(), CHUNK_SIZE):
+            connection.execute(insert(User), chunk)
+        for chunk in _chunks(task_rows(), CHUNK_SIZE):
+            connection.execute(insert(Task), chunk)
+        connection.exec_driver_sql('ANALYZE')
+
+    return {
+        'users': users,
+        'tasks': sum(counts),
+        'max_tasks_per_user': max(counts, default=0),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', required=True, help='base vazia a popular')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--tasks', type=float, default=20)
+    parser.add_argument('--uniform', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.url)
+    try:
+        migrate(engine)
+        summary = seed(
+            engine, args.users, args.tasks, uniform=args.uniform, rng_seed=args.seed
+        )
+    finally:
+        engine.dispose()
+
+    print(
+        f'{summary["users"]} usuários, {summary["tasks"]} tarefas '
+        f'(máx. {summary["max_tasks_per_user"]} por usuário) '
+        f'em {summary["seconds"]:.1f}s'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+"""Gerador de carga com jornadas de usuário contra um uvicorn local.
+
+Uso (a partir de backend/, com as variáveis JWT_* da aplicação):
+
+    # malha fechada: 50 usuários virtuais repetindo a jornada por 60s
+    python -m benchmarks.loadgen --users 50 --duration 60
+
+    # malha aberta: 5 sessões novas/s (Poisson), no máximo 200 simultâneas
+    python -m benchmarks.loadgen --rate 5 --max-sessions 200 --duration 60
+
+Cada sessão percorre: register (ou login de um usuário já semeado, ver
+--returning) -> userinfo -> list_tasks -> 1 a 3 creates -> update e troca
+de status -> list_tasks -> logout, com pausas exponenciais (--think) entre
+os passos.
+
+Sem --url, sobe um uvicorn com um SQLite temporário (migrations + datagen);
+--workers e --env NOME=valor repassam opções ao servidor. O relatório traz
+vazão, percentis e taxa de erro por janela de --interval segundos (para ver
+degradação ao longo do tempo) e por passo da jornada. Na malha aberta,
+chegadas que encontram --max-sessions ativas são descartadas e contadas.
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import create_engine
+
+from benchmarks.common import (
+    free_port,
+    percentiles,
+    start_server,
+    stop_process,
+    wait_ready,
+    write_results,
+)
+from benchmarks.datagen import BENCH_PASSWORD, migrate, seed
+
+# (instante em s desde o início, passo, latência ms, erro ou None)
+Sample = Tuple[float, str, float, Optional[str]]
+
+
+class Recorder:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.samples: List[Sample] = []
+        self.sessions_started = 0
+        self.sessions_completed = 0
+        self.sessions_failed = 0
+        self.sessions_rejected = 0
+        self.session_ms: List[float] = []
+
+    async def call(self, step: str, request, expected: int) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        error: Optional[str] = None
+        resp = None
+        try:
+            resp = await request
+            if resp.status_code != expected:
+                error = str(resp.status_code)
+        except httpx.HTTPError as exc:
+            error = type(exc).__name__
+        end = time.perf_counter()
+        self.samples.append((
+            end - self.started,
+            step,
+            (end - start) * 1000,
+            error,
+        ))
+        return None if error else resp
+
+    def timeline(self, interval: float) -> List[Dict[str, Any]]:
+        windows: Dict[int, List[Sample]] = {}
+        for sample in self.samples:
+            windows.setdefault(int(sample[0] // interval), []).append(sample)
+
+        rows = []
+        for index in range(max(windows, default=-1) + 1):
+            samples = windows.get(index, [])
+            errors = sum(1 for sample in samples if sample[3])
+            rows.append({
+                'start_s': index * interval,
+                'requests_per_s': len(samples) / interval,
+                'error_rate': errors / len(samples) if samples else 0.0,
+                'latency_ms': percentiles(s[2] for s in samples if not s[3]),
+            })
+        return rows
+
+    def by_step(self) -> Dict[str, Any]:
+        steps: Dict[str, Dict[str, Any]] = {}
+        for _, step, latency, error in self.samples:
+            entry = steps.setdefault(step, {'ok': [], 'errors': {}})
+            if error:
+                entry['errors'][error] = entry['errors'].get(error, 0) + 1
+            else:
+                entry['ok'].append(latency)
+        return {
+            step: {
+                'requests': len(entry['ok']) + sum(entry['errors'].values()),
+                'latency_ms': percentiles(entry['ok']),
+                'errors': entry['errors'],
+            }
+            for step, entry in steps.items()
+        }
+
+    def summary(self, elapsed: float, interval: float) -> Dict[str, Any]:
+        errors = sum(1 for sample in self.samples if sample[3])
+        return {
+            'elapsed_s': elapsed,
+            'requests': len(self.samples),
+            'requests_per_s': len(self.samples) / elapsed if elapsed else 0.0,
+            'error_rate': errors / len(self.samples) if self.samples else 0.0,
+            'latency_ms': percentiles(s[2] for s in self.samples if not s[3]),
+            'sessions': {
+                'started': self.sessions_started,
+                'completed': self.sessions_completed,
+                'failed': self.sessions_failed,
+                'rejected': self.sessions_rejected,
+                'duration_ms': percentiles(self.session_ms),
+            },
+            'steps': self.by_step(),
+            'timeline': self.timeline(interval),
+        }
+
+
+class StepFailed(Exception):
+    pass
+
+
+async def journey(
+    client: httpx.AsyncClient, recorder: Recorder, rng: random.Random, args, run_id: str
+) -> None:
+    """Uma sessão completa; StepFailed interrompe no primeiro passo com erro."""
+
+    async def step(name: str, request, expected: int) -> httpx.Response:
+        resp = await recorder.call(name, request, expected)
+        if resp is None:
+            raise StepFailed(name)
+        if args.think > 0:
+            await asyncio.sleep(rng.expovariate(1 / args.think))
+        return resp
+
+    recorder.sessions_started += 1
+    number = recorder.sessions_started
+    if args.seed_users and rng.random() < args.returning:
+        email = f'u{rng.randint(1, args.seed_users)}@example.com'
+        credentials = {'email': email, 'password': BENCH_PASSWORD}
+        resp = await step(
+            'login', client.post('/api/auth/login', json=credentials), 200
+        )
+    else:
+        payload = {
+            'name': f'Carga {number}',
+            'email': f'load-{run_id}-{number}@example.com',
+            'password': BENCH_PASSWORD,
+        }
+        resp = await step(
+            'register', client.post('/api/auth/register', json=payload), 201
+        )
+    headers = {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+
+    await step('userinfo', client.get('/api/auth/userinfo', headers=headers), 200)
+    await step('list_tasks', client.get('/api/tasks', headers=headers), 200)
+
+    created: List[int] = []
+    for i in range(rng.randint(1, 3)):
+        payload = {'title': f'Tarefa {i}', 'priority': rng.choice(['baixa', 'alta'])}
+        resp = await step(
+            'create_task', client.post('/api/tasks', json=payload, headers=headers), 201
+        )
+        created.append(resp.json()['id'])
+
+    task_url = f'/api/tasks/{rng.choice(created)}'
+    await step(
+        'update_task',
+        client.put(task_url, json={'title': 'Editada'}, headers=headers),
+        200,
+    )
+    await step(
+        'toggle_status',
+        client.patch(
+            f'{task_url}/status', json={'status': 'concluida'}, headers=headers
+        ),
+        200,
+    )
+    await step('list_tasks', client.get('/api/tasks', headers=headers), 200)
+    await step('logout', client.post('/api/auth/logout', headers=headers), 204)
+
+
+async def run_session(client, recorder: Recorder, rng, args, run_id: str) -> None:
+    start = time.perf_counter()
+    try:
+        await journey(client, recorder, rng, args, run_id)
+    except StepFailed:
+        recorder.sessions_failed += 1
+    else:
+        recorder.sessions_completed += 1
+        recorder.session_ms.append((time.perf_counter() - start) * 1000)
+
+
+async def run_load(base_url: str, args) -> Dict[str, Any]:
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    deadline = time.perf_counter() + args.duration
+    concurrency = args.max_sessions if args.rate else args.users
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        if args.rate:
+            # Malha aberta: chegadas não esperam o servidor responder
+            rng = random.Random(args.seed)
+            active: set = set()
+            while time.perf_counter() < deadline:
+                await asyncio.sleep(rng.expovariate(args.rate))
+                if len(active) >= args.max_sessions:
+                    recorder.sessions_rejected += 1
+                    continue
+                task = asyncio.create_task(
+                    run_session(
+                        client, recorder, random.Random(rng.random()), args, run_id
+                    )
+                )
+                active.add(task)
+                task.add_done_callback(active.discard)
+            if active:
+                await asyncio.wait(active, timeout=args.timeout)
+                for task in list(active):
+                    task.cancel()
+        else:
+            # Malha fechada: cada usuário virtual recomeça ao terminar
+            async def virtual_user(index: int) -> None:
+                rng = random.Random(args.seed + index)
+                while time.perf_counter() < deadline:
+                    await run_session(client, recorder, rng, args, run_id)
+
+            await asyncio.gather(*(virtual_user(i) for i in range(args.users)))
+
+    elapsed = time.perf_counter() - recorder.started
+    return recorder.summary(elapsed, args.interval)
+
+
+def print_report(summary: Dict[str, Any]) -> None:
+    print(f'{"t (s)":>6} {"req/s":>8} {"erros":>7} {"p50":>8} {"p95":>8} {"p99":>8}')
+    for row in summary['timeline']:
+        latency = row['latency_ms']
+        print(
+            f'{row["start_s"]:6.0f} {row["requests_per_s"]:8.1f} '
+            f'{row["error_rate"]:7.1%} {latency.get("p50", 0):8.1f} '
+            f'{latency.get("p95", 0):8.1f} {latency.get("p99", 0):8.1f}'
+        )
+    print()
+    for step, stats in summary['steps'].items():
+        latency = stats['latency_ms']
+        print(
+            f'{step:<14} {stats["requests"]:6d} req  p50 {latency.get("p50", 0):7.1f} '
+            f'p99 {latency.get("p99", 0):7.1f} ms  erros {stats["errors"] or "-"}'
+        )
+    sessions = summary['sessions']
+    print(
+        f'\n{summary["requests_per_s"]:.1f} req/s, erros {summary["error_rate"]:.1%}; '
+        f'sessões: {sessions["completed"]} completas, {sessions["failed"]} com '
+        f'falha, {sessions["rejected"]} descartadas'
+    )
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--users', type=int, default=20, help='usuários virtuais (malha fechada)'
+    )
+    parser.add_argument(
+        '--rate', type=float, help='sessões novas por segundo (malha aberta)'
+    )
+    parser.add_argument('--max-sessions', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--think', type=float, default=0.5, help='pausa média (s)')
+    parser.add_argument(
+        '--returning',
+        type=float,
+        default=0.7,
+        help='fração de sessões que fazem login em vez de register',
+    )
+    parser.add_argument('--seed-users', type=int, default=1000)
+    parser.add_argument('--seed-tasks', type=float, default=20)
+    parser.add_argument('--interval', type=float, default=5.0)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--url', help='servidor já no ar (não sobe uvicorn)')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument(
+        '--env', action='append', default=[], help='NOME=valor para o servidor'
+    )
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    if args.url:
+        # Base de terceiros: não há usuários semeados com senha conhecida
+        args.seed_users = 0
+        summary = asyncio.run(run_load(args.url, args))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            database_url = f'sqlite:///{Path(tmp) / "load.db"}'
+            engine = create_engine(database_url)
+            migrate(engine)
+            seed(engine, args.seed_users, args.seed_tasks, rng_seed=args.seed)
+            engine.dispose()
+
+            port = free_port()
+            base_url = f'http://127.0.0.1:{port}'
+            env = dict(item.split('=', 1) for item in args.env)
+            env['DATABASE_URL'] = database_url
+            server = start_server(env, port, ['--workers', str(args.workers)])
+            try:
+                asyncio.run(wait_ready(base_url))
+                summary = asyncio.run(run_load(base_url, args))
+            finally:
+                stop_process(server)
+
+    print_report(summary)
+    config = {
+        key: getattr(args, key)
+        for key in (
+            'users',
+            'rate',
+            'max_sessions',
+            'duration',
+            'think',
+            'returning',
+            'seed_users',
+            'seed_tasks',
+            'workers',
+            'env',
+        )
+    }
+    path = write_results('load', {'config': config, **summary}, args.output)
+    print(f'resultados em {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""Plano de execução de cada consulta emitida pelos endpoints.
+
+Uso (a partir de backend/, com as variáveis JWT_* da aplicação):
+
+    python -m benchmarks.query_plans --users 200 --tasks 50
+
+O schema é criado pelas migrations do Alembic (não pelo metadata), a base
+recebe dados sintéticos e uma jornada percorre as rotas de auth e tarefas.
+Cada SELECT/UPDATE/DELETE capturado passa por `EXPLAIN QUERY PLAN` (SQLite)
+ou `EXPLAIN (FORMAT JSON)` (PostgreSQL, com seqscan desabilitado para ver se
+existe índice utilizável). Varreduras completas de `tasks` ou `users` são
+reportadas e fazem o comando sair com status 1; o mesmo harness é usado por
+tests/test_query_plans.py.
+"""
+
+import argparse
+import re
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import Session
+
+from backend.app import create_app
+from backend.models.database import get_read_session, get_session
+from backend.services.task_events import EventLog
+
+from benchmarks.common import write_results
+from benchmarks.datagen import migrate, seed
+
+# Tabelas que nunca podem ser varridas por inteiro
+GUARDED_TABLES = ('tasks', 'users')
+
+_EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+_SQLITE_SCAN = re.compile(r'^SCAN (\w+)')
+_PG_SCAN = re.compile(r'^Seq Scan on (\w+)')
+
+Statement = Tuple[str, Any]
+
+
+@contextmanager
+def capture_statements(engine: Engine) -> Iterator[List[Statement]]:
+    """Coleta (sql, parâmetros) de tudo que `engine` executar no bloco."""
+    statements: List[Statement] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append((statement, parameters[0] if many else parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def _pg_nodes(node: Dict[str, Any]) -> Iterator[str]:
+    relation = node.get('Relation Name')
+    index = node.get('Index Name')
+    line = node['Node Type']
+    if index:
+        line += f' using {index}'
+    if relation:
+        line += f' on {relation}'
+    yield line
+    for child in node.get('Plans', []):
+        yield from _pg_nodes(child)
+
+
+def explain(engine: Engine, statement: str, parameters: Any) -> List[str]:
+    """Linhas do plano de `statement` (uma por nó)."""
+    dialect = engine.dialect.name
+    with engine.connect() as connection:
+        if dialect == 'sqlite':
+            rows = connection.exec_driver_sql(
+                f'EXPLAIN QUERY PLAN {statement}', parameters
+            ).all()
+            return [row[-1] for row in rows]
+        if dialect == 'postgresql':
+            # SET LOCAL vale até o rollback feito ao fechar a conexão
+            connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+            plan = connection.exec_driver_sql(
+                f'EXPLAIN (FORMAT JSON) {statement}', parameters
+            ).scalar()
+            return list(_pg_nodes(plan[0]['Plan']))
+    raise ValueError(f'EXPLAIN não suportado para o dialeto {dialect!r}.')
+
+
+def full_scans(plan: List[str], tables=GUARDED_TABLES) -> List[str]:
+    """Tabelas protegidas que o plano percorre por inteiro."""
+    scanned = []
+    for line in plan:
+        match = _SQLITE_SCAN.match(line.strip()) or _PG_SCAN.match(line.strip())
+        if match and match.group(1) in tables:
+            scanned.append(match.group(1))
+    return scanned
+
+
+def _expect(resp, status: int):
+    if resp.status_code != status:
+        raise RuntimeError(
+            f'{resp.request.method} {resp.request.url.path}: '
+            f'esperado {status}, recebido {resp.status_code} ({resp.text})'
+        )
+    return resp
+
+
+def journey(client: TestClient, step: Callable[[str], Any]) -> None:
+    """Percorre as rotas de auth e tarefas; `step(rótulo)` delimita cada uma."""
+    credentials = {'email': 'plano@example.com', 'password': 'S3nh@F0rte'}
+
+    with step('POST /api/auth/register'):
+        _expect(
+            client.post('/api/auth/register', json={'name': 'Plano', **credentials}),
+            201,
+        )
+    with step('POST /api/auth/login'):
+        token = _expect(client.post('/api/auth/login', json=credentials), 200)
+    headers = {'Authorization': f'Bearer {token.json()["access_token"]}'}
+
+    with step('GET /api/auth/userinfo'):
+        _expect(client.get('/api/auth/userinfo', headers=headers), 200)
+    with step('POST /api/tasks'):
+        task = _expect(
+            client.post('/api/tasks', json={'title': 'Plano'}, headers=headers), 201
+        )
+    task_url = f'/api/tasks/{task.json()["id"]}'
+
+    with step('GET /api/tasks'):
+        _expect(client.get('/api/tasks', headers=headers), 200)
+    with step('GET /api/tasks/{task_id}'):
+        _expect(client.get(task_url, headers=headers), 200)
+    with step('PUT /api/tasks/{task_id}'):
+        _expect(client.put(task_url, json={'title': 'Plano 2'}, headers=headers), 200)
+    with step('PATCH /api/tasks/{task_id}/status'):
+        _expect(
+            client.patch(
+                f'{task_url}/status', json={'status': 'concluida'}, headers=headers
+            ),
+            200,
+        )
+    neighbor = _expect(
+        client.post('/api/tasks', json={'title': 'Vizinha'}, headers=headers), 201
+    )
+    with step('PATCH /api/tasks/{task_id}/position'):
+        _expect(
+            client.patch(
+                f'{task_url}/position',
+                json={'after_id': neighbor.json()['id']},
+                headers=headers,
+            ),
+            200,
+        )
+    first, last = (
+        _expect(client.post('/api/tasks', json={'title': t}, headers=headers), 201)
+        for t in ('Primeira', 'Última')
+    )
+
+    def block(url: str, blocker) -> Any:
+        return client.post(
+            f'{url}/dependencies', json={'blocker_id': blocker}, headers=headers
+        )
+
+    _expect(block(f'/api/tasks/{neighbor.json()["id"]}', task.json()['id']), 201)
+    _expect(block(f'/api/tasks/{last.json()["id"]}', first.json()['id']), 201)
+    # Contra a ordem topológica atual: passa pelas buscas na faixa afetada
+    first_url = f'/api/tasks/{first.json()["id"]}'
+    with step('POST /api/tasks/{task_id}/dependencies'):
+        _expect(block(first_url, neighbor.json()['id']), 201)
+    with step('GET /api/tasks/{task_id}/dependencies'):
+        _expect(client.get(f'{first_url}/dependencies', headers=headers), 200)
+    with step('GET /api/tasks/ready'):
+        _expect(client.get('/api/tasks/ready', headers=headers), 200)
+    with step('DELETE /api/tasks/{task_id}/dependencies/{blocker_id}'):
+        _expect(
+            client.delete(
+                f'{first_url}/dependencies/{neighbor.json()["id"]}', headers=headers
+            ),
+            204,
+        )
+    with step('GET /api/tasks/overdue'):
+        _expect(client.get('/api/tasks/overdue', headers=headers), 200)
+    with step('GET /api/tasks/due-within'):
+        _expect(client.get('/api/tasks/due-within', headers=headers), 200)
+    with step('GET /api/tasks/events'):
+        _expect(client.get('/api/tasks/events', headers=headers), 200)
+    with step('DELETE /api/tasks/{task_id}'):
+        _expect(client.delete(task_url, headers=headers), 204)
+
+
+def endpoint_plans(engine: Engine) -> Dict[str, List[Dict[str, Any]]]:
+    """Roda a jornada contra `engine` e explica as consultas de cada rota."""
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app = create_app()
+    app.dependency_overrides[get_session] = session_override
+    app.dependency_overrides[get_read_session] = session_override
+    app.state.task_events = EventLog(lambda: engine)
+
+    captured: Dict[str, List[Statement]] = {}
+
+    @contextmanager
+    def step(label: str):
+        with capture_statements(engine) as statements:
+            yield
+        captured[label] = statements
+
+    with TestClient(app) as client:
+        journey(client, step)
+
+    plans: Dict[str, List[Dict[str, Any]]] = {}
+    for label, statements in captured.items():
+        plans[label] = []
+        for statement, parameters in statements:
+            if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+                continue
+            plan = explain(engine, statement, parameters)
+            plans[label].append({
+                'sql': ' '.join(statement.split()),
+                'plan': plan,
+                'full_scans': full_scans(plan),
+            })
+    return plans
+
+
+def seeded_engine(url: str, users: int, tasks_per_user: int) -> Engine:
+    """Engine de uma base migrada, com dados sintéticos e estatísticas."""
+    engine = create_engine(url)
+    migrate(engine)
+    # seed termina com ANALYZE: o planejador escolhe como faria em produção
+    seed(engine, users, tasks_per_user)
+    return engine
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--tasks', type=int, default=50)
+    parser.add_argument(
+        '--url', help='base vazia a usar (padrão: SQLite em diretório temporário)'
+    )
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f'sqlite:///{Path(tmp) / "plans.db"}'
+        engine = seeded_engine(url, args.users, args.tasks)
+        try:
+            plans = endpoint_plans(engine)
+        finally:
+            engine.dispose()
+
+    failures = 0
+    for label, queries in plans.items():
+        print(label)
+        for query in queries:
+            flag = (
+                'SCAN ' + ','.join(query['full_scans']) if query['full_scans'] else 'ok'
+            )
+            failures += bool(query['full_scans'])
+            print(f'  [{flag}] {query["sql"][:100]}')
+            for line in query['plan']:
+                print(f'      {line}')
+
+    path = write_results(
+        'query_plans',
+        {'users': args.users, 'tasks': args.tasks, 'plans': plans},
+        args.output,
+    )
+    print(f'resultados em {path}')
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
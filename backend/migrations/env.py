@@ -5,17 +5,24 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from backend.models import dependencies, events, jobs, sharding  # noqa: F401 (tabelas fora de users)
 from backend.models.users import table_registry
-from backend.settings import Settings
+from backend.settings import get_settings
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-config.set_main_option('sqlalchemy.url', Settings().DATABASE_URL)
+
+# Conexão já aberta (ex.: testes de plano de consulta) dispensa a URL e a
+# configuração de logging do alembic.ini
+connection = config.attributes.get('connection')
+
+if connection is None:
+    config.set_main_option('sqlalchemy.url', get_settings().DATABASE_URL)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+if config.config_file_name is not None and connection is None:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -78,5 +85,9 @@ def run_migrations_online() -> None:
 
 if context.is_offline_mode():
     run_migrations_offline()
+elif connection is not None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+    with context.begin_transaction():
+        context.run_migrations()
 else:
     run_migrations_online()
@@ -0,0 +1,30 @@
+"""index tasks by owner
+
+Revision ID: 5b1f0c7d9a42
+Revises: 217678ed28ab
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1f0c7d9a42'
+down_revision: Union[str, Sequence[str], None] = '217678ed28ab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tasks.user_id é filtro de todas as rotas de tarefas; (user_id, id)
+    # também entrega a listagem já ordenada
+    op.create_index('ix_tasks_user_id_id', 'tasks', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_id_id', table_name='tasks')
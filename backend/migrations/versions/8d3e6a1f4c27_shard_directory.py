@@ -0,0 +1,43 @@
+"""shard directory and id blocks
+
+Revision ID: 8d3e6a1f4c27
+Revises: 5b1f0c7d9a42
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3e6a1f4c27'
+down_revision: Union[str, Sequence[str], None] = '5b1f0c7d9a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Ficam no banco principal; os shards só têm a tabela tasks
+    op.create_table(
+        'shard_directory',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('shard', sa.String(), nullable=False),
+        sa.Column('moving_to', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_table(
+        'id_blocks',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('next_value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('id_blocks')
+    op.drop_table('shard_directory')
@@ -0,0 +1,82 @@
+"""manual ordering rank on tasks
+
+Revision ID: a7d2f4c9e318
+Revises: f3c8a1d6b274
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2f4c9e318'
+down_revision: Union[str, Sequence[str], None] = 'f3c8a1d6b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RankType = sa.String().with_variant(sa.String(collation='C'), 'postgresql')
+
+# Cópia do necessário de backend.models.ranking: a migração não pode mudar
+# junto com o código da aplicação
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+
+def evenly_spaced(n: int) -> List[str]:
+    """As `n` primeiras chaves a partir de 'a0' ('a' + 1 dígito, 'b' + 2...)."""
+    keys: List[str] = []
+    head, width = 'a', 1
+    while len(keys) < n:
+        for value in range(min(len(DIGITS) ** width, n - len(keys))):
+            digits = ''
+            for _ in range(width):
+                value, digit = divmod(value, len(DIGITS))
+                digits = DIGITS[digit] + digits
+            keys.append(head + digits)
+        head, width = chr(ord(head) + 1), width + 1
+    return keys
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('rank', RankType, nullable=True))
+
+    # A ordem atual da listagem (mais novas primeiro) vira a ordem manual
+    tasks = sa.table('tasks', sa.column('id'), sa.column('user_id'), sa.column('rank'))
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(tasks.c.user_id, tasks.c.id).order_by(
+            tasks.c.user_id, tasks.c.id.desc()
+        )
+    ).all()
+    statement = (
+        tasks
+        .update()
+        .where(tasks.c.id == sa.bindparam('task_id'))
+        .values(rank=sa.bindparam('new_rank'))
+    )
+    for _, group in groupby(rows, key=itemgetter(0)):
+        ids = [task_id for _, task_id in group]
+        connection.execute(
+            statement,
+            [
+                {'task_id': task_id, 'new_rank': rank}
+                for task_id, rank in zip(ids, evenly_spaced(len(ids)))
+            ],
+        )
+
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.alter_column('rank', existing_type=RankType, nullable=False)
+    op.create_index('ix_tasks_user_rank', 'tasks', ['user_id', 'rank'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_rank', table_name='tasks')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('rank')
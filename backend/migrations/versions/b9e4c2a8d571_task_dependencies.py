@@ -0,0 +1,58 @@
+"""task dependencies and topological order
+
+Revision ID: b9e4c2a8d571
+Revises: a7d2f4c9e318
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4c2a8d571'
+down_revision: Union[str, Sequence[str], None] = 'a7d2f4c9e318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_dependencies',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('blocker_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(),
+            server_default=sa.text('(CURRENT_TIMESTAMP)'),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['blocker_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('task_id', 'blocker_id'),
+    )
+    op.create_index(
+        'ix_task_dependencies_blocker_id',
+        'task_dependencies',
+        ['blocker_id', 'task_id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_task_dependencies_user_id', 'task_dependencies', ['user_id'], unique=False
+    )
+    # Sem backfill: a tarefa ganha posição ao entrar na primeira aresta
+    op.add_column('tasks', sa.Column('topo_order', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('topo_order')
+    op.drop_index('ix_task_dependencies_user_id', table_name='task_dependencies')
+    op.drop_index('ix_task_dependencies_blocker_id', table_name='task_dependencies')
+    op.drop_table('task_dependencies')
@@ -0,0 +1,46 @@
+"""append-only task events
+
+Revision ID: c4a7e2b9d815
+Revises: 8d3e6a1f4c27
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2b9d815'
+down_revision: Union[str, Sequence[str], None] = '8d3e6a1f4c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('changes', sa.JSON(), nullable=True),
+        sa.Column('occurred_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_task_events_user_id_id', 'task_events', ['user_id', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_task_events_task_id_id', 'task_events', ['task_id', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_events_task_id_id', table_name='task_events')
+    op.drop_index('ix_task_events_user_id_id', table_name='task_events')
+    op.drop_table('task_events')
@@ -0,0 +1,40 @@
+"""partial index on pending tasks with due date
+
+Revision ID: f3c8a1d6b274
+Revises: e1b5d3a7c902
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a1d6b274'
+down_revision: Union[str, Sequence[str], None] = 'e1b5d3a7c902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmo texto de backend.models.users.PENDING_WITH_DUE_DATE (migrations não
+# importam o modelo: o predicado desta revisão não muda com ele)
+PENDING_WITH_DUE_DATE = "status = 'PENDENTE' AND due_date IS NOT NULL"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_tasks_pending_due',
+        'tasks',
+        ['user_id', 'due_date'],
+        unique=False,
+        sqlite_where=sa.text(PENDING_WITH_DUE_DATE),
+        postgresql_where=sa.text(PENDING_WITH_DUE_DATE),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_pending_due', table_name='tasks')
@@ -1,22 +1,148 @@
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.models.database import dispose_engine, get_engine
 from backend.routers.auth import auth
+from backend.routers.bootstrap import bootstrap
+from backend.routers.health import health
+from backend.routers.jobs import jobs
+from backend.routers.metrics import metrics as metrics_router
 from backend.routers.task import tasks
-
-app = FastAPI()
-app.include_router(auth)
-app.include_router(tasks)
+from backend.services import metrics, sql_stats
+from backend.services.auth import dispose_auth, init_auth
+from backend.services.group_commit import close_committers
+from backend.services.task_cache import create_task_cache
+from backend.services.task_events import create_event_log
+from backend.settings import Settings, get_settings
 
 origins = [
     'http://localhost:3000',
 ]
 
-# Adicionar o middleware CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,  # Permite o envio de credenciais
-    allow_methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
-    allow_headers=['*'],  # Permite todos os cabeçalhos
-)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engine e Auth nascem dentro do worker (depois do fork do servidor),
+    # nunca no import do módulo.
+    # As settings do app valem para eles e para os roteadores de réplicas e
+    # shards criados depois (ver configured_settings)
+    settings = app.state.settings
+    if settings.DATABASE_ASYNC:
+        from backend.models.async_database import (
+            dispose_async_engine,
+            get_async_engine,
+        )
+
+        get_async_engine(settings)
+    else:
+        get_engine(settings)
+    init_auth(settings)
+    yield
+    close_committers()
+    if app.state.task_events is not None:
+        # Antes do dispose: os eventos na fila ainda vão para o banco
+        app.state.task_events.close()
+    if settings.DATABASE_ASYNC:
+        await dispose_async_engine()
+    dispose_engine()
+    dispose_auth()
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    settings = settings if settings is not None else get_settings()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+    app.state.task_cache = create_task_cache(settings)
+    app.state.task_events = create_event_log(settings)
+
+    if settings.DATABASE_ASYNC:
+        # Subconjunto da API (ver Settings.DATABASE_ASYNC)
+        from backend.routers.async_auth import async_auth
+        from backend.routers.async_task import async_tasks
+
+        app.include_router(async_auth)
+        app.include_router(async_tasks)
+    else:
+        app.include_router(auth)
+        app.include_router(tasks)
+        app.include_router(bootstrap)
+        app.include_router(jobs)
+    app.include_router(health)
+
+    if settings.ADMIN_TOKEN:
+        from backend.routers.diagnostics import diagnostics
+
+        app.include_router(diagnostics)
+
+    if settings.WORKER_MAX_REQUESTS > 0:
+        from backend.services.recycle import MaxRequestsMiddleware
+
+        app.add_middleware(
+            MaxRequestsMiddleware,
+            max_requests=settings.WORKER_MAX_REQUESTS,
+            jitter=settings.WORKER_MAX_REQUESTS_JITTER,
+        )
+
+    if settings.METRICS_ENABLED:
+        metrics.configure(
+            settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_INTERVAL
+        )
+        app.include_router(metrics_router)
+        app.add_middleware(metrics.MetricsMiddleware)
+
+    if settings.PROFILING_TOKEN or settings.PROFILING_SAMPLE_RATE > 0:
+        from backend.services.profiling import ProfilingMiddleware
+
+        # Dentro do SQLStatsMiddleware, para o perfil levar o SQL da requisição
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=settings.PROFILING_DIR,
+            token=settings.PROFILING_TOKEN,
+            sample_rate=settings.PROFILING_SAMPLE_RATE,
+        )
+
+    sql_stats.install(settings.SQL_SLOW_QUERY_MS)
+    app.add_middleware(
+        sql_stats.SQLStatsMiddleware,
+        debug=settings.SQL_DEBUG,
+        n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+    )
+
+    if settings.TRACING_ENABLED:
+        from backend.services import tracing
+
+        # Por fora dos demais: o span raiz cobre todo o processamento
+        tracing.install()
+        app.add_middleware(
+            tracing.TracingMiddleware,
+            exporter=tracing.Exporter(
+                settings.TRACING_EXPORT_PATH,
+                settings.TRACING_OTLP_ENDPOINT,
+                settings.TRACING_SERVICE_NAME,
+            ),
+            sample_rate=settings.TRACING_SAMPLE_RATE,
+        )
+
+    # Adicionar o middleware CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,  # Permite o envio de credenciais
+        allow_methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
+        allow_headers=['*'],  # Permite todos os cabeçalhos
+    )
+
+    return app
+
+
+def __getattr__(name: str):
+    # `backend.app:app` continua funcionando (fastapi dev, uvicorn), mas a
+    # aplicação só é montada quando alguém de fato pede por ela.
+    if name == 'app':
+        app = globals()['app'] = create_app()
+        return app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,61 @@
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from backend.models.database import (
+    PRIMARY,
+    configured_settings,
+    engine_options,
+    sqlite_tuned,
+)
+from backend.models.sqlite import apply_tuning
+from backend.services.pool import instrument
+from backend.settings import Settings
+
+_ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+_async_engine: Optional[AsyncEngine] = None
+
+
+def async_url(url: str) -> str:
+    """Troca o driver síncrono pelo equivalente async (sqlite -> aiosqlite...)."""
+    parsed = make_url(url)
+    backend_name = parsed.get_backend_name()
+    if backend_name not in _ASYNC_DRIVERS:
+        raise ValueError(f'Sem driver async conhecido para {backend_name!r}.')
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend_name]).render_as_string(
+        hide_password=False
+    )
+
+
+def get_async_engine(settings: Optional[Settings] = None) -> AsyncEngine:
+    global _async_engine
+    settings = configured_settings(settings)
+    if _async_engine is None:
+        url = settings.DATABASE_ASYNC_URL or async_url(settings.DATABASE_URL)
+        _async_engine = create_async_engine(
+            url, **engine_options(settings, url, is_async=True)
+        )
+        if sqlite_tuned(settings):
+            # Só os PRAGMAs: o writer dedicado é exclusivo do caminho síncrono
+            apply_tuning(_async_engine.sync_engine, settings)
+        instrument(_async_engine.sync_engine, PRIMARY)
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
+async def get_async_session():
+    # expire_on_commit=False: atributos continuam acessíveis após o commit sem
+    # um lazy load implícito (que não é permitido fora do greenlet do driver)
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
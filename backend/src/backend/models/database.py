@@ -1,11 +1,233 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import Session
 
-from backend.settings import Settings
+from backend.models.replicas import (
+    ROUTING_KEY,
+    ReplicaRouter,
+    routing_key,
+    track_writes,
+)
+from backend.models.sharding import ShardRouter
+from backend.models.sqlite import apply_tuning, begin_immediate, is_file_sqlite
+from backend.services.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    instrument,
+)
+from backend.settings import Settings, get_settings
+
+PRIMARY = 'primary'
+READER = 'reader'
+DIRECTORY = 'directory'
+
+_settings: Optional[Settings] = None
+_engine: Optional[Engine] = None
+_router: Optional[ReplicaRouter] = None
+_shards: Optional[ShardRouter] = None
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == 'sqlite' and parsed.database in {
+        None,
+        '',
+        ':memory:',
+    }
+
+
+def engine_options(
+    settings: Settings, url: str, *, label: str = PRIMARY, is_async: bool = False
+) -> Dict[str, Any]:
+    """kwargs de create_engine/create_async_engine a partir de Settings."""
+    options: Dict[str, Any] = {
+        'pool_pre_ping': settings.DATABASE_POOL_PRE_PING,
+        'pool_recycle': settings.DATABASE_POOL_RECYCLE,
+        'pool_logging_name': label,
+    }
+    # SQLite em memória usa SingletonThreadPool/StaticPool, sem fila
+    if not _is_memory_sqlite(url):
+        options.update({
+            'poolclass': InstrumentedAsyncQueuePool
+            if is_async
+            else InstrumentedQueuePool,
+            'pool_size': settings.DATABASE_POOL_SIZE,
+            'max_overflow': settings.DATABASE_MAX_OVERFLOW,
+            'pool_timeout': settings.DATABASE_POOL_TIMEOUT,
+        })
+    return options
+
+
+def sqlite_tuned(settings: Settings) -> bool:
+    return settings.SQLITE_TUNED and is_file_sqlite(settings.DATABASE_URL)
+
+
+def pool_capacity(settings: Settings) -> int:
+    if sqlite_tuned(settings):
+        return 1
+    return settings.DATABASE_POOL_SIZE + max(settings.DATABASE_MAX_OVERFLOW, 0)
+
+
+def create_primary_engine(settings: Settings) -> Engine:
+    url = settings.DATABASE_URL
+    options = engine_options(settings, url)
+
+    if sqlite_tuned(settings):
+        # Um único writer: quem chega depois espera na fila do pool
+        # (DATABASE_POOL_TIMEOUT) em vez de disputar o lock do arquivo.
+        options.update({'pool_size': 1, 'max_overflow': 0})
+        engine = create_engine(url, **options)
+        apply_tuning(engine, settings)
+        begin_immediate(engine)
+    else:
+        engine = create_engine(url, **options)
+
+    return instrument(engine, PRIMARY)
+
+
+def create_read_engine(settings: Settings) -> Optional[Engine]:
+    """Engine só de leitura; None quando as leituras usam o primário."""
+    if not sqlite_tuned(settings):
+        return None
+
+    url = settings.DATABASE_URL
+    options = engine_options(settings, url, label=READER)
+    options['pool_size'] = settings.SQLITE_READ_POOL_SIZE
+    engine = create_engine(url, **options)
+    apply_tuning(engine, settings, read_only=True)
+    return instrument(engine, READER)
+
+
+def configured_settings(settings: Optional[Settings] = None) -> Settings:
+    """Settings dos engines do processo.
+
+    A primeira chamada com `settings` (o lifespan de create_app passa as do
+    app) vale até o dispose_engine; antes disso, get_settings().
+    """
+    global _settings
+    if _settings is None and settings is not None:
+        _settings = settings
+    return _settings if _settings is not None else get_settings()
+
 
-engine = create_engine(Settings().DATABASE_URL)
+def get_engine(settings: Optional[Settings] = None) -> Engine:
+    """Cria o engine no primeiro uso (por processo, depois do fork)."""
+    global _engine
+    settings = configured_settings(settings)
+    if _engine is None:
+        _engine = create_primary_engine(settings)
+    return _engine
 
 
-def get_session():
-    with Session(engine) as session:
+def create_replica_engines(settings: Settings) -> List[Engine]:
+    """Réplicas de DATABASE_REPLICA_URLS; sem elas, o leitor do SQLite afinado."""
+    engines = []
+    for index, url in enumerate(settings.DATABASE_REPLICA_URLS, start=1):
+        label = f'replica-{index}'
+        engine = create_engine(url, **engine_options(settings, url, label=label))
+        if settings.SQLITE_TUNED and is_file_sqlite(url):
+            apply_tuning(engine, settings, read_only=True)
+        engines.append(instrument(engine, label))
+
+    if not engines:
+        reader = create_read_engine(settings)
+        if reader is not None:
+            engines.append(reader)
+    return engines
+
+
+def get_replica_router(settings: Optional[Settings] = None) -> ReplicaRouter:
+    global _router
+    settings = configured_settings(settings)
+    if _router is None:
+        _router = ReplicaRouter(
+            get_engine(),
+            create_replica_engines(settings),
+            sticky_seconds=settings.DATABASE_REPLICA_STICKY_SECONDS,
+            max_lag=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+            check_interval=settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL,
+        )
+    return _router
+
+
+def get_read_engine(key: Optional[str] = None) -> Engine:
+    return get_replica_router().engine_for_read(key)
+
+
+def create_directory_engine(settings: Settings) -> Engine:
+    """Engine próprio para o diretório e os ids dos shards (SQLite afinado).
+
+    O writer do banco principal tem uma conexão só, e quem a segura é a
+    sessão da requisição: consultar o diretório por ele esperaria o
+    pool_timeout. Este pool separado lê em paralelo (WAL) e pega o lock de
+    escrita só ao reservar um bloco de ids (sem BEGIN IMMEDIATE: o
+    IdAllocator já começa pelo UPDATE).
+    """
+    url = settings.DATABASE_URL
+    engine = create_engine(url, **engine_options(settings, url, label=DIRECTORY))
+    apply_tuning(engine, settings)
+    return instrument(engine, DIRECTORY)
+
+
+def create_shard_router(settings: Settings) -> ShardRouter:
+    engines = {}
+    for name, url in settings.DATABASE_SHARD_URLS.items():
+        label = f'shard-{name}'
+        engine = create_engine(url, **engine_options(settings, url, label=label))
+        if settings.SQLITE_TUNED and is_file_sqlite(url):
+            apply_tuning(engine, settings)
+            begin_immediate(engine)
+        engines[name] = instrument(engine, label)
+    directory = (
+        create_directory_engine(settings) if sqlite_tuned(settings) else get_engine()
+    )
+    return ShardRouter(
+        engines,
+        directory,
+        vnodes=settings.DATABASE_SHARD_VNODES,
+        ttl=settings.DATABASE_SHARD_DIRECTORY_TTL,
+    )
+
+
+def get_shard_router(settings: Optional[Settings] = None) -> Optional[ShardRouter]:
+    """Roteador de shards das tarefas; None sem DATABASE_SHARD_URLS."""
+    global _shards
+    settings = configured_settings(settings)
+    if _shards is None and settings.DATABASE_SHARD_URLS:
+        _shards = create_shard_router(settings)
+    return _shards
+
+
+def dispose_engine() -> None:
+    global _settings, _engine, _router, _shards
+    if _shards is not None:
+        _shards.dispose()
+        if _shards.directory is not _engine:
+            _shards.directory.dispose()
+    if _router is not None:
+        _router.dispose()
+    if _engine is not None:
+        _engine.dispose()
+    _settings = _engine = _router = _shards = None
+
+
+def get_session(request: Request):
+    with Session(get_engine()) as session:
+        # Commits com escrita prendem este cliente ao primário por um tempo
+        session.info[ROUTING_KEY] = routing_key(request)
         yield session
+
+
+def get_read_session(request: Request):
+    """Sessão para endpoints somente leitura (réplica ou primário)."""
+    key = routing_key(request)
+    with Session(get_read_engine(key)) as session:
+        session.info[ROUTING_KEY] = key
+        yield session
+
+
+# Registrado uma vez por processo; só age em sessões com ROUTING_KEY
+track_writes(get_replica_router)
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_as_dataclass, mapped_column
+
+from backend.models.users import table_registry
+
+
+@mapped_as_dataclass(table_registry)
+class TaskDependency:
+    """Aresta "`task_id` bloqueada por `blocker_id`" (mesmo dono nas duas).
+
+    Fica junto das tarefas (no shard do usuário, com sharding). O CASCADE
+    só vale onde as FKs são aplicadas (PostgreSQL); no SQLite, e nos shards,
+    que não têm FKs, quem apaga tarefas apaga também as arestas delas (ver
+    backend.services.dependencies.delete_edges).
+    """
+
+    __tablename__ = 'task_dependencies'
+
+    # Chave natural: ids de tarefas já são únicos entre os shards, então a
+    # aresta pode mudar de shard sem colidir com as de outros usuários
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True
+    )
+    blocker_id: Mapped[int] = mapped_column(
+        ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True
+    )
+    user_id: Mapped[int]
+    created_at: Mapped[datetime] = mapped_column(init=False, server_default=func.now())
+
+    __table_args__ = (
+        # Sentido contrário da chave: quem `blocker_id` bloqueia
+        Index('ix_task_dependencies_blocker_id', 'blocker_id', 'task_id'),
+        # Cópia entre shards
+        Index('ix_task_dependencies_user_id', 'user_id'),
+    )
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, Index
+from sqlalchemy.orm import Mapped, mapped_as_dataclass, mapped_column
+
+from backend.models.users import table_registry
+
+
+@mapped_as_dataclass(table_registry)
+class TaskEvent:
+    """Histórico append-only das mudanças em tarefas (nunca atualizado).
+
+    Sem FK para tasks: o evento `deleted` sobrevive à tarefa, e com sharding
+    as tarefas nem estão neste banco.
+    """
+
+    __tablename__ = 'task_events'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    task_id: Mapped[int]
+    # Quem fez a mudança (hoje, sempre o dono da tarefa)
+    user_id: Mapped[int]
+    # created, updated, status_changed, deleted
+    action: Mapped[str]
+    # campo -> [antes, depois]; None do lado que não existe
+    changes: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON)
+    # Momento da mudança na API (UTC), não o da gravação em lote
+    occurred_at: Mapped[datetime]
+
+    __table_args__ = (
+        # Cursor por id, por usuário e por tarefa
+        Index('ix_task_events_user_id_id', 'user_id', 'id'),
+        Index('ix_task_events_task_id_id', 'task_id', 'id'),
+    )
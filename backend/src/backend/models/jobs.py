@@ -0,0 +1,65 @@
+import enum
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, Enum as SAEnum, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_as_dataclass, mapped_column
+
+from backend.models.users import table_registry
+
+
+def utc_now() -> datetime:
+    """Agora em UTC, sem fuso: a referência de run_after e locked_at."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobStatus(str, enum.Enum):
+    AGUARDANDO = 'aguardando'
+    EXECUTANDO = 'executando'
+    CONCLUIDO = 'concluido'
+    FALHOU = 'falhou'
+
+
+@mapped_as_dataclass(table_registry)
+class Job:
+    """Operação demorada executada pelo worker (`python -m backend.worker`).
+
+    Fica no banco principal, como users: com sharding, o handler é quem
+    busca o shard das tarefas do usuário.
+    """
+
+    __tablename__ = 'jobs'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    # Nome do handler (services/jobs.py)
+    kind: Mapped[str]
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'))
+    params: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, default=None)
+    # Maior primeiro; empate pela ordem de chegada
+    priority: Mapped[int] = mapped_column(default=0)
+    status: Mapped[JobStatus] = mapped_column(
+        SAEnum(JobStatus, name='status_job'), default=JobStatus.AGUARDANDO
+    )
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int] = mapped_column(default=3)
+    # 0 a 100
+    progress: Mapped[int] = mapped_column(default=0)
+    result: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, default=None)
+    error: Mapped[str | None] = mapped_column(default=None)
+    # Retentativas esperam até aqui (backoff). O valor vem do Python: o
+    # worker compara com utc_now(), e o now() do PostgreSQL numa coluna sem
+    # fuso sai na hora local da sessão
+    run_after: Mapped[datetime] = mapped_column(
+        init=False, insert_default=utc_now, server_default=func.now()
+    )
+    # Worker que pegou o job; locked_at é renovado a cada progresso e,
+    # parado há mais que JOBS_LEASE_SECONDS, o job volta para a fila
+    locked_by: Mapped[str | None] = mapped_column(default=None)
+    locked_at: Mapped[datetime | None] = mapped_column(default=None)
+    created_at: Mapped[datetime] = mapped_column(init=False, server_default=func.now())
+    finished_at: Mapped[datetime | None] = mapped_column(default=None)
+
+    __table_args__ = (
+        # Próximo da fila sem ordenar a tabela inteira
+        Index('ix_jobs_status_priority_id', 'status', 'priority', 'id'),
+    )
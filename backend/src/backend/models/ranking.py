@@ -0,0 +1,171 @@
+"""Chaves de ordem fracionária (ordem manual das tarefas).
+
+Cada tarefa guarda uma string `rank`; a lista é a ordem lexicográfica
+dessas strings. Mover uma tarefa é gerar uma chave entre as dos vizinhos
+de destino: só a linha movida muda, sem renumerar as outras.
+
+Formato (o de `fractional-indexing`, de David Greenspan): uma parte
+inteira de tamanho variável (a primeira letra diz quantos dígitos vêm
+depois: 'a' = 1, 'b' = 2, ..., 'Z' = 1 negativo, 'Y' = 2 ...) e uma
+fração em base 62 sem zero à direita. Inserir sempre no começo ou no fim
+só incrementa a parte inteira (a chave cresce devagar); inserir muitas
+vezes no mesmo vão alonga a fração, e aí `evenly_spaced` reescreve a
+lista com chaves curtas (ver o job `rebalance_ranks`).
+
+Só usa dígitos ASCII: a ordem de bytes (COLLATE BINARY do SQLite, "C" do
+PostgreSQL) é a mesma ordem das strings no Python.
+"""
+
+from typing import List, Optional
+
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+_ZERO = DIGITS[0]
+# Menor parte inteira possível: não há como decrementar
+_SMALLEST_INTEGER = 'A' + _ZERO * 26
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """Fração entre `a` e `b` (None = depois de todas); a < b."""
+    if b is not None:
+        # Prefixo comum (com `a` completado por zeros) fica igual
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else _ZERO) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    # Dígitos vizinhos
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _integer_length(head: str) -> int:
+    if 'a' <= head <= 'z':
+        return ord(head) - ord('a') + 2
+    if 'A' <= head <= 'Z':
+        return ord('Z') - ord(head) + 2
+    raise ValueError(f'Chave de ordem inválida: {head!r}.')
+
+
+def _split(key: str) -> tuple:
+    length = _integer_length(key[0])
+    if length > len(key):
+        raise ValueError(f'Chave de ordem inválida: {key!r}.')
+    return key[:length], key[length:]
+
+
+def validate(key: str) -> None:
+    if not key or key == _SMALLEST_INTEGER:
+        raise ValueError(f'Chave de ordem inválida: {key!r}.')
+    _, fraction = _split(key)
+    if fraction.endswith(_ZERO):
+        raise ValueError(f'Chave de ordem inválida: {key!r}.')
+
+
+def _increment(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) + 1
+        if d < len(DIGITS):
+            digits[i] = DIGITS[d]
+            return head + ''.join(digits)
+        digits[i] = _ZERO
+    # Estourou: a parte inteira ganha (ou perde, se negativa) um dígito
+    if head == 'Z':
+        return 'a' + _ZERO
+    if head == 'z':
+        return None
+    head = chr(ord(head) + 1)
+    if head > 'a':
+        digits.append(_ZERO)
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def _decrement(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) - 1
+        if d >= 0:
+            digits[i] = DIGITS[d]
+            return head + ''.join(digits)
+        digits[i] = DIGITS[-1]
+    if head == 'a':
+        return 'Z' + DIGITS[-1]
+    if head == 'A':
+        return None
+    head = chr(ord(head) - 1)
+    if head < 'Z':
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """Chave entre `a` e `b` (None = começo / fim da lista)."""
+    if a is not None:
+        validate(a)
+    if b is not None:
+        validate(b)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f'Chaves fora de ordem: {a!r} >= {b!r}.')
+
+    if a is None:
+        if b is None:
+            return 'a' + _ZERO
+        integer_b, fraction_b = _split(b)
+        if integer_b == _SMALLEST_INTEGER:
+            return integer_b + _midpoint('', fraction_b)
+        if integer_b < b:
+            return integer_b
+        key = _decrement(integer_b)
+        if key is None:
+            raise ValueError('Não há chave antes da primeira.')
+        return key
+
+    integer_a, fraction_a = _split(a)
+    if b is None:
+        key = _increment(integer_a)
+        return integer_a + _midpoint(fraction_a, None) if key is None else key
+
+    integer_b, fraction_b = _split(b)
+    if integer_a == integer_b:
+        return integer_a + _midpoint(fraction_a, fraction_b)
+    key = _increment(integer_a)
+    if key is None:
+        raise ValueError('Não há chave depois da última.')
+    if key < b:
+        return key
+    return integer_a + _midpoint(fraction_a, None)
+
+
+def keys_between(a: Optional[str], b: Optional[str], n: int) -> List[str]:
+    """`n` chaves crescentes entre `a` e `b`, o mais curtas possível."""
+    if n <= 0:
+        return []
+    if n == 1:
+        return [key_between(a, b)]
+    if b is None:
+        keys = [key_between(a, None)]
+        for _ in range(n - 1):
+            keys.append(key_between(keys[-1], None))
+        return keys
+    if a is None:
+        keys = [key_between(None, b)]
+        for _ in range(n - 1):
+            keys.append(key_between(None, keys[-1]))
+        return keys[::-1]
+    middle = n // 2
+    key = key_between(a, b)
+    return [*keys_between(a, key, middle), key, *keys_between(key, b, n - middle - 1)]
+
+
+def evenly_spaced(n: int) -> List[str]:
+    """Chaves curtas para uma lista inteira de `n` itens (rebalanceamento)."""
+    return keys_between(None, None, n)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import Engine, event, text
+from sqlalchemy.orm import Session
+
+# Nome da chave em Session.info com o "dono" da sessão para a aderência
+ROUTING_KEY = 'routing_key'
+_WROTE = 'wrote'
+
+LagProbe = Callable[[Engine], float]
+
+
+def default_lag_probe(engine: Engine) -> float:
+    """Atraso de replicação em segundos (0 onde não há replicação)."""
+    if engine.dialect.name != 'postgresql':
+        return 0.0
+    with engine.connect() as connection:
+        lag = connection.execute(
+            text(
+                'SELECT COALESCE(EXTRACT(EPOCH FROM '
+                '(now() - pg_last_xact_replay_timestamp())), 0)'
+            )
+        ).scalar()
+    return float(lag or 0.0)
+
+
+def routing_key(request) -> str:
+    """Identifica o cliente para a aderência ao primário após escrita.
+
+    Usa o `sub` do bearer token sem verificar a assinatura: serve só para
+    escolher o banco, a autenticação continua sendo feita pelas rotas.
+    """
+    authorization = request.headers.get('authorization', '')
+    if authorization[:7].lower() == 'bearer ':
+        import jwt
+
+        try:
+            claims = jwt.decode(
+                authorization[7:].strip(), options={'verify_signature': False}
+            )
+            if claims.get('sub') is not None:
+                return f'user:{claims["sub"]}'
+        except jwt.InvalidTokenError:
+            pass
+    client = request.client
+    return f'client:{client.host if client else "?"}'
+
+
+class ReplicaRouter:
+    """Escolhe o engine de leitura: réplica saudável ou o primário.
+
+    - aderência (read-your-writes): depois de um commit com escrita, a chave
+      da sessão fica presa ao primário por `sticky_seconds`;
+    - atraso: réplicas com lag acima de `max_lag` (ou cujo probe falhou) são
+      puladas até a próxima verificação, feita a cada `check_interval`.
+
+    A aderência é por processo; com vários workers o mesmo cliente pode cair
+    em outro worker dentro da janela.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: List[Engine],
+        *,
+        sticky_seconds: float = 5.0,
+        max_lag: float = 10.0,
+        check_interval: float = 5.0,
+        lag_probe: LagProbe = default_lag_probe,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.sticky_seconds = sticky_seconds
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lag_probe = lag_probe
+        self._clock = clock
+        self._cycle = itertools.cycle(range(len(self.replicas) or 1))
+        self._pins: Dict[str, float] = {}
+        self._lag: Dict[int, tuple[float, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    # -------- Aderência --------
+    def pin(self, key: str) -> None:
+        if not self.replicas or self.sticky_seconds <= 0:
+            return
+        now = self._clock()
+        with self._lock:
+            self._pins[key] = now + self.sticky_seconds
+            if len(self._pins) > 10_000:
+                self._pins = {k: v for k, v in self._pins.items() if v > now}
+
+    def is_pinned(self, key: Optional[str]) -> bool:
+        if key is None:
+            return False
+        expires = self._pins.get(key)
+        return expires is not None and expires > self._clock()
+
+    # -------- Atraso --------
+    def lag(self, index: int) -> Optional[float]:
+        """Lag conhecido da réplica `index` (None = indisponível)."""
+        now = self._clock()
+        checked_at, lag = self._lag.get(index, (None, None))
+        if checked_at is None or now - checked_at >= self.check_interval:
+            try:
+                lag = self._lag_probe(self.replicas[index])
+            except Exception:
+                lag = None
+            self._lag[index] = (now, lag)
+        return lag
+
+    def _healthy(self, index: int) -> bool:
+        lag = self.lag(index)
+        return lag is not None and lag <= self.max_lag
+
+    # -------- Roteamento --------
+    def engine_for_read(self, key: Optional[str] = None) -> Engine:
+        if not self.replicas or self.is_pinned(key):
+            return self.primary
+        for _ in range(len(self.replicas)):
+            index = next(self._cycle)
+            if self._healthy(index):
+                return self.replicas[index]
+        return self.primary
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                'label': replica.pool._orig_logging_name,
+                'lag_seconds': self.lag(index),
+                'healthy': self._healthy(index),
+            }
+            for index, replica in enumerate(self.replicas)
+        ]
+
+    def dispose(self) -> None:
+        for replica in self.replicas:
+            replica.dispose()
+
+
+def track_writes(router_getter: Callable[[], ReplicaRouter]) -> None:
+    """Fixa no primário a chave das sessões que commitaram escrita."""
+
+    @event.listens_for(Session, 'after_flush')
+    def _flushed(session, flush_context):
+        session.info[_WROTE] = True
+
+    @event.listens_for(Session, 'do_orm_execute')
+    def _dml(orm_execute_state):
+        if not orm_execute_state.is_select:
+            orm_execute_state.session.info[_WROTE] = True
+
+    @event.listens_for(Session, 'after_commit')
+    def _pin(session):
+        key = session.info.get(ROUTING_KEY)
+        if session.info.pop(_WROTE, False) and key is not None:
+            router_getter().pin(key)
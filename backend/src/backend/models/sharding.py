@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import (
+    Connection,
+    Engine,
+    Index,
+    MetaData,
+    Table,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.orm import Mapped, mapped_as_dataclass, mapped_column
+
+from backend.models.dependencies import TaskDependency
+from backend.models.users import Task, User, table_registry
+
+# Tabelas que ficam nos shards (as referenciadas antes), todas com user_id
+SHARD_TABLES = (Task.__table__, TaskDependency.__table__)
+
+
+# -------------------- Diretório (no banco principal) -------------------- #
+@mapped_as_dataclass(table_registry)
+class ShardAssignment:
+    """Exceções ao anel: usuários fixados num shard ou em migração."""
+
+    __tablename__ = 'shard_directory'
+
+    user_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    shard: Mapped[str]
+    # Destino de uma migração em andamento: escritas do usuário ficam
+    # bloqueadas até a virada
+    moving_to: Mapped[str | None] = mapped_column(default=None)
+
+
+@mapped_as_dataclass(table_registry)
+class IdBlock:
+    """Próximo id livre por sequência (alocação hi/lo entre shards)."""
+
+    __tablename__ = 'id_blocks'
+
+    name: Mapped[str] = mapped_column(primary_key=True)
+    next_value: Mapped[int]
+
+
+# -------------------- Schema dos shards -------------------- #
+def shard_metadata() -> MetaData:
+    """Só as SHARD_TABLES, sem FKs (users fica no banco principal)."""
+    metadata = MetaData()
+    for source in SHARD_TABLES:
+        table = Table(
+            source.name, metadata, *(column._copy() for column in source.columns)
+        )
+        for index in source.indexes:
+            # dialect_kwargs leva junto o WHERE dos índices parciais
+            Index(
+                index.name,
+                *(table.c[column.name] for column in index.columns),
+                **index.dialect_kwargs,
+            )
+    return metadata
+
+
+def create_shard_schema(engine: Engine) -> None:
+    metadata = shard_metadata()
+    metadata.create_all(engine)
+    # Shards já existentes: create_all não mexe em tabela pronta, então os
+    # índices novos vêm um a um (reshard init reaplicável)
+    for table in metadata.tables.values():
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+# -------------------- Anel -------------------- #
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest())
+
+
+class HashRing:
+    """Hash consistente com `vnodes` pontos por shard.
+
+    Acrescentar um shard muda o dono de ~1/N dos usuários; os demais ficam
+    onde estavam.
+    """
+
+    def __init__(self, names: Iterable[str], vnodes: int = 64):
+        points = sorted(
+            (_hash(f'{name}#{i}'), name) for name in names for i in range(vnodes)
+        )
+        if not points:
+            raise ValueError('O anel precisa de ao menos um shard.')
+        self._keys = [point for point, _ in points]
+        self._names = [name for _, name in points]
+
+    def lookup(self, user_id: int) -> str:
+        index = bisect_right(self._keys, _hash(str(user_id))) % len(self._keys)
+        return self._names[index]
+
+
+@dataclass(frozen=True)
+class Placement:
+    shard: str
+    moving_to: Optional[str] = None
+
+
+class ShardMoving(Exception):
+    """O usuário está sendo migrado de shard; escritas devem esperar."""
+
+
+class ShardRouter:
+    """Leva um user_id ao engine do shard das suas tarefas.
+
+    O dono vem do anel, salvo exceção em `shard_directory` (no banco de
+    `directory`). A consulta ao diretório é guardada por `ttl` segundos por
+    processo; por isso a migração (move_user) espera mais que o `ttl` entre
+    as etapas, até todos os workers enxergarem o novo estado.
+    """
+
+    def __init__(
+        self,
+        shards: Dict[str, Engine],
+        directory: Engine,
+        *,
+        vnodes: int = 64,
+        ttl: float = 2.0,
+        id_block_size: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.shards = dict(shards)
+        self.directory = directory
+        self.ring = HashRing(self.shards, vnodes)
+        self.ttl = ttl
+        self.ids = IdAllocator(directory, 'tasks', id_block_size)
+        self._clock = clock
+        self._cache: Dict[int, Tuple[float, Placement]] = {}
+        self._lock = threading.Lock()
+
+    def placement(self, user_id: int, *, fresh: bool = False) -> Placement:
+        now = self._clock()
+        cached = None if fresh else self._cache.get(user_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        with self.directory.connect() as connection:
+            row = connection.execute(
+                select(ShardAssignment.shard, ShardAssignment.moving_to).where(
+                    ShardAssignment.user_id == user_id
+                )
+            ).first()
+        placement = (
+            Placement(row.shard, row.moving_to)
+            if row is not None
+            else Placement(self.ring.lookup(user_id))
+        )
+        with self._lock:
+            if len(self._cache) > 100_000:
+                self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            self._cache[user_id] = (now + self.ttl, placement)
+        return placement
+
+    def engine_for(self, user_id: int, *, write: bool = False) -> Engine:
+        placement = self.placement(user_id)
+        if write and placement.moving_to is not None:
+            raise ShardMoving(user_id)
+        return self.shards[placement.shard]
+
+    def forget(self, user_id: int) -> None:
+        self._cache.pop(user_id, None)
+
+    def dispose(self) -> None:
+        for engine in self.shards.values():
+            engine.dispose()
+
+
+class IdAllocator:
+    """Ids únicos entre shards: reserva blocos de `block` no banco principal.
+
+    Um UPDATE por bloco (não por linha); ids de um bloco não usado até o
+    fim do processo se perdem, como numa sequence com cache.
+    """
+
+    def __init__(self, engine: Engine, name: str, block: int = 1000):
+        self.engine = engine
+        self.name = name
+        self.block = block
+        self._next = 0
+        self._limit = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> None:
+        with self.engine.begin() as connection:
+            # UPDATE primeiro: toma o lock de escrita antes de ler
+            updated = connection.execute(
+                update(IdBlock)
+                .where(IdBlock.name == self.name)
+                .values(next_value=IdBlock.next_value + self.block)
+            ).rowcount
+            if not updated:
+                # Sequência nova (o reshard init já a semeia com o maior id)
+                connection.execute(
+                    insert(IdBlock).values(name=self.name, next_value=1 + self.block)
+                )
+            limit = connection.execute(
+                select(IdBlock.next_value).where(IdBlock.name == self.name)
+            ).scalar_one()
+        self._next, self._limit = limit - self.block, limit
+
+    def next_id(self) -> int:
+        with self._lock:
+            if self._next >= self._limit:
+                self._reserve()
+            value = self._next
+            self._next += 1
+            return value
+
+
+def seed_ids(engine: Engine, name: str, start: int) -> None:
+    """Garante que a sequência `name` comece depois de `start`."""
+    with engine.begin() as connection:
+        current = connection.execute(
+            select(IdBlock.next_value).where(IdBlock.name == name)
+        ).scalar()
+        if current is None:
+            connection.execute(insert(IdBlock).values(name=name, next_value=start + 1))
+        elif current <= start:
+            connection.execute(
+                update(IdBlock).where(IdBlock.name == name).values(next_value=start + 1)
+            )
+
+
+# -------------------- Migração entre shards -------------------- #
+def pages(
+    connection: Connection, table: Table, condition, batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Linhas de `table` que atendem `condition`, em lotes pela chave primária."""
+    key = list(table.primary_key.columns)
+    last = None
+    while True:
+        query = select(table).where(condition)
+        if last is not None:
+            query = query.where(tuple_(*key) > tuple_(*last))
+        rows = connection.execute(query.order_by(*key).limit(batch_size)).mappings()
+        batch = [dict(row) for row in rows]
+        if not batch:
+            return
+        yield batch
+        last = [batch[-1][column.name] for column in key]
+
+
+def _set_assignment(
+    router: ShardRouter, user_id: int, shard: Optional[str], moving_to=None
+) -> None:
+    with router.directory.begin() as connection:
+        connection.execute(
+            delete(ShardAssignment).where(ShardAssignment.user_id == user_id)
+        )
+        if shard is not None:
+            connection.execute(
+                insert(ShardAssignment).values(
+                    user_id=user_id, shard=shard, moving_to=moving_to
+                )
+            )
+    router.forget(user_id)
+
+
+def pin_users(router: ShardRouter, placements: Dict[int, str]) -> None:
+    """Fixa usuários no shard atual (antes de mudar o anel)."""
+    for user_id, shard in placements.items():
+        _set_assignment(router, user_id, shard)
+
+
+def _feed(digest, batch: List[Dict[str, Any]]) -> None:
+    for row in batch:
+        digest.update(repr(sorted(row.items())).encode())
+
+
+def _fingerprint(connection: Connection, user_id: int, batch_size: int) -> str:
+    """Resumo das linhas do usuário em todas as SHARD_TABLES."""
+    digest = hashlib.blake2b(digest_size=16)
+    for table in SHARD_TABLES:
+        for batch in pages(connection, table, table.c.user_id == user_id, batch_size):
+            _feed(digest, batch)
+    return digest.hexdigest()
+
+
+def _copy_user(
+    router: ShardRouter, user_id: int, source: str, target: str, batch_size: int
+) -> Tuple[Dict[str, int], str]:
+    """Copia as linhas do usuário; devolve as contagens e o resumo do copiado."""
+    copied: Dict[str, int] = {}
+    digest = hashlib.blake2b(digest_size=16)
+    with router.shards[target].begin() as dst:
+        for table in reversed(SHARD_TABLES):
+            dst.execute(delete(table).where(table.c.user_id == user_id))
+        with router.shards[source].connect() as src:
+            for table in SHARD_TABLES:
+                owned = table.c.user_id == user_id
+                copied[table.name] = 0
+                for batch in pages(src, table, owned, batch_size):
+                    dst.execute(insert(table), batch)
+                    _feed(digest, batch)
+                    copied[table.name] += len(batch)
+                found = dst.execute(
+                    select(func.count()).select_from(table).where(owned)
+                ).scalar_one()
+                if found != copied[table.name]:
+                    raise RuntimeError(
+                        f'Cópia incompleta do usuário {user_id} ({table.name}):'
+                        f' {found} de {copied[table.name]}.'
+                    )
+    return copied, digest.hexdigest()
+
+
+def move_user(
+    router: ShardRouter,
+    user_id: int,
+    target: str,
+    *,
+    grace: Optional[float] = None,
+    batch_size: int = 1000,
+    attempts: int = 3,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Dict[str, Any]:
+    """Move as tarefas de um usuário para `target` com o serviço no ar.
+
+    1. marca o usuário como em migração (escritas recebem 503) e espera
+       `grace` para todos os workers verem a marca;
+    2. copia as tarefas (e as dependências) em lotes, mantendo os ids, e
+       confere que a origem não mudou durante a cópia (senão copia de novo,
+       até `attempts` vezes);
+    3. vira o diretório para o destino e espera `grace` de novo;
+    4. apaga as linhas da origem, se ainda forem as copiadas.
+
+    A conferência pega o writer que resolveu a origem antes da marca e
+    demorou mais que `grace` para gravar: a escrita não se perde. Se ela
+    chega depois da virada, as linhas ficam na origem e a função falha.
+
+    Leituras seguem na origem até a virada. Reexecutar depois de uma falha
+    antes da virada é seguro: a cópia começa limpando o destino.
+    """
+    if target not in router.shards:
+        raise ValueError(f'Shard desconhecido: {target}.')
+    grace = router.ttl + 0.5 if grace is None else grace
+    placement = router.placement(user_id, fresh=True)
+    source = placement.shard
+    if source == target:
+        return {'user_id': user_id, 'source': source, 'target': target, 'moved': 0}
+
+    start = time.perf_counter()
+    _set_assignment(router, user_id, source, moving_to=target)
+    sleep(grace)
+
+    try:
+        for _ in range(attempts):
+            copied, digest = _copy_user(router, user_id, source, target, batch_size)
+            with router.shards[source].connect() as src:
+                if _fingerprint(src, user_id, batch_size) == digest:
+                    break
+        else:
+            raise RuntimeError(
+                f'A origem do usuário {user_id} mudou durante {attempts} cópias.'
+            )
+    except Exception:
+        # Volta a aceitar escritas na origem
+        _set_assignment(router, user_id, _pin_or_ring(router, user_id, source))
+        raise
+
+    _set_assignment(router, user_id, _pin_or_ring(router, user_id, target))
+    sleep(grace)
+    with router.shards[source].begin() as src:
+        # Na transação do DELETE (com BEGIN IMMEDIATE, como nos shards
+        # SQLite afinados, nada entra entre a conferência e ele)
+        if _fingerprint(src, user_id, batch_size) != digest:
+            raise RuntimeError(
+                f'Escrita tardia em {source} depois da cópia do usuário'
+                f' {user_id}: as linhas ficaram lá para conferência.'
+            )
+        for table in reversed(SHARD_TABLES):
+            src.execute(delete(table).where(table.c.user_id == user_id))
+
+    return {
+        'user_id': user_id,
+        'source': source,
+        'target': target,
+        'moved': copied['tasks'],
+        'dependencies': copied['task_dependencies'],
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def _pin_or_ring(router: ShardRouter, user_id: int, shard: str) -> Optional[str]:
+    # Onde o anel já aponta, a entrada no diretório é desnecessária
+    return None if router.ring.lookup(user_id) == shard else shard
+
+
+def user_ids(directory: Engine) -> List[int]:
+    with directory.connect() as connection:
+        return list(connection.execute(select(User.id).order_by(User.id)).scalars())
@@ -0,0 +1,76 @@
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from backend.settings import Settings
+
+
+def is_file_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == 'sqlite' and parsed.database not in {
+        None,
+        '',
+        ':memory:',
+    }
+
+
+def tuning_pragmas(settings: Settings) -> list[str]:
+    """PRAGMAs do perfil de produção, aplicados a cada conexão nova."""
+    return [
+        'PRAGMA journal_mode=WAL',
+        f'PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}',
+        f'PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}',
+        f'PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}',
+        f'PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}',
+        f'PRAGMA temp_store={settings.SQLITE_TEMP_STORE}',
+    ]
+
+
+def apply_tuning(engine: Engine, settings: Settings, *, read_only: bool = False):
+    """Registra os PRAGMAs no evento `connect` do engine."""
+    pragmas = tuning_pragmas(settings)
+    if read_only:
+        # Conexões de leitura nunca disputam o lock de escrita
+        pragmas.append('PRAGMA query_only=ON')
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+def begin_immediate(engine: Engine) -> Engine:
+    """Transações do writer começam com BEGIN IMMEDIATE.
+
+    Assim o lock de escrita é pego no início da transação (respeitando o
+    busy_timeout) em vez de falhar com `database is locked` ao promover um
+    lock de leitura no meio dela. O pysqlite precisa deixar de emitir o
+    próprio BEGIN para isso funcionar.
+    """
+
+    @event.listens_for(engine, 'connect')
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def _begin(connection):
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+    return engine
+
+
+def ensure_transaction(session: Session) -> None:
+    """Abre de fato a transação da sessão antes de usar SAVEPOINTs.
+
+    O pysqlite só emite BEGIN antes de um DML; sem ele, o SAVEPOINT abre a
+    transação e o RELEASE do primeiro já seria um commit. Engines com
+    begin_immediate (ou outros bancos) não precisam de nada.
+    """
+    connection = session.connection()
+    dbapi_connection = connection.connection.dbapi_connection
+    if connection.dialect.name == 'sqlite' and not dbapi_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN')
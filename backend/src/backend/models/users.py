@@ -1,4 +1,4 @@
-from sqlalchemy import func, Enum as SAEnum, ForeignKey, Index
+from sqlalchemy import func, select, text, Enum as SAEnum, ForeignKey, Index, String
 from sqlalchemy.orm import (
     Mapped,
     mapped_as_dataclass,
@@ -10,6 +10,8 @@ from sqlalchemy.orm import (
 import enum
 from datetime import date, datetime
 
+from backend.models.ranking import key_between
+
 
 table_registry = registry()
 
@@ -40,6 +42,35 @@ class TaskPriority(str, enum.Enum):
     ALTA = 'alta'
 
 
+# Predicado do índice parcial de pendentes com prazo. O enum é gravado pelo
+# nome (PENDENTE), e as consultas repetem este texto literal: com o status
+# como parâmetro o planejador do SQLite não prova que o índice serve
+PENDING_WITH_DUE_DATE = "status = 'PENDENTE' AND due_date IS NOT NULL"
+
+# Chaves de ordem comparadas byte a byte (a collation padrão do PostgreSQL
+# segue o locale e embaralharia maiúsculas e minúsculas)
+RankType = String().with_variant(String(collation='C'), 'postgresql')
+
+
+def _first_rank(context) -> str:
+    """Tarefa nova entra no topo da lista do dono (antes da menor chave).
+
+    Criações concorrentes podem ler a mesma menor chave e repetir o rank: a
+    lista desempata por id e o PATCH de posição separa os empates.
+    """
+    user_id = context.get_current_parameters()['user_id']
+    # Num INSERT de várias linhas, as anteriores ainda não estão no banco
+    issued = context.__dict__.setdefault('_first_ranks', {})
+    if user_id in issued:
+        first = issued[user_id]
+    else:
+        first = context.connection.scalar(
+            select(func.min(Task.rank)).where(Task.user_id == user_id)
+        )
+    issued[user_id] = key_between(None, first)
+    return issued[user_id]
+
+
 @mapped_as_dataclass(table_registry)
 class Task:
     __tablename__ = 'tasks'
@@ -60,6 +91,11 @@ class Task:
         default=TaskPriority.MEDIA,
     )
     due_date: Mapped[date | None] = mapped_column(default=None)
+    # Ordem manual (ver backend.models.ranking); sem valor, vai para o topo
+    rank: Mapped[str] = mapped_column(RankType, init=False, insert_default=_first_rank)
+    # Posição numa ordem topológica das dependências (ver
+    # backend.services.dependencies); None até a tarefa entrar numa aresta
+    topo_order: Mapped[int | None] = mapped_column(init=False, default=None)
 
     created_at: Mapped[datetime] = mapped_column(init=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
@@ -72,4 +108,17 @@ class Task:
         Index(
             'ix_tasks_status_priority', 'status', 'priority'
         ), 
+        # Listagem por dono já ordenada por id, sem varrer a tabela
+        Index('ix_tasks_user_id_id', 'user_id', 'id'),
+        # Listagem na ordem manual (e vizinhos de uma tarefa movida)
+        Index('ix_tasks_user_rank', 'user_id', 'rank'),
+        # Atrasadas / vencendo: só a fatia pendente com prazo, por dono e
+        # já na ordem do prazo
+        Index(
+            'ix_tasks_pending_due',
+            'user_id',
+            'due_date',
+            sqlite_where=text(PENDING_WITH_DUE_DATE),
+            postgresql_where=text(PENDING_WITH_DUE_DATE),
+        ),
     )
@@ -0,0 +1,185 @@
+"""Administração dos shards de tarefas (DATABASE_SHARD_URLS).
+
+Uso (a partir de backend/, com as mesmas variáveis da aplicação):
+
+    python -m backend.reshard init [--import-main]
+    python -m backend.reshard status
+    python -m backend.reshard pin --previous s1,s2
+    python -m backend.reshard move USER_ID SHARD
+    python -m backend.reshard rebalance [--limit N]
+
+Para acrescentar um shard sem parar o serviço:
+
+1. `init` com a URL nova já em DATABASE_SHARD_URLS (cria o schema);
+2. `pin --previous <shards antigos>` fixa no shard atual cada usuário cujo
+   dono muda no anel novo;
+3. publicar a configuração nova nos workers;
+4. `rebalance` move os usuários fixados para o dono no anel, um por vez.
+"""
+
+import argparse
+import json
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, select, true
+
+from backend.models.database import get_shard_router
+from backend.models.sharding import (
+    SHARD_TABLES,
+    HashRing,
+    ShardAssignment,
+    ShardRouter,
+    create_shard_schema,
+    move_user,
+    pages,
+    pin_users,
+    seed_ids,
+    user_ids,
+)
+from backend.models.users import Task
+from backend.settings import get_settings
+
+
+def _print(data: Dict[str, Any]) -> None:
+    print(json.dumps(data, ensure_ascii=False))
+
+
+def _max_task_id(router: ShardRouter) -> int:
+    engines = [router.directory, *router.shards.values()]
+    highest = 0
+    for engine in engines:
+        with engine.connect() as connection:
+            highest = max(
+                highest, connection.execute(select(func.max(Task.id))).scalar() or 0
+            )
+    return highest
+
+
+def import_main(router: ShardRouter, batch_size: int = 1000) -> int:
+    """Copia as tarefas (e as dependências) do banco principal para os shards
+    e as apaga de lá. Devolve quantas tarefas foram copiadas.
+
+    Feito uma vez, com a aplicação ainda sem DATABASE_SHARD_URLS nos workers
+    (ou parada): escritas concorrentes no banco principal se perderiam.
+    """
+    copied = 0
+    with router.directory.begin() as main:
+        for table in SHARD_TABLES:
+            for batch in pages(main, table, true(), batch_size):
+                by_shard: Dict[str, List[Dict[str, Any]]] = {}
+                for row in batch:
+                    shard = router.placement(row['user_id'], fresh=True).shard
+                    by_shard.setdefault(shard, []).append(row)
+                for shard, rows in by_shard.items():
+                    with router.shards[shard].begin() as dst:
+                        dst.execute(insert(table), rows)
+                if table is Task.__table__:
+                    copied += len(batch)
+        for table in reversed(SHARD_TABLES):
+            main.execute(delete(table))
+    return copied
+
+
+def init(router: ShardRouter, import_tasks: bool = False) -> Dict[str, Any]:
+    for engine in router.shards.values():
+        create_shard_schema(engine)
+    imported = import_main(router) if import_tasks else 0
+    seed_ids(router.directory, router.ids.name, _max_task_id(router))
+    return {'shards': sorted(router.shards), 'imported': imported}
+
+
+def status(router: ShardRouter) -> Dict[str, Any]:
+    tasks: Dict[str, int] = {}
+    for name, engine in sorted(router.shards.items()):
+        with engine.connect() as connection:
+            tasks[name] = connection.execute(
+                select(func.count()).select_from(Task)
+            ).scalar_one()
+    with router.directory.connect() as connection:
+        rows = connection.execute(select(ShardAssignment)).all()
+    return {
+        'tasks': tasks,
+        'pinned': sum(1 for row in rows if row.moving_to is None),
+        'moving': [
+            {'user_id': row.user_id, 'from': row.shard, 'to': row.moving_to}
+            for row in rows
+            if row.moving_to is not None
+        ],
+        'misplaced': sum(
+            1 for row in rows if row.shard != router.ring.lookup(row.user_id)
+        ),
+    }
+
+
+def pin(router: ShardRouter, previous: List[str]) -> Dict[str, Any]:
+    """Fixa onde estão hoje os usuários que o anel novo mandaria para outro shard."""
+    old_ring = HashRing(previous, get_settings().DATABASE_SHARD_VNODES)
+    with router.directory.connect() as connection:
+        assigned = set(connection.execute(select(ShardAssignment.user_id)).scalars())
+    placements = {}
+    for user_id in user_ids(router.directory):
+        if user_id in assigned:
+            continue
+        current = old_ring.lookup(user_id)
+        if current != router.ring.lookup(user_id):
+            placements[user_id] = current
+    pin_users(router, placements)
+    return {'pinned': len(placements)}
+
+
+def rebalance(router: ShardRouter, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Move para o dono no anel os usuários fixados em outro shard."""
+    with router.directory.connect() as connection:
+        rows = connection.execute(
+            select(ShardAssignment).where(ShardAssignment.moving_to.is_(None))
+        ).all()
+    pending = [row for row in rows if row.shard != router.ring.lookup(row.user_id)]
+    moved = 0
+    for row in pending[:limit]:
+        _print(move_user(router, row.user_id, router.ring.lookup(row.user_id)))
+        moved += 1
+    return {'moved': moved, 'remaining': len(pending) - moved}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    init_parser = commands.add_parser('init', help='cria o schema dos shards')
+    init_parser.add_argument(
+        '--import-main',
+        action='store_true',
+        help='move para os shards as tarefas do banco principal',
+    )
+    commands.add_parser('status', help='tarefas por shard e diretório')
+    pin_parser = commands.add_parser('pin', help='fixa usuários antes de mudar o anel')
+    pin_parser.add_argument(
+        '--previous', required=True, help='shards antes da mudança (a,b,...)'
+    )
+    move_parser = commands.add_parser('move', help='move um usuário de shard')
+    move_parser.add_argument('user_id', type=int)
+    move_parser.add_argument('shard')
+    rebalance_parser = commands.add_parser(
+        'rebalance', help='leva os usuários fixados ao dono no anel'
+    )
+    rebalance_parser.add_argument('--limit', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    router = get_shard_router()
+    if router is None:
+        parser.error('DATABASE_SHARD_URLS não configurado.')
+
+    if args.command == 'init':
+        _print(init(router, args.import_main))
+    elif args.command == 'status':
+        _print(status(router))
+    elif args.command == 'pin':
+        _print(pin(router, [name for name in args.previous.split(',') if name]))
+    elif args.command == 'move':
+        _print(move_user(router, args.user_id, args.shard))
+    elif args.command == 'rebalance':
+        _print(rebalance(router, args.limit))
+
+
+if __name__ == '__main__':
+    main()
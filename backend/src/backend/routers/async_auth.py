@@ -0,0 +1,173 @@
+from http import HTTPStatus
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Security, Header, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.async_database import get_async_session
+from backend.models.users import User
+from backend.schemas.auth import (
+    Token,
+    UserRegisterSchema,
+    UserLoginSchema,
+    UserInfoSchema,
+)
+
+from backend.services.auth import get_auth, Auth
+from backend.services.tracing import TracedRoute
+
+# Mesmas rotas de backend.routers.auth, servidas com AsyncSession
+# (habilitadas com DATABASE_ASYNC=true).
+async_auth = APIRouter(prefix='/api/auth', tags=['auth'], route_class=TracedRoute)
+
+
+@async_auth.post(
+    path='/register',
+    status_code=HTTPStatus.CREATED,
+    response_model=Token,
+)
+async def register(
+    user: UserRegisterSchema,
+    session: AsyncSession = Depends(get_async_session),
+    auth_service: Auth = Depends(get_auth),
+):
+    db_user = await session.scalar(select(User).where(User.email == user.email))
+
+    if db_user is not None:
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail='Usuário já cadastrado.',
+        )
+
+    # Argon2 é CPU-bound: fora do event loop
+    hashed_password = await run_in_threadpool(auth_service.hash_password, user.password)
+
+    db_user = User(
+        name=user.name,
+        email=user.email,
+        hashed_password=hashed_password,
+    )
+
+    session.add(db_user)
+    await session.commit()
+    await session.refresh(db_user)
+
+    tokens = auth_service.generate_token(
+        subject=db_user.id,
+        extra_claims={'email': db_user.email},
+    )
+
+    return Token(**tokens)
+
+
+@async_auth.post(
+    path='/login',
+    status_code=HTTPStatus.OK,
+    response_model=Token,
+)
+async def login(
+    credentials: UserLoginSchema,
+    session: AsyncSession = Depends(get_async_session),
+    auth_service: Auth = Depends(get_auth),
+):
+    db_user = await session.scalar(select(User).where(User.email == credentials.email))
+    if db_user is None:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Credenciais inválidas.',
+        )
+
+    valid = await run_in_threadpool(
+        auth_service.verify_password, credentials.password, db_user.hashed_password
+    )
+    if not valid:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Credenciais inválidas.',
+        )
+
+    tokens = auth_service.generate_token(
+        subject=db_user.id,
+        extra_claims={'email': db_user.email, 'name': db_user.name},
+    )
+
+    return Token(**tokens)
+
+
+@async_auth.get(
+    path='/userinfo',
+    status_code=HTTPStatus.OK,
+    response_model=UserInfoSchema,
+)
+async def userinfo(
+    credentials: HTTPAuthorizationCredentials = Security(HTTPBearer(auto_error=False)),
+    session: AsyncSession = Depends(get_async_session),
+    auth_service: Auth = Depends(get_auth),
+):
+    if not credentials or credentials.scheme.lower() != 'bearer':
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Token ausente ou esquema inválido. Use Authorization: Bearer <token>.',
+        )
+
+    try:
+        ok, payload, _ = auth_service.verify_token(credentials.credentials)
+        if not ok:
+            raise HTTPException(
+                status_code=HTTPStatus.UNAUTHORIZED,
+                detail='Token inválido ou expirado.',
+            )
+
+        user_id = payload.get('sub')
+        if user_id is None:
+            raise HTTPException(
+                status_code=HTTPStatus.UNAUTHORIZED,
+                detail='Token inválido: subject ausente.',
+            )
+        # asyncpg não converte tipos implicitamente como o psycopg
+        user_id = int(user_id)
+    except Exception:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Token inválido ou expirado.',
+        )
+
+    user = await session.get(User, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Usuário não encontrado.',
+        )
+
+    return UserInfoSchema(id=user.id, name=user.name, email=user.email)
+
+
+@async_auth.get(path='/jwks', status_code=HTTPStatus.OK)
+async def jwks(
+    response: Response,
+    auth_service: Auth = Depends(get_auth),
+):
+    max_age = getattr(auth_service.settings, 'JWT_JWKS_MAX_AGE', 300)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return auth_service.jwks()
+
+
+@async_auth.post('/logout', status_code=HTTPStatus.NO_CONTENT)
+async def logout(
+    authorization: Optional[str] = Header(default=None, alias='Authorization'),
+    auth: Auth = Depends(get_auth),
+) -> None:
+    if authorization and authorization.lower().startswith('bearer '):
+        token = authorization[7:].strip()
+        try:
+            auth.revoke_token(token)
+        except Exception:
+            # Ignora erros silenciosamente
+            pass
+
+    # Retorna 204 (No Content)
+    return
@@ -0,0 +1,195 @@
+from http import HTTPStatus
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Security
+from fastapi.security import HTTPAuthorizationCredentials
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.async_database import get_async_session
+from backend.models.users import User, Task
+from backend.routers.task import _safe_dump, security
+from backend.schemas.task import (
+    TaskCreateSchema,
+    TaskOutSchema,
+    TaskUpdateSchema,
+    TaskStatusSchema,
+)
+from backend.services.auth import get_auth, Auth
+from backend.services.dependencies import delete_edges
+from backend.services.tracing import TracedRoute, span
+
+
+# -------------------- Router -------------------- #
+# CRUD de backend.routers.task servido com AsyncSession (habilitado com
+# DATABASE_ASYNC=true). Sem cache, histórico, group commit nem MessagePack:
+# Settings recusa essas opções junto com o modo async.
+async_tasks = APIRouter(prefix='/api/tasks', tags=['tasks'], route_class=TracedRoute)
+
+
+# -------------------- Helpers -------------------- #
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    session: AsyncSession = Depends(get_async_session),
+    auth_service: Auth = Depends(get_auth),
+) -> User:
+    if not credentials or credentials.scheme.lower() != 'bearer':
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Token ausente ou esquema inválido. Use Authorization: Bearer <token>.',
+        )
+
+    ok, payload, _ = auth_service.verify_token(credentials.credentials)
+    if not ok:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Token inválido ou expirado.',
+        )
+    email = payload.get('email')
+    if not email:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Token inválido: email ausente.',
+        )
+
+    with span('db.user_lookup'):
+        user = await session.scalar(select(User).where(User.email == email))
+    if user is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Usuário não encontrado.',
+        )
+    return user
+
+
+async def _get_task_owned_or_404(
+    session: AsyncSession, user: User, task_id: int
+) -> Task:
+    task = await session.scalar(
+        select(Task).where(Task.id == task_id, Task.user_id == user.id)
+    )
+    if task is None:
+        # Não revelar existência de tarefas de outros usuários
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Tarefa não encontrada.',
+        )
+    return task
+
+
+async def _commit_and_refresh(session: AsyncSession, task: Task) -> Task:
+    session.add(task)
+    await session.commit()
+    await session.refresh(task)
+    return task
+
+
+# -------------------- Endpoint -------------------- #
+@async_tasks.get(
+    '',
+    status_code=HTTPStatus.OK,
+    response_model=List[TaskOutSchema],
+)
+async def list_tasks(
+    current_user: User = Depends(get_current_user_async),
+    session: AsyncSession = Depends(get_async_session),
+):
+    rows = await session.scalars(
+        select(Task).where(Task.user_id == current_user.id).order_by(Task.rank, Task.id)
+    )
+    return rows.all()
+
+
+@async_tasks.post(
+    '',
+    status_code=HTTPStatus.CREATED,
+    response_model=TaskOutSchema,
+)
+async def create_task(
+    payload: TaskCreateSchema,
+    current_user: User = Depends(get_current_user_async),
+    session: AsyncSession = Depends(get_async_session),
+):
+    data = _safe_dump(payload)
+
+    task = Task(
+        title=data['title'],
+        user_id=current_user.id,
+        description=data.get('description'),
+        priority=data.get('priority'),
+        status=data.get('status'),
+        due_date=data.get('due_date'),
+    )
+    return await _commit_and_refresh(session, task)
+
+
+@async_tasks.get(
+    '/{task_id}',
+    status_code=HTTPStatus.OK,
+    response_model=TaskOutSchema,
+)
+async def get_task_by_id(
+    task_id: int,
+    current_user: User = Depends(get_current_user_async),
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await _get_task_owned_or_404(session, current_user, task_id)
+
+
+@async_tasks.put(
+    '/{task_id}',
+    status_code=HTTPStatus.OK,
+    response_model=TaskOutSchema,
+)
+@async_tasks.patch(
+    '/{task_id}',
+    status_code=HTTPStatus.OK,
+    response_model=TaskOutSchema,
+)
+async def update_task(
+    task_id: int,
+    payload: TaskUpdateSchema,
+    current_user: User = Depends(get_current_user_async),
+    session: AsyncSession = Depends(get_async_session),
+):
+    task = await _get_task_owned_or_404(session, current_user, task_id)
+    data = _safe_dump(payload)
+
+    for field in ('title', 'description', 'priority', 'status', 'due_date'):
+        if field in data and data[field] is not None:
+            setattr(task, field, data[field])
+
+    return await _commit_and_refresh(session, task)
+
+
+@async_tasks.delete(
+    '/{task_id}',
+    status_code=HTTPStatus.NO_CONTENT,
+)
+async def delete_task(
+    task_id: int,
+    current_user: User = Depends(get_current_user_async),
+    session: AsyncSession = Depends(get_async_session),
+):
+    task = await _get_task_owned_or_404(session, current_user, task_id)
+    await session.execute(delete_edges([task.id]))
+    await session.delete(task)
+    await session.commit()
+    return None
+
+
+@async_tasks.patch(
+    '/{task_id}/status',
+    status_code=HTTPStatus.OK,
+    response_model=TaskOutSchema,
+)
+async def change_task_status(
+    task_id: int,
+    payload: TaskStatusSchema,
+    current_user: User = Depends(get_current_user_async),
+    session: AsyncSession = Depends(get_async_session),
+):
+    task = await _get_task_owned_or_404(session, current_user, task_id)
+    task.status = payload.status
+    return await _commit_and_refresh(session, task)
@@ -1,13 +1,13 @@
 from http import HTTPStatus
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Security, Header
+from fastapi import APIRouter, Depends, HTTPException, Security, Header, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from backend.models.database import get_session
+from backend.models.database import get_read_session, get_session
 from backend.models.users import User
 from backend.schemas.auth import (
     Token,
@@ -17,8 +17,9 @@ from backend.schemas.auth import (
 )
 
 from backend.services.auth import get_auth, Auth
+from backend.services.tracing import TracedRoute
 
-auth = APIRouter(prefix='/api/auth', tags=['auth'])
+auth = APIRouter(prefix='/api/auth', tags=['auth'], route_class=TracedRoute)
 
 
 @auth.post(
@@ -98,7 +99,7 @@ def login(
 )
 def userinfo(
     credentials: HTTPAuthorizationCredentials = Security(HTTPBearer(auto_error=False)),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     auth_service: Auth = Depends(get_auth),
 ):
     if not credentials or credentials.scheme.lower() != 'bearer':
@@ -139,6 +140,17 @@ def userinfo(
     return UserInfoSchema(id=user.id, name=user.name, email=user.email)
 
 
+@auth.get(path='/jwks', status_code=HTTPStatus.OK)
+def jwks(
+    response: Response,
+    auth_service: Auth = Depends(get_auth),
+):
+    # Chaves públicas para serviços de borda validarem tokens localmente
+    max_age = getattr(auth_service.settings, 'JWT_JWKS_MAX_AGE', 300)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return auth_service.jwks()
+
+
 @auth.post('/logout', status_code=HTTPStatus.NO_CONTENT)
 def logout(
     authorization: Optional[str] = Header(default=None, alias='Authorization'),
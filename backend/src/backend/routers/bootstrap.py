@@ -0,0 +1,124 @@
+import hashlib
+from http import HTTPStatus
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.models.users import Task, TaskPriority, TaskStatus, User
+from backend.routers.task import (
+    get_current_user_readonly,
+    get_task_read_session,
+    pinned_to_primary,
+)
+from backend.schemas.auth import UserInfoSchema
+from backend.schemas.bootstrap import BootstrapSchema, TaskCountsSchema
+from backend.schemas.task import TaskOutSchema
+from backend.services.task_cache import TaskListCache, get_task_cache
+from backend.services.tracing import TracedRoute, span
+
+# -------------------- Router -------------------- #
+bootstrap = APIRouter(prefix='/api', tags=['bootstrap'], route_class=TracedRoute)
+
+# O corpo depende do token (usuário): só o navegador guarda, e sempre
+# revalida com If-None-Match
+CACHE_CONTROL = 'private, no-cache'
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {
+        value.strip().removeprefix('W/') for value in if_none_match.split(',')
+    }
+    return '*' in candidates or etag in candidates
+
+
+def _counts(session: Session, user_id: int) -> TaskCountsSchema:
+    # Uma consulta agrupada dá os dois totais (status e prioridade)
+    rows = session.execute(
+        select(Task.status, Task.priority, func.count())
+        .where(Task.user_id == user_id)
+        .group_by(Task.status, Task.priority)
+    ).all()
+    by_status = dict.fromkeys(TaskStatus, 0)
+    by_priority = dict.fromkeys(TaskPriority, 0)
+    for status, priority, count in rows:
+        by_status[status] += count
+        by_priority[priority] += count
+    return TaskCountsSchema(
+        total=sum(by_status.values()), by_status=by_status, by_priority=by_priority
+    )
+
+
+def _render(session: Session, user: User, limit: int) -> bytes:
+    with span('db.task_query'):
+        rows = (
+            session
+            .execute(
+                select(Task)
+                .where(Task.user_id == user.id)
+                .order_by(Task.rank, Task.id)
+                .limit(limit + 1)
+            )
+            .scalars()
+            .all()
+        )
+    counts = _counts(session, user.id)
+    return (
+        BootstrapSchema(
+            user=UserInfoSchema(id=user.id, name=user.name, email=user.email),
+            tasks=[
+                TaskOutSchema.model_validate(task, from_attributes=True)
+                for task in rows[:limit]
+            ],
+            has_more=len(rows) > limit,
+            counts=counts,
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+@bootstrap.get(
+    '/bootstrap',
+    status_code=HTTPStatus.OK,
+    response_model=BootstrapSchema,
+    responses={HTTPStatus.NOT_MODIFIED.value: {'description': 'ETag inalterado.'}},
+)
+def get_bootstrap(
+    request: Request,
+    limit: int = Query(default=20, ge=1, le=100),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_task_read_session),
+    cache: Optional[TaskListCache] = Depends(get_task_cache),
+):
+    """Carga inicial do dashboard: usuário, primeira página e contagens.
+
+    Uma autenticação e duas consultas de tarefas (página e contagens
+    agrupadas). O corpo entra no cache de listas, invalidado pelas mesmas
+    escritas que invalidam GET /api/tasks.
+    """
+    key = (current_user.id, f'bootstrap?limit={limit}')
+    bypass = cache is not None and pinned_to_primary(request)
+    body = cache.get(key) if cache is not None and not bypass else None
+    hit = body is not None
+    if body is None:
+        version = cache.version(current_user.id) if cache is not None else None
+        body = _render(session, current_user, limit)
+        if cache is not None:
+            cache.put(key, body, version)
+
+    etag = _etag(body)
+    headers = {'ETag': etag, 'Cache-Control': CACHE_CONTROL, 'Vary': 'Authorization'}
+    if cache is not None:
+        headers['X-Cache'] = 'hit' if hit else 'bypass' if bypass else 'miss'
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
@@ -0,0 +1,67 @@
+import secrets
+from http import HTTPStatus
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+
+from backend.services.diagnostics import memory_report, tracker
+
+
+def require_admin(
+    request: Request,
+    x_admin_token: Optional[str] = Header(default=None),
+) -> None:
+    expected = request.app.state.settings.ADMIN_TOKEN
+    if not (
+        expected
+        and x_admin_token
+        and secrets.compare_digest(x_admin_token.encode(), expected.encode())
+    ):
+        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail='Acesso restrito.')
+
+
+# -------------------- Router -------------------- #
+# Diagnóstico de memória do worker que atender a requisição (veja `pid`)
+diagnostics = APIRouter(
+    prefix='/api/diagnostics',
+    tags=['diagnostics'],
+    dependencies=[Depends(require_admin)],
+    include_in_schema=False,
+)
+
+
+@diagnostics.get('/memory', status_code=HTTPStatus.OK)
+def memory(objects: int = Query(default=0, ge=0, le=200)):
+    """RSS, tracemalloc, tamanho dos caches e GC; `objects` lista os tipos
+    com mais instâncias (percorre o heap inteiro)."""
+    return memory_report(objects)
+
+
+@diagnostics.post('/memory/snapshot', status_code=HTTPStatus.CREATED)
+def take_snapshot(
+    frames: int = Query(default=1, ge=1, le=50),
+    limit: int = Query(default=20, ge=1, le=200),
+):
+    """Liga o tracemalloc (se preciso) e grava a base para /memory/diff."""
+    return tracker.snapshot(frames, limit)
+
+
+@diagnostics.get('/memory/diff', status_code=HTTPStatus.OK)
+def snapshot_diff(
+    group_by: Literal['lineno', 'filename', 'traceback'] = 'lineno',
+    limit: int = Query(default=20, ge=1, le=200),
+    rebase: bool = False,
+):
+    result = tracker.diff(group_by, limit, rebase)
+    if result is None:
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail='Nenhum snapshot base: chame POST /memory/snapshot antes.',
+        )
+    return result
+
+
+@diagnostics.delete('/memory/snapshot', status_code=HTTPStatus.NO_CONTENT)
+def stop_tracing() -> None:
+    """Desliga o tracemalloc e descarta a base."""
+    tracker.stop()
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from sqlalchemy import Engine, text
+
+from backend.models.database import get_engine, get_replica_router, pool_capacity
+from backend.services.pool import pool_status
+
+health = APIRouter(prefix='/api/health', tags=['health'])
+
+
+def get_primary_engine(request: Request) -> Engine:
+    """Engine (síncrono) cujo pool é reportado; no modo async, o sync_engine."""
+    if request.app.state.settings.DATABASE_ASYNC:
+        from backend.models.async_database import get_async_engine
+
+        return get_async_engine().sync_engine
+    return get_engine()
+
+
+def _ping(engine: Engine) -> None:
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+
+
+@health.get('/live', status_code=HTTPStatus.OK)
+def live():
+    return {'status': 'ok'}
+
+
+@health.get('/ready', status_code=HTTPStatus.OK)
+async def ready(
+    request: Request,
+    response: Response,
+    engine: Engine = Depends(get_primary_engine),
+):
+    settings = request.app.state.settings
+    pool = pool_status(engine, capacity=pool_capacity(settings))
+
+    # Pool cheio não é falha: o ping entra na fila do checkout e só falha
+    # (TimeoutError) se nenhuma conexão voltar dentro do pool_timeout
+    try:
+        if settings.DATABASE_ASYNC:
+            from backend.models.async_database import get_async_engine
+
+            async with get_async_engine().connect() as connection:
+                await connection.execute(text('SELECT 1'))
+        else:
+            await run_in_threadpool(_ping, engine)
+        database = {'ok': True}
+    except Exception as exc:
+        database = {'ok': False, 'error': type(exc).__name__}
+
+    is_ready = database['ok']
+    if not is_ready:
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+
+    body = {
+        'status': 'ready' if is_ready else 'unavailable',
+        'database': database,
+        'pool': pool,
+    }
+    if not settings.DATABASE_ASYNC:
+        # Réplicas fora do ar não tiram o serviço do ar: leituras voltam ao primário
+        body['replicas'] = await run_in_threadpool(get_replica_router().status)
+    return body
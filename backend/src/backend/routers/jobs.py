@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.models.database import get_read_session, get_session
+from backend.models.jobs import Job, JobStatus
+from backend.models.users import User
+from backend.routers.task import get_current_user, get_current_user_readonly
+from backend.schemas.jobs import JobCreateSchema, JobOutSchema
+from backend.services.jobs import enqueue, export_path
+from backend.services.tracing import TracedRoute
+
+# -------------------- Router -------------------- #
+jobs = APIRouter(prefix='/api/jobs', tags=['jobs'], route_class=TracedRoute)
+
+
+def _get_job_owned_or_404(session: Session, user: User, job_id: int) -> Job:
+    job = session.scalar(select(Job).where(Job.id == job_id, Job.user_id == user.id))
+    if job is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Job não encontrado.'
+        )
+    return job
+
+
+@jobs.post(
+    '',
+    status_code=HTTPStatus.ACCEPTED,
+    response_model=JobOutSchema,
+)
+def create_job(
+    request: Request,
+    response: Response,
+    payload: JobCreateSchema = Body(),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Enfileira uma operação demorada; acompanhe em GET /api/jobs/{id}.
+
+    Quem executa é o worker (`python -m backend.worker`): sem ele rodando,
+    o job fica em `aguardando`.
+    """
+    params = payload.model_dump(mode='json', exclude={'kind', 'priority'})
+    job = enqueue(
+        session,
+        payload.kind,
+        current_user.id,
+        params or None,
+        priority=payload.priority,
+        max_attempts=request.app.state.settings.JOBS_MAX_ATTEMPTS,
+    )
+    session.commit()
+    session.refresh(job)
+    response.headers['Location'] = f'/api/jobs/{job.id}'
+    return job
+
+
+@jobs.get(
+    '/{job_id}',
+    status_code=HTTPStatus.OK,
+    response_model=JobOutSchema,
+)
+def get_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_read_session),
+):
+    """Status, progresso (0 a 100) e, ao concluir, o resultado do job."""
+    return _get_job_owned_or_404(session, current_user, job_id)
+
+
+@jobs.get(
+    '/{job_id}/download',
+    status_code=HTTPStatus.OK,
+    response_class=FileResponse,
+)
+def download_job(
+    job_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_read_session),
+):
+    """Arquivo gerado pelo job (export_tasks), depois de concluído."""
+    job = _get_job_owned_or_404(session, current_user, job_id)
+    path = export_path(request.app.state.settings.JOBS_EXPORT_DIR, job.id)
+    if job.status != JobStatus.CONCLUIDO or not path.is_file():
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Arquivo do job não encontrado.'
+        )
+    return FileResponse(path, media_type='application/x-ndjson', filename=path.name)
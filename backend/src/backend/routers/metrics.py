@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from backend.services.metrics import CONTENT_TYPE, exposition
+
+metrics = APIRouter(tags=['metrics'])
+
+
+@metrics.get('/metrics', include_in_schema=False)
+def prometheus_metrics():
+    # Fora de /api: é o caminho que os scrapers do Prometheus esperam
+    return Response(content=exposition(), media_type=CONTENT_TYPE)
@@ -1,28 +1,82 @@
+from datetime import date, timedelta
 from http import HTTPStatus
-from typing import List
+from typing import Callable, List, Optional
+from urllib.parse import urlencode
 
 from backend.schemas.task import TaskOutSchema
-from fastapi import APIRouter, Depends, HTTPException, Security
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    Security,
+)
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import delete, func, select, text, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from backend.models.database import get_session
-from backend.models.users import User, Task
+from backend.models.database import (
+    get_engine,
+    get_read_session,
+    get_replica_router,
+    get_session,
+    get_shard_router,
+)
+from backend.models.replicas import ROUTING_KEY, routing_key
+from backend.models.dependencies import TaskDependency
+from backend.models.events import TaskEvent
+from backend.models.jobs import Job, JobStatus
+from backend.models.ranking import key_between
+from backend.models.sharding import ShardMoving
+from backend.models.sqlite import ensure_transaction
+from backend.models.users import PENDING_WITH_DUE_DATE, User, Task, TaskStatus
 from backend.services.auth import get_auth, Auth
+from backend.services.dependencies import (
+    DependencyCycle,
+    add_dependency,
+    blockers_pending,
+    delete_edges,
+)
+from backend.services.encoding import (
+    MSGPACK,
+    MSGPACK_RESPONSES,
+    MsgpackResponse,
+    MsgpackRoute,
+    TASK_COLUMNS,
+    pack_rows,
+    pack_task,
+    packb,
+    wants_msgpack,
+)
+from backend.services.group_commit import GroupCommitter, committer_for
+from backend.services.jobs import enqueue
+from backend.services.task_cache import TaskListCache, get_task_cache
+from backend.services.task_events import EventLog, diff, get_event_log
+from backend.services.tracing import span
 
 
 from backend.schemas.task import (
+    BatchRequestSchema,
+    BatchResponseSchema,
+    TaskEventPageSchema,
     TaskCreateSchema,
+    TaskDependencyOutSchema,
+    TaskDependencySchema,
+    TaskMoveSchema,
     TaskUpdateSchema,
     TaskStatusSchema,
 )
 
 
 # -------------------- Router -------------------- #
-tasks = APIRouter(prefix='/api/tasks', tags=['tasks'])
+tasks = APIRouter(prefix='/api/tasks', tags=['tasks'], route_class=MsgpackRoute)
 security = HTTPBearer(auto_error=False)
+_TASK_LIST = TypeAdapter(List[TaskOutSchema])
 
 
 # -------------------- Helpers -------------------- #
@@ -33,10 +87,16 @@ def _safe_dump(model) -> dict:
     return model.dict(exclude_unset=True)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Security(security),
-    session: Session = Depends(get_session),
-    auth_service: Auth = Depends(get_auth),
+def _encoded(body: bytes, packed: bool, headers: dict) -> Response:
+    if packed:
+        return MsgpackResponse(body, headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
+
+
+def _authenticate(
+    credentials: HTTPAuthorizationCredentials,
+    session: Session,
+    auth_service: Auth,
 ) -> User:
     if not credentials or credentials.scheme.lower() != 'bearer':
         raise HTTPException(
@@ -66,7 +126,8 @@ def get_current_user(
             detail='Token inválido ou expirado.',
         )
 
-    user = session.scalar(select(User).where(User.email == email))
+    with span('db.user_lookup'):
+        user = session.scalar(select(User).where(User.email == email))
     if user is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
@@ -75,6 +136,161 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    session: Session = Depends(get_session),
+    auth_service: Auth = Depends(get_auth),
+) -> User:
+    return _authenticate(credentials, session, auth_service)
+
+
+def get_current_user_readonly(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    session: Session = Depends(get_read_session),
+    auth_service: Auth = Depends(get_auth),
+) -> User:
+    """Como get_current_user, mas na sessão de leitura do endpoint."""
+    return _authenticate(credentials, session, auth_service)
+
+
+def get_task_session(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Sessão onde estão as tarefas do usuário: o banco principal ou o shard."""
+    shards = get_shard_router()
+    if shards is None:
+        yield session
+        return
+    # A sessão do banco principal só serviu à autenticação: devolve a
+    # conexão ao pool já. No SQLite afinado ela é o único writer e, presa
+    # até o fim da requisição, seguraria o lock que o IdAllocator precisa
+    session.close()
+    try:
+        engine = shards.engine_for(current_user.id, write=True)
+    except ShardMoving:
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail='Tarefas em migração entre bancos. Tente novamente em instantes.',
+            headers={'Retry-After': '1'},
+        )
+    with Session(engine) as shard_session:
+        yield shard_session
+
+
+def get_task_read_session(
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_read_session),
+):
+    """Como get_task_session, para leitura (segue na origem durante a migração)."""
+    shards = get_shard_router()
+    if shards is None:
+        yield session
+        return
+    with Session(shards.engine_for(current_user.id)) as shard_session:
+        yield shard_session
+
+
+def get_group_committer(
+    request: Request,
+    session: Session = Depends(get_task_session),
+) -> Optional[GroupCommitter]:
+    """Group commit do banco das tarefas do usuário (None se desligado)."""
+    settings = request.app.state.settings
+    if not settings.GROUP_COMMIT_ENABLED:
+        return None
+    return committer_for(session.get_bind(), settings)
+
+
+def _save(
+    session: Session,
+    committer: Optional[GroupCommitter],
+    write: Callable[[Session], Task],
+) -> Task:
+    """Aplica `write` e faz o commit: sozinho ou no lote do group commit."""
+    if committer is None:
+        task = write(session)
+        session.commit()
+        session.refresh(task)
+        return task
+
+    def grouped(group_session: Session) -> Task:
+        task = write(group_session)
+        group_session.flush()
+        group_session.refresh(task)
+        return task
+
+    key = session.info.get(ROUTING_KEY)
+    # A conexão da requisição (autenticação) volta ao pool antes de esperar
+    # o lote: presa aqui, a thread do committer disputaria com ela um pool
+    # pequeno (1 conexão no SQLite afinado) até estourar o pool_timeout
+    session.close()
+    task = committer.submit(grouped)
+    # O commit foi na sessão do lote: prende o cliente ao primário como o
+    # track_writes faria com a sessão da requisição
+    if key is not None:
+        get_replica_router().pin(key)
+    return task
+
+
+def _invalidate_list(cache: Optional[TaskListCache], user_id: int) -> None:
+    # Sempre depois do commit: antes dele, uma leitura concorrente ainda
+    # veria (e guardaria) a lista antiga com a versão nova
+    if cache is not None:
+        cache.invalidate(user_id)
+
+
+def pinned_to_primary(request: Request) -> bool:
+    """Cliente que escreveu há pouco e lê do primário (ver ReplicaRouter).
+
+    O cache pode ter sido preenchido por uma réplica ainda sem a escrita:
+    para esse cliente a leitura vai ao banco e a resposta (do primário)
+    substitui a entrada.
+    """
+    return get_replica_router().is_pinned(routing_key(request))
+
+
+def _new_task(data: dict, user: User) -> Task:
+    task = Task(
+        title=data['title'],
+        user_id=user.id,
+        description=data.get('description'),
+        priority=data.get('priority'),
+        status=data.get('status'),
+        due_date=data.get('due_date'),
+    )
+    shards = get_shard_router()
+    if shards is not None:
+        # Ids únicos entre os shards: a migração de um usuário mantém os ids
+        task.id = shards.ids.next_id()
+    return task
+
+
+def _apply_update(task: Task, data: dict) -> None:
+    for field in ('title', 'description', 'priority', 'status', 'due_date'):
+        if field in data and data[field] is not None:
+            setattr(task, field, data[field])
+
+
+_EVENT_FIELDS = ('title', 'description', 'priority', 'status', 'due_date')
+
+
+def _fields(task: Task) -> dict:
+    return {field: getattr(task, field) for field in _EVENT_FIELDS}
+
+
+def _record(
+    events: Optional[EventLog],
+    task_id: int,
+    user_id: int,
+    action: str,
+    changes: dict,
+) -> None:
+    # Sempre depois do commit: evento de escrita desfeita não entra no log
+    if events is not None and changes:
+        events.emit(task_id, user_id, action, changes)
+
+
 def _get_task_owned_or_404(session: Session, user: User, task_id: int) -> Task:
     task = session.scalar(
         select(Task).where(Task.id == task_id, Task.user_id == user.id)
@@ -93,19 +309,46 @@ def _get_task_owned_or_404(session: Session, user: User, task_id: int) -> Task:
     '',
     status_code=HTTPStatus.OK,
     response_model=List[TaskOutSchema],
+    responses=MSGPACK_RESPONSES,
 )
 def list_tasks(
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    request: Request,
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_task_read_session),
+    cache: Optional[TaskListCache] = Depends(get_task_cache),
 ):
-    rows = (
-        session.execute(
-            select(Task).where(Task.user_id == current_user.id).order_by(Task.id.desc())
+    packed = wants_msgpack(request)
+    if cache is not None:
+        params = urlencode(sorted(request.query_params.multi_items()))
+        # Cada formato tem a sua entrada (mesma invalidação por usuário)
+        key = (current_user.id, f'{params}#msgpack' if packed else params)
+        bypass = pinned_to_primary(request)
+        body = None if bypass else cache.get(key)
+        if body is not None:
+            return _encoded(body, packed, {'X-Cache': 'hit'})
+        version = cache.version(current_user.id)
+
+    with span('db.task_query') as query_span:
+        # MessagePack sai direto das linhas, sem montar objetos do ORM
+        query = select(*TASK_COLUMNS) if packed else select(Task)
+        result = session.execute(
+            query.where(Task.user_id == current_user.id).order_by(Task.rank, Task.id)
         )
-        .scalars()
-        .all()
-    )
-    return rows
+        rows = result.all() if packed else result.scalars().all()
+        if query_span is not None:
+            query_span.set('tasks.count', len(rows))
+    if cache is None:
+        return MsgpackResponse(pack_rows(rows)) if packed else rows
+
+    if packed:
+        body = pack_rows(rows)
+    else:
+        # Serializa aqui para guardar os bytes prontos (mesmo JSON do response_model)
+        body = _TASK_LIST.dump_json(
+            _TASK_LIST.validate_python(rows, from_attributes=True)
+        )
+    cache.put(key, body, version)
+    return _encoded(body, packed, {'X-Cache': 'bypass' if bypass else 'miss'})
 
 
 @tasks.post(
@@ -116,41 +359,311 @@ def list_tasks(
 def create_task(
     payload: TaskCreateSchema,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_task_session),
+    cache: Optional[TaskListCache] = Depends(get_task_cache),
+    committer: Optional[GroupCommitter] = Depends(get_group_committer),
+    events: Optional[EventLog] = Depends(get_event_log),
 ):
-    data = _safe_dump(payload)
+    task = _new_task(_safe_dump(payload), current_user)
+
+    def write(target: Session) -> Task:
+        target.add(task)
+        return task
+
+    task = _save(session, committer, write)
+    _invalidate_list(cache, task.user_id)
+    _record(events, task.id, task.user_id, 'created', diff({}, _fields(task)))
+    return task
 
-    task = Task(
-        title=data['title'],
-        user_id=current_user.id,
-        description=data.get('description'),
-        priority=data.get('priority'),
-        status=data.get('status'),
-        due_date=data.get('due_date'),
-    )
 
-    if hasattr(task, 'user'):
-        task.user = current_user
+def _run_batch_op(session: Session, user: User, operation, log: list) -> dict:
+    """Executa uma operação do lote; erros saem como HTTPException.
+
+    Escritas acrescentam (task_id, ação, mudanças) a `log`, emitido só
+    depois do commit.
+    """
+    if operation.op == 'get':
+        rows = session.scalars(
+            select(Task)
+            .where(Task.user_id == user.id, Task.id.in_(operation.ids))
+            .order_by(Task.id)
+        ).all()
+        found = {task.id for task in rows}
+        missing = [task_id for task_id in operation.ids if task_id not in found]
+        return {
+            'status': HTTPStatus.OK,
+            'data': _TASK_LIST.validate_python(rows, from_attributes=True),
+            'missing': missing or None,
+        }
+
+    if operation.op == 'create':
+        task = _new_task(_safe_dump(operation.data), user)
+        session.add(task)
+        before, action, status = {}, 'created', HTTPStatus.CREATED
     else:
-        task.user_id = current_user.id  # type: ignore[attr-defined]
+        task = _get_task_owned_or_404(session, user, operation.id)
+        before = _fields(task)
+        if operation.op == 'delete':
+            session.execute(delete_edges([task.id]))
+            session.delete(task)
+            session.flush()
+            log.append((operation.id, 'deleted', diff(before, {})))
+            return {'status': HTTPStatus.NO_CONTENT}
+        if operation.op == 'update':
+            _apply_update(task, _safe_dump(operation.data))
+            action = 'updated'
+        else:
+            task.status = operation.status
+            action = 'status_changed'
+        status = HTTPStatus.OK
+
+    session.flush()
+    # Valores do servidor (created_at/updated_at); converte já, antes que o
+    # commit expire o objeto
+    session.refresh(task)
+    log.append((task.id, action, diff(before, _fields(task))))
+    return {
+        'status': status,
+        'data': TaskOutSchema.model_validate(task, from_attributes=True),
+    }
+
+
+def _batch_aborted(operations, failed: int, error: dict) -> List[dict]:
+    results = []
+    for index, operation in enumerate(operations):
+        if index == failed:
+            results.append({'op': operation.op, **error})
+            continue
+        verb = 'Desfeita' if index < failed else 'Não executada'
+        results.append({
+            'op': operation.op,
+            'status': HTTPStatus.FAILED_DEPENDENCY,
+            'detail': f'{verb}: a operação {failed} falhou.',
+        })
+    return results
+
+
+def _batch_response(request: Request, data: dict):
+    if wants_msgpack(request):
+        return MsgpackResponse(packb(BatchResponseSchema(**data).model_dump()))
+    return data
+
+
+@tasks.post(
+    '/batch-ops',
+    status_code=HTTPStatus.OK,
+    response_model=BatchResponseSchema,
+    responses=MSGPACK_RESPONSES,
+    openapi_extra={
+        'requestBody': {
+            'content': {
+                MSGPACK: {'schema': {'$ref': '#/components/schemas/BatchRequestSchema'}}
+            }
+        }
+    },
+)
+def batch_ops(
+    payload: BatchRequestSchema,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_task_session),
+    cache: Optional[TaskListCache] = Depends(get_task_cache),
+    events: Optional[EventLog] = Depends(get_event_log),
+):
+    """Várias operações em ordem, com uma autenticação e uma transação.
+
+    Com `atomic` (padrão), a primeira falha desfaz tudo: ela traz o próprio
+    erro e as demais vêm com 424. Sem `atomic`, cada operação roda num
+    SAVEPOINT e só as que falham são desfeitas.
+
+    Aceita e responde MessagePack (Content-Type / Accept) além de JSON.
+    """
+    operations = payload.operations
+    user_id = current_user.id
+    results: List[dict] = []
+    log: List[tuple] = []
+
+    if not payload.atomic:
+        ensure_transaction(session)
+    for index, operation in enumerate(operations):
+        try:
+            if payload.atomic:
+                result = _run_batch_op(session, current_user, operation, log)
+            else:
+                with session.begin_nested():
+                    result = _run_batch_op(session, current_user, operation, log)
+        except HTTPException as exc:
+            result = {'status': exc.status_code, 'detail': exc.detail}
+            if payload.atomic:
+                session.rollback()
+                return _batch_response(
+                    request,
+                    {
+                        'committed': False,
+                        'results': _batch_aborted(operations, index, result),
+                    },
+                )
+        results.append({'op': operation.op, **result})
 
-    session.add(task)
     session.commit()
-    session.refresh(task)
-    return task
+    if any(operation.op != 'get' for operation in operations):
+        _invalidate_list(cache, user_id)
+    for task_id, action, changes in log:
+        _record(events, task_id, user_id, action, changes)
+    return _batch_response(request, {'committed': True, 'results': results})
+
+
+@tasks.get(
+    '/events',
+    status_code=HTTPStatus.OK,
+    response_model=TaskEventPageSchema,
+)
+def list_task_events(
+    after: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    task_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_read_session),
+):
+    """Histórico de mudanças nas tarefas do usuário, do mais antigo ao mais
+    novo, paginado pelo id do evento. Os eventos são gravados em lote:
+    podem levar até TASK_EVENTS_FLUSH_INTERVAL para aparecer."""
+    query = select(TaskEvent).where(
+        TaskEvent.user_id == current_user.id, TaskEvent.id > after
+    )
+    if task_id is not None:
+        query = query.where(TaskEvent.task_id == task_id)
+    rows = session.scalars(query.order_by(TaskEvent.id).limit(limit + 1)).all()
+    page = rows[:limit]
+    return {
+        'events': page,
+        'next_cursor': page[-1].id if page else after,
+        'has_more': len(rows) > limit,
+    }
+
+
+def _pending_due(
+    session: Session, user_id: int, condition, limit: int, packed: bool
+) -> List:
+    """Tarefas (ou, com `packed`, linhas de TASK_COLUMNS) pendentes com prazo."""
+    query = select(*TASK_COLUMNS) if packed else select(Task)
+    with span('db.task_query'):
+        result = session.execute(
+            query
+            .where(
+                Task.user_id == user_id,
+                # Literal, não parâmetro: casa com o índice parcial
+                text(PENDING_WITH_DUE_DATE),
+                condition,
+            )
+            .order_by(Task.due_date, Task.id)
+            .limit(limit)
+        )
+        return result.all() if packed else result.scalars().all()
+
+
+@tasks.get(
+    '/overdue',
+    status_code=HTTPStatus.OK,
+    response_model=List[TaskOutSchema],
+    responses=MSGPACK_RESPONSES,
+)
+def list_overdue_tasks(
+    request: Request,
+    today: Optional[date] = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_task_read_session),
+):
+    """Pendentes com prazo antes de `today` (padrão: hoje no servidor),
+    do prazo mais antigo ao mais recente. Mande `today` com a data local
+    do usuário quando o fuso dele for outro."""
+    today = today or date.today()
+    packed = wants_msgpack(request)
+    rows = _pending_due(session, current_user.id, Task.due_date < today, limit, packed)
+    return MsgpackResponse(pack_rows(rows)) if packed else rows
+
+
+@tasks.get(
+    '/due-within',
+    status_code=HTTPStatus.OK,
+    response_model=List[TaskOutSchema],
+    responses=MSGPACK_RESPONSES,
+)
+def list_tasks_due_within(
+    request: Request,
+    days: int = Query(default=7, ge=0, le=365),
+    today: Optional[date] = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_task_read_session),
+):
+    """Pendentes com prazo entre `today` e `today + days` (inclusive);
+    as atrasadas ficam em /overdue."""
+    today = today or date.today()
+    packed = wants_msgpack(request)
+    rows = _pending_due(
+        session,
+        current_user.id,
+        Task.due_date.between(today, today + timedelta(days=days)),
+        limit,
+        packed,
+    )
+    return MsgpackResponse(pack_rows(rows)) if packed else rows
+
+
+@tasks.get(
+    '/ready',
+    status_code=HTTPStatus.OK,
+    response_model=List[TaskOutSchema],
+    responses=MSGPACK_RESPONSES,
+)
+def list_ready_tasks(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=500),
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_task_read_session),
+):
+    """Pendentes sem bloqueador pendente: o que já dá para fazer.
+
+    Nenhuma delas bloqueia outra da lista (essa ainda teria um bloqueador
+    pendente), então qualquer ordem entre elas é topológica: vêm na ordem
+    manual. Uma consulta só, pelo índice da ordem manual e, por tarefa,
+    pela chave das arestas.
+    """
+    packed = wants_msgpack(request)
+    query = select(*TASK_COLUMNS) if packed else select(Task)
+    with span('db.task_query'):
+        result = session.execute(
+            query
+            .where(
+                Task.user_id == current_user.id,
+                Task.status == TaskStatus.PENDENTE,
+                ~blockers_pending(),
+            )
+            .order_by(Task.rank, Task.id)
+            .limit(limit)
+        )
+        if packed:
+            return MsgpackResponse(pack_rows(result.all()))
+        return result.scalars().all()
 
 
 @tasks.get(
     '/{task_id}',
     status_code=HTTPStatus.OK,
     response_model=TaskOutSchema,
+    responses=MSGPACK_RESPONSES,
 )
 def get_task_by_id(
     task_id: int,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    request: Request,
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_task_read_session),
 ):
     task = _get_task_owned_or_404(session, current_user, task_id)
+    if wants_msgpack(request):
+        return MsgpackResponse(pack_task(task))
     return task
 
 
@@ -168,18 +681,24 @@ def update_task(
     task_id: int,
     payload: TaskUpdateSchema,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_task_session),
+    cache: Optional[TaskListCache] = Depends(get_task_cache),
+    committer: Optional[GroupCommitter] = Depends(get_group_committer),
+    events: Optional[EventLog] = Depends(get_event_log),
 ):
-    task = _get_task_owned_or_404(session, current_user, task_id)
     data = _safe_dump(payload)
-
-    for field in ('title', 'description', 'priority', 'status', 'due_date'):
-        if field in data and data[field] is not None:
-            setattr(task, field, data[field])
-
-    session.add(task)
-    session.commit()
-    session.refresh(task)
+    before = {}
+
+    def write(target: Session) -> Task:
+        task = _get_task_owned_or_404(target, current_user, task_id)
+        before.update(_fields(task))
+        _apply_update(task, data)
+        target.add(task)
+        return task
+
+    task = _save(session, committer, write)
+    _invalidate_list(cache, task.user_id)
+    _record(events, task.id, task.user_id, 'updated', diff(before, _fields(task)))
     return task
 
 
@@ -190,11 +709,18 @@ def update_task(
 def delete_task(
     task_id: int,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_task_session),
+    cache: Optional[TaskListCache] = Depends(get_task_cache),
+    events: Optional[EventLog] = Depends(get_event_log),
 ):
     task = _get_task_owned_or_404(session, current_user, task_id)
+    user_id = task.user_id
+    before = _fields(task)
+    session.execute(delete_edges([task_id]))
     session.delete(task)
     session.commit()
+    _invalidate_list(cache, user_id)
+    _record(events, task_id, user_id, 'deleted', diff(before, {}))
     return None
 
 
@@ -207,11 +733,237 @@ def change_task_status(
     task_id: int,
     payload: TaskStatusSchema,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_task_session),
+    cache: Optional[TaskListCache] = Depends(get_task_cache),
+    committer: Optional[GroupCommitter] = Depends(get_group_committer),
+    events: Optional[EventLog] = Depends(get_event_log),
+):
+    before = {}
+
+    def write(target: Session) -> Task:
+        task = _get_task_owned_or_404(target, current_user, task_id)
+        before['status'] = task.status
+        task.status = payload.status
+        target.add(task)
+        return task
+
+    task = _save(session, committer, write)
+    _invalidate_list(cache, task.user_id)
+    changes = diff(before, {'status': task.status})
+    _record(events, task.id, task.user_id, 'status_changed', changes)
+    return task
+
+
+def _neighbor_ranks(
+    session: Session, user: User, task: Task, payload: TaskMoveSchema
+) -> tuple:
+    """Chaves entre as quais a tarefa entra (None = começo / fim da lista).
+
+    A lista segue (rank, id): criações concorrentes podem gravar o mesmo
+    rank no topo. Se o vão pedido fica entre duas tarefas empatadas, as do
+    lado de cima ganham chaves distintas antes (_spread_ties).
+    """
+    others = (Task.user_id == user.id, Task.id != task.id)
+    position = tuple_(Task.rank, Task.id)
+    if payload.before_id is not None:
+        upper = _get_task_owned_or_404(session, user, payload.before_id)
+        lower = session.scalar(
+            select(Task.rank)
+            .where(*others, position < tuple_(upper.rank, upper.id))
+            .order_by(Task.rank.desc(), Task.id.desc())
+            .limit(1)
+        )
+        if lower == upper.rank:
+            return lower, _spread_ties(session, others, lower, Task.id >= upper.id)
+        return lower, upper.rank
+    if payload.after_id is not None:
+        lower = _get_task_owned_or_404(session, user, payload.after_id)
+        upper = session.scalar(
+            select(Task.rank)
+            .where(*others, position > tuple_(lower.rank, lower.id))
+            .order_by(Task.rank, Task.id)
+            .limit(1)
+        )
+        if upper == lower.rank:
+            return upper, _spread_ties(session, others, upper, Task.id > lower.id)
+        return lower.rank, upper
+    return session.scalar(select(func.max(Task.rank)).where(*others)), None
+
+
+def _spread_ties(session: Session, others: tuple, rank: str, condition) -> str:
+    """Reescreve, em ordem de id, as tarefas com `rank` que atendem
+    `condition` com chaves crescentes entre `rank` e o próximo rank da lista.
+    Devolve a menor delas; as empatadas de fora de `condition` ficam antes.
+    """
+    tied = session.scalars(
+        select(Task).where(*others, Task.rank == rank, condition).order_by(Task.id)
+    ).all()
+    ceiling = session.scalar(
+        select(func.min(Task.rank)).where(*others, Task.rank > rank)
+    )
+    key = rank
+    for tied_task in tied:
+        key = key_between(key, ceiling)
+        tied_task.rank = key
+    return tied[0].rank
+
+
+def _schedule_rebalance(session: Session, user_id: int, settings) -> None:
+    """Enfileira o `rebalance_ranks` do usuário, se ainda não houver um."""
+    pending = session.scalar(
+        select(Job.id)
+        .where(
+            Job.kind == 'rebalance_ranks',
+            Job.user_id == user_id,
+            Job.status == JobStatus.AGUARDANDO,
+        )
+        .limit(1)
+    )
+    if pending is None:
+        # Manutenção: cede a vez aos jobs pedidos pelos usuários
+        enqueue(
+            session,
+            'rebalance_ranks',
+            user_id,
+            priority=-5,
+            max_attempts=settings.JOBS_MAX_ATTEMPTS,
+        )
+        session.commit()
+
+
+@tasks.patch(
+    '/{task_id}/position',
+    status_code=HTTPStatus.OK,
+    response_model=TaskOutSchema,
+)
+def move_task(
+    task_id: int,
+    payload: TaskMoveSchema,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_task_session),
+    cache: Optional[TaskListCache] = Depends(get_task_cache),
+    events: Optional[EventLog] = Depends(get_event_log),
 ):
+    """Ordem manual (arrastar e soltar): a tarefa vai logo antes de
+    `before_id`, logo depois de `after_id` ou, sem nenhum, para o fim.
+
+    Só a linha movida é gravada: ela ganha uma chave entre as dos novos
+    vizinhos.
+    """
+    if payload.before_id is not None and payload.after_id is not None:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail='Informe before_id ou after_id, não os dois.',
+        )
     task = _get_task_owned_or_404(session, current_user, task_id)
-    task.status = payload.status
-    session.add(task)
+    before = {'rank': task.rank}
+    task.rank = key_between(*_neighbor_ranks(session, current_user, task, payload))
     session.commit()
     session.refresh(task)
+    _invalidate_list(cache, task.user_id)
+    _record(events, task.id, task.user_id, 'moved', diff(before, {'rank': task.rank}))
+
+    settings = request.app.state.settings
+    if len(task.rank) > settings.TASK_RANK_MAX_LENGTH:
+        # A fila fica no banco principal: a própria `session` ou, com as
+        # tarefas num shard, uma sessão nova (a que autenticou a requisição
+        # já devolveu a conexão em get_task_session)
+        if get_shard_router() is None:
+            _schedule_rebalance(session, task.user_id, settings)
+        else:
+            with Session(get_engine()) as primary:
+                _schedule_rebalance(primary, task.user_id, settings)
     return task
+
+
+@tasks.get(
+    '/{task_id}/dependencies',
+    status_code=HTTPStatus.OK,
+    response_model=List[TaskOutSchema],
+)
+def list_task_blockers(
+    task_id: int,
+    current_user: User = Depends(get_current_user_readonly),
+    session: Session = Depends(get_task_read_session),
+):
+    """Tarefas que bloqueiam `task_id` (as concluídas também), na ordem manual."""
+    task = _get_task_owned_or_404(session, current_user, task_id)
+    return session.scalars(
+        select(Task)
+        .join(TaskDependency, TaskDependency.blocker_id == Task.id)
+        .where(TaskDependency.task_id == task.id)
+        .order_by(Task.rank, Task.id)
+    ).all()
+
+
+@tasks.post(
+    '/{task_id}/dependencies',
+    status_code=HTTPStatus.CREATED,
+    response_model=TaskDependencyOutSchema,
+)
+def add_task_dependency(
+    task_id: int,
+    payload: TaskDependencySchema,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_task_session),
+    events: Optional[EventLog] = Depends(get_event_log),
+):
+    """`task_id` fica bloqueada até `blocker_id` ser concluída.
+
+    409 se a aresta já existe ou se fecharia um ciclo (o detalhe mostra o
+    caminho, cada tarefa bloqueando a seguinte).
+    """
+    _get_task_owned_or_404(session, current_user, task_id)
+    # O bloqueador também tem que ser do usuário (mesmo 404 da tarefa)
+    _get_task_owned_or_404(session, current_user, payload.blocker_id)
+    try:
+        edge = add_dependency(session, current_user.id, task_id, payload.blocker_id)
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail='Dependência já cadastrada.',
+        )
+    except DependencyCycle as cycle:
+        session.rollback()
+        path = ' → '.join(str(node) for node in cycle.path)
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail=f'A dependência criaria um ciclo: {path}.',
+        )
+    session.commit()
+    session.refresh(edge)
+    changes = diff({}, {'blocked_by': payload.blocker_id})
+    _record(events, task_id, current_user.id, 'dependency_added', changes)
+    return edge
+
+
+@tasks.delete(
+    '/{task_id}/dependencies/{blocker_id}',
+    status_code=HTTPStatus.NO_CONTENT,
+)
+def remove_task_dependency(
+    task_id: int,
+    blocker_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_task_session),
+    events: Optional[EventLog] = Depends(get_event_log),
+):
+    # Remover não mexe na ordem topológica: ela continua válida
+    _get_task_owned_or_404(session, current_user, task_id)
+    result = session.execute(
+        delete(TaskDependency).where(
+            TaskDependency.task_id == task_id,
+            TaskDependency.blocker_id == blocker_id,
+        )
+    )
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Dependência não encontrada.',
+        )
+    session.commit()
+    changes = diff({'blocked_by': blocker_id}, {})
+    _record(events, task_id, current_user.id, 'dependency_removed', changes)
+    return None
@@ -0,0 +1,21 @@
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from backend.models.users import TaskPriority, TaskStatus
+from backend.schemas.auth import UserInfoSchema
+from backend.schemas.task import TaskOutSchema
+
+
+class TaskCountsSchema(BaseModel):
+    total: int
+    by_status: Dict[TaskStatus, int]
+    by_priority: Dict[TaskPriority, int]
+
+
+class BootstrapSchema(BaseModel):
+    user: UserInfoSchema
+    # Primeira página de GET /api/tasks (mesma ordem: a manual, por rank)
+    tasks: List[TaskOutSchema]
+    has_more: bool
+    counts: TaskCountsSchema
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+from typing import Annotated, Any, Dict, Literal, Optional, Union
+
+from backend.models.jobs import JobStatus
+from backend.models.users import TaskStatus
+
+
+class JobBaseSchema(BaseModel):
+    # -10 a 10; maior sai primeiro da fila
+    priority: int = Field(default=0, ge=-10, le=10)
+
+
+class ExportTasksJob(JobBaseSchema):
+    kind: Literal['export_tasks']
+
+
+class DeleteTasksJob(JobBaseSchema):
+    kind: Literal['delete_tasks']
+    # Sem status: apaga todas as tarefas do usuário
+    status: Optional[TaskStatus] = None
+
+
+JobCreateSchema = Annotated[
+    Union[ExportTasksJob, DeleteTasksJob],
+    Field(discriminator='kind'),
+]
+
+
+class JobOutSchema(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    priority: int
+    progress: int
+    attempts: int
+    max_attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
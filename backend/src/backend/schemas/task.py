@@ -1,7 +1,7 @@
 from datetime import date, datetime
 
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 from backend.models.users import TaskPriority, TaskStatus
 
 
@@ -25,6 +25,13 @@ class TaskStatusSchema(BaseModel):
     status: TaskStatus
 
 
+class TaskMoveSchema(BaseModel):
+    # Destino pelos vizinhos: logo antes de `before_id` ou logo depois de
+    # `after_id`. Sem nenhum dos dois, a tarefa vai para o fim da lista
+    before_id: Optional[int] = None
+    after_id: Optional[int] = None
+
+
 class TaskOutSchema(BaseModel):
     id: int
     title: str
@@ -32,5 +39,98 @@ class TaskOutSchema(BaseModel):
     status: TaskStatus
     priority: TaskPriority
     due_date: Optional[date] = None
+    # Chave da ordem manual: a listagem vem em ordem crescente dela
+    rank: str
     created_at: datetime
     updated_at: datetime
+
+
+# -------------------- Dependências (/api/tasks/{id}/dependencies) -------------------- #
+class TaskDependencySchema(BaseModel):
+    # A tarefa da URL fica bloqueada até `blocker_id` ser concluída
+    blocker_id: int
+
+
+class TaskDependencyOutSchema(BaseModel):
+    task_id: int
+    blocker_id: int
+    created_at: datetime
+
+
+# -------------------- Lote (/api/tasks/batch-ops) -------------------- #
+BATCH_MAX_OPERATIONS = 100
+BATCH_MAX_IDS = 200
+
+
+class BatchGetOp(BaseModel):
+    op: Literal['get']
+    ids: List[int] = Field(min_length=1, max_length=BATCH_MAX_IDS)
+
+
+class BatchCreateOp(BaseModel):
+    op: Literal['create']
+    data: TaskCreateSchema
+
+
+class BatchUpdateOp(BaseModel):
+    op: Literal['update']
+    id: int
+    data: TaskUpdateSchema
+
+
+class BatchDeleteOp(BaseModel):
+    op: Literal['delete']
+    id: int
+
+
+class BatchSetStatusOp(BaseModel):
+    op: Literal['set_status']
+    id: int
+    status: TaskStatus
+
+
+BatchOperation = Annotated[
+    Union[BatchGetOp, BatchCreateOp, BatchUpdateOp, BatchDeleteOp, BatchSetStatusOp],
+    Field(discriminator='op'),
+]
+
+
+class BatchRequestSchema(BaseModel):
+    operations: List[BatchOperation] = Field(
+        min_length=1, max_length=BATCH_MAX_OPERATIONS
+    )
+    # True: tudo ou nada. False: cada operação vale por si (as que falham
+    # são desfeitas sozinhas) e o commit é um só no fim
+    atomic: bool = True
+
+
+class BatchResultSchema(BaseModel):
+    op: str
+    # Status HTTP que a operação teria como requisição avulsa
+    status: int
+    data: Optional[Union[List[TaskOutSchema], TaskOutSchema]] = None
+    detail: Optional[str] = None
+    # Só no `get`: ids pedidos que não existem (ou são de outro usuário)
+    missing: Optional[List[int]] = None
+
+
+class BatchResponseSchema(BaseModel):
+    committed: bool
+    results: List[BatchResultSchema]
+
+
+# -------------------- Histórico (/api/tasks/events) -------------------- #
+class TaskEventSchema(BaseModel):
+    id: int
+    task_id: int
+    user_id: int
+    action: str
+    changes: Optional[Dict[str, Any]] = None
+    occurred_at: datetime
+
+
+class TaskEventPageSchema(BaseModel):
+    events: List[TaskEventSchema]
+    # Passe como `after` para continuar (também para acompanhar eventos novos)
+    next_cursor: int
+    has_more: bool
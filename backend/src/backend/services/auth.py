@@ -1,39 +1,78 @@
 from __future__ import annotations
 
+import logging
 import secrets
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional, Tuple
 
-import jwt  # PyJWT
-from pwdlib import PasswordHash
+from backend.services import metrics, tracing
+from backend.settings import Settings, get_settings
 
-from backend.settings import Settings
+# PyJWT, pwdlib/argon2 e cryptography são importados sob demanda: o import de
+# backend.app fica leve e o custo só é pago no processo que atende requisições.
 
 
+logger = logging.getLogger('backend.auth')
+
 _auth_singleton: Optional['Auth'] = None
+_REVOKED = 'Token revogado.'
+# Intervalo mínimo (s) entre varreduras de jtis revogados expirados
+REVOKED_PRUNE_INTERVAL = 60.0
 
 
-def get_auth():
+def init_auth(settings: Optional[Settings] = None) -> 'Auth':
+    """Cria o Auth do processo; o lifespan de create_app passa as settings do app."""
     global _auth_singleton
     if _auth_singleton is None:
-        _auth_singleton = Auth()
+        _auth_singleton = Auth(settings)
     return _auth_singleton
 
 
+def get_auth():
+    return init_auth()
+
+
+def dispose_auth() -> None:
+    global _auth_singleton
+    _auth_singleton = None
+
+
 class Auth:
-    def __init__(self):
-        self.settings = Settings()
+    def __init__(self, settings: Optional[Settings] = None):
+        from pwdlib import PasswordHash
+
+        from backend.services.keys import KeyRing
+
+        self.settings = settings if settings is not None else get_settings()
         self._pwd = PasswordHash.recommended()
-        self._revoked_jtis: set[str] = set()
+        # jti -> exp (epoch): a entrada só precisa viver até o token expirar
+        self._revoked_jtis: Dict[str, float] = {}
+        # Tokens com iat anterior a este instante são recusados (ver
+        # _revoke_all_before)
+        self._revoked_before = 0.0
+        self._next_revoked_prune = 0.0
+        self.keys = KeyRing.from_settings(self.settings)
 
     def hash_password(self, plain_password: str) -> str:
-        return self._pwd.hash(plain_password)
+        start = time.perf_counter()
+        try:
+            return self._pwd.hash(plain_password)
+        finally:
+            metrics.auth_password_seconds.labels('hash').observe(
+                time.perf_counter() - start
+            )
 
     def verify_password(self, plain_password: str, password_hash: str) -> bool:
+        start = time.perf_counter()
         try:
             return self._pwd.verify(plain_password, password_hash)
         except Exception:
             return False
+        finally:
+            metrics.auth_password_seconds.labels('verify').observe(
+                time.perf_counter() - start
+            )
 
     # -------- Token helpers --------
     def _encode(
@@ -44,6 +83,8 @@ class Auth:
         extra_claims: Optional[Dict[str, Any]] = None,
     ) -> str:
         """Cria um token JWT assinado."""
+        import jwt
+
         now = datetime.now(timezone.utc)
         jti = secrets.token_urlsafe(16)
 
@@ -63,17 +104,29 @@ class Auth:
         if extra_claims:
             payload.update(extra_claims)
 
+        kid, key, algorithm = self.keys.signing_key()
         return jwt.encode(
             payload,
-            self.settings.JWT_SECRET,
-            algorithm=self.settings.JWT_ALGORITHM,
+            key,
+            algorithm=algorithm,
+            headers={'kid': kid} if kid else None,
         )
 
+    def _verification_key(self, token: str) -> Tuple[Any, str]:
+        """Escolhe a chave de verificação pelo `kid` do cabeçalho."""
+        import jwt
+
+        kid = jwt.get_unverified_header(token).get('kid')
+        return self.keys.verification_key(kid)
+
     def _decode(self, token: str) -> Dict[str, Any]:
+        import jwt
+
         options = {'require': ['exp', 'iat', 'nbf', 'iss', 'sub', 'jti']}
+        key, algorithm = self._verification_key(token)
 
         kwargs: Dict[str, Any] = {
-            'algorithms': [self.settings.JWT_ALGORITHM],
+            'algorithms': [algorithm],
             'issuer': self.settings.JWT_ISSUER,
             'options': options,
         }
@@ -81,12 +134,15 @@ class Auth:
         if getattr(self.settings, 'JWT_AUDIENCE', None):
             kwargs['audience'] = self.settings.JWT_AUDIENCE
 
-        payload = jwt.decode(token, self.settings.JWT_SECRET, **kwargs)
+        payload = jwt.decode(token, key, **kwargs)
 
         if payload.get('token_use') != 'access':
             raise jwt.InvalidTokenError('Tipo de token inesperado.')
-        if payload.get('jti') in self._revoked_jtis:
-            raise jwt.InvalidTokenError('Token revogado.')
+        if (
+            payload.get('jti') in self._revoked_jtis
+            or payload['iat'] < self._revoked_before
+        ):
+            raise jwt.InvalidTokenError(_REVOKED)
 
         return payload
 
@@ -111,22 +167,89 @@ class Auth:
     def verify_token(
         self, token: str
     ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
-        try:
-            payload = self._decode(token)
-            return True, payload, None
-        except jwt.ExpiredSignatureError:
-            return False, None, 'expired'
-        except jwt.InvalidTokenError as e:
-            return False, None, f'invalid: {e}'
+        import jwt
+
+        with tracing.span('auth.verify_token') as span:
+            try:
+                payload = self._decode(token)
+                return True, payload, None
+            except jwt.ExpiredSignatureError:
+                metrics.auth_verify_failures.labels('expired').inc()
+                if span is not None:
+                    span.set('auth.failure', 'expired')
+                return False, None, 'expired'
+            except jwt.InvalidTokenError as e:
+                reason = 'revoked' if str(e) == _REVOKED else 'invalid'
+                metrics.auth_verify_failures.labels(reason).inc()
+                if span is not None:
+                    span.set('auth.failure', reason)
+                return False, None, f'invalid: {e}'
+
+    def jwks(self) -> Dict[str, Any]:
+        return self.keys.jwks()
+
+    def revoke_by_jti(self, jti: str, expires_at: Optional[float] = None) -> None:
+        now = time.time()
+        if expires_at is None:
+            # exp desconhecido: vale pelo maior TTL que um token emitido pode ter
+            expires_at = now + self.settings.JWT_TTL_MINUTES * 60
+        revoked = self._revoked_jtis
+        if jti not in revoked and len(revoked) >= self.settings.JWT_REVOKED_MAX:
+            # Cheio: saem só os já expirados. Descartar um jti ainda válido
+            # devolveria a vida a um token revogado
+            self.prune_revoked(now, force=True)
+            if len(revoked) >= self.settings.JWT_REVOKED_MAX:
+                self._revoke_all_before(now)
+                return
+        revoked[jti] = max(expires_at, revoked.get(jti, 0.0))
+        metrics.auth_revocations.inc()
+        self.prune_revoked(now)
 
-    def revoke_by_jti(self, jti: str) -> None:
-        self._revoked_jtis.add(jti)
+    def _revoke_all_before(self, now: float) -> None:
+        """Teto cheio de jtis válidos: falha fechada.
+
+        Todo token emitido até `now` passa a ser recusado, revogado ou não
+        (os usuários entram de novo), e a lista recomeça vazia: a marca já
+        cobre todos os jtis dela e o que acaba de ser revogado.
+        """
+        self._revoked_before = now
+        self._revoked_jtis.clear()
+        metrics.auth_revocations.inc()
+        metrics.auth_revoked_overflows.inc()
+        metrics.auth_revoked_tokens.set(0)
+        logger.warning(
+            'JWT_REVOKED_MAX (%d) atingido: tokens emitidos até agora serão recusados',
+            self.settings.JWT_REVOKED_MAX,
+        )
+
+    def prune_revoked(self, now: Optional[float] = None, force: bool = False) -> int:
+        """Descarta jtis de tokens já expirados (o exp os recusa de qualquer jeito).
+
+        Roda no máximo uma vez por REVOKED_PRUNE_INTERVAL, salvo `force`;
+        devolve quantas entradas saíram.
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        if force or now >= self._next_revoked_prune:
+            self._next_revoked_prune = now + REVOKED_PRUNE_INTERVAL
+            for jti, expires_at in list(self._revoked_jtis.items()):
+                if expires_at <= now:
+                    self._revoked_jtis.pop(jti, None)
+                    removed += 1
+        metrics.auth_revoked_tokens.set(len(self._revoked_jtis))
+        return removed
+
+    def revoked_count(self) -> int:
+        return len(self._revoked_jtis)
 
     def revoke_token(self, token: str) -> bool:
+        import jwt
+
         try:
             options = {'verify_exp': False, 'require': ['iss', 'sub', 'jti']}
+            key, algorithm = self._verification_key(token)
             kwargs: Dict[str, Any] = {
-                'algorithms': [self.settings.JWT_ALGORITHM],
+                'algorithms': [algorithm],
                 'issuer': self.settings.JWT_ISSUER,
                 'options': options,
             }
@@ -134,10 +257,10 @@ class Auth:
             if getattr(self.settings, 'JWT_AUDIENCE', None):
                 kwargs['audience'] = self.settings.JWT_AUDIENCE
 
-            payload = jwt.decode(token, self.settings.JWT_SECRET, **kwargs)
+            payload = jwt.decode(token, key, **kwargs)
             jti = payload.get('jti')
             if jti:
-                self._revoked_jtis.add(jti)
+                self.revoke_by_jti(jti, payload.get('exp'))
                 return True
         except Exception:
             pass
@@ -0,0 +1,185 @@
+"""Dependências entre tarefas ("A bloqueada por B"), sem ciclos.
+
+Toda tarefa que participa de alguma aresta tem uma posição `topo_order`
+numa ordem topológica do grafo do dono: o bloqueador sempre vem antes da
+tarefa que bloqueia. Com ela, inserir uma aresta não percorre o grafo
+inteiro (Pearce e Kelly, "A dynamic topological sort algorithm for
+directed acyclic graphs", 2006):
+
+- bloqueador já antes da tarefa: a ordem continua valendo, nada a fazer;
+- senão, só a faixa entre as duas posições pode mudar. Uma busca a partir
+  da tarefa (pelas que ela bloqueia, sem sair da faixa) que chegue ao
+  bloqueador é um ciclo. Sem ciclo, o que ela achou passa para depois do
+  que alcança o bloqueador no sentido contrário (também dentro da faixa),
+  reaproveitando as mesmas posições.
+
+Cada nível das buscas é uma consulta nos índices das arestas. Remover uma
+aresta (ou apagar uma tarefa) não invalida a ordem.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Delete, bindparam, delete, exists, func, or_, select, update
+from sqlalchemy.orm import Session, aliased
+
+from backend.models.dependencies import TaskDependency
+from backend.models.users import Task, TaskStatus
+
+_Blocker = aliased(Task, name='blocker')
+
+
+class DependencyCycle(Exception):
+    """A aresta fecharia um ciclo; `path` vai do bloqueador de volta a ele,
+    cada tarefa bloqueando a seguinte."""
+
+    def __init__(self, path: List[int]):
+        super().__init__(' -> '.join(str(task_id) for task_id in path))
+        self.path = path
+
+
+def _lock_graph(session: Session, user_id: int) -> None:
+    """Serializa as mudanças no grafo do usuário até o fim da transação.
+
+    Sem isso, duas arestas inseridas ao mesmo tempo poderiam passar cada
+    uma pela verificação e fechar juntas um ciclo. No SQLite a aresta é
+    gravada antes das buscas, o que já pega o lock de escrita do banco.
+    """
+    if session.get_bind().dialect.name == 'postgresql':
+        session.execute(select(func.pg_advisory_xact_lock(user_id)))
+
+
+def _place(
+    session: Session, user_id: int, task_id: int, blocker_id: int
+) -> Dict[int, int]:
+    """Posições das duas pontas; quem ainda não tem entra numa extremidade.
+
+    Sem arestas antes desta, o bloqueador novo não depende de ninguém (vai
+    para antes de todas) e a tarefa nova não bloqueia ninguém (depois de
+    todas): nenhuma das duas obriga a mexer no resto da ordem.
+    """
+    positions = dict(
+        session.execute(
+            select(Task.id, Task.topo_order).where(Task.id.in_([task_id, blocker_id]))
+        ).all()
+    )
+    placed = {}
+    if None in positions.values():
+        lowest, highest = session.execute(
+            select(func.min(Task.topo_order), func.max(Task.topo_order)).where(
+                Task.user_id == user_id
+            )
+        ).one()
+        if lowest is None:
+            lowest, highest = 1, 0
+        if positions[blocker_id] is None:
+            placed[blocker_id] = lowest - 1
+        if positions[task_id] is None:
+            placed[task_id] = highest + 1
+    _reorder(session, placed)
+    positions.update(placed)
+    return positions
+
+
+def _search(
+    session: Session, start: int, position: int, bound: int, *, forward: bool
+) -> Dict[int, Tuple[Optional[int], int]]:
+    """Tarefas alcançáveis de `start` sem sair da faixa até `bound`.
+
+    `forward`: pelas que cada uma bloqueia (posições <= bound); senão,
+    pelos bloqueadores (posições >= bound). Devolve id -> (de onde veio,
+    posição).
+    """
+    if forward:
+        source, target = TaskDependency.blocker_id, TaskDependency.task_id
+        inside = Task.topo_order <= bound
+    else:
+        source, target = TaskDependency.task_id, TaskDependency.blocker_id
+        inside = Task.topo_order >= bound
+    found: Dict[int, Tuple[Optional[int], int]] = {start: (None, position)}
+    frontier = [start]
+    while frontier:
+        rows = session.execute(
+            select(source, target, Task.topo_order)
+            .join(Task, Task.id == target)
+            .where(source.in_(frontier), inside)
+        ).all()
+        frontier = []
+        for parent, task_id, task_position in rows:
+            if task_id not in found:
+                found[task_id] = (parent, task_position)
+                frontier.append(task_id)
+    return found
+
+
+def _reorder(session: Session, positions: Dict[int, int]) -> None:
+    if not positions:
+        return
+    tasks = Task.__table__
+    # Posição interna: `updated_at` não muda, a tarefa em si não foi editada
+    session.execute(
+        update(tasks)
+        .where(tasks.c.id == bindparam('task_id'))
+        .values(topo_order=bindparam('position'), updated_at=tasks.c.updated_at),
+        [
+            {'task_id': task_id, 'position': position}
+            for task_id, position in positions.items()
+        ],
+    )
+
+
+def add_dependency(
+    session: Session, user_id: int, task_id: int, blocker_id: int
+) -> TaskDependency:
+    """Grava "`task_id` bloqueada por `blocker_id`" mantendo a ordem.
+
+    As duas tarefas já devem ser do usuário. Levanta DependencyCycle (com a
+    aresta já na sessão: quem chama desfaz a transação); o commit também
+    fica com quem chama.
+    """
+    _lock_graph(session, user_id)
+    edge = TaskDependency(task_id=task_id, blocker_id=blocker_id, user_id=user_id)
+    session.add(edge)
+    session.flush()
+
+    positions = _place(session, user_id, task_id, blocker_id)
+    lower, upper = positions[task_id], positions[blocker_id]
+    if upper < lower:
+        return edge
+
+    ahead = _search(session, task_id, lower, upper, forward=True)
+    if blocker_id in ahead:
+        path = [blocker_id]
+        while path[-1] != task_id:
+            path.append(ahead[path[-1]][0])
+        raise DependencyCycle([blocker_id, *reversed(path)])
+    behind = _search(session, blocker_id, upper, lower, forward=False)
+
+    def by_position(found):
+        return sorted(found, key=lambda node: found[node][1])
+
+    # Quem leva ao bloqueador e depois quem depende da tarefa, cada grupo
+    # na ordem relativa que já tinha, nas mesmas posições de antes
+    nodes = by_position(behind) + by_position(ahead)
+    slots = sorted(found[1] for found in (*behind.values(), *ahead.values()))
+    _reorder(session, dict(zip(nodes, slots)))
+    return edge
+
+
+def blockers_pending():
+    """Condição das tarefas com algum bloqueador ainda pendente."""
+    return exists().where(
+        TaskDependency.task_id == Task.id,
+        _Blocker.id == TaskDependency.blocker_id,
+        _Blocker.status == TaskStatus.PENDENTE,
+    )
+
+
+def delete_edges(task_ids: Iterable[int]) -> Delete:
+    """DELETE das arestas que tocam as tarefas (antes de apagá-las)."""
+    task_ids = list(task_ids)
+    return delete(TaskDependency).where(
+        or_(
+            TaskDependency.task_id.in_(task_ids),
+            TaskDependency.blocker_id.in_(task_ids),
+        )
+    )
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from backend.services.metrics import REGISTRY, rss_bytes
+
+# Alocações do próprio tracemalloc e do import de módulos só fazem ruído
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB no Linux, bytes no macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _kib(size: int) -> float:
+    return round(size / 1024, 1)
+
+
+def _stat(stat, group_by: str) -> Dict[str, Any]:
+    frame = stat.traceback[0]
+    data: Dict[str, Any] = {
+        'file': frame.filename,
+        'line': frame.lineno if group_by != 'filename' else None,
+        'size_kib': _kib(stat.size),
+        'count': stat.count,
+    }
+    if hasattr(stat, 'size_diff'):
+        data['size_diff_kib'] = _kib(stat.size_diff)
+        data['count_diff'] = stat.count_diff
+    if group_by == 'traceback':
+        data['traceback'] = stat.traceback.format()
+    return data
+
+
+class MemoryTracker:
+    """Snapshots do tracemalloc no processo atual, comparados a uma base.
+
+    O tracemalloc só liga no primeiro snapshot (custa CPU e memória
+    enquanto ativo) e desliga em `stop()`. Cada worker tem o seu: o
+    resultado vale para o processo que atendeu a requisição.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._baseline_at: Optional[str] = None
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            'tracing': tracing,
+            'frames': tracemalloc.get_traceback_limit() if tracing else None,
+            'traced_kib': _kib(current),
+            'traced_peak_kib': _kib(peak),
+            'overhead_kib': _kib(tracemalloc.get_tracemalloc_memory()),
+            'baseline_at': self._baseline_at,
+        }
+
+    def _take(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def snapshot(self, frames: int = 1, limit: int = 20) -> Dict[str, Any]:
+        """Liga o tracemalloc se preciso e guarda um snapshot como base."""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            snapshot = self._take()
+            self._baseline = snapshot
+            self._baseline_at = datetime.now(timezone.utc).isoformat()
+            top = snapshot.statistics('lineno')[:limit]
+        return {**self.status(), 'top': [_stat(stat, 'lineno') for stat in top]}
+
+    def diff(
+        self, group_by: str = 'lineno', limit: int = 20, rebase: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Maiores crescimentos desde a base; None se não houver base."""
+        with self._lock:
+            if self._baseline is None or not tracemalloc.is_tracing():
+                return None
+            snapshot = self._take()
+            stats = snapshot.compare_to(self._baseline, group_by)
+            baseline_at = self._baseline_at
+            if rebase:
+                self._baseline = snapshot
+                self._baseline_at = datetime.now(timezone.utc).isoformat()
+        growth = sum(stat.size_diff for stat in stats)
+        return {
+            **self.status(),
+            'compared_to': baseline_at,
+            'size_diff_kib': _kib(growth),
+            'top': [_stat(stat, group_by) for stat in stats[:limit]],
+        }
+
+    def stop(self) -> None:
+        with self._lock:
+            self._baseline = None
+            self._baseline_at = None
+            tracemalloc.stop()
+
+
+tracker = MemoryTracker()
+
+
+def cache_sizes() -> Dict[str, Any]:
+    """Tamanho das estruturas que vivem o processo inteiro."""
+    from backend.models import database
+    from backend.services import auth, sql_stats
+    from backend.settings import get_settings
+
+    series = REGISTRY.series_count()
+    sizes: Dict[str, Any] = {
+        'auth_revoked_jtis': auth._auth_singleton.revoked_count()
+        if auth._auth_singleton is not None
+        else 0,
+        'sql_fingerprints': len(sql_stats.query_stats()),
+        'metrics_series': sum(series.values()),
+        'metrics_series_by_name': series,
+        'settings_cache': get_settings.cache_info().currsize,
+    }
+    engine = database._engine
+    if engine is not None and engine._compiled_cache is not None:
+        # Cache de SQL compilado do SQLAlchemy (LRU limitado pelo engine)
+        sizes['sqlalchemy_compiled_cache'] = len(engine._compiled_cache)
+    return sizes
+
+
+def gc_stats() -> Dict[str, Any]:
+    return {
+        'counts': list(gc.get_count()),
+        'thresholds': list(gc.get_threshold()),
+        'generations': gc.get_stats(),
+        'garbage': len(gc.garbage),
+        'frozen': gc.get_freeze_count(),
+    }
+
+
+def object_counts(limit: int = 20) -> List[Dict[str, Any]]:
+    """Tipos com mais instâncias rastreadas pelo GC (percorre todo o heap)."""
+    counts = Counter(
+        f'{type(obj).__module__}.{type(obj).__qualname__}' for obj in gc.get_objects()
+    )
+    return [{'type': name, 'count': count} for name, count in counts.most_common(limit)]
+
+
+def memory_report(objects: int = 0) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        'pid': os.getpid(),
+        'rss_bytes': rss_bytes(),
+        'peak_rss_bytes': peak_rss_bytes(),
+        'tracemalloc': tracker.status(),
+        'caches': cache_sizes(),
+        'gc': gc_stats(),
+    }
+    if objects > 0:
+        report['objects'] = object_counts(objects)
+    return report
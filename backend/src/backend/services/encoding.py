@@ -0,0 +1,183 @@
+"""Respostas (e corpos de lote) em MessagePack, por negociação de conteúdo.
+
+Com `Accept: application/msgpack`, as rotas de tarefas respondem em
+MessagePack: os mesmos campos do JSON, empacotados direto das linhas da
+consulta (sem objetos do ORM nem JSON no meio) e com datas como Timestamp (extensão -1 do
+MessagePack: 6 ou 10 bytes, contra ~28 do ISO-8601). `due_date` vira o
+Timestamp da meia-noite UTC do dia.
+
+No sentido contrário, rotas com `MsgpackRoute` aceitam corpo com
+`Content-Type: application/msgpack`: ele é decodificado e entregue ao
+FastAPI como se fosse o JSON, com a mesma validação e os mesmos 422.
+"""
+
+from __future__ import annotations
+
+import enum
+from datetime import date, datetime, timezone
+from http import HTTPStatus
+from typing import Any, Dict, Iterable, Optional
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel
+
+from backend.models.users import Task
+from backend.schemas.task import TaskOutSchema
+from backend.services.tracing import TracedRoute
+
+MSGPACK = 'application/msgpack'
+# Nomes que clientes antigos ainda mandam
+_MSGPACK_TYPES = {MSGPACK, 'application/x-msgpack', 'application/vnd.msgpack'}
+_EPOCH = datetime(1970, 1, 1)
+
+TASK_FIELDS = tuple(TaskOutSchema.model_fields)
+# select(*TASK_COLUMNS) devolve linhas prontas para `pack_rows`
+TASK_COLUMNS = tuple(getattr(Task, field) for field in TASK_FIELDS)
+
+# `responses=` das rotas que também respondem MessagePack (só documentação)
+MSGPACK_RESPONSES = {HTTPStatus.OK: {'content': {MSGPACK: {}}}}
+
+
+def _media_type(value: str) -> str:
+    return value.split(';', 1)[0].strip().lower()
+
+
+def _accept(header: str) -> Dict[str, float]:
+    """Tipo de mídia -> q do cabeçalho Accept."""
+    weights: Dict[str, float] = {}
+    for item in header.split(','):
+        media_type, *params = (part.strip() for part in item.split(';'))
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[media_type.lower()] = q
+    return weights
+
+
+def wants_msgpack(request: Request) -> bool:
+    """O cliente pediu MessagePack com peso maior ou igual ao do JSON."""
+    header = request.headers.get('accept')
+    if not header:
+        return False
+    weights = _accept(header)
+    packed = max((weights.get(name, 0.0) for name in _MSGPACK_TYPES), default=0.0)
+    if packed <= 0:
+        return False
+    json = weights.get(
+        'application/json', weights.get('application/*', weights.get('*/*', 0.0))
+    )
+    return packed >= json
+
+
+def is_msgpack(content_type: Optional[str]) -> bool:
+    return content_type is not None and _media_type(content_type) in _MSGPACK_TYPES
+
+
+def _timestamp(value: datetime):
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - _EPOCH
+    return msgpack.Timestamp(
+        delta.days * 86_400 + delta.seconds, delta.microseconds * 1000
+    )
+
+
+def _default(value: Any) -> Any:
+    # Chamado pelo Packer só para o que ele não conhece
+    if isinstance(value, datetime):
+        return _timestamp(value)
+    if isinstance(value, date):
+        return _timestamp(datetime(value.year, value.month, value.day))
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f'Tipo sem codificação MessagePack: {type(value).__name__}.')
+
+
+def packb(data: Any) -> bytes:
+    return msgpack.packb(data, default=_default, datetime=False)
+
+
+def pack_rows(rows: Iterable[Any]) -> bytes:
+    """Lista de tarefas a partir de linhas de `select(*TASK_COLUMNS)`.
+
+    Com 1000 tarefas custa pouco mais da metade de `pack_tasks`: não há
+    objetos do ORM para montar nem atributos instrumentados para ler.
+    """
+    return packb([dict(zip(TASK_FIELDS, row)) for row in rows])
+
+
+def pack_tasks(tasks: Iterable[Any]) -> bytes:
+    """Lista de tarefas (objetos do ORM) com os campos de TaskOutSchema."""
+    return packb([
+        {field: getattr(task, field) for field in TASK_FIELDS} for task in tasks
+    ])
+
+
+def pack_task(task: Any) -> bytes:
+    return packb({field: getattr(task, field) for field in TASK_FIELDS})
+
+
+def unpackb(body: bytes) -> Any:
+    # Timestamps chegam como datetime UTC (o pydantic aceita nos campos date
+    # quando é meia-noite)
+    return msgpack.unpackb(body, timestamp=3)
+
+
+class MsgpackResponse(Response):
+    media_type = MSGPACK
+
+    def __init__(self, content: bytes, status_code: int = 200, headers=None):
+        headers = {'Vary': 'Accept', **(headers or {})}
+        super().__init__(content, status_code=status_code, headers=headers)
+
+
+async def _as_json_request(request: Request) -> Request:
+    """Mesma requisição, com o corpo MessagePack no lugar do JSON."""
+    body = await request.body()
+    try:
+        data = unpackb(body) if body else None
+    except ValueError:
+        raise RequestValidationError([
+            {
+                'type': 'msgpack_invalid',
+                'loc': ('body',),
+                'msg': 'MessagePack inválido.',
+                'input': {},
+            }
+        ])
+    headers = [
+        (name, value)
+        for name, value in request.scope['headers']
+        if name != b'content-type'
+    ]
+    headers.append((b'content-type', b'application/json'))
+    decoded = Request({**request.scope, 'headers': headers}, request.receive)
+    # Caches do Starlette: o FastAPI lê daqui sem tocar no stream de novo
+    decoded._body = body
+    decoded._json = data
+    return decoded
+
+
+class MsgpackRoute(TracedRoute):
+    """TracedRoute que também aceita corpo em MessagePack."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if is_msgpack(request.headers.get('content-type')):
+                request = await _as_json_request(request)
+            return await handler(request)
+
+        return route_handler
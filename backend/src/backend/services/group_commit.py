@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from backend.models.sqlite import ensure_transaction
+from backend.services import metrics
+
+T = TypeVar('T')
+Operation = Callable[[Session], T]
+
+_STOP = object()
+
+
+class _Pending:
+    __slots__ = ('context', 'future', 'operation')
+
+    def __init__(self, operation: Operation):
+        self.operation = operation
+        self.future: Future = Future()
+        # Spans e contagem de SQL continuam na conta da requisição
+        self.context = contextvars.copy_context()
+
+
+class GroupCommitter:
+    """Junta escritas de requisições concorrentes numa única transação.
+
+    `submit(operation)` entrega a função a uma thread do engine, que espera
+    até `window` segundos (ou `max_batch` escritas) por outras, roda cada uma
+    num SAVEPOINT da mesma sessão e faz um único COMMIT. Quem chamou recebe o
+    próprio retorno ou a própria exceção; uma operação que falha só desfaz o
+    seu SAVEPOINT. Se o COMMIT falhar, todas as do lote recebem o erro.
+
+    A sessão usa expire_on_commit=False: os objetos devolvidos chegam
+    carregados (operações que dependem de valores do servidor fazem
+    flush + refresh dentro da operação).
+    """
+
+    def __init__(self, engine: Engine, *, window: float = 0.002, max_batch: int = 64):
+        self.engine = engine
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        # Thread criada no primeiro uso, já dentro do worker
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name='group-commit', daemon=True
+                    )
+                    self._thread.start()
+
+    def submit(self, operation: Operation) -> T:
+        pending = _Pending(operation)
+        self._ensure_started()
+        self._queue.put(pending)
+        return pending.future.result()
+
+    def _collect(self, first: _Pending) -> Tuple[List[_Pending], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch, stop = self._collect(item)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch: List[_Pending]) -> None:
+        outcomes = []
+        try:
+            with Session(self.engine, expire_on_commit=False) as session:
+                ensure_transaction(session)
+                for pending in batch:
+                    try:
+                        with session.begin_nested():
+                            result = pending.context.run(pending.operation, session)
+                    except Exception as exc:
+                        outcomes.append((pending, None, exc))
+                    else:
+                        outcomes.append((pending, result, None))
+                session.commit()
+        except Exception as exc:
+            metrics.group_commit_failures.inc()
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(exc)
+            return
+
+        metrics.group_commit_batch_size.observe(len(batch))
+        for pending, result, error in outcomes:
+            if error is not None:
+                pending.future.set_exception(error)
+            else:
+                pending.future.set_result(result)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Processa o que já está na fila e encerra a thread."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_committers: Dict[Engine, GroupCommitter] = {}
+_committers_lock = threading.Lock()
+
+
+def committer_for(engine: Engine, settings) -> GroupCommitter:
+    """Um GroupCommitter por engine (primário ou shard) por processo."""
+    with _committers_lock:
+        committer = _committers.get(engine)
+        if committer is None:
+            committer = _committers[engine] = GroupCommitter(
+                engine,
+                window=settings.GROUP_COMMIT_WINDOW_MS / 1000,
+                max_batch=settings.GROUP_COMMIT_MAX_BATCH,
+            )
+    return committer
+
+
+def close_committers() -> None:
+    with _committers_lock:
+        committers = list(_committers.values())
+        _committers.clear()
+    for committer in committers:
+        committer.close()
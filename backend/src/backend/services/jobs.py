@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import Engine, bindparam, delete, func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from backend.models.database import get_shard_router
+from backend.models.jobs import Job, JobStatus, utc_now
+from backend.models.ranking import evenly_spaced
+from backend.models.users import Task, TaskStatus
+from backend.schemas.task import TaskOutSchema
+from backend.services import metrics
+from backend.services.dependencies import delete_edges
+from backend.services.task_cache import TaskListCache
+from backend.services.task_events import EventLog, diff
+
+logger = logging.getLogger('backend.jobs')
+
+JobHandler = Callable[['JobContext'], Optional[Dict[str, Any]]]
+HANDLERS: Dict[str, JobHandler] = {}
+
+
+def handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Registra a função que executa os jobs de `kind`."""
+
+    def register(function: JobHandler) -> JobHandler:
+        HANDLERS[kind] = function
+        return function
+
+    return register
+
+
+class JobFailed(Exception):
+    """Falha definitiva: o job vai para `falhou` sem novas tentativas."""
+
+
+def enqueue(
+    session: Session,
+    kind: str,
+    user_id: int,
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    priority: int = 0,
+    max_attempts: int = 3,
+) -> Job:
+    """Acrescenta o job à sessão (quem chama faz o commit)."""
+    if kind not in HANDLERS:
+        raise ValueError(f'Tipo de job desconhecido: {kind}.')
+    job = Job(
+        kind=kind,
+        user_id=user_id,
+        params=params,
+        priority=priority,
+        max_attempts=max_attempts,
+    )
+    session.add(job)
+    return job
+
+
+# -------------------- Fila -------------------- #
+def claim(engine: Engine, worker_id: str) -> Optional[Job]:
+    """Pega o próximo job da fila (maior prioridade, mais antigo).
+
+    Um único UPDATE ... WHERE id = (SELECT ...) RETURNING. No PostgreSQL o
+    SELECT leva FOR UPDATE SKIP LOCKED: workers concorrentes pegam jobs
+    diferentes sem esperar um pelo outro. O SQLite ignora o FOR UPDATE, mas
+    só tem um writer por vez: o UPDATE inteiro roda sob o lock de escrita e
+    dois workers nunca pegam o mesmo job.
+    """
+    now = utc_now()
+    # Alias: sem ele o subselect seria correlacionado com o UPDATE
+    queued = aliased(Job)
+    next_job = (
+        select(queued.id)
+        .where(queued.status == JobStatus.AGUARDANDO, queued.run_after <= now)
+        .order_by(queued.priority.desc(), queued.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    with Session(engine, expire_on_commit=False) as session:
+        job = session.scalars(
+            update(Job)
+            .where(Job.id == next_job, Job.status == JobStatus.AGUARDANDO)
+            .values(
+                status=JobStatus.EXECUTANDO,
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_at=now,
+            )
+            .returning(Job)
+        ).first()
+        session.commit()
+    return job
+
+
+def requeue_stale(engine: Engine, lease: float) -> int:
+    """Devolve à fila os jobs de workers que pararam de dar sinal."""
+    limit = utc_now() - timedelta(seconds=lease)
+    stale = (Job.status == JobStatus.EXECUTANDO, Job.locked_at < limit)
+    with engine.begin() as connection:
+        failed = connection.execute(
+            update(Job)
+            .where(*stale, Job.attempts >= Job.max_attempts)
+            .values(
+                status=JobStatus.FALHOU,
+                error='Worker parou durante a execução.',
+                locked_by=None,
+                finished_at=utc_now(),
+            )
+        ).rowcount
+        requeued = connection.execute(
+            update(Job)
+            .where(*stale)
+            .values(status=JobStatus.AGUARDANDO, locked_by=None, run_after=utc_now())
+        ).rowcount
+    if failed or requeued:
+        logger.warning(
+            'jobs parados: %d de volta à fila, %d falharam', requeued, failed
+        )
+    return requeued
+
+
+@dataclass
+class JobContext:
+    """O que o handler recebe: o job, o banco e onde avisar das escritas."""
+
+    job_id: int
+    user_id: int
+    params: Dict[str, Any]
+    engine: Engine
+    worker_id: str
+    events: Optional[EventLog] = None
+    cache: Optional[TaskListCache] = None
+    export_dir: str = './exports'
+
+    def task_engine(self, *, write: bool = False) -> Engine:
+        """Banco das tarefas do usuário (o shard dele, se houver)."""
+        router = get_shard_router()
+        if router is None:
+            return self.engine
+        # ShardMoving numa escrita: o job volta para a fila e tenta depois
+        return router.engine_for(self.user_id, write=write)
+
+    def progress(self, done: int, total: int) -> None:
+        """Grava o progresso (0 a 100) e renova a posse do job."""
+        percent = 100 if total <= 0 else min(100, done * 100 // total)
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(Job)
+                .where(Job.id == self.job_id, Job.locked_by == self.worker_id)
+                .values(progress=percent, locked_at=utc_now())
+            )
+
+
+def _finish(engine: Engine, job: Job, **values) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.locked_by == job.locked_by)
+            .values(locked_by=None, **values)
+        )
+
+
+class Worker:
+    """Executa jobs da tabela `jobs`, um por vez.
+
+    Com PostgreSQL, suba quantos processos quiser; com SQLite, um só (um
+    writer por arquivo: mais workers só disputariam o lock com a API).
+    Falhas voltam para a fila com espera exponencial (`backoff` * 2^n) até
+    `max_attempts` do job; JobFailed encerra na hora.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        worker_id: Optional[str] = None,
+        poll_interval: float = 1.0,
+        lease: float = 300.0,
+        backoff: float = 5.0,
+        events: Optional[EventLog] = None,
+        cache: Optional[TaskListCache] = None,
+        export_dir: str = './exports',
+    ):
+        self.engine = engine
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.backoff = backoff
+        self.events = events
+        self.cache = cache
+        self.export_dir = export_dir
+        self._last_requeue: Optional[float] = None
+
+    def run_once(self) -> bool:
+        """Executa um job, se houver; False com a fila vazia."""
+        if (
+            self._last_requeue is None
+            or time.monotonic() - self._last_requeue > self.lease / 2
+        ):
+            requeue_stale(self.engine, self.lease)
+            self._last_requeue = time.monotonic()
+
+        job = claim(self.engine, self.worker_id)
+        if job is None:
+            return False
+
+        function = HANDLERS.get(job.kind)
+        context = JobContext(
+            job_id=job.id,
+            user_id=job.user_id,
+            params=job.params or {},
+            engine=self.engine,
+            worker_id=self.worker_id,
+            events=self.events,
+            cache=self.cache,
+            export_dir=self.export_dir,
+        )
+        start = time.perf_counter()
+        try:
+            if function is None:
+                raise JobFailed(f'Tipo de job desconhecido: {job.kind}.')
+            result = function(context)
+        except Exception as exc:
+            outcome = self._failed(job, exc)
+        else:
+            _finish(
+                self.engine,
+                job,
+                status=JobStatus.CONCLUIDO,
+                progress=100,
+                result=result,
+                error=None,
+                finished_at=utc_now(),
+            )
+            outcome = 'succeeded'
+        metrics.jobs_processed.labels(job.kind, outcome).inc()
+        metrics.job_duration.labels(job.kind).observe(time.perf_counter() - start)
+        return True
+
+    def _failed(self, job: Job, exc: Exception) -> str:
+        error = f'{type(exc).__name__}: {exc}'
+        if isinstance(exc, JobFailed) or job.attempts >= job.max_attempts:
+            logger.error('job %d (%s) falhou: %s', job.id, job.kind, error)
+            _finish(
+                self.engine,
+                job,
+                status=JobStatus.FALHOU,
+                error=error,
+                finished_at=utc_now(),
+            )
+            return 'failed'
+        delay = self.backoff * 2 ** (job.attempts - 1)
+        logger.warning(
+            'job %d (%s) falhou (tentativa %d), nova tentativa em %.0fs: %s',
+            job.id,
+            job.kind,
+            job.attempts,
+            delay,
+            error,
+        )
+        _finish(
+            self.engine,
+            job,
+            status=JobStatus.AGUARDANDO,
+            error=error,
+            run_after=utc_now() + timedelta(seconds=delay),
+        )
+        return 'retried'
+
+    def run(self, stop: threading.Event) -> None:
+        """Processa até `stop`; o job em andamento sempre termina."""
+        while not stop.is_set():
+            try:
+                ran = self.run_once()
+            except Exception:
+                # Banco fora do ar, por exemplo: espera e tenta de novo
+                logger.exception('falha ao buscar jobs')
+                ran = False
+            if not ran:
+                stop.wait(self.poll_interval)
+
+
+# -------------------- Handlers -------------------- #
+_PAGE = 500
+
+
+def _task_json(task: Task) -> Dict[str, Any]:
+    return TaskOutSchema.model_validate(task, from_attributes=True).model_dump(
+        mode='json'
+    )
+
+
+def export_path(directory: str, job_id: int) -> Path:
+    """Arquivo do export do job (o nome sai do id, nunca do `result`)."""
+    return Path(directory) / f'tasks-{job_id}.jsonl'
+
+
+@handler('export_tasks')
+def export_tasks(context: JobContext) -> Dict[str, Any]:
+    """Todas as tarefas do usuário, em páginas por id, num arquivo JSON Lines.
+
+    O `result` do job leva só a contagem e o nome do arquivo: a lista
+    inteira na coluna JSON cresceria sem limite com o número de tarefas.
+    """
+    path = export_path(context.export_dir, context.job_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Escreve ao lado e renomeia: uma nova tentativa não deixa arquivo pela metade
+    partial = path.with_suffix('.part')
+    count = 0
+    with (
+        Session(context.task_engine()) as session,
+        partial.open('w', encoding='utf-8') as output,
+    ):
+        total = session.scalar(
+            select(func.count()).where(Task.user_id == context.user_id)
+        )
+        last_id = 0
+        while True:
+            page = session.scalars(
+                select(Task)
+                .where(Task.user_id == context.user_id, Task.id > last_id)
+                .order_by(Task.id)
+                .limit(_PAGE)
+            ).all()
+            if not page:
+                break
+            output.writelines(
+                json.dumps(_task_json(task), ensure_ascii=False) + '\n' for task in page
+            )
+            count += len(page)
+            last_id = page[-1].id
+            context.progress(count, total)
+    os.replace(partial, path)
+    return {'count': count, 'file': path.name}
+
+
+@handler('delete_tasks')
+def delete_tasks(context: JobContext) -> Dict[str, Any]:
+    """Apaga as tarefas do usuário (só as do `status` dado, se houver).
+
+    Um commit por página: se o worker cair no meio, a nova tentativa
+    continua do que sobrou.
+    """
+    status = context.params.get('status')
+    conditions = [Task.user_id == context.user_id]
+    if status is not None:
+        conditions.append(Task.status == TaskStatus(status))
+    fields = ('title', 'description', 'priority', 'status', 'due_date')
+
+    deleted = 0
+    with Session(context.task_engine(write=True)) as session:
+        total = session.scalar(select(func.count()).where(*conditions))
+        while True:
+            page = session.scalars(
+                select(Task).where(*conditions).order_by(Task.id).limit(_PAGE)
+            ).all()
+            if not page:
+                break
+            removed = [
+                (task.id, {field: getattr(task, field) for field in fields})
+                for task in page
+            ]
+            ids = [task_id for task_id, _ in removed]
+            session.execute(delete_edges(ids))
+            session.execute(delete(Task).where(Task.id.in_(ids)))
+            session.commit()
+            deleted += len(removed)
+            if context.cache is not None:
+                context.cache.invalidate(context.user_id)
+            if context.events is not None:
+                for task_id, before in removed:
+                    context.events.emit(
+                        task_id, context.user_id, 'deleted', diff(before, {})
+                    )
+            context.progress(deleted, total)
+    return {'deleted': deleted}
+
+
+@handler('rebalance_ranks')
+def rebalance_ranks(context: JobContext) -> Dict[str, Any]:
+    """Reescreve a ordem manual do usuário com chaves curtas (mesma ordem).
+
+    Numa transação só, com as linhas bloqueadas (FOR UPDATE no PostgreSQL;
+    no SQLite um movimento concorrente derruba a tentativa, refeita pela
+    fila): nenhum movimento se perde no meio da troca. `updated_at` não
+    muda, a tarefa em si não foi editada.
+    """
+    tasks = Task.__table__
+    with Session(context.task_engine(write=True)) as session:
+        ids = session.scalars(
+            select(Task.id)
+            .where(Task.user_id == context.user_id)
+            .order_by(Task.rank, Task.id)
+            .with_for_update()
+        ).all()
+        if ids:
+            session.execute(
+                update(tasks)
+                .where(tasks.c.id == bindparam('task_id'))
+                .values(rank=bindparam('new_rank'), updated_at=tasks.c.updated_at),
+                [
+                    {'task_id': task_id, 'new_rank': rank}
+                    for task_id, rank in zip(ids, evenly_spaced(len(ids)))
+                ],
+            )
+        session.commit()
+    if context.cache is not None:
+        context.cache.invalidate(context.user_id)
+    context.progress(len(ids), len(ids))
+    return {'tasks': len(ids)}
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import jwt  # PyJWT
+
+
+_SYMMETRIC_PREFIX = 'HS'
+
+
+def _read_pem(value: str) -> str:
+    """Aceita o PEM inline ou o caminho de um arquivo .pem."""
+    if value.lstrip().startswith('-----BEGIN'):
+        return value
+    return Path(value).read_text(encoding='utf-8')
+
+
+def _algorithm_for(key: Any, preferred: str) -> str:
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return 'EdDSA'
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return preferred if preferred[:2] in {'RS', 'PS'} else 'RS256'
+    raise ValueError(f'Tipo de chave não suportado: {type(key).__name__}')
+
+
+class KeyRing:
+    """Chaves de assinatura/verificação indexadas por `kid`.
+
+    No modo simétrico (HS*) tudo se resume ao `JWT_SECRET`. No modo
+    assimétrico as chaves públicas já interpretadas ficam em cache por `kid`,
+    então nenhum PEM é relido ou reinterpretado a cada token.
+    """
+
+    def __init__(
+        self,
+        *,
+        algorithm: str,
+        secret: str = '',
+        private_keys: Optional[Dict[str, str]] = None,
+        public_keys: Optional[Dict[str, str]] = None,
+        signing_kid: Optional[str] = None,
+    ):
+        self.algorithm = algorithm
+        self._secret = secret
+        self._private_pems = dict(private_keys or {})
+        self._public_pems = dict(public_keys or {})
+        self._signing_kid = signing_kid
+        self._signing: Optional[Tuple[str, Any, str]] = None
+        self._verification: Dict[str, Tuple[Any, str]] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> 'KeyRing':
+        return cls(
+            algorithm=settings.JWT_ALGORITHM,
+            secret=getattr(settings, 'JWT_SECRET', ''),
+            private_keys=getattr(settings, 'JWT_PRIVATE_KEYS', None),
+            public_keys=getattr(settings, 'JWT_PUBLIC_KEYS', None),
+            signing_kid=getattr(settings, 'JWT_SIGNING_KID', None),
+        )
+
+    @property
+    def is_symmetric(self) -> bool:
+        return self.algorithm.upper().startswith(_SYMMETRIC_PREFIX)
+
+    @property
+    def kids(self) -> list[str]:
+        return sorted(set(self._private_pems) | set(self._public_pems))
+
+    # -------- Assinatura --------
+    def signing_key(self) -> Tuple[Optional[str], Any, str]:
+        """Retorna (kid, chave, algoritmo) usados para assinar novos tokens."""
+        if self.is_symmetric:
+            return None, self._secret, self.algorithm
+
+        if self._signing is None:
+            kid = self._signing_kid or next(iter(sorted(self._private_pems)), None)
+            if kid is None or kid not in self._private_pems:
+                raise ValueError('Nenhuma chave privada ativa para assinatura.')
+
+            algorithm = jwt.get_algorithm_by_name(self.algorithm)
+            key = algorithm.prepare_key(_read_pem(self._private_pems[kid]))
+            self._signing = (kid, key, _algorithm_for(key, self.algorithm))
+            # A pública correspondente já entra no cache de verificação
+            self._verification[kid] = (key.public_key(), self._signing[2])
+
+        return self._signing
+
+    # -------- Verificação --------
+    def verification_key(self, kid: Optional[str]) -> Tuple[Any, str]:
+        """Retorna (chave, algoritmo) para verificar um token com este `kid`."""
+        if self.is_symmetric:
+            return self._secret, self.algorithm
+
+        if kid is None:
+            raise jwt.InvalidTokenError('Cabeçalho kid ausente.')
+
+        cached = self._verification.get(kid)
+        if cached is not None:
+            return cached
+
+        if kid in self._private_pems:
+            pem = _read_pem(self._private_pems[kid])
+            algorithm = jwt.get_algorithm_by_name(self.algorithm)
+            key = algorithm.prepare_key(pem).public_key()
+        elif kid in self._public_pems:
+            from cryptography.hazmat.primitives.serialization import (
+                load_pem_public_key,
+            )
+
+            key = load_pem_public_key(_read_pem(self._public_pems[kid]).encode())
+        else:
+            raise jwt.InvalidTokenError('Chave de assinatura desconhecida.')
+
+        entry = (key, _algorithm_for(key, self.algorithm))
+        self._verification[kid] = entry
+        return entry
+
+    def jwks(self) -> Dict[str, Any]:
+        """Conjunto de chaves públicas no formato JWKS (RFC 7517)."""
+        if self.is_symmetric:
+            return {'keys': []}
+
+        keys = []
+        for kid in self.kids:
+            key, alg = self.verification_key(kid)
+            jwk = jwt.get_algorithm_by_name(alg).to_jwk(key, as_dict=True)
+            jwk.update({'kid': kid, 'use': 'sig', 'alg': alg})
+            keys.append(jwk)
+        return {'keys': keys}
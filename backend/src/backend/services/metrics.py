@@ -0,0 +1,503 @@
+from __future__ import annotations
+
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Limites padrão (segundos) do histograma de latência HTTP
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 500, 1000, 5000, 10_000, 50_000, 100_000, 500_000, 1_000_000)
+ARGON2_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+JOB_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600)
+
+# Rótulo de rota para requisições que não casaram com nenhuma rota (evita
+# uma série por URL arbitrária)
+UNMATCHED = '<unmatched>'
+
+LabelValues = Tuple[str, ...]
+
+
+class _Child:
+    """Uma série (combinação de rótulos). O lock é só dela: sem disputa global."""
+
+    __slots__ = ('_lock', 'value')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def snapshot(self) -> float:
+        return self.value
+
+
+class _HistogramChild:
+    __slots__ = ('_buckets', '_counts', '_lock', '_sum')
+
+    def __init__(self, buckets: Sequence[float]):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)  # último = +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'counts': list(self._counts), 'sum': self._sum}
+
+
+class Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._children: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+        if not self.label_names:
+            self._default = self.labels()
+
+    def _new_child(self):
+        return _Child()
+
+    def labels(self, *values: Any) -> Any:
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.label_names):
+                raise ValueError(
+                    f'{self.name}: esperados rótulos {self.label_names}, recebido {key}.'
+                )
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'type': self.kind,
+            'help': self.documentation,
+            'labels': list(self.label_names),
+            'samples': [
+                [list(key), child.snapshot()]
+                for key, child in list(self._children.items())
+            ],
+        }
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    """Gauge somado entre workers; séries de processos mortos são descartadas."""
+
+    kind = 'gauge'
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labels)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = super().snapshot()
+        data['buckets'] = list(self.buckets)
+        return data
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labels=()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name, documentation, labels=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), **kwargs) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, **kwargs))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def series_count(self) -> Dict[str, int]:
+        """Séries vivas por métrica (cada combinação de rótulos ocupa memória)."""
+        return {name: len(metric._children) for name, metric in self._metrics.items()}
+
+
+REGISTRY = Registry()
+
+http_requests = REGISTRY.counter(
+    'http_requests_total',
+    'Requisições HTTP por método, rota e status.',
+    ('method', 'route', 'status'),
+)
+http_duration = REGISTRY.histogram(
+    'http_request_duration_seconds',
+    'Latência das requisições HTTP por método e rota.',
+    ('method', 'route'),
+)
+http_response_size = REGISTRY.histogram(
+    'http_response_size_bytes',
+    'Tamanho do corpo das respostas por método e rota.',
+    ('method', 'route'),
+    buckets=SIZE_BUCKETS,
+)
+http_in_flight = REGISTRY.gauge(
+    'http_requests_in_flight', 'Requisições HTTP em andamento.'
+)
+auth_verify_failures = REGISTRY.counter(
+    'auth_token_verify_failures_total',
+    'Tokens recusados na verificação, por motivo.',
+    ('reason',),
+)
+auth_revocations = REGISTRY.counter(
+    'auth_token_revocations_total', 'Tokens revogados (logout).'
+)
+auth_revoked_overflows = REGISTRY.counter(
+    'auth_revoked_overflows_total',
+    'Vezes que JWT_REVOKED_MAX encheu e todo token emitido até ali foi recusado.',
+)
+auth_revoked_tokens = REGISTRY.gauge(
+    'auth_revoked_tokens', 'jtis revogados ainda não expirados, em memória.'
+)
+process_resident_memory = REGISTRY.gauge(
+    'process_resident_memory_bytes', 'Memória residente (RSS) dos workers.'
+)
+task_cache_requests = REGISTRY.counter(
+    'task_cache_requests_total',
+    'Consultas ao cache de list_tasks por resultado (hit, miss, stale).',
+    ('result',),
+)
+task_cache_invalidations = REGISTRY.counter(
+    'task_cache_invalidations_total', 'Invalidações do cache de list_tasks.'
+)
+task_cache_entries = REGISTRY.gauge(
+    'task_cache_entries', 'Entradas no cache de list_tasks.'
+)
+group_commit_batch_size = REGISTRY.histogram(
+    'group_commit_batch_size',
+    'Escritas por transação no group commit.',
+    buckets=BATCH_BUCKETS,
+)
+group_commit_failures = REGISTRY.counter(
+    'group_commit_failures_total',
+    'Transações do group commit que falharam no commit (todo o lote).',
+)
+task_events_queue = REGISTRY.gauge(
+    'task_events_queue_size', 'Eventos de tarefa aguardando gravação em lote.'
+)
+task_events_written = REGISTRY.counter(
+    'task_events_written_total', 'Eventos de tarefa gravados no banco.'
+)
+task_events_spooled = REGISTRY.counter(
+    'task_events_spooled_total',
+    'Eventos de tarefa desviados para o spool (fila cheia ou falha do banco).',
+)
+task_events_dropped = REGISTRY.counter(
+    'task_events_dropped_total', 'Eventos de tarefa perdidos (sem spool configurado).'
+)
+jobs_processed = REGISTRY.counter(
+    'jobs_processed_total',
+    'Execuções de jobs por tipo e resultado (succeeded, retried, failed).',
+    ('kind', 'outcome'),
+)
+job_duration = REGISTRY.histogram(
+    'job_duration_seconds',
+    'Duração de cada execução de job, por tipo.',
+    ('kind',),
+    buckets=JOB_BUCKETS,
+)
+db_pool_checked_out = REGISTRY.gauge(
+    'db_pool_checked_out', 'Conexões do pool em uso, por pool.', ('pool',)
+)
+db_pool_saturated = REGISTRY.gauge(
+    'db_pool_saturated',
+    'Pools com todas as conexões em uso na última checagem (1 = cheio).',
+    ('pool',),
+)
+db_pool_checkout_timeouts = REGISTRY.counter(
+    'db_pool_checkout_timeouts_total',
+    'Checkouts que estouraram o pool_timeout esperando conexão, por pool.',
+    ('pool',),
+)
+auth_password_seconds = REGISTRY.histogram(
+    'auth_password_hash_seconds',
+    'Tempo do argon2 por operação (hash ou verify).',
+    ('operation',),
+    buckets=ARGON2_BUCKETS,
+)
+
+
+# -------------------- Vários workers -------------------- #
+class MultiprocessStore:
+    """Um arquivo JSON por processo em `directory`, agregado na leitura.
+
+    Cada worker grava o próprio snapshot a cada `interval` segundos (e ao
+    sair); quem atende `/metrics` grava o seu na hora e soma os arquivos de
+    todos. Contadores e histogramas de workers mortos continuam somando (são
+    cumulativos); gauges só contam processos vivos.
+    """
+
+    def __init__(self, directory: str, registry: Registry, interval: float = 5.0):
+        self.directory = Path(directory)
+        self.registry = registry
+        self.interval = interval
+        self._pid: Optional[int] = None
+        self._flush_lock = threading.Lock()
+
+    def _path(self, pid: int) -> Path:
+        return self.directory / f'metrics-{pid}.json'
+
+    def flush(self) -> None:
+        update_process_metrics()
+        pid = os.getpid()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f'.metrics-{pid}.tmp'
+        with self._flush_lock:
+            tmp.write_text(
+                json.dumps({'pid': pid, 'metrics': self.registry.snapshot()}),
+                encoding='utf-8',
+            )
+            os.replace(tmp, self._path(pid))
+
+    def ensure_started(self) -> None:
+        """Liga o flush periódico no processo atual (depois do fork)."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        self._pid = pid
+
+        def loop() -> None:
+            while True:
+                time.sleep(self.interval)
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+
+        threading.Thread(target=loop, name='metrics-flush', daemon=True).start()
+        atexit.register(self.flush)
+
+    def collect(self) -> List[Tuple[int, Dict[str, Any]]]:
+        self.flush()
+        snapshots = []
+        for path in self.directory.glob('metrics-*.json'):
+            try:
+                data = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+            snapshots.append((data['pid'], data['metrics']))
+        return snapshots
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge(snapshots: Iterable[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Soma snapshots de vários processos num único snapshot."""
+    merged: Dict[str, Any] = {}
+    for pid, metrics in snapshots:
+        alive = None
+        for name, data in metrics.items():
+            if data['type'] == 'gauge':
+                alive = _pid_alive(pid) if alive is None else alive
+                if not alive:
+                    continue
+            target = merged.setdefault(name, {**data, 'samples': {}})
+            for key, value in data['samples']:
+                key = tuple(key)
+                if data['type'] == 'histogram':
+                    current = target['samples'].get(key)
+                    if current is None:
+                        target['samples'][key] = {
+                            'counts': list(value['counts']),
+                            'sum': value['sum'],
+                        }
+                    else:
+                        current['counts'] = [
+                            a + b for a, b in zip(current['counts'], value['counts'])
+                        ]
+                        current['sum'] += value['sum']
+                else:
+                    target['samples'][key] = target['samples'].get(key, 0.0) + value
+    for data in merged.values():
+        data['samples'] = [[list(k), v] for k, v in data['samples'].items()]
+    return merged
+
+
+# -------------------- Exposição -------------------- #
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(snapshot: Dict[str, Any]) -> str:
+    """Formato texto do Prometheus (0.0.4)."""
+    lines: List[str] = []
+    for name, data in snapshot.items():
+        lines.append(f'# HELP {name} {data["help"]}')
+        lines.append(f'# TYPE {name} {data["type"]}')
+        names = data['labels']
+        for values, value in sorted(data['samples'], key=lambda item: item[0]):
+            if data['type'] != 'histogram':
+                lines.append(f'{name}{_labels(names, values)} {_number(value)}')
+                continue
+            running = 0
+            bounds = [*data['buckets'], math.inf]
+            for bound, count in zip(bounds, value['counts']):
+                running += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f'{name}_bucket{_labels(names, values, le)} {running}')
+            lines.append(f'{name}_sum{_labels(names, values)} {_number(value["sum"])}')
+            lines.append(f'{name}_count{_labels(names, values)} {running}')
+    return '\n'.join(lines) + '\n'
+
+
+def rss_bytes() -> Optional[int]:
+    """RSS atual do processo (Linux, via /proc); None onde não há /proc."""
+    try:
+        with open('/proc/self/statm', encoding='ascii') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def update_process_metrics() -> None:
+    rss = rss_bytes()
+    if rss is not None:
+        process_resident_memory.set(rss)
+
+
+_store: Optional[MultiprocessStore] = None
+
+
+def configure(directory: Optional[str], interval: float = 5.0) -> None:
+    """Liga (ou desliga, com None) a agregação entre workers por arquivos."""
+    global _store
+    _store = MultiprocessStore(directory, REGISTRY, interval) if directory else None
+
+
+def exposition() -> str:
+    update_process_metrics()
+    if _store is None:
+        return render(REGISTRY.snapshot())
+    return render(merge(_store.collect()))
+
+
+# -------------------- Middleware -------------------- #
+class MetricsMiddleware:
+    """Mede cada requisição HTTP pelo template da rota (`/api/tasks/{task_id}`)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        if _store is not None:
+            _store.ensure_started()
+
+        status = 500
+        size = 0
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            route = scope.get('route')
+            template = getattr(route, 'path', None) or UNMATCHED
+            method = scope['method']
+            http_requests.labels(method, template, status).inc()
+            http_duration.labels(method, template).observe(elapsed)
+            http_response_size.labels(method, template).observe(size)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from backend.services import metrics
+
+
+# Limites (ms) do histograma de espera no checkout do pool
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Histograma de buckets cumulativos no estilo Prometheus."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # último = +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative, running = {}, 0
+        for bound, count in zip((*self.buckets, '+Inf'), counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {'buckets': cumulative, 'count': running, 'sum': total}
+
+
+class PoolStats:
+    """Contadores de um pool, alimentados pelos eventos do SQLAlchemy."""
+
+    def __init__(self):
+        self.checkout_wait_ms = Histogram(WAIT_BUCKETS_MS)
+        self.checkouts = 0
+        self.checkins = 0
+        self.checkout_timeouts = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'checkouts': self.checkouts,
+            'checkins': self.checkins,
+            'checkout_timeouts': self.checkout_timeouts,
+            # churn: conexões abertas/fechadas desde o início do processo
+            'connects': self.connects,
+            'closes': self.closes,
+            'invalidations': self.invalidations,
+            'checkout_wait_ms': self.checkout_wait_ms.snapshot(),
+        }
+
+
+_stats: Dict[str, PoolStats] = {}
+_stats_lock = threading.Lock()
+
+
+def stats_for(label: str) -> PoolStats:
+    stats = _stats.get(label)
+    if stats is None:
+        with _stats_lock:
+            stats = _stats.setdefault(label, PoolStats())
+    return stats
+
+
+def all_stats() -> Dict[str, PoolStats]:
+    return dict(_stats)
+
+
+class _TimedCheckout:
+    """Mede quanto cada checkout esperou por uma conexão livre.
+
+    O rótulo é o `logging_name` do pool (`pool_logging_name` no
+    create_engine), que sobrevive ao `recreate()` feito por `dispose()`.
+    """
+
+    def connect(self):
+        label = self._orig_logging_name or 'default'
+        stats = stats_for(label)
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            stats.checkout_timeouts += 1
+            metrics.db_pool_checkout_timeouts.labels(label).inc()
+            raise
+        finally:
+            stats.checkout_wait_ms.observe((time.perf_counter() - start) * 1000)
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(engine: Engine, label: str) -> Engine:
+    """Registra os listeners de churn/checkout do pool de `engine`."""
+    stats = stats_for(label)
+    checked_out = metrics.db_pool_checked_out.labels(label)
+
+    def on_connect(dbapi_connection, connection_record):
+        stats.connects += 1
+
+    def on_close(dbapi_connection, connection_record):
+        stats.closes += 1
+
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.invalidations += 1
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.checkouts += 1
+        checked_out.inc()
+
+    def on_checkin(dbapi_connection, connection_record):
+        stats.checkins += 1
+        checked_out.dec()
+
+    event.listen(engine, 'connect', on_connect)
+    event.listen(engine, 'close', on_close)
+    event.listen(engine, 'invalidate', on_invalidate)
+    event.listen(engine, 'checkout', on_checkout)
+    event.listen(engine, 'checkin', on_checkin)
+    return engine
+
+
+def pool_status(engine: Engine, *, capacity: Optional[int] = None) -> Dict[str, Any]:
+    """Ocupação atual do pool de `engine` + contadores acumulados."""
+    pool = engine.pool
+    label = pool._orig_logging_name or 'default'
+    status: Dict[str, Any] = {'label': label, 'pool': type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        checked_out = pool.checkedout()
+        status.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': checked_out,
+            'overflow': max(pool.overflow(), 0),
+        })
+        if capacity is not None:
+            status['capacity'] = capacity
+            status['saturated'] = checked_out >= capacity
+            metrics.db_pool_saturated.labels(label).set(int(status['saturated']))
+
+    status.update(stats_for(label).snapshot())
+    return status
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import random
+import re
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from backend.services import sql_stats
+
+logger = logging.getLogger('backend.profiling')
+
+HEADER = 'x-profile'
+_SLUG = re.compile(r'[^A-Za-z0-9]+')
+
+# Um profiler por vez no processo: o cProfile (sys.monitoring no 3.12+)
+# não aceita dois ativos, e perfis sobrepostos se contaminariam
+_busy = threading.Lock()
+
+
+def top_functions(profile: cProfile.Profile, limit: int = 30) -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(profile, stream=out)
+    stats.sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
+
+
+class ProfilingMiddleware:
+    """Roda a requisição sob o cProfile quando pedido e grava o perfil.
+
+    Uma requisição é perfilada se trouxer `X-Profile: <PROFILING_TOKEN>` ou
+    se for sorteada por `sample_rate`. O resultado vai para `directory`:
+    `<id>.prof` (pstats; abra com snakeviz ou `python -m pstats`) e
+    `<id>.json` com rota, usuário, status, duração, o SQL executado e as
+    funções mais caras. A resposta leva `X-Profile-Id`.
+
+    Só é instalado quando há token ou taxa de amostragem: desligado, não
+    custa nada. No Python 3.12+ o cProfile observa todas as threads, então
+    o corpo de endpoints síncronos (threadpool) entra no perfil, assim como
+    o de requisições concorrentes no mesmo intervalo.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        directory: str,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+    ):
+        self.app = app
+        self.directory = Path(directory)
+        self.token = token
+        self.sample_rate = sample_rate
+
+    def _wanted(self, scope) -> bool:
+        if self.token:
+            for name, value in scope['headers']:
+                if name == HEADER.encode():
+                    return secrets.compare_digest(value.decode('latin-1'), self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        if not _busy.acquire(blocking=False):
+            logger.info('profiling ignorado: outro perfil em andamento')
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                message = {
+                    **message,
+                    'headers': [
+                        *message.get('headers', []),
+                        (b'x-profile-id', profile_id.encode()),
+                    ],
+                }
+            await send(message)
+
+        stats = sql_stats.current_stats()
+        if stats is not None:
+            stats.statements = []
+
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                profile.disable()
+            duration_ms = (time.perf_counter() - start) * 1000
+            self._save(profile_id, profile, scope, status, duration_ms, stats)
+        finally:
+            _busy.release()
+
+    def _save(self, profile_id, profile, scope, status, duration_ms, stats) -> None:
+        from starlette.requests import Request
+
+        from backend.models.replicas import routing_key
+
+        route = getattr(scope.get('route'), 'path', None)
+        slug = _SLUG.sub('-', route or scope['path']).strip('-') or 'root'
+        stem = f'{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{slug}-{profile_id}'
+
+        metadata: Dict[str, Any] = {
+            'id': profile_id,
+            'method': scope['method'],
+            'path': scope['path'],
+            'route': route,
+            # sub do token sem verificar assinatura: só identifica o perfil
+            'user': routing_key(Request(scope)),
+            'status': status,
+            'duration_ms': round(duration_ms, 3),
+            'sql': {
+                'count': stats.count if stats else None,
+                'time_ms': round(stats.time_ms, 3) if stats else None,
+                'statements': stats.statements if stats else None,
+            },
+            'top_functions': top_functions(profile),
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(self.directory / f'{stem}.prof')
+            (self.directory / f'{stem}.json').write_text(
+                json.dumps(metadata, indent=2, ensure_ascii=False), encoding='utf-8'
+            )
+        except OSError:
+            logger.exception('não foi possível gravar o perfil %s', profile_id)
+            return
+        logger.info('perfil %s gravado em %s', profile_id, self.directory / stem)
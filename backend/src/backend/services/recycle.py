@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import signal
+from typing import Callable, Optional
+
+from backend.services.metrics import rss_bytes
+
+logger = logging.getLogger('backend.recycle')
+
+
+def _terminate() -> None:
+    # SIGTERM no próprio processo: o uvicorn termina as requisições em
+    # andamento antes de sair, e o supervisor sobe um worker novo
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+class MaxRequestsMiddleware:
+    """Recicla o worker depois de `max_requests` requisições HTTP.
+
+    Cada processo sorteia um extra de 0 a `jitter` para que workers
+    iniciados juntos não reiniciem juntos. Ao atingir o limite, `stop` é
+    chamado uma única vez, depois de a resposta ter sido enviada. A pilha
+    de middlewares é montada na primeira requisição, já dentro do worker,
+    então o sorteio é por processo.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        max_requests: int,
+        jitter: int = 0,
+        stop: Optional[Callable[[], None]] = None,
+    ):
+        self.app = app
+        self.limit = max_requests + (random.randint(0, jitter) if jitter > 0 else 0)
+        self.stop = stop or _terminate
+        self.requests = 0
+        self._stopping = False
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.requests += 1
+            if self.requests >= self.limit and not self._stopping:
+                self._stopping = True
+                logger.warning(
+                    json.dumps({
+                        'event': 'worker_recycle',
+                        'pid': os.getpid(),
+                        'requests': self.requests,
+                        'limit': self.limit,
+                        'rss_bytes': rss_bytes(),
+                    })
+                )
+                self.stop()
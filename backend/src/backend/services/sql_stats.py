@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger('backend.sql')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_PARAM = re.compile(r'%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SPACES = re.compile(r'\s+')
+
+# Limite de fingerprints distintos agregados por processo
+MAX_FINGERPRINTS = 1000
+
+
+def fingerprint(statement: str) -> str:
+    """SQL normalizado: literais e parâmetros viram `?` e listas IN, `(?+)`."""
+    sql = _STRING.sub('?', statement)
+    sql = _PARAM.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(?+)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+def fingerprint_id(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:12]
+
+
+class RequestStats:
+    """Comandos SQL e tempo de banco de uma requisição."""
+
+    def __init__(self, method: str = '', path: str = ''):
+        self.method = method
+        self.path = path
+        self.count = 0
+        self.time_ms = 0.0
+        self.fingerprints: Counter[str] = Counter()
+        # Texto integral dos comandos, só quando alguém pediu (ex.: profiling)
+        self.statements: Optional[List[Dict[str, Any]]] = None
+
+    def record(
+        self, normalized: str, elapsed_ms: float, statement: Optional[str] = None
+    ) -> None:
+        self.count += 1
+        self.time_ms += elapsed_ms
+        self.fingerprints[normalized] += 1
+        if self.statements is not None:
+            self.statements.append({
+                'sql': statement or normalized,
+                'duration_ms': round(elapsed_ms, 3),
+            })
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """Fingerprints executados `threshold` vezes ou mais (suspeita de N+1)."""
+        return {
+            sql: count for sql, count in self.fingerprints.items() if count >= threshold
+        }
+
+
+class QueryStat:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+        }
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar('sql_stats', default=None)
+_aggregate: Dict[str, QueryStat] = {}
+_aggregate_lock = threading.Lock()
+_slow_query_ms: float = 200.0
+_installed = False
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def _aggregate_for(normalized: str) -> QueryStat:
+    stat = _aggregate.get(normalized)
+    if stat is None:
+        with _aggregate_lock:
+            if len(_aggregate) >= MAX_FINGERPRINTS:
+                normalized = '<outros>'
+            stat = _aggregate.setdefault(normalized, QueryStat())
+    return stat
+
+
+def query_stats(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Estatísticas agregadas por fingerprint, do maior tempo total ao menor."""
+    with _aggregate_lock:
+        items = [(sql, stat.snapshot()) for sql, stat in _aggregate.items()]
+    items.sort(key=lambda item: item[1]['total_ms'], reverse=True)
+    return [
+        {'fingerprint': sql, 'id': fingerprint_id(sql), **stat}
+        for sql, stat in items[:limit]
+    ]
+
+
+def reset_query_stats() -> None:
+    with _aggregate_lock:
+        _aggregate.clear()
+
+
+def _log(event_name: str, **fields: Any) -> None:
+    logger.warning(json.dumps({'event': event_name, **fields}, ensure_ascii=False))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    context._sql_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    started = getattr(context, '_sql_started', None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    normalized = fingerprint(statement)
+
+    stat = _aggregate_for(normalized)
+    with _aggregate_lock:
+        stat.count += 1
+        stat.total_ms += elapsed_ms
+        stat.max_ms = max(stat.max_ms, elapsed_ms)
+
+    request = _current.get()
+    if request is not None:
+        request.record(normalized, elapsed_ms, statement)
+
+    if elapsed_ms >= _slow_query_ms:
+        _log(
+            'slow_query',
+            id=fingerprint_id(normalized),
+            fingerprint=normalized,
+            duration_ms=round(elapsed_ms, 3),
+            threshold_ms=_slow_query_ms,
+            method=request.method if request else None,
+            path=request.path if request else None,
+            stats=stat.snapshot(),
+        )
+
+
+def install(slow_query_ms: float = 200.0) -> None:
+    """Registra a contagem em todos os engines do processo (uma vez)."""
+    global _installed, _slow_query_ms
+    _slow_query_ms = slow_query_ms
+    if _installed:
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    _installed = True
+
+
+class SQLStatsMiddleware:
+    """Abre um RequestStats por requisição HTTP.
+
+    Com `debug`, a resposta leva `X-SQL-Count`, `X-SQL-Time-Ms`,
+    `Server-Timing` e, se houver suspeita de N+1, `X-SQL-N-Plus-One` com o
+    número de fingerprints repetidos. Os suspeitos sempre vão para o log.
+    """
+
+    def __init__(self, app, *, debug: bool = False, n_plus_one_threshold: int = 3):
+        self.app = app
+        self.debug = debug
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope['method'], scope['path'])
+        token = _current.set(stats)
+
+        async def send_with_stats(message):
+            if message['type'] == 'http.response.start':
+                repeated = stats.repeated(self.n_plus_one_threshold)
+                for sql, count in repeated.items():
+                    _log(
+                        'n_plus_one',
+                        id=fingerprint_id(sql),
+                        fingerprint=sql,
+                        executions=count,
+                        method=stats.method,
+                        path=stats.path,
+                    )
+                if self.debug:
+                    headers = list(message.get('headers', []))
+                    headers += [
+                        (b'x-sql-count', str(stats.count).encode()),
+                        (b'x-sql-time-ms', f'{stats.time_ms:.3f}'.encode()),
+                        (b'server-timing', f'db;dur={stats.time_ms:.3f}'.encode()),
+                    ]
+                    if repeated:
+                        headers.append((
+                            b'x-sql-n-plus-one',
+                            str(len(repeated)).encode(),
+                        ))
+                    message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+
+from backend.services import metrics
+
+# Chave: (user_id, parâmetros da consulta normalizados)
+CacheKey = Tuple[int, str]
+
+_SLOT = struct.Struct('<Q')
+
+
+class LocalChannel:
+    """Versões de invalidação por usuário, só neste processo."""
+
+    def __init__(self):
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+
+class FileChannel:
+    """Versões de invalidação compartilhadas entre workers do mesmo host.
+
+    Uma tabela de `slots` contadores de 64 bits num arquivo mapeado em
+    memória (`directory/task-cache.versions`); o usuário cai no slot
+    `user_id % slots`. Ler a versão é um acesso à memória, sem syscall;
+    o incremento usa lockf para não perder atualizações concorrentes.
+    Colisões de slot só causam invalidações a mais.
+    """
+
+    def __init__(self, directory: str, slots: int = 65536):
+        import fcntl
+
+        self._lockf = fcntl.lockf
+        self._lock_ex = fcntl.LOCK_EX
+        self._unlock = fcntl.LOCK_UN
+        self.slots = slots
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path / 'task-cache.versions'
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        size = slots * _SLOT.size
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+    def _offset(self, user_id: int) -> int:
+        return (user_id % self.slots) * _SLOT.size
+
+    def version(self, user_id: int) -> int:
+        return _SLOT.unpack_from(self._map, self._offset(user_id))[0]
+
+    def invalidate(self, user_id: int) -> None:
+        offset = self._offset(user_id)
+        self._lockf(self._fd, self._lock_ex, _SLOT.size, offset)
+        try:
+            current = _SLOT.unpack_from(self._map, offset)[0]
+            _SLOT.pack_into(self._map, offset, current + 1)
+        finally:
+            self._lockf(self._fd, self._unlock, _SLOT.size, offset)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+class TaskListCache:
+    """Respostas serializadas de list_tasks por usuário e parâmetros.
+
+    LRU com até `max_entries` entradas, cada uma válida por `ttl` segundos
+    e enquanto a versão do usuário no `channel` não mudar. Escritas chamam
+    `invalidate(user_id)` depois do commit. Quem vai consultar o banco pega
+    `version()` antes e passa para `put`: se uma escrita invalidar no meio
+    do caminho, a resposta antiga não entra no cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 10_000,
+        ttl: float = 30.0,
+        max_entry_bytes: int = 1024 * 1024,
+        channel=None,
+        clock=time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.channel = channel if channel is not None else LocalChannel()
+        self.clock = clock
+        # chave -> (corpo, expira em, versão do usuário no preenchimento)
+        self._entries: OrderedDict[CacheKey, Tuple[bytes, float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self, user_id: int) -> int:
+        return self.channel.version(user_id)
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                result = 'miss'
+            elif entry[1] <= self.clock() or entry[2] != self.version(key[0]):
+                del self._entries[key]
+                result = 'stale'
+            else:
+                self._entries.move_to_end(key)
+                result = 'hit'
+            size = len(self._entries)
+        metrics.task_cache_requests.labels(result).inc()
+        metrics.task_cache_entries.set(size)
+        return entry[0] if result == 'hit' else None
+
+    def put(self, key: CacheKey, body: bytes, version: int) -> bool:
+        if len(body) > self.max_entry_bytes or version != self.version(key[0]):
+            return False
+        with self._lock:
+            self._entries[key] = (body, self.clock() + self.ttl, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            size = len(self._entries)
+        metrics.task_cache_entries.set(size)
+        return True
+
+    def invalidate(self, user_id: int) -> None:
+        # O(1): as entradas do usuário (aqui e nos outros workers) ficam com
+        # versão velha e saem no próximo get ou pela LRU
+        self.channel.invalidate(user_id)
+        metrics.task_cache_invalidations.inc()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        metrics.task_cache_entries.set(0)
+
+
+def get_task_cache(request: Request) -> Optional[TaskListCache]:
+    """Cache da aplicação (None quando TASK_CACHE_ENABLED=false)."""
+    return getattr(request.app.state, 'task_cache', None)
+
+
+def create_task_cache(settings) -> Optional[TaskListCache]:
+    # Sem canal compartilhado a invalidação não sai do processo e os outros
+    # workers (e o de jobs) serviriam a lista antiga: sem cache
+    if not settings.TASK_CACHE_ENABLED or not settings.TASK_CACHE_CHANNEL_DIR:
+        return None
+    return TaskListCache(
+        max_entries=settings.TASK_CACHE_MAX_ENTRIES,
+        ttl=settings.TASK_CACHE_TTL_SECONDS,
+        max_entry_bytes=settings.TASK_CACHE_MAX_ENTRY_BYTES,
+        channel=FileChannel(settings.TASK_CACHE_CHANNEL_DIR),
+    )
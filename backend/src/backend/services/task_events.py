@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import atexit
+import enum
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import Engine, insert
+
+from backend.models.database import get_engine
+from backend.models.events import TaskEvent
+from backend.services import metrics
+
+logger = logging.getLogger('backend.task_events')
+
+_STOP = object()
+
+
+def _plain(value: Any) -> Any:
+    """Valor de campo de tarefa em forma JSON (enum pelo valor, data ISO)."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def diff(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """campo -> [antes, depois] dos campos que mudaram."""
+    changes = {}
+    for field in before.keys() | after.keys():
+        old, new = _plain(before.get(field)), _plain(after.get(field))
+        if old != new:
+            changes[field] = [old, new]
+    return changes
+
+
+class EventLog:
+    """Log append-only de eventos de tarefas com gravação em lote.
+
+    `emit` só enfileira (fila limitada a `max_queue`); uma thread grava
+    lotes de até `batch_size` eventos num INSERT, esperando até
+    `flush_interval` segundos para juntar o lote. O que não pode ir para o
+    banco (fila cheia, falha do INSERT, encerramento sem banco) vai para um
+    arquivo JSONL por processo em `spool_dir`, reaplicado quando a thread
+    de algum worker inicia. `close()` (lifespan e atexit) grava o que
+    restou na fila antes de sair.
+    """
+
+    def __init__(
+        self,
+        engine: Callable[[], Engine],
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        spool_dir: Optional[str] = None,
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_dir = Path(spool_dir) if spool_dir else None
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._spool_lock = threading.Lock()
+        self._atexit = False
+
+    # -------------------- produção -------------------- #
+    def emit(
+        self,
+        task_id: int,
+        user_id: int,
+        action: str,
+        changes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        event = {
+            'task_id': task_id,
+            'user_id': user_id,
+            'action': action,
+            'changes': changes or None,
+            'occurred_at': datetime.now(timezone.utc).replace(tzinfo=None),
+        }
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Sem bloquear a requisição e sem crescer a memória
+            self._spool([event])
+        metrics.task_events_queue.set(self._queue.qsize())
+
+    def _ensure_started(self) -> None:
+        # Thread criada no primeiro uso, já dentro do worker
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name='task-events', daemon=True
+                    )
+                    self._thread.start()
+                    if not self._atexit:
+                        atexit.register(self.close)
+                        self._atexit = True
+
+    # -------------------- gravação -------------------- #
+    def _run(self) -> None:
+        self.replay_spool()
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            metrics.task_events_queue.set(self._queue.qsize())
+            if stop:
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        try:
+            with self.engine().begin() as connection:
+                connection.execute(insert(TaskEvent), batch)
+        except Exception:
+            logger.exception('falha ao gravar %d eventos de tarefa', len(batch))
+            self._spool(batch)
+            return False
+        metrics.task_events_written.inc(len(batch))
+        return True
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        pending = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return pending
+            if item is not _STOP:
+                pending.append(item)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Para a thread e grava tudo o que ainda está na fila."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+        # O que chegou depois do _STOP (ou sobrou de um join que expirou)
+        pending = self._drain()
+        for start in range(0, len(pending), self.batch_size):
+            self._write(pending[start : start + self.batch_size])
+
+    # -------------------- spool -------------------- #
+    def _spool_path(self) -> Optional[Path]:
+        if self.spool_dir is None:
+            return None
+        return self.spool_dir / f'task-events-{os.getpid()}.jsonl'
+
+    def _spool(self, events: List[Dict[str, Any]]) -> None:
+        path = self._spool_path()
+        if path is None:
+            logger.error('%d eventos de tarefa descartados (sem spool)', len(events))
+            metrics.task_events_dropped.inc(len(events))
+            return
+        lines = ''.join(
+            json.dumps({**event, 'occurred_at': event['occurred_at'].isoformat()})
+            + '\n'
+            for event in events
+        )
+        with self._spool_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write(lines)
+                file.flush()
+                os.fsync(file.fileno())
+        metrics.task_events_spooled.inc(len(events))
+
+    def replay_spool(self) -> int:
+        """Grava no banco os eventos que ficaram em arquivos de spool.
+
+        Cada arquivo é renomeado antes (só um worker o pega); se a gravação
+        falhar, os eventos voltam para o spool deste processo. Entrega pelo
+        menos uma vez: um crash no meio da reaplicação deixa o arquivo
+        `replaying-*` para conferência manual.
+        """
+        if self.spool_dir is None or not self.spool_dir.is_dir():
+            return 0
+        replayed = 0
+        for path in sorted(self.spool_dir.glob('task-events-*.jsonl')):
+            claimed = path.with_name(f'replaying-{os.getpid()}-{path.name}')
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue  # outro worker pegou
+            with open(claimed, encoding='utf-8') as file:
+                events = [json.loads(line) for line in file if line.strip()]
+            for event in events:
+                event['occurred_at'] = datetime.fromisoformat(event['occurred_at'])
+            for start in range(0, len(events), self.batch_size):
+                if self._write(events[start : start + self.batch_size]):
+                    replayed += len(events[start : start + self.batch_size])
+            claimed.unlink()
+        return replayed
+
+
+def get_event_log(request: Request) -> Optional[EventLog]:
+    """Log da aplicação (None quando TASK_EVENTS_ENABLED=false)."""
+    return getattr(request.app.state, 'task_events', None)
+
+
+def create_event_log(settings) -> Optional[EventLog]:
+    if not settings.TASK_EVENTS_ENABLED:
+        return None
+    return EventLog(
+        get_engine,
+        max_queue=settings.TASK_EVENTS_MAX_QUEUE,
+        batch_size=settings.TASK_EVENTS_BATCH_SIZE,
+        flush_interval=settings.TASK_EVENTS_FLUSH_INTERVAL,
+        spool_dir=settings.TASK_EVENTS_SPOOL_DIR,
+    )
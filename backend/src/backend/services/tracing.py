@@ -0,0 +1,470 @@
+from __future__ import annotations
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger('backend.tracing')
+
+HEADER = 'traceparent'
+# Resposta: nome do W3C Trace Context nível 2 para devolver o contexto
+RESPONSE_HEADER = 'traceresponse'
+
+_TRACEPARENT = re.compile(
+    r'^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-.*)?$'
+)
+# Texto de SQL guardado por span
+MAX_STATEMENT = 2000
+
+# SpanKind do OTLP
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_ERROR = 2
+
+
+def parse_traceparent(value: str) -> Optional[Tuple[str, str, bool]]:
+    """(trace_id, parent_id, sampled) de um `traceparent`, ou None se inválido."""
+    match = _TRACEPARENT.match(value.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, parent_id, flags, rest = match.groups()
+    if version == 'ff' or (version == '00' and rest):
+        return None
+    if trace_id == '0' * 32 or parent_id == '0' * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 0x01)
+
+
+class Trace:
+    """Spans terminados de uma requisição, na ordem em que terminaram."""
+
+    def __init__(self, trace_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans: List[Span] = []
+        # Serialização da resposta: aberta quando o endpoint retorna e
+        # fechada pelo middleware no http.response.start
+        self.pending: Optional[Span] = None
+
+    def end_pending(self) -> None:
+        if self.pending is not None:
+            self.pending.end()
+            self.pending = None
+
+
+class Span:
+    __slots__ = (
+        'trace',
+        'span_id',
+        'parent_id',
+        'name',
+        'kind',
+        'attributes',
+        'start_ns',
+        'end_ns',
+        'error',
+    )
+
+    def __init__(
+        self,
+        trace: Trace,
+        name: str,
+        parent_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: int = KIND_INTERNAL,
+    ):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, exc: BaseException) -> None:
+        self.error = f'{type(exc).__name__}: {exc}'
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.trace.spans.append(self)
+
+    def traceparent(self) -> str:
+        flags = '01' if self.trace.sampled else '00'
+        return f'00-{self.trace.trace_id}-{self.span_id}-{flags}'
+
+    def to_otlp(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or self.start_ns),
+            'attributes': [
+                {'key': key, 'value': _otlp_value(value)}
+                for key, value in self.attributes.items()
+                if value is not None
+            ],
+            'status': {},
+        }
+        if self.parent_id:
+            data['parentSpanId'] = self.parent_id
+        if self.error:
+            data['status'] = {'code': STATUS_ERROR, 'message': self.error}
+        return data
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def otlp_payload(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """Corpo de um ExportTraceServiceRequest (OTLP/HTTP com JSON)."""
+    return {
+        'resourceSpans': [
+            {
+                'resource': {
+                    'attributes': [
+                        {'key': 'service.name', 'value': {'stringValue': service_name}}
+                    ]
+                },
+                'scopeSpans': [
+                    {
+                        'scope': {'name': 'backend.tracing'},
+                        'spans': [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+_current: ContextVar[Optional[Span]] = ContextVar('trace_span', default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_traceparent() -> Optional[str]:
+    """`traceparent` para propagar a chamadas de saída, se houver trace ativo."""
+    span = _current.get()
+    return span.traceparent() if span is not None else None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Span filho do atual; sem trace amostrado ativo, não faz nada."""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.record_error(exc)
+        raise
+    finally:
+        _current.reset(token)
+        child.end()
+
+
+# -------------------- SQL -------------------- #
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    parent = _current.get()
+    if parent is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else ''
+    context._trace_span = Span(
+        parent.trace,
+        f'sql {operation}'.strip(),
+        parent.span_id,
+        {
+            'db.system': conn.dialect.name,
+            'db.statement': statement[:MAX_STATEMENT],
+            'db.executemany': many or None,
+        },
+        kind=KIND_CLIENT,
+    )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    current = getattr(context, '_trace_span', None)
+    if current is not None:
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            current.set('db.rowcount', cursor.rowcount)
+        current.end()
+        context._trace_span = None
+
+
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    current = getattr(context, '_trace_span', None)
+    if current is not None:
+        current.record_error(exception_context.original_exception)
+        current.end()
+        context._trace_span = None
+
+
+_installed = False
+
+
+def install() -> None:
+    """Um span por comando SQL em todos os engines do processo (uma vez)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(Engine, 'handle_error', _handle_error)
+    _installed = True
+
+
+# -------------------- Endpoints -------------------- #
+def traced_endpoint(endpoint):
+    """Envolve o endpoint num span e abre o de serialização ao retornar.
+
+    O wrapper mantém nome e assinatura (functools.wraps), então o FastAPI
+    resolve dependências e response_model como no endpoint original.
+    """
+    if getattr(endpoint, '_traced', False):
+        return endpoint
+    name = f'handler {endpoint.__name__}'
+
+    def begin_serialize() -> None:
+        parent = _current.get()
+        if parent is not None:
+            parent.trace.pending = Span(
+                parent.trace, 'response.serialize', parent.span_id
+            )
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                result = await endpoint(*args, **kwargs)
+            begin_serialize()
+            return result
+
+    else:
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                result = endpoint(*args, **kwargs)
+            begin_serialize()
+            return result
+
+    wrapper._traced = True
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    """route_class dos routers: cada endpoint ganha span e serialização."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, traced_endpoint(endpoint), **kwargs)
+
+
+# -------------------- Exportação -------------------- #
+class Exporter:
+    """Exporta traces em lote numa thread, fora do caminho da requisição.
+
+    Cada lote vira um ExportTraceServiceRequest em JSON: uma linha em
+    `path` (JSONL, lido por qualquer ferramenta que entenda OTLP/JSON) e/ou
+    um POST em `endpoint` (ex.: http://localhost:4318/v1/traces de um
+    OpenTelemetry Collector). Com a fila cheia, traces são descartados.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        service_name: str = 'backend',
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 256,
+        interval: float = 1.0,
+        timeout: float = 5.0,
+    ):
+        self.path = Path(path) if path else None
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.interval = interval
+        self.timeout = timeout
+        self.dropped = 0
+        self._queue: queue.Queue[List[Span]] = queue.Queue(maxsize=max_queue)
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._pid: Optional[int] = None
+
+    def export(self, spans: List[Span]) -> None:
+        self._ensure_started()
+        with self._idle:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+            self._done(1)
+
+    def _done(self, count: int) -> None:
+        with self._idle:
+            self._pending -= count
+            self._idle.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Espera a fila esvaziar; False se `timeout` estourar antes."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def _ensure_started(self) -> None:
+        # Uma thread por processo, criada depois do fork do servidor
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        self._pid = pid
+        threading.Thread(target=self._loop, name='tracing-export', daemon=True).start()
+        atexit.register(self.flush)
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.write([span for spans in batch for span in spans])
+            except Exception:
+                logger.exception('falha ao exportar %d traces', len(batch))
+            finally:
+                self._done(len(batch))
+
+    def write(self, spans: List[Span]) -> None:
+        body = json.dumps(otlp_payload(spans, self.service_name), ensure_ascii=False)
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open('a', encoding='utf-8') as fh:
+                fh.write(body + '\n')
+        if self.endpoint:
+            request = urllib.request.Request(
+                self.endpoint,
+                data=body.encode('utf-8'),
+                headers={'Content-Type': 'application/json'},
+                method='POST',
+            )
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+
+
+# -------------------- Middleware -------------------- #
+class TracingMiddleware:
+    """Abre o span raiz da requisição e exporta o trace ao final.
+
+    Um `traceparent` válido na requisição define trace, pai e a decisão de
+    amostragem (quem chamou já decidiu); sem ele, a requisição é amostrada
+    com probabilidade `sample_rate`. A resposta sempre leva
+    `traceresponse` com o trace e o id do span raiz, para correlacionar
+    logs mesmo quando o trace não foi exportado.
+    """
+
+    def __init__(self, app, *, exporter: Exporter, sample_rate: float = 0.0):
+        self.app = app
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def _context(self, scope) -> Tuple[str, Optional[str], bool]:
+        for name, value in scope['headers']:
+            if name == HEADER.encode():
+                incoming = parse_traceparent(value.decode('latin-1'))
+                if incoming is not None:
+                    return incoming
+                break
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        return secrets.token_hex(16), None, sampled
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_id, sampled = self._context(scope)
+        trace = Trace(trace_id, sampled)
+        method = scope['method']
+        root = Span(
+            trace,
+            f'{method} {scope["path"]}',
+            parent_id,
+            {'http.method': method, 'http.target': scope['path']},
+            kind=KIND_SERVER,
+        )
+        token = _current.set(root) if sampled else None
+
+        async def send_traced(message):
+            if message['type'] == 'http.response.start':
+                trace.end_pending()
+                root.set('http.status_code', message['status'])
+                message = {
+                    **message,
+                    'headers': [
+                        *message.get('headers', []),
+                        (RESPONSE_HEADER.encode(), root.traceparent().encode()),
+                    ],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_traced)
+        except BaseException as exc:
+            root.record_error(exc)
+            raise
+        finally:
+            if token is not None:
+                _current.reset(token)
+            route = getattr(scope.get('route'), 'path', None)
+            if route:
+                root.name = f'{method} {route}'
+                root.set('http.route', route)
+            trace.end_pending()
+            root.end()
+            if sampled:
+                self.exporter.export(trace.spans)
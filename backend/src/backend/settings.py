@@ -1,14 +1,206 @@
+from functools import lru_cache
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+# Recursos que as rotas async não implementam (ver DATABASE_ASYNC)
+ASYNC_UNSUPPORTED = (
+    'DATABASE_REPLICA_URLS',
+    'DATABASE_SHARD_URLS',
+    'TASK_CACHE_ENABLED',
+    'GROUP_COMMIT_ENABLED',
+    'TASK_EVENTS_ENABLED',
+)
+# Destas, as ligadas por padrão: com DATABASE_ASYNC ficam desligadas, a não
+# ser que venham explícitas (e aí o validador recusa)
+ASYNC_OFF_BY_DEFAULT = ('TASK_EVENTS_ENABLED',)
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file='./src/backend/.env', env_file_encoding='utf-8'
     )
 
     DATABASE_URL: str
+    # Rotas async com AsyncSession (aiosqlite/asyncpg) em vez do Session
+    # síncrono. Só um subconjunto da API: auth, CRUD de tarefas (JSON),
+    # health e métricas. Bootstrap, jobs, lote, histórico, ordem manual,
+    # dependências e MessagePack existem só no modo síncrono, e as opções
+    # de ASYNC_UNSUPPORTED são recusadas junto com ele (o histórico, ligado
+    # por padrão, desliga sozinho)
+    DATABASE_ASYNC: bool = False
+    # Opcional: por padrão derivada de DATABASE_URL trocando o driver
+    DATABASE_ASYNC_URL: str | None = None
+    # Pool de conexões (ignorado para SQLite em memória)
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+    # Réplicas de leitura: rotas somente leitura vão para elas, com aderência
+    # ao primário depois de escrever e descarte de réplicas atrasadas
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_STICKY_SECONDS: float = 5.0
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 10.0
+    DATABASE_REPLICA_LAG_CHECK_INTERVAL: float = 5.0
+
+    # Sharding das tarefas por user_id: nome -> URL de cada shard. Usuários,
+    # o diretório de exceções (shard_directory) e a alocação de ids ficam em
+    # DATABASE_URL. Vazio = tarefas no banco principal, como sempre. Só no
+    # modo síncrono: as rotas async leem e gravam tudo em DATABASE_URL
+    DATABASE_SHARD_URLS: dict[str, str] = {}
+    DATABASE_SHARD_VNODES: int = 64
+    # Por quanto tempo cada worker confia na sua leitura do diretório
+    DATABASE_SHARD_DIRECTORY_TTL: float = 2.0
+
+    # Perfil de produção para SQLite em arquivo: WAL + PRAGMAs, um writer
+    # dedicado e um pool separado de conexões de leitura
+    SQLITE_TUNED: bool = False
+    SQLITE_SYNCHRONOUS: str = 'NORMAL'
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64 * 1024  # negativo = KiB (64 MiB)
+    SQLITE_TEMP_STORE: str = 'MEMORY'
+    SQLITE_READ_POOL_SIZE: int = 8
+
+    # Contagem de comandos SQL por requisição: com SQL_DEBUG a resposta leva
+    # os cabeçalhos X-SQL-*; consultas lentas e N+1 vão para o log
+    SQL_DEBUG: bool = False
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_N_PLUS_ONE_THRESHOLD: int = 3
+
+    # Métricas Prometheus em /metrics. Com vários workers, aponte
+    # METRICS_MULTIPROC_DIR para um diretório compartilhado (e limpo a cada
+    # deploy): cada processo grava ali seu snapshot e /metrics soma todos
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: str | None = None
+    METRICS_FLUSH_INTERVAL: float = 5.0
+
+    # Profiling sob demanda: requisições com `X-Profile: <PROFILING_TOKEN>`
+    # ou sorteadas por PROFILING_SAMPLE_RATE rodam sob o cProfile. Sem token
+    # e com taxa 0 o middleware nem é instalado
+    PROFILING_TOKEN: str | None = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str = './profiles'
+
+    # Tracing por fase (auth, busca do usuário, SQL, serialização) com
+    # propagação W3C `traceparent`. Os traces amostrados vão em OTLP/JSON
+    # para TRACING_EXPORT_PATH (JSONL) e/ou TRACING_OTLP_ENDPOINT
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 0.01
+    TRACING_EXPORT_PATH: str | None = './traces/spans.jsonl'
+    TRACING_OTLP_ENDPOINT: str | None = None
+    TRACING_SERVICE_NAME: str = 'backend'
+
+    # Cache da resposta serializada de list_tasks por usuário e parâmetros,
+    # invalidado pelas escritas depois do commit. As invalidações passam
+    # entre os workers do host por TASK_CACHE_CHANNEL_DIR (diretório local
+    # compartilhado por eles, e pelo worker de jobs); sem ele o cache fica
+    # desligado, já que cada worker serviria a lista antiga por até o TTL.
+    # Por isso vem desligado: ligar é escolher também o diretório
+    TASK_CACHE_ENABLED: bool = False
+    TASK_CACHE_TTL_SECONDS: float = 30.0
+    TASK_CACHE_MAX_ENTRIES: int = 10_000
+    TASK_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+    TASK_CACHE_CHANNEL_DIR: str | None = None
+
+    # Group commit: criação de tarefas e troca de status de requisições
+    # concorrentes esperam até GROUP_COMMIT_WINDOW_MS e entram juntas numa
+    # transação (um fsync para o lote). Vale a pena quando o commit domina a
+    # latência (SQLite, disco lento); com pouca concorrência só soma a janela
+    GROUP_COMMIT_ENABLED: bool = False
+    GROUP_COMMIT_WINDOW_MS: float = 2.0
+    GROUP_COMMIT_MAX_BATCH: int = 64
+
+    # Histórico append-only das mudanças em tarefas (task_events). As rotas
+    # só enfileiram; uma thread por worker grava em lotes. Fila cheia ou
+    # banco fora do ar desviam para arquivos em TASK_EVENTS_SPOOL_DIR,
+    # reaplicados no próximo início
+    TASK_EVENTS_ENABLED: bool = True
+    TASK_EVENTS_MAX_QUEUE: int = 10_000
+    TASK_EVENTS_BATCH_SIZE: int = 500
+    TASK_EVENTS_FLUSH_INTERVAL: float = 1.0
+    TASK_EVENTS_SPOOL_DIR: str | None = './spool'
+
+    # Fila de jobs (tabela jobs) para operações demoradas, executados por
+    # `python -m backend.worker`. O worker procura jobs a cada
+    # JOBS_POLL_INTERVAL; um job sem sinal de progresso por
+    # JOBS_LEASE_SECONDS volta para a fila (worker caiu). Falhas esperam
+    # JOBS_RETRY_BACKOFF_SECONDS * 2^(tentativa - 1) até JOBS_MAX_ATTEMPTS
+    JOBS_POLL_INTERVAL: float = 1.0
+    JOBS_LEASE_SECONDS: float = 300.0
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_RETRY_BACKOFF_SECONDS: float = 5.0
+    # Arquivos do export_tasks (JSON Lines), baixados em
+    # GET /api/jobs/{id}/download: o `result` do job guarda só o nome. Com
+    # o worker em outra máquina, aponte para um diretório compartilhado
+    JOBS_EXPORT_DIR: str = './exports'
+
+    # Ordem manual das tarefas (chaves fracionárias em tasks.rank). Mover
+    # muitas vezes para o mesmo vão alonga a chave; passando de
+    # TASK_RANK_MAX_LENGTH caracteres, um job `rebalance_ranks` reescreve
+    # as chaves do usuário
+    TASK_RANK_MAX_LENGTH: int = 32
+
+    # Diagnóstico de memória em /api/diagnostics (tracemalloc, caches, GC),
+    # só com `X-Admin-Token: <ADMIN_TOKEN>`. Sem token as rotas nem existem
+    ADMIN_TOKEN: str | None = None
+
+    # Reciclagem de workers: depois de WORKER_MAX_REQUESTS requisições (mais
+    # um sorteio de até WORKER_MAX_REQUESTS_JITTER, para os workers não
+    # reiniciarem juntos) o processo recebe SIGTERM e sai com graça; quem o
+    # supervisiona (uvicorn --workers, gunicorn, orquestrador) sobe outro.
+    # 0 desliga
+    WORKER_MAX_REQUESTS: int = 0
+    WORKER_MAX_REQUESTS_JITTER: int = 0
+
     JWT_ISSUER: str
     JWT_AUDIENCE: str
     JWT_ALGORITHM: str
-    JWT_SECRET: str
+    JWT_SECRET: str = ''
     JWT_TTL_MINUTES: int
+    # Teto de jtis revogados em memória. Cheio (descontados os expirados),
+    # todo token emitido até ali passa a ser recusado: os usuários entram de
+    # novo, mas nenhum token revogado volta a valer
+    JWT_REVOKED_MAX: int = 100_000
+
+    # Assinatura assimétrica (EdDSA/RS256): kid -> PEM ou caminho do arquivo .pem
+    JWT_PRIVATE_KEYS: dict[str, str] = {}
+    # Chaves públicas aposentadas, aceitas só na verificação
+    JWT_PUBLIC_KEYS: dict[str, str] = {}
+    JWT_SIGNING_KID: str | None = None
+    JWT_JWKS_MAX_AGE: int = 300
+
+    @model_validator(mode='after')
+    def _async_defaults(self) -> 'Settings':
+        if self.DATABASE_ASYNC:
+            for name in ASYNC_OFF_BY_DEFAULT:
+                if name not in self.model_fields_set:
+                    setattr(self, name, False)
+        return self
+
+    @model_validator(mode='after')
+    def _check_async_subset(self) -> 'Settings':
+        if self.DATABASE_ASYNC:
+            enabled = [name for name in ASYNC_UNSUPPORTED if getattr(self, name)]
+            if enabled:
+                names = ', '.join(enabled)
+                raise ValueError(
+                    f'DATABASE_ASYNC não suporta {names}: desligue essas opções'
+                    ' ou use o modo síncrono.'
+                )
+        return self
+
+    @model_validator(mode='after')
+    def _check_jwt_secret(self) -> 'Settings':
+        # Em HS* o segredo é a própria chave: vazio, qualquer um assina tokens
+        if self.JWT_ALGORITHM.upper().startswith('HS') and not self.JWT_SECRET:
+            raise ValueError('JWT_SECRET é obrigatório com JWT_ALGORITHM HS*.')
+        return self
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Instância única de Settings, lida do ambiente/.env no primeiro uso."""
+    return Settings()
@@ -0,0 +1,64 @@
+"""Worker da fila de jobs (tabela jobs).
+
+Uso (a partir de backend/, com as mesmas variáveis da aplicação):
+
+    python -m backend.worker            # até SIGTERM/SIGINT
+    python -m backend.worker --once     # esvazia a fila e sai
+
+SIGTERM ou Ctrl+C param a busca de jobs; o job em andamento termina antes
+de o processo sair. Com SQLite, rode um worker só.
+"""
+
+import argparse
+import logging
+import signal
+import threading
+from typing import List, Optional
+
+from backend.models.database import dispose_engine, get_engine
+from backend.services.jobs import Worker
+from backend.services.task_cache import create_task_cache
+from backend.services.task_events import create_event_log
+from backend.settings import get_settings
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--once', action='store_true', help='executa os jobs disponíveis e sai'
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO, format='%(asctime)s %(name)s %(levelname)s %(message)s'
+    )
+    settings = get_settings()
+    events = create_event_log(settings)
+    worker = Worker(
+        get_engine(settings),
+        poll_interval=settings.JOBS_POLL_INTERVAL,
+        lease=settings.JOBS_LEASE_SECONDS,
+        backoff=settings.JOBS_RETRY_BACKOFF_SECONDS,
+        events=events,
+        export_dir=settings.JOBS_EXPORT_DIR,
+        # Invalida o cache dos workers da API pelo TASK_CACHE_CHANNEL_DIR
+        cache=create_task_cache(settings),
+    )
+
+    try:
+        if args.once:
+            while worker.run_once():
+                pass
+        else:
+            stop = threading.Event()
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: stop.set())
+            worker.run(stop)
+    finally:
+        if events is not None:
+            events.close()
+        dispose_engine()
+
+
+if __name__ == '__main__':
+    main()
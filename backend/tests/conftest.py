@@ -4,12 +4,16 @@ from datetime import datetime
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from backend.app import app
-from backend.models.database import get_session
+from backend.app import app, create_app
+from backend.models.async_database import async_url, get_async_session
+from backend.models.database import get_read_session, get_session
 from backend.models.users import table_registry
+from backend.services.task_cache import create_task_cache
+from backend.settings import Settings
 
 
 @pytest.fixture
@@ -30,17 +34,50 @@ def session():
 
 
 @pytest.fixture
-def client(session):
+def client(session, tmp_path):
     def get_session_override():
         return session
 
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_read_session] = get_session_override
+        # Cache ligado, com o canal no diretório do teste. Um por teste: o
+        # app é global e os ids se repetem entre testes
+        app.state.task_cache = cache = create_task_cache(
+            Settings(TASK_CACHE_ENABLED=True, TASK_CACHE_CHANNEL_DIR=str(tmp_path))
+        )
+        # O log de eventos grava pelo engine global, fora da sessão de teste
+        # (tem testes próprios)
+        app.state.task_events = None
         yield client
 
+    cache.channel.close()
+    app.state.task_cache = None
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def async_client(tmp_path):
+    # Arquivo em disco: o schema é criado pelo engine síncrono e o app usa
+    # aiosqlite no event loop do TestClient.
+    url = f'sqlite:///{tmp_path / "async.db"}'
+    sync_engine = create_engine(url)
+    table_registry.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+    engine = create_async_engine(async_url(url), poolclass=NullPool)
+
+    async def get_async_session_override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    async_app = create_app(Settings(DATABASE_ASYNC=True))
+    async_app.dependency_overrides[get_async_session] = get_async_session_override
+
+    with TestClient(async_app) as client:
+        yield client
+
+
 @contextmanager
 def _mock_db_time(*, model, time=datetime(2025, 10, 1)):
     def fake_time_hook(mapper, connection, target):
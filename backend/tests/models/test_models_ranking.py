@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from backend.models.ranking import (
+    evenly_spaced,
+    key_between,
+    keys_between,
+    validate,
+)
+
+
+@pytest.mark.parametrize(
+    ('a', 'b', 'expected'),
+    [
+        (None, None, 'a0'),
+        (None, 'a0', 'Zz'),
+        ('a0', None, 'a1'),
+        ('a0', 'a1', 'a0V'),
+        ('a1', 'a2', 'a1V'),
+        ('az', None, 'b00'),
+        ('Zz', 'a0', 'ZzV'),
+        ('a0V', 'a1', 'a0l'),
+    ],
+)
+def test_key_between(a, b, expected):
+    assert key_between(a, b) == expected
+
+
+def test_random_insertions_keep_order_and_short_keys():
+    rng = random.Random(0)
+    keys = [key_between(None, None)]
+    for _ in range(2000):
+        i = rng.randint(0, len(keys))
+        before = keys[i - 1] if i > 0 else None
+        after = keys[i] if i < len(keys) else None
+        keys.insert(i, key_between(before, after))
+
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    assert max(len(key) for key in keys) <= 6
+
+
+def test_same_gap_grows_keys_until_rebalanced():
+    low, high = 'a0', 'a1'
+    for _ in range(60):
+        high = key_between(low, high)
+    assert len(high) > 10
+
+    keys = evenly_spaced(1000)
+    assert keys == sorted(keys)
+    assert max(len(key) for key in keys) == 3
+
+
+def test_keys_between_fits_inside_the_gap():
+    keys = keys_between('a0', 'a1', 5)
+
+    assert keys == sorted(keys)
+    assert all('a0' < key < 'a1' for key in keys)
+    assert keys_between(None, None, 0) == []
+
+
+@pytest.mark.parametrize('key', ['', 'a', 'a00', 'A' + '0' * 26, '!0'])
+def test_invalid_keys_are_rejected(key):
+    with pytest.raises(ValueError):
+        validate(key)
+
+
+def test_neighbors_out_of_order_are_rejected():
+    with pytest.raises(ValueError):
+        key_between('a1', 'a0')
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+
+from backend.models.replicas import ReplicaRouter, routing_key
+from backend.services.auth import Auth
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def engines(tmp_path):
+    primary = create_engine(f'sqlite:///{tmp_path / "p.db"}', pool_logging_name='p')
+    replicas = [
+        create_engine(f'sqlite:///{tmp_path / f"r{i}.db"}', pool_logging_name=f'r{i}')
+        for i in (1, 2)
+    ]
+    yield primary, replicas
+    for engine in (primary, *replicas):
+        engine.dispose()
+
+
+def test_reads_round_robin_across_replicas(engines):
+    primary, replicas = engines
+    router = ReplicaRouter(primary, replicas)
+
+    picked = [router.engine_for_read('user:1') for _ in range(4)]
+    assert picked == [replicas[0], replicas[1], replicas[0], replicas[1]]
+
+
+def test_without_replicas_reads_go_to_primary(engines):
+    primary, _ = engines
+    router = ReplicaRouter(primary, [])
+
+    router.pin('user:1')
+    assert router.engine_for_read('user:1') is primary
+
+
+def test_pin_sends_reads_to_primary_until_it_expires(engines):
+    primary, replicas = engines
+    clock = FakeClock()
+    router = ReplicaRouter(primary, replicas, sticky_seconds=5, clock=clock)
+
+    router.pin('user:1')
+    assert router.engine_for_read('user:1') is primary
+    assert router.engine_for_read('user:2') in replicas
+
+    clock.now += 5.1
+    assert router.engine_for_read('user:1') in replicas
+
+
+def test_lagging_or_broken_replicas_are_skipped(engines):
+    primary, replicas = engines
+    clock = FakeClock()
+    lags = {'r1': 30.0, 'r2': 0.5}
+
+    def probe(engine):
+        lag = lags[engine.pool._orig_logging_name]
+        if lag is None:
+            raise ConnectionError
+        return lag
+
+    router = ReplicaRouter(
+        primary, replicas, max_lag=10, check_interval=5, lag_probe=probe, clock=clock
+    )
+    assert {router.engine_for_read() for _ in range(4)} == {replicas[1]}
+
+    # Valores em cache até o próximo intervalo
+    lags.update({'r1': 0.0, 'r2': None})
+    assert router.engine_for_read() is replicas[1]
+
+    clock.now += 5
+    assert {router.engine_for_read() for _ in range(4)} == {replicas[0]}
+    assert router.status() == [
+        {'label': 'r1', 'lag_seconds': 0.0, 'healthy': True},
+        {'label': 'r2', 'lag_seconds': None, 'healthy': False},
+    ]
+
+    lags['r1'] = 99.0
+    clock.now += 5
+    assert router.engine_for_read() is primary
+
+
+def test_routing_key_uses_token_subject_or_client():
+    token = Auth().generate_token(subject=7)['access_token']
+    with_token = SimpleNamespace(
+        headers={'authorization': f'Bearer {token}'}, client=None
+    )
+    anonymous = SimpleNamespace(headers={}, client=SimpleNamespace(host='10.0.0.1'))
+
+    assert routing_key(with_token) == 'user:7'
+    assert routing_key(anonymous) == 'client:10.0.0.1'
@@ -0,0 +1,250 @@
+from collections import Counter
+
+import pytest
+from sqlalchemy import create_engine, event, func, insert, select
+
+from backend.models.sharding import (
+    HashRing,
+    IdAllocator,
+    ShardMoving,
+    ShardRouter,
+    create_shard_schema,
+    move_user,
+    pin_users,
+    seed_ids,
+)
+from backend.models.dependencies import TaskDependency
+from backend.models.users import Task, table_registry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def router(tmp_path):
+    main = create_engine(f'sqlite:///{tmp_path / "main.db"}')
+    table_registry.metadata.create_all(main)
+    shards = {
+        name: create_engine(f'sqlite:///{tmp_path / f"{name}.db"}')
+        for name in ('a', 'b')
+    }
+    for engine in shards.values():
+        create_shard_schema(engine)
+    router = ShardRouter(shards, main, ttl=5, id_block_size=10, clock=FakeClock())
+    yield router
+    router.dispose()
+    main.dispose()
+
+
+def _add_tasks(router, user_id, count):
+    engine = router.engine_for(user_id, write=True)
+    with engine.begin() as connection:
+        for _ in range(count):
+            connection.execute(
+                insert(Task).values(
+                    id=router.ids.next_id(),
+                    title='t',
+                    user_id=user_id,
+                    status='PENDENTE',
+                    priority='MEDIA',
+                )
+            )
+
+
+def _count(engine, user_id):
+    with engine.connect() as connection:
+        return connection.execute(
+            select(func.count()).select_from(Task).where(Task.user_id == user_id)
+        ).scalar_one()
+
+
+def test_ring_spreads_users_and_is_stable_when_growing():
+    before = HashRing(['a', 'b', 'c'])
+    after = HashRing(['a', 'b', 'c', 'd'])
+    users = range(1, 3001)
+
+    spread = Counter(before.lookup(user_id) for user_id in users)
+    assert set(spread) == {'a', 'b', 'c'}
+    assert min(spread.values()) > 600
+
+    moved = [u for u in users if before.lookup(u) != after.lookup(u)]
+    # Só quem vai para o shard novo muda de lugar (~1/4)
+    assert all(after.lookup(u) == 'd' for u in moved)
+    assert 0.1 < len(moved) / len(users) < 0.4
+
+
+def test_directory_overrides_ring_after_ttl(router):
+    user_id = 7
+    ring_owner = router.ring.lookup(user_id)
+    other = 'b' if ring_owner == 'a' else 'a'
+    assert router.placement(user_id).shard == ring_owner
+
+    with router.directory.begin() as connection:
+        connection.exec_driver_sql(
+            'INSERT INTO shard_directory (user_id, shard) VALUES (?, ?)',
+            (user_id, other),
+        )
+    # Ainda dentro do TTL: leitura guardada
+    assert router.placement(user_id).shard == ring_owner
+    router._clock.now += 6
+    assert router.placement(user_id).shard == other
+
+
+def test_id_allocator_reserves_blocks(router):
+    seed_ids(router.directory, 'tasks', 41)
+    allocator = IdAllocator(router.directory, 'tasks', block=10)
+    other = IdAllocator(router.directory, 'tasks', block=10)
+
+    first = [allocator.next_id() for _ in range(3)]
+    assert first == [42, 43, 44]
+    # Outro processo recebe o bloco seguinte
+    assert other.next_id() == 52
+    assert [allocator.next_id() for _ in range(8)][-1] == 62
+
+
+def test_move_user_copies_and_flips(router):
+    user_id = 3
+    source = router.ring.lookup(user_id)
+    target = 'b' if source == 'a' else 'a'
+    _add_tasks(router, user_id, 25)
+    with router.shards[source].connect() as connection:
+        ids = set(connection.execute(select(Task.id)).scalars())
+
+    steps = []
+
+    def sleep(_):
+        # Durante a migração as escritas ficam bloqueadas
+        steps.append(router.placement(user_id, fresh=True))
+        if len(steps) == 1:
+            with pytest.raises(ShardMoving):
+                router.engine_for(user_id, write=True)
+
+    result = move_user(router, user_id, target, batch_size=10, sleep=sleep)
+
+    assert result['moved'] == 25
+    assert steps[0].moving_to == target
+    assert steps[1].shard == target and steps[1].moving_to is None
+    assert router.engine_for(user_id, write=True) is router.shards[target]
+    assert _count(router.shards[source], user_id) == 0
+    with router.shards[target].connect() as connection:
+        assert set(connection.execute(select(Task.id)).scalars()) == ids
+
+
+def test_move_user_takes_dependencies_along(router):
+    user_id = 3
+    source = router.ring.lookup(user_id)
+    target = 'b' if source == 'a' else 'a'
+    _add_tasks(router, user_id, 3)
+    with router.shards[source].begin() as connection:
+        a, b, c = connection.execute(select(Task.id).order_by(Task.id)).scalars()
+        connection.execute(
+            insert(TaskDependency),
+            [
+                {'task_id': b, 'blocker_id': a, 'user_id': user_id},
+                {'task_id': c, 'blocker_id': b, 'user_id': user_id},
+            ],
+        )
+
+    result = move_user(router, user_id, target, batch_size=1, sleep=lambda _: None)
+
+    assert result['dependencies'] == 2
+    with router.shards[target].connect() as connection:
+        edges = connection.execute(
+            select(TaskDependency.blocker_id, TaskDependency.task_id)
+        ).all()
+    assert sorted(edges) == [(a, b), (b, c)]
+    with router.shards[source].connect() as connection:
+        assert connection.execute(select(TaskDependency)).all() == []
+
+
+def test_move_back_to_ring_owner_drops_directory_entry(router):
+    user_id = 3
+    owner = router.ring.lookup(user_id)
+    other = 'b' if owner == 'a' else 'a'
+    pin_users(router, {user_id: other})
+    _add_tasks(router, user_id, 2)
+
+    move_user(router, user_id, owner, sleep=lambda _: None)
+
+    with router.directory.connect() as connection:
+        rows = connection.exec_driver_sql('SELECT * FROM shard_directory').all()
+    assert rows == []
+    assert _count(router.shards[owner], user_id) == 2
+
+
+def test_failed_move_releases_writes(router):
+    user_id = 3
+    source = router.ring.lookup(user_id)
+    target = 'b' if source == 'a' else 'a'
+    _add_tasks(router, user_id, 1)
+    router.shards[target].dispose()
+    with router.shards[target].begin() as connection:
+        connection.exec_driver_sql('DROP TABLE tasks')
+
+    with pytest.raises(Exception):
+        move_user(router, user_id, target, sleep=lambda _: None)
+
+    placement = router.placement(user_id, fresh=True)
+    assert placement.shard == source and placement.moving_to is None
+    assert _count(router.shards[source], user_id) == 1
+
+
+def _late_write(router, shard, user_id):
+    """Um writer que resolveu a origem antes da marca e só agora grava."""
+    with router.shards[shard].begin() as connection:
+        connection.execute(
+            insert(Task).values(
+                id=router.ids.next_id(),
+                title='tardia',
+                user_id=user_id,
+                status='PENDENTE',
+                priority='MEDIA',
+            )
+        )
+
+
+def test_move_user_recopies_after_a_late_write(router):
+    user_id = 3
+    source = router.ring.lookup(user_id)
+    target = 'b' if source == 'a' else 'a'
+    _add_tasks(router, user_id, 2)
+    copies = []
+
+    @event.listens_for(router.shards[target], 'commit')
+    def _copied(connection):
+        copies.append(connection)
+        if len(copies) == 1:
+            _late_write(router, source, user_id)
+
+    result = move_user(router, user_id, target, sleep=lambda _: None)
+
+    assert len(copies) == 2
+    assert result['moved'] == 3
+    assert _count(router.shards[target], user_id) == 3
+    assert _count(router.shards[source], user_id) == 0
+
+
+def test_move_user_keeps_source_after_a_write_past_the_flip(router):
+    user_id = 3
+    source = router.ring.lookup(user_id)
+    target = 'b' if source == 'a' else 'a'
+    _add_tasks(router, user_id, 2)
+    calls = []
+
+    def sleep(seconds):
+        calls.append(seconds)
+        if len(calls) == 2:
+            _late_write(router, source, user_id)
+
+    with pytest.raises(RuntimeError, match='Escrita tardia'):
+        move_user(router, user_id, target, sleep=sleep)
+
+    # Nada se perde: a origem fica inteira para conferência
+    assert _count(router.shards[source], user_id) == 3
+    assert _count(router.shards[target], user_id) == 2
+    assert router.placement(user_id, fresh=True).shard == target
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import exc, insert, select, text
+from sqlalchemy.orm import Session
+
+from backend.models.database import (
+    create_primary_engine,
+    create_read_engine,
+    pool_capacity,
+)
+from backend.models.users import Task, User, table_registry
+from backend.settings import get_settings
+
+
+@pytest.fixture
+def tuned_settings(tmp_path):
+    return get_settings().model_copy(
+        update={
+            'DATABASE_URL': f'sqlite:///{tmp_path / "tuned.db"}',
+            'SQLITE_TUNED': True,
+            'SQLITE_READ_POOL_SIZE': 2,
+        }
+    )
+
+
+@pytest.fixture
+def engines(tuned_settings):
+    writer = create_primary_engine(tuned_settings)
+    reader = create_read_engine(tuned_settings)
+    table_registry.metadata.create_all(writer)
+    yield writer, reader
+    reader.dispose()
+    writer.dispose()
+
+
+def _pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+
+
+def test_tuning_pragmas_are_applied(engines):
+    writer, reader = engines
+
+    for engine in (writer, reader):
+        assert _pragma(engine, 'journal_mode') == 'wal'
+        assert _pragma(engine, 'synchronous') == 1  # NORMAL
+        assert _pragma(engine, 'busy_timeout') == 5000
+        assert _pragma(engine, 'temp_store') == 2  # MEMORY
+        assert _pragma(engine, 'cache_size') == -64 * 1024
+
+    assert _pragma(reader, 'query_only') == 1
+    assert _pragma(writer, 'query_only') == 0
+
+
+def test_writer_is_a_single_connection(engines, tuned_settings):
+    writer, reader = engines
+
+    assert writer.pool.size() == 1
+    assert writer.pool._max_overflow == 0
+    assert reader.pool.size() == 2
+    assert pool_capacity(tuned_settings) == 1
+
+
+def test_reader_refuses_writes(engines):
+    _, reader = engines
+
+    with pytest.raises(exc.OperationalError):
+        with reader.begin() as connection:
+            connection.execute(
+                insert(User).values(
+                    name='x', email='x@example.com', hashed_password='h'
+                )
+            )
+
+
+def test_concurrent_writes_queue_on_writer_instead_of_locking(engines):
+    writer, reader = engines
+    with Session(writer) as session:
+        user = User(name='Ada', email='ada@example.com', hashed_password='h')
+        session.add(user)
+        session.commit()
+        user_id = user.id
+
+    def write(i):
+        with Session(writer) as session:
+            session.add(Task(title=f'T{i}', user_id=user_id))
+            session.commit()
+
+    def read(_):
+        with Session(reader) as session:
+            return len(session.scalars(select(Task)).all())
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(40)))
+        list(pool.map(read, range(40)))
+
+    with reader.connect() as connection:
+        assert connection.execute(text('SELECT count(*) FROM tasks')).scalar() == 40
+
+
+def test_without_tuning_reads_share_the_primary(tmp_path):
+    settings = get_settings().model_copy(
+        update={'DATABASE_URL': f'sqlite:///{tmp_path / "plain.db"}'}
+    )
+    assert create_read_engine(settings) is None
+
+    engine = create_primary_engine(settings)
+    assert _pragma(engine, 'journal_mode') == 'delete'
+    engine.dispose()
@@ -41,6 +41,9 @@ def test_create_task_defaults(session, mock_db_time):
         'status': TaskStatus.PENDENTE,
         'priority': TaskPriority.MEDIA,
         'due_date': None,
+        # Primeira tarefa do usuário
+        'rank': 'a0',
+        'topo_order': None,
         'created_at': mocked_time,
         'updated_at': mocked_time,
         'user_id': user.id,
@@ -77,6 +80,8 @@ def test_create_task_full_fields(session, mock_db_time):
             'status': TaskStatus.CONCLUIDA,
             'priority': TaskPriority.ALTA,
             'due_date': venc,
+            'rank': 'a0',
+            'topo_order': None,
             'created_at': mocked_time,
             'updated_at': mocked_time,
             'user_id': user.id,
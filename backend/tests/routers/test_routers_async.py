@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+from backend.models.async_database import async_url
+
+
+def _register(client, *, email='ada@example.com', password='S3nh@F0rte') -> str:
+    resp = client.post(
+        '/api/auth/register',
+        json={'name': 'Ada Lovelace', 'email': email, 'password': password},
+    )
+    assert resp.status_code == HTTPStatus.CREATED
+    return resp.json()['access_token']
+
+
+def _login(client, *, email='ada@example.com', password='S3nh@F0rte') -> str:
+    resp = client.post('/api/auth/login', json={'email': email, 'password': password})
+    assert resp.status_code == HTTPStatus.OK
+    return resp.json()['access_token']
+
+
+def test_async_url_swaps_driver():
+    assert async_url('sqlite:///./database.db') == 'sqlite+aiosqlite:///./database.db'
+    assert (
+        async_url('postgresql://u:p@db:5432/app')
+        == 'postgresql+asyncpg://u:p@db:5432/app'
+    )
+
+
+def test_async_register_login_and_userinfo(async_client):
+    _register(async_client)
+    token = _login(async_client)
+
+    resp = async_client.get(
+        '/api/auth/userinfo', headers={'Authorization': f'Bearer {token}'}
+    )
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json()['email'] == 'ada@example.com'
+
+
+def test_async_register_conflict(async_client):
+    _register(async_client)
+    resp = async_client.post(
+        '/api/auth/register',
+        json={'name': 'Outra', 'email': 'ada@example.com', 'password': 'x'},
+    )
+    assert resp.status_code == HTTPStatus.CONFLICT
+    assert resp.json()['detail'] == 'Usuário já cadastrado.'
+
+
+def test_async_login_wrong_password_returns_401(async_client):
+    _register(async_client)
+    resp = async_client.post(
+        '/api/auth/login', json={'email': 'ada@example.com', 'password': 'errada'}
+    )
+    assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_async_task_crud_flow(async_client):
+    token = _register(async_client)
+    _register(async_client, email='outra@example.com')
+    headers = {'Authorization': f'Bearer {token}'}
+
+    created = async_client.post(
+        '/api/tasks', json={'title': 'Async', 'priority': 'alta'}, headers=headers
+    )
+    assert created.status_code == HTTPStatus.CREATED
+    task = created.json()
+    assert task['status'] == 'pendente'
+    assert task['created_at']
+
+    listed = async_client.get('/api/tasks', headers=headers)
+    assert [t['id'] for t in listed.json()] == [task['id']]
+
+    updated = async_client.patch(
+        f'/api/tasks/{task["id"]}', json={'title': 'Novo'}, headers=headers
+    )
+    assert updated.json()['title'] == 'Novo'
+
+    toggled = async_client.patch(
+        f'/api/tasks/{task["id"]}/status', json={'status': 'concluida'}, headers=headers
+    )
+    assert toggled.json()['status'] == 'concluida'
+
+    other = _login(async_client, email='outra@example.com')
+    hidden = async_client.get(
+        f'/api/tasks/{task["id"]}', headers={'Authorization': f'Bearer {other}'}
+    )
+    assert hidden.status_code == HTTPStatus.NOT_FOUND
+
+    deleted = async_client.delete(f'/api/tasks/{task["id"]}', headers=headers)
+    assert deleted.status_code == HTTPStatus.NO_CONTENT
+    assert async_client.get('/api/tasks', headers=headers).json() == []
+
+
+def test_async_tasks_require_token(async_client):
+    resp = async_client.get('/api/tasks')
+    assert resp.status_code == HTTPStatus.UNAUTHORIZED
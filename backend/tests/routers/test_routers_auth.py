@@ -271,3 +271,12 @@ def test_logout_with_wrong_scheme_returns_204(client, session):
     )
 
     assert resp.status_code == HTTPStatus.NO_CONTENT
+
+
+# JWKS
+def test_jwks_is_public_and_cacheable(client):
+    resp = client.get('/api/auth/jwks')
+
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.headers['cache-control'].startswith('public, max-age=')
+    assert 'keys' in resp.json()
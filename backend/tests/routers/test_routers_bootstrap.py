@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+from sqlalchemy import event
+
+from backend.models.users import Task, TaskPriority, TaskStatus, User
+from backend.services.auth import Auth
+
+
+def _login(client, session, email='boot@example.com'):
+    user = User(
+        name='Ada', email=email, hashed_password=Auth().hash_password('S3nh@F0rte')
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    resp = client.post(
+        '/api/auth/login', json={'email': email, 'password': 'S3nh@F0rte'}
+    )
+    return user, {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+
+
+def test_bootstrap_returns_user_first_page_and_counts(client, session):
+    user, headers = _login(client, session)
+    session.add_all([
+        Task(title='a', user_id=user.id, status=TaskStatus.CONCLUIDA),
+        Task(title='b', user_id=user.id, priority=TaskPriority.ALTA),
+        Task(title='c', user_id=user.id),
+    ])
+    session.commit()
+
+    statements = []
+    event.listen(
+        session.get_bind(),
+        'before_cursor_execute',
+        lambda *args: statements.append(args[2]),
+    )
+    resp = client.get('/api/bootstrap?limit=2', headers=headers)
+
+    assert resp.status_code == HTTPStatus.OK
+    body = resp.json()
+    assert body['user'] == {'id': user.id, 'name': 'Ada', 'email': 'boot@example.com'}
+    assert [t['title'] for t in body['tasks']] == ['c', 'b']
+    assert body['has_more'] is True
+    assert body['counts'] == {
+        'total': 3,
+        'by_status': {'pendente': 2, 'concluida': 1},
+        'by_priority': {'baixa': 0, 'media': 2, 'alta': 1},
+    }
+    # Usuário, página e contagens
+    assert len(statements) == 3
+
+
+def test_bootstrap_etag_and_invalidation(client, session):
+    _, headers = _login(client, session)
+
+    first = client.get('/api/bootstrap', headers=headers)
+    etag = first.headers['etag']
+    assert first.headers['cache-control'] == 'private, no-cache'
+
+    again = client.get('/api/bootstrap', headers={**headers, 'If-None-Match': etag})
+    assert again.status_code == HTTPStatus.NOT_MODIFIED
+    assert again.headers['x-cache'] == 'hit'
+    assert again.content == b''
+
+    client.post('/api/tasks', headers=headers, json={'title': 'Nova'})
+    changed = client.get('/api/bootstrap', headers={**headers, 'If-None-Match': etag})
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.headers['etag'] != etag
+    assert changed.json()['counts']['total'] == 1
+
+
+def test_bootstrap_requires_token(client):
+    resp = client.get('/api/bootstrap')
+    assert resp.status_code == HTTPStatus.UNAUTHORIZED
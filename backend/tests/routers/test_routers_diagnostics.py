@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import create_app
+from backend.services.diagnostics import tracker
+from backend.settings import get_settings
+
+ADMIN = {'X-Admin-Token': 'admin-secreto'}
+
+
+@pytest.fixture
+def admin_client():
+    app = create_app(get_settings().model_copy(update={'ADMIN_TOKEN': 'admin-secreto'}))
+    with TestClient(app) as client:
+        yield client
+    tracker.stop()
+
+
+def test_routes_absent_without_admin_token(client):
+    assert client.get('/api/diagnostics/memory').status_code == HTTPStatus.NOT_FOUND
+
+
+def test_requires_admin_token(admin_client):
+    assert (
+        admin_client.get('/api/diagnostics/memory').status_code == HTTPStatus.FORBIDDEN
+    )
+    resp = admin_client.get(
+        '/api/diagnostics/memory', headers={'X-Admin-Token': 'errado'}
+    )
+    assert resp.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_memory_report(admin_client):
+    resp = admin_client.get('/api/diagnostics/memory?objects=5', headers=ADMIN)
+
+    assert resp.status_code == HTTPStatus.OK
+    body = resp.json()
+    assert body['rss_bytes'] > 0
+    assert body['tracemalloc']['tracing'] is False
+    assert body['caches']['auth_revoked_jtis'] >= 0
+    assert body['caches']['metrics_series'] > 0
+    assert len(body['gc']['generations']) == 3
+    assert len(body['objects']) == 5
+
+
+def test_snapshot_diff_shows_growth(admin_client):
+    assert (
+        admin_client.get('/api/diagnostics/memory/diff', headers=ADMIN).status_code
+        == HTTPStatus.CONFLICT
+    )
+
+    resp = admin_client.post('/api/diagnostics/memory/snapshot', headers=ADMIN)
+    assert resp.status_code == HTTPStatus.CREATED
+    assert resp.json()['tracing'] is True
+
+    leak = [bytearray(1024) for _ in range(2000)]  # noqa: F841
+    resp = admin_client.get('/api/diagnostics/memory/diff?limit=5', headers=ADMIN)
+    assert resp.status_code == HTTPStatus.OK
+    top = resp.json()['top']
+    assert any(
+        entry['file'].endswith('test_routers_diagnostics.py')
+        and entry['size_diff_kib'] >= 2000
+        for entry in top
+    )
+
+    resp = admin_client.delete('/api/diagnostics/memory/snapshot', headers=ADMIN)
+    assert resp.status_code == HTTPStatus.NO_CONTENT
+    assert (
+        admin_client.get('/api/diagnostics/memory', headers=ADMIN).json()[
+            'tracemalloc'
+        ]['tracing']
+        is False
+    )
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import create_engine
+
+from backend.app import app
+from backend.models.database import engine_options
+from backend.routers.health import get_primary_engine
+from backend.services.metrics import exposition
+from backend.services.pool import instrument, stats_for
+from backend.settings import get_settings
+
+
+def _pool_engine(tmp_path, **overrides):
+    settings = get_settings().model_copy(update=overrides)
+    url = f'sqlite:///{tmp_path / "health.db"}'
+    engine = instrument(
+        create_engine(url, **engine_options(settings, url, label='health')), 'health'
+    )
+    app.dependency_overrides[get_primary_engine] = lambda: engine
+    return engine
+
+
+@pytest.fixture
+def pool_engine(tmp_path):
+    engine = _pool_engine(tmp_path)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def single_connection_engine(tmp_path):
+    engine = _pool_engine(
+        tmp_path,
+        DATABASE_POOL_SIZE=1,
+        DATABASE_MAX_OVERFLOW=0,
+        DATABASE_POOL_TIMEOUT=0.1,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_live(client):
+    resp = client.get('/api/health/live')
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json() == {'status': 'ok'}
+
+
+def test_ready_reports_pool(client, pool_engine):
+    resp = client.get('/api/health/ready')
+
+    assert resp.status_code == HTTPStatus.OK
+    body = resp.json()
+    assert body['status'] == 'ready'
+    assert body['database'] == {'ok': True}
+    assert body['pool']['label'] == 'health'
+    assert body['pool']['checked_out'] == 0
+    assert body['pool']['saturated'] is False
+    assert 'checkout_wait_ms' in body['pool']
+
+
+def test_ready_reports_saturation_without_failing(client, pool_engine, monkeypatch):
+    monkeypatch.setattr('backend.routers.health.pool_capacity', lambda settings: 1)
+
+    with pool_engine.connect():
+        resp = client.get('/api/health/ready')
+
+    assert resp.status_code == HTTPStatus.OK
+    body = resp.json()
+    assert body['database'] == {'ok': True}
+    assert body['pool']['saturated'] is True
+    assert 'db_pool_saturated{pool="health"} 1' in exposition()
+
+
+def test_ready_returns_503_when_checkout_times_out(client, single_connection_engine):
+    before = stats_for('health').checkout_timeouts
+
+    with single_connection_engine.connect():
+        resp = client.get('/api/health/ready')
+
+    assert resp.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    body = resp.json()
+    assert body['status'] == 'unavailable'
+    assert body['database'] == {'ok': False, 'error': 'TimeoutError'}
+    assert stats_for('health').checkout_timeouts == before + 1
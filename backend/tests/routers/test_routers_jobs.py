@@ -0,0 +1,111 @@
+import json
+from http import HTTPStatus
+
+from backend.models.users import Task, TaskStatus, User
+from backend.services.auth import Auth
+from backend.services.jobs import Worker
+
+
+def _login(client, session, email='jobs@example.com'):
+    user = User(
+        name='Ada', email=email, hashed_password=Auth().hash_password('S3nh@F0rte')
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    resp = client.post(
+        '/api/auth/login', json={'email': email, 'password': 'S3nh@F0rte'}
+    )
+    return user, {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+
+
+def test_job_is_queued_then_run_by_worker(client, session):
+    user, headers = _login(client, session)
+    session.add_all([
+        Task(title='a', user_id=user.id, status=TaskStatus.CONCLUIDA),
+        Task(title='b', user_id=user.id),
+    ])
+    session.commit()
+
+    resp = client.post(
+        '/api/jobs',
+        json={'kind': 'delete_tasks', 'status': 'concluida', 'priority': 3},
+        headers=headers,
+    )
+    assert resp.status_code == HTTPStatus.ACCEPTED
+    job = resp.json()
+    assert resp.headers['Location'] == f'/api/jobs/{job["id"]}'
+    assert job['status'] == 'aguardando'
+    assert job['priority'] == 3
+    assert job['progress'] == 0
+
+    assert Worker(session.get_bind(), worker_id='teste').run_once() is True
+
+    resp = client.get(f'/api/jobs/{job["id"]}', headers=headers)
+    assert resp.status_code == HTTPStatus.OK
+    done = resp.json()
+    assert done['status'] == 'concluido'
+    assert done['progress'] == 100
+    assert done['result'] == {'deleted': 1}
+    assert done['finished_at'] is not None
+
+
+def test_export_is_downloaded_as_a_file(client, session, tmp_path, monkeypatch):
+    settings = client.app.state.settings
+    monkeypatch.setattr(
+        client.app.state,
+        'settings',
+        settings.model_copy(update={'JOBS_EXPORT_DIR': str(tmp_path)}),
+    )
+    user, headers = _login(client, session)
+    session.add_all([
+        Task(title='a', user_id=user.id),
+        Task(title='b', user_id=user.id),
+    ])
+    session.commit()
+    job_id = client.post(
+        '/api/jobs', json={'kind': 'export_tasks'}, headers=headers
+    ).json()['id']
+    download = f'/api/jobs/{job_id}/download'
+
+    assert client.get(download, headers=headers).status_code == HTTPStatus.NOT_FOUND
+
+    worker = Worker(session.get_bind(), worker_id='teste', export_dir=str(tmp_path))
+    assert worker.run_once() is True
+    # O worker gravou por outra sessão: a da API (compartilhada no teste)
+    # ainda pode ter o job antigo no identity map
+    session.expire_all()
+    result = client.get(f'/api/jobs/{job_id}', headers=headers).json()['result']
+    assert result == {'count': 2, 'file': f'tasks-{job_id}.jsonl'}
+
+    resp = client.get(download, headers=headers)
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.headers['content-type'] == 'application/x-ndjson'
+    assert [json.loads(line)['title'] for line in resp.text.splitlines()] == [
+        'a',
+        'b',
+    ]
+
+    _, other = _login(client, session, email='outro@example.com')
+    assert client.get(download, headers=other).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_job_of_another_user_is_not_found(client, session):
+    _, headers = _login(client, session)
+    job_id = client.post(
+        '/api/jobs', json={'kind': 'export_tasks'}, headers=headers
+    ).json()['id']
+    _, other = _login(client, session, email='outro@example.com')
+
+    resp = client.get(f'/api/jobs/{job_id}', headers=other)
+
+    assert resp.status_code == HTTPStatus.NOT_FOUND
+    assert resp.json()['detail'] == 'Job não encontrado.'
+
+
+def test_unknown_job_kind_is_rejected(client, session):
+    _, headers = _login(client, session)
+
+    resp = client.post('/api/jobs', json={'kind': 'formatar_disco'}, headers=headers)
+
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+
+import backend.models.database as database
+from backend.app import create_app
+from backend.models.replicas import ReplicaRouter
+from backend.models.users import User, table_registry
+from backend.services.auth import Auth
+
+
+@pytest.fixture
+def replicated(tmp_path, monkeypatch):
+    """Primário e réplica em dois arquivos SQLite (a réplica não replica)."""
+    primary = create_engine(f'sqlite:///{tmp_path / "primary.db"}')
+    replica = create_engine(f'sqlite:///{tmp_path / "replica.db"}')
+
+    hashed = Auth().hash_password('S3nh@F0rte')
+    for engine in (primary, replica):
+        table_registry.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                insert(User).values(
+                    name='Ada', email='ada@example.com', hashed_password=hashed
+                )
+            )
+
+    router = ReplicaRouter(primary, [replica], sticky_seconds=60)
+    monkeypatch.setattr(database, '_engine', primary)
+    monkeypatch.setattr(database, '_router', router)
+
+    with TestClient(create_app()) as client:
+        resp = client.post(
+            '/api/auth/login',
+            json={'email': 'ada@example.com', 'password': 'S3nh@F0rte'},
+        )
+        headers = {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+        yield client, headers, router
+
+
+def test_reads_hit_the_replica(replicated):
+    client, headers, router = replicated
+
+    with router.replicas[0].begin() as connection:
+        connection.exec_driver_sql(
+            'INSERT INTO tasks (title, user_id, status, priority, rank) '
+            "VALUES ('só na réplica', 1, 'PENDENTE', 'MEDIA', 'a0')"
+        )
+
+    resp = client.get('/api/tasks', headers=headers)
+    assert resp.status_code == HTTPStatus.OK
+    assert [t['title'] for t in resp.json()] == ['só na réplica']
+
+
+def test_user_reads_own_writes_after_commit(replicated):
+    client, headers, router = replicated
+
+    created = client.post('/api/tasks', json={'title': 'Nova'}, headers=headers)
+    assert created.status_code == HTTPStatus.CREATED
+
+    # A réplica ainda não tem a tarefa, mas o usuário está preso ao primário
+    resp = client.get(f'/api/tasks/{created.json()["id"]}', headers=headers)
+    assert resp.status_code == HTTPStatus.OK
+    assert router.is_pinned('user:1')
+
+
+def test_pin_expires_back_to_replica(replicated):
+    client, headers, router = replicated
+    router.sticky_seconds = 0
+
+    client.post('/api/tasks', json={'title': 'Nova'}, headers=headers)
+
+    resp = client.get('/api/tasks', headers=headers)
+    assert resp.json() == []
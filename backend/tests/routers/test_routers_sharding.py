@@ -0,0 +1,175 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, insert, select
+
+import backend.models.database as database
+from backend.app import create_app
+from backend.models.sharding import ShardRouter, create_shard_schema, move_user
+from backend.models.users import Task, User, table_registry
+from backend.reshard import init
+from backend.services.auth import Auth
+from backend.settings import Settings
+
+
+@pytest.fixture
+def sharded(tmp_path, monkeypatch):
+    """Usuários no banco principal e tarefas em dois shards SQLite."""
+    main = create_engine(f'sqlite:///{tmp_path / "main.db"}')
+    table_registry.metadata.create_all(main)
+    shards = {
+        name: create_engine(f'sqlite:///{tmp_path / f"{name}.db"}')
+        for name in ('a', 'b')
+    }
+    for engine in shards.values():
+        create_shard_schema(engine)
+
+    hashed = Auth().hash_password('S3nh@F0rte')
+    with main.begin() as connection:
+        for name in ('ana', 'bia', 'caio', 'duda'):
+            connection.execute(
+                insert(User).values(
+                    name=name, email=f'{name}@example.com', hashed_password=hashed
+                )
+            )
+
+    router = ShardRouter(shards, main, ttl=0)
+    monkeypatch.setattr(database, '_engine', main)
+    monkeypatch.setattr(database, '_shards', router)
+
+    with TestClient(create_app()) as client:
+
+        def login(name):
+            resp = client.post(
+                '/api/auth/login',
+                json={'email': f'{name}@example.com', 'password': 'S3nh@F0rte'},
+            )
+            return {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+
+        yield client, login, router
+
+
+def _tasks_per_shard(router):
+    counts = {}
+    for name, engine in router.shards.items():
+        with engine.connect() as connection:
+            counts[name] = connection.execute(
+                select(func.count()).select_from(Task)
+            ).scalar_one()
+    return counts
+
+
+def test_tasks_live_in_the_owner_shard(sharded):
+    client, login, router = sharded
+    created = {}
+    for user_id, name in enumerate(('ana', 'bia', 'caio', 'duda'), start=1):
+        resp = client.post('/api/tasks', json={'title': name}, headers=login(name))
+        assert resp.status_code == HTTPStatus.CREATED
+        created[user_id] = resp.json()['id']
+
+    # Ids únicos entre os shards
+    assert len(set(created.values())) == len(created)
+    expected = {name: 0 for name in router.shards}
+    for user_id in created:
+        expected[router.ring.lookup(user_id)] += 1
+    assert _tasks_per_shard(router) == expected
+    with database._engine.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(Task)).scalar() == 0
+
+    headers = login('ana')
+    resp = client.get('/api/tasks', headers=headers)
+    assert [t['title'] for t in resp.json()] == ['ana']
+    resp = client.get(f'/api/tasks/{created[2]}', headers=headers)
+    assert resp.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_tasks_follow_the_user_to_another_shard(sharded):
+    client, login, router = sharded
+    headers = login('ana')
+    task_id = client.post('/api/tasks', json={'title': 'x'}, headers=headers).json()[
+        'id'
+    ]
+    source = router.ring.lookup(1)
+    target = 'b' if source == 'a' else 'a'
+
+    move_user(router, 1, target, sleep=lambda _: None)
+
+    resp = client.patch(
+        f'/api/tasks/{task_id}', json={'title': 'movida'}, headers=headers
+    )
+    assert resp.status_code == HTTPStatus.OK
+    assert _tasks_per_shard(router)[source] == 0
+    assert [t['title'] for t in client.get('/api/tasks', headers=headers).json()] == [
+        'movida'
+    ]
+
+
+def test_writes_wait_while_moving(sharded):
+    client, login, router = sharded
+    headers = login('ana')
+    client.post('/api/tasks', json={'title': 'x'}, headers=headers)
+    source = router.ring.lookup(1)
+    target = 'b' if source == 'a' else 'a'
+
+    def sleep(_):
+        if not responses:
+            responses.append(
+                client.post('/api/tasks', json={'title': 'y'}, headers=headers)
+            )
+            responses.append(client.get('/api/tasks', headers=headers))
+
+    responses = []
+    move_user(router, 1, target, sleep=sleep)
+
+    blocked, listed = responses
+    assert blocked.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert blocked.headers['Retry-After'] == '1'
+    assert listed.status_code == HTTPStatus.OK
+    assert [t['title'] for t in listed.json()] == ['x']
+
+
+def test_sqlite_tuned_with_shards(tmp_path, monkeypatch):
+    """O writer único do SQLite afinado não pode servir também o diretório."""
+    settings = Settings(
+        DATABASE_URL=f'sqlite:///{tmp_path / "main.db"}',
+        DATABASE_SHARD_URLS={
+            name: f'sqlite:///{tmp_path / f"{name}.db"}' for name in ('a', 'b')
+        },
+        SQLITE_TUNED=True,
+        # Um deadlock vira erro rápido, não um teste parado por 30 s
+        DATABASE_POOL_TIMEOUT=2,
+        SQLITE_BUSY_TIMEOUT_MS=2000,
+    )
+    setup = create_engine(settings.DATABASE_URL)
+    table_registry.metadata.create_all(setup)
+    with setup.begin() as connection:
+        connection.execute(
+            insert(User).values(
+                name='ana',
+                email='ana@example.com',
+                hashed_password=Auth().hash_password('S3nh@F0rte'),
+            )
+        )
+        connection.execute(insert(Task).values(title='antiga', user_id=1))
+    setup.dispose()
+
+    monkeypatch.setattr(database, '_engine', database.create_primary_engine(settings))
+    router = database.create_shard_router(settings)
+    monkeypatch.setattr(database, '_shards', router)
+    assert router.directory is not database._engine
+
+    # reshard init --import-main: lê o diretório com o banco principal aberto
+    assert init(router, import_tasks=True)['imported'] == 1
+
+    with TestClient(create_app()) as client:
+        resp = client.post(
+            '/api/auth/login',
+            json={'email': 'ana@example.com', 'password': 'S3nh@F0rte'},
+        )
+        headers = {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+        resp = client.post('/api/tasks', json={'title': 'nova'}, headers=headers)
+        assert resp.status_code == HTTPStatus.CREATED
+        assert resp.json()['id'] > 1
+        titles = [t['title'] for t in client.get('/api/tasks', headers=headers).json()]
+    assert sorted(titles) == ['antiga', 'nova']
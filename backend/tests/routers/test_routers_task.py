@@ -1,9 +1,19 @@
+from datetime import date, datetime, timezone
 from http import HTTPStatus
 
-from sqlalchemy import select
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
 
-from backend.models.users import User, Task
+import backend.models.database as database
+from backend.app import create_app
+from backend.models.dependencies import TaskDependency
+from backend.models.jobs import Job, JobStatus
+from backend.models.replicas import ReplicaRouter
+from backend.models.users import User, Task, TaskStatus, table_registry
 from backend.services.auth import Auth
+from backend.services.encoding import packb, unpackb
+from backend.settings import get_settings
 
 
 # --- helpers ---
@@ -252,3 +262,613 @@ def test_create_task_with_wrong_scheme_returns_401(client, session):
     assert resp.status_code == HTTPStatus.UNAUTHORIZED
     body = resp.json()
     assert body.get("detail") == "Token ausente ou esquema inválido. Use Authorization: Bearer <token>."
+
+
+def test_list_tasks_is_cached_and_invalidated_by_writes(client, session):
+    # Arrange
+    user = _create_user(session, email='cache@example.com')
+    token = _login_and_get_token(
+        client, email='cache@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+    created = client.post('/api/tasks', headers=headers, json={'title': 'A'}).json()
+
+    # Act / Assert: a segunda leitura vem do cache
+    first = client.get('/api/tasks', headers=headers)
+    second = client.get('/api/tasks', headers=headers)
+    assert first.headers['x-cache'] == 'miss'
+    assert second.headers['x-cache'] == 'hit'
+    assert second.json() == first.json()
+    assert [t['title'] for t in first.json()] == ['A']
+
+    # Escrita fora da API não invalida (o TTL cobre); pela API, sim
+    _create_task(session, title='Direto', user_id=user.id)
+    assert len(client.get('/api/tasks', headers=headers).json()) == 1
+
+    task_url = f'/api/tasks/{created["id"]}'
+    writes = [
+        lambda: client.put(task_url, headers=headers, json={'title': 'B'}),
+        lambda: client.patch(task_url, headers=headers, json={'title': 'C'}),
+        lambda: client.patch(
+            f'{task_url}/status', headers=headers, json={'status': 'concluida'}
+        ),
+        lambda: client.post('/api/tasks', headers=headers, json={'title': 'D'}),
+        lambda: client.delete(task_url, headers=headers),
+    ]
+    for write in writes:
+        client.get('/api/tasks', headers=headers)
+        assert write().status_code < HTTPStatus.BAD_REQUEST
+        resp = client.get('/api/tasks', headers=headers)
+        assert resp.headers['x-cache'] == 'miss'
+
+    assert [t['title'] for t in resp.json()] == ['D', 'Direto']
+
+
+def test_list_tasks_skips_cache_while_pinned_to_primary(client, session, monkeypatch):
+    user = _create_user(session, email='pin@example.com')
+    token = _login_and_get_token(client, email='pin@example.com', password='S3nh@F0rte')
+    headers = {'Authorization': f'Bearer {token}'}
+    router = ReplicaRouter(object(), [object()], sticky_seconds=60)
+    monkeypatch.setattr('backend.routers.task.get_replica_router', lambda: router)
+    assert client.get('/api/tasks', headers=headers).headers['x-cache'] == 'miss'
+
+    # Entrada velha no cache (como a preenchida por uma réplica atrasada)
+    _create_task(session, title='Nova', user_id=user.id)
+    router.pin(f'user:{user.id}')
+    pinned = client.get('/api/tasks', headers=headers)
+    assert pinned.headers['x-cache'] == 'bypass'
+    assert [t['title'] for t in pinned.json()] == ['Nova']
+
+    # A leitura do primário substituiu a entrada velha
+    router._pins.clear()
+    after = client.get('/api/tasks', headers=headers)
+    assert after.headers['x-cache'] == 'hit'
+    assert after.json() == pinned.json()
+
+
+# --- POST /api/tasks/batch-ops ---
+
+
+def test_batch_ops_runs_in_order_and_commits_once(client, session):
+    # Arrange
+    user = _create_user(session, email='batch@example.com')
+    other = _create_user(session, name='Outro', email='outro@example.com')
+    mine = _create_task(session, title='Minha', user_id=user.id)
+    theirs = _create_task(session, title='Alheia', user_id=other.id)
+    token = _login_and_get_token(
+        client, email='batch@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+
+    # Act
+    resp = client.post(
+        '/api/tasks/batch-ops',
+        headers=headers,
+        json={
+            'operations': [
+                {'op': 'create', 'data': {'title': 'Nova'}},
+                {'op': 'set_status', 'id': mine.id, 'status': 'concluida'},
+                {'op': 'update', 'id': mine.id, 'data': {'title': 'Editada'}},
+                {'op': 'get', 'ids': [mine.id, theirs.id]},
+                {'op': 'delete', 'id': mine.id},
+            ]
+        },
+    )
+
+    # Assert
+    assert resp.status_code == HTTPStatus.OK
+    body = resp.json()
+    assert body['committed'] is True
+    assert [r['status'] for r in body['results']] == [201, 200, 200, 200, 204]
+    created, status, updated, fetched, _ = body['results']
+    assert created['data']['title'] == 'Nova'
+    assert status['data']['status'] == 'concluida'
+    assert updated['data']['title'] == 'Editada'
+    assert [t['title'] for t in fetched['data']] == ['Editada']
+    assert fetched['missing'] == [theirs.id]
+
+    titles = session.scalars(select(Task.title).where(Task.user_id == user.id)).all()
+    assert titles == ['Nova']
+
+
+def test_batch_ops_atomic_failure_rolls_back_everything(client, session):
+    # Arrange
+    _create_user(session, email='atomic@example.com')
+    token = _login_and_get_token(
+        client, email='atomic@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+
+    # Act
+    resp = client.post(
+        '/api/tasks/batch-ops',
+        headers=headers,
+        json={
+            'operations': [
+                {'op': 'create', 'data': {'title': 'Desfeita'}},
+                {'op': 'delete', 'id': 999},
+                {'op': 'create', 'data': {'title': 'Nunca'}},
+            ]
+        },
+    )
+
+    # Assert
+    body = resp.json()
+    assert resp.status_code == HTTPStatus.OK
+    assert body['committed'] is False
+    assert [r['status'] for r in body['results']] == [424, 404, 424]
+    assert body['results'][1]['detail'] == 'Tarefa não encontrada.'
+    assert session.scalars(select(Task)).all() == []
+
+
+def test_batch_ops_non_atomic_keeps_successful_operations(client, session):
+    # Arrange
+    _create_user(session, email='partial@example.com')
+    token = _login_and_get_token(
+        client, email='partial@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+
+    # Act
+    resp = client.post(
+        '/api/tasks/batch-ops',
+        headers=headers,
+        json={
+            'atomic': False,
+            'operations': [
+                {'op': 'create', 'data': {'title': 'Fica'}},
+                {'op': 'set_status', 'id': 999, 'status': 'concluida'},
+                {'op': 'create', 'data': {'title': 'Também fica'}},
+            ],
+        },
+    )
+
+    # Assert
+    body = resp.json()
+    assert body['committed'] is True
+    assert [r['status'] for r in body['results']] == [201, 404, 201]
+    titles = session.scalars(select(Task.title).order_by(Task.id)).all()
+    assert titles == ['Fica', 'Também fica']
+
+
+def test_batch_ops_rejects_unknown_operation(client, session):
+    _create_user(session, email='invalid@example.com')
+    token = _login_and_get_token(
+        client, email='invalid@example.com', password='S3nh@F0rte'
+    )
+
+    resp = client.post(
+        '/api/tasks/batch-ops',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'operations': [{'op': 'truncate'}]},
+    )
+
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+# --- GET /api/tasks/overdue e /api/tasks/due-within ---
+
+
+def test_overdue_and_due_within_only_pending_with_due_date(client, session):
+    # Arrange
+    user = _create_user(session, email='prazo@example.com')
+    other = _create_user(session, email='outro@example.com')
+    token = _login_and_get_token(
+        client, email='prazo@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+    pending, done = TaskStatus.PENDENTE, TaskStatus.CONCLUIDA
+    for title, status, due_date, owner in [
+        ('atrasada', pending, date(2025, 5, 1), user),
+        ('mais atrasada', pending, date(2025, 4, 1), user),
+        ('feita', done, date(2025, 4, 15), user),
+        ('sem prazo', pending, None, user),
+        ('hoje', pending, date(2025, 5, 10), user),
+        ('semana', pending, date(2025, 5, 17), user),
+        ('depois', pending, date(2025, 5, 18), user),
+        ('alheia', pending, date(2025, 4, 1), other),
+    ]:
+        _create_task(
+            session, title=title, user_id=owner.id, status=status, due_date=due_date
+        )
+
+    # Act
+    overdue = client.get('/api/tasks/overdue?today=2025-05-10', headers=headers)
+    week = client.get(
+        '/api/tasks/due-within?today=2025-05-10&days=7', headers=headers
+    )
+    limited = client.get(
+        '/api/tasks/overdue?today=2025-05-10&limit=1', headers=headers
+    )
+
+    # Assert
+    assert overdue.status_code == HTTPStatus.OK
+    assert [t['title'] for t in overdue.json()] == ['mais atrasada', 'atrasada']
+    assert [t['title'] for t in week.json()] == ['hoje', 'semana']
+    assert [t['title'] for t in limited.json()] == ['mais atrasada']
+
+
+def test_due_within_rejects_negative_days(client, session):
+    _create_user(session, email='dias@example.com')
+    token = _login_and_get_token(
+        client, email='dias@example.com', password='S3nh@F0rte'
+    )
+
+    resp = client.get(
+        '/api/tasks/due-within?days=-1',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+# --- MessagePack ---
+
+
+def test_tasks_in_msgpack_when_accepted(client, session):
+    # Arrange
+    user = _create_user(session, email='msgpack@example.com')
+    task = _create_task(
+        session,
+        title='Compacta',
+        user_id=user.id,
+        status=TaskStatus.PENDENTE,
+        due_date=date(2025, 5, 10),
+    )
+    token = _login_and_get_token(
+        client, email='msgpack@example.com', password='S3nh@F0rte'
+    )
+    auth = {'Authorization': f'Bearer {token}'}
+    packed = {**auth, 'Accept': 'application/msgpack, application/json;q=0.5'}
+
+    # Act
+    listed = client.get('/api/tasks', headers=packed)
+    single = client.get(f'/api/tasks/{task.id}', headers=packed)
+    as_json = client.get('/api/tasks', headers=auth)
+
+    # Assert
+    assert listed.headers['content-type'] == 'application/msgpack'
+    assert 'Accept' in listed.headers['vary']
+    [data] = unpackb(listed.content)
+    assert data == unpackb(single.content)
+    assert data['title'] == 'Compacta'
+    assert data['status'] == 'pendente'
+    assert data['due_date'] == datetime(2025, 5, 10, tzinfo=timezone.utc)
+    assert isinstance(data['created_at'], datetime)
+    assert len(listed.content) < len(as_json.content)
+    assert as_json.json()[0]['due_date'] == '2025-05-10'
+
+
+def test_json_wins_when_msgpack_has_lower_weight(client, session):
+    _create_user(session, email='peso@example.com')
+    token = _login_and_get_token(
+        client, email='peso@example.com', password='S3nh@F0rte'
+    )
+
+    resp = client.get(
+        '/api/tasks',
+        headers={
+            'Authorization': f'Bearer {token}',
+            'Accept': 'application/msgpack;q=0.5, application/json',
+        },
+    )
+
+    assert resp.headers['content-type'] == 'application/json'
+
+
+def test_batch_ops_with_msgpack_body_and_response(client, session):
+    # Arrange
+    _create_user(session, email='lote@example.com')
+    token = _login_and_get_token(
+        client, email='lote@example.com', password='S3nh@F0rte'
+    )
+    headers = {
+        'Authorization': f'Bearer {token}',
+        'Content-Type': 'application/msgpack',
+        'Accept': 'application/msgpack',
+    }
+    due = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+    # Act
+    resp = client.post(
+        '/api/tasks/batch-ops',
+        headers=headers,
+        content=packb({
+            'operations': [
+                {'op': 'create', 'data': {'title': 'Binária', 'due_date': due}}
+            ]
+        }),
+    )
+    invalid = client.post(
+        '/api/tasks/batch-ops',
+        headers=headers,
+        content=packb({'operations': [{'op': 'formatar'}]}),
+    )
+    garbage = client.post('/api/tasks/batch-ops', headers=headers, content=b'\xc1')
+
+    # Assert
+    assert resp.status_code == HTTPStatus.OK
+    body = unpackb(resp.content)
+    assert body['committed'] is True
+    [created] = body['results']
+    assert created['status'] == HTTPStatus.CREATED
+    assert created['data']['title'] == 'Binária'
+    assert created['data']['due_date'] == due
+    assert invalid.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert garbage.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+# --- PATCH /api/tasks/{task_id}/position ---
+
+
+def test_move_task_changes_only_its_rank(client, session):
+    # Arrange: criadas em ordem, a mais nova fica no topo
+    user = _create_user(session, email='ordem@example.com')
+    token = _login_and_get_token(
+        client, email='ordem@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+    a, b, c = (
+        client.post('/api/tasks', json={'title': title}, headers=headers).json()
+        for title in 'ABC'
+    )
+
+    def titles():
+        return [t['title'] for t in client.get('/api/tasks', headers=headers).json()]
+
+    assert titles() == ['C', 'B', 'A']
+
+    # Act / Assert
+    moved = client.patch(
+        f'/api/tasks/{c["id"]}/position', json={'after_id': b['id']}, headers=headers
+    )
+    assert moved.status_code == HTTPStatus.OK
+    assert b['rank'] < moved.json()['rank'] < a['rank']
+    assert titles() == ['B', 'C', 'A']
+
+    client.patch(
+        f'/api/tasks/{a["id"]}/position', json={'before_id': b['id']}, headers=headers
+    )
+    assert titles() == ['A', 'B', 'C']
+
+    client.patch(f'/api/tasks/{a["id"]}/position', json={}, headers=headers)
+    assert titles() == ['B', 'C', 'A']
+
+    ranks = session.scalars(
+        select(Task.rank).where(Task.user_id == user.id).order_by(Task.id)
+    ).all()
+    assert ranks[1] == b['rank']
+
+
+def test_move_task_between_tied_ranks(client, session):
+    # Arrange: criações concorrentes leram o mesmo topo e gravaram o mesmo rank
+    user = _create_user(session, email='empate@example.com')
+    x, y, z = (_create_task(session, title=t, user_id=user.id) for t in 'XYZ')
+    session.execute(update(Task).where(Task.user_id == user.id).values(rank='a0'))
+    session.commit()
+    token = _login_and_get_token(
+        client, email='empate@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+
+    def titles():
+        return [t['title'] for t in client.get('/api/tasks', headers=headers).json()]
+
+    assert titles() == ['X', 'Y', 'Z']
+
+    # Act / Assert: empatadas desempatam por id, e o vão entre elas existe
+    moved = client.patch(
+        f'/api/tasks/{z.id}/position', json={'before_id': y.id}, headers=headers
+    )
+    assert moved.status_code == HTTPStatus.OK
+    assert titles() == ['X', 'Z', 'Y']
+
+    session.execute(update(Task).where(Task.user_id == user.id).values(rank='a0'))
+    session.commit()
+    moved = client.patch(
+        f'/api/tasks/{x.id}/position', json={'after_id': y.id}, headers=headers
+    )
+    assert moved.status_code == HTTPStatus.OK
+    assert titles() == ['Y', 'X', 'Z']
+
+
+def test_move_task_validates_neighbors(client, session):
+    user = _create_user(session, email='vizinho@example.com')
+    other = _create_user(session, name='Outro', email='outro@example.com')
+    task = _create_task(session, user_id=user.id)
+    theirs = _create_task(session, user_id=other.id)
+    token = _login_and_get_token(
+        client, email='vizinho@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+    url = f'/api/tasks/{task.id}/position'
+
+    both = client.patch(
+        url, json={'before_id': task.id, 'after_id': task.id}, headers=headers
+    )
+    alien = client.patch(url, json={'before_id': theirs.id}, headers=headers)
+
+    assert both.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert alien.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_long_rank_schedules_one_rebalance(client, session, monkeypatch):
+    # Arrange
+    user = _create_user(session, email='longa@example.com')
+    token = _login_and_get_token(
+        client, email='longa@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+    bottom, middle, top = (
+        _create_task(session, title=title, user_id=user.id)
+        for title in ('baixo', 'meio', 'topo')
+    )
+    monkeypatch.setattr(client.app.state.settings, 'TASK_RANK_MAX_LENGTH', 2)
+
+    # Act: sempre logo depois do topo, o vão encolhe e a chave cresce
+    for task in (bottom, middle):
+        resp = client.patch(
+            f'/api/tasks/{task.id}/position',
+            json={'after_id': top.id},
+            headers=headers,
+        )
+        assert resp.status_code == HTTPStatus.OK
+        assert len(resp.json()['rank']) > 2
+
+    # Assert
+    jobs = session.scalars(select(Job).where(Job.kind == 'rebalance_ranks')).all()
+    assert [(job.user_id, job.status) for job in jobs] == [
+        (user.id, JobStatus.AGUARDANDO)
+    ]
+
+
+def test_rebalance_is_queued_with_a_single_connection_pool(tmp_path, monkeypatch):
+    # Pool de uma conexão (SQLite afinado): o job entra pela sessão que a
+    # requisição já tem, sem esperar por outra até o pool_timeout
+    settings = get_settings().model_copy(
+        update={
+            'DATABASE_URL': f'sqlite:///{tmp_path / "rank.db"}',
+            'SQLITE_TUNED': True,
+            'DATABASE_POOL_TIMEOUT': 1.0,
+            'TASK_RANK_MAX_LENGTH': 1,
+        }
+    )
+    engine = database.create_primary_engine(settings)
+    table_registry.metadata.create_all(engine)
+    monkeypatch.setattr(database, '_engine', engine)
+    with Session(engine) as session:
+        user = _create_user(session, email='pool@example.com')
+        top = _create_task(session, title='topo', user_id=user.id).id
+        task = _create_task(session, title='baixo', user_id=user.id).id
+
+    with TestClient(create_app(settings)) as client:
+        token = _login_and_get_token(
+            client, email='pool@example.com', password='S3nh@F0rte'
+        )
+        resp = client.patch(
+            f'/api/tasks/{task}/position',
+            json={'after_id': top},
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    with Session(engine) as session:
+        kinds = session.scalars(select(Job.kind)).all()
+    engine.dispose()
+    assert resp.status_code == HTTPStatus.OK
+    assert kinds == ['rebalance_ranks']
+
+
+def test_ready_tasks_follow_dependencies(client, session):
+    # Arrange: revisar bloqueada por escrever, publicar bloqueada por revisar
+    user = _create_user(session, email='deps@example.com')
+    token = _login_and_get_token(
+        client, email='deps@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+    write, review, publish, _ = (
+        _create_task(session, title=title, user_id=user.id)
+        for title in ('escrever', 'revisar', 'publicar', 'avulsa')
+    )
+
+    def ready():
+        resp = client.get('/api/tasks/ready', headers=headers)
+        assert resp.status_code == HTTPStatus.OK
+        return [t['title'] for t in resp.json()]
+
+    for task, blocker in ((review, write), (publish, review)):
+        resp = client.post(
+            f'/api/tasks/{task.id}/dependencies',
+            json={'blocker_id': blocker.id},
+            headers=headers,
+        )
+        assert resp.status_code == HTTPStatus.CREATED
+        assert resp.json()['blocker_id'] == blocker.id
+
+    # Act / Assert: na ordem manual (a mais nova no topo)
+    assert ready() == ['avulsa', 'escrever']
+    blockers = client.get(f'/api/tasks/{publish.id}/dependencies', headers=headers)
+    assert [t['title'] for t in blockers.json()] == ['revisar']
+
+    client.patch(
+        f'/api/tasks/{write.id}/status', json={'status': 'concluida'}, headers=headers
+    )
+    assert ready() == ['avulsa', 'revisar']
+
+    resp = client.delete(
+        f'/api/tasks/{publish.id}/dependencies/{review.id}', headers=headers
+    )
+    assert resp.status_code == HTTPStatus.NO_CONTENT
+    assert ready() == ['avulsa', 'publicar', 'revisar']
+
+
+def test_dependency_cycle_and_duplicate_return_409(client, session):
+    user = _create_user(session, email='ciclo@example.com')
+    token = _login_and_get_token(
+        client, email='ciclo@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+    a, b, c = (_create_task(session, title=t, user_id=user.id) for t in 'abc')
+
+    def block(task, blocker):
+        return client.post(
+            f'/api/tasks/{task.id}/dependencies',
+            json={'blocker_id': blocker.id},
+            headers=headers,
+        )
+
+    assert block(b, a).status_code == HTTPStatus.CREATED
+    assert block(c, b).status_code == HTTPStatus.CREATED
+
+    resp = block(a, c)
+    assert resp.status_code == HTTPStatus.CONFLICT
+    assert resp.json()['detail'] == (
+        f'A dependência criaria um ciclo: {c.id} → {a.id} → {b.id} → {c.id}.'
+    )
+    assert block(b, a).json()['detail'] == 'Dependência já cadastrada.'
+    assert block(a, a).status_code == HTTPStatus.CONFLICT
+    assert session.scalar(
+        select(TaskDependency).where(TaskDependency.task_id == a.id)
+    ) is None
+
+
+def test_dependency_on_other_users_task_returns_404(client, session):
+    user = _create_user(session, email='dono@example.com')
+    other = _create_user(session, email='outro@example.com')
+    token = _login_and_get_token(
+        client, email='dono@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+    mine = _create_task(session, user_id=user.id)
+    theirs = _create_task(session, user_id=other.id)
+
+    resp = client.post(
+        f'/api/tasks/{mine.id}/dependencies',
+        json={'blocker_id': theirs.id},
+        headers=headers,
+    )
+    assert resp.status_code == HTTPStatus.NOT_FOUND
+    resp = client.delete(
+        f'/api/tasks/{mine.id}/dependencies/{theirs.id}', headers=headers
+    )
+    assert resp.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_deleting_task_removes_its_dependencies(client, session):
+    user = _create_user(session, email='apagar@example.com')
+    token = _login_and_get_token(
+        client, email='apagar@example.com', password='S3nh@F0rte'
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+    blocker, task = (_create_task(session, title=t, user_id=user.id) for t in 'ab')
+    client.post(
+        f'/api/tasks/{task.id}/dependencies',
+        json={'blocker_id': blocker.id},
+        headers=headers,
+    )
+
+    resp = client.delete(f'/api/tasks/{blocker.id}', headers=headers)
+
+    assert resp.status_code == HTTPStatus.NO_CONTENT
+    assert session.scalars(select(TaskDependency)).all() == []
+    ready = client.get('/api/tasks/ready', headers=headers).json()
+    assert [t['id'] for t in ready] == [task.id]
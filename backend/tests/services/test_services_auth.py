@@ -16,11 +16,12 @@ def patched_settings(monkeypatch):
         JWT_ALGORITHM = 'HS256'
         JWT_SECRET = 'test-secret'
         JWT_TTL_MINUTES = 1
+        JWT_REVOKED_MAX = 100
 
     def func_settings():
         return TestSettings()
 
-    monkeypatch.setattr(auth_module, 'Settings', func_settings)
+    monkeypatch.setattr(auth_module, 'get_settings', func_settings)
     return TestSettings
 
 
@@ -133,3 +134,55 @@ def test_generate_token_return_shape(auth, patched_settings):
     assert isinstance(result['access_token'], str)
     assert result['token_type'] == 'Bearer'
     assert result['expires_in'] == patched_settings.JWT_TTL_MINUTES * 60
+
+
+def test_revoked_jtis_are_pruned_after_expiry(auth):
+    token = auth._encode(sub='u1', ttl=timedelta(minutes=5))
+    exp = auth._decode(token)['exp']
+    auth.revoke_token(token)
+    auth.revoke_by_jti('sem-exp')
+    assert auth.revoked_count() == 2
+
+    # Sem exp conhecido, vale pelo TTL configurado (1 min aqui)
+    assert auth.prune_revoked(time.time() + 61, force=True) == 1
+    assert auth.revoked_count() == 1
+
+    # Antes do exp o jti fica; depois, o token já seria recusado por expirar
+    assert auth.prune_revoked(exp - 1, force=True) == 0
+    assert auth.prune_revoked(exp + 1, force=True) == 1
+    assert auth.revoked_count() == 0
+
+
+def test_revoked_jtis_cap_fails_closed(auth, patched_settings):
+    patched_settings.JWT_REVOKED_MAX = 3
+    tokens = [auth._encode(sub=f'u{n}', ttl=timedelta(minutes=5)) for n in range(5)]
+    for token in tokens[:3]:
+        auth.revoke_token(token)
+    assert auth.revoked_count() == 3
+
+    # Revogar de novo um jti presente não conta contra o teto
+    auth.revoke_token(tokens[0])
+    assert auth.revoked_count() == 3
+
+    # Cheio só de jtis válidos: nenhum sai, todos os tokens até aqui caem
+    auth.revoke_token(tokens[3])
+    assert auth.revoked_count() == 0
+    for token in tokens:
+        ok, _, error = auth.verify_token(token)
+        assert not ok
+        assert error == 'invalid: Token revogado.'
+
+    # Tokens emitidos depois da marca seguem valendo
+    auth._revoked_before = time.time() - 10
+    fresh = auth._encode(sub='u9', ttl=timedelta(minutes=5))
+    assert auth.verify_token(fresh)[0]
+
+
+def test_revoked_jtis_cap_prunes_expired_first(auth, patched_settings):
+    patched_settings.JWT_REVOKED_MAX = 2
+    auth.revoke_by_jti('velho', expires_at=time.time() - 1)
+    auth.revoke_by_jti('a')
+    auth.revoke_by_jti('b')
+
+    assert set(auth._revoked_jtis) == {'a', 'b'}
+    assert auth._revoked_before == 0.0
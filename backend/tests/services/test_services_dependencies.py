@@ -0,0 +1,116 @@
+import random
+
+import pytest
+from sqlalchemy import insert, select
+
+from backend.models.dependencies import TaskDependency
+from backend.models.users import Task, User
+from backend.services.dependencies import DependencyCycle, add_dependency
+
+
+@pytest.fixture
+def tasks(session):
+    session.execute(
+        insert(User).values(name='Ada', email='ada@example.com', hashed_password='h')
+    )
+    session.execute(
+        insert(Task),
+        [
+            {'title': f't{n}', 'user_id': 1, 'status': 'PENDENTE', 'priority': 'MEDIA'}
+            for n in range(12)
+        ],
+    )
+    session.commit()
+    return session.scalars(select(Task.id).order_by(Task.id)).all()
+
+
+def _positions(session):
+    return dict(session.execute(select(Task.id, Task.topo_order)).all())
+
+
+def _assert_topological(session):
+    positions = _positions(session)
+    placed = [p for p in positions.values() if p is not None]
+    assert len(placed) == len(set(placed))
+    for edge in session.scalars(select(TaskDependency)):
+        assert positions[edge.blocker_id] < positions[edge.task_id]
+
+
+def _reaches(edges, start, goal):
+    seen, stack = set(), [start]
+    while stack:
+        node = stack.pop()
+        if node == goal:
+            return True
+        if node not in seen:
+            seen.add(node)
+            stack.extend(task for blocker, task in edges if blocker == node)
+    return False
+
+
+def test_edge_against_the_order_moves_only_the_affected_range(session, tasks):
+    a, b, c, d, unrelated = tasks[:5]
+    # a -> b -> c e, à parte, d -> unrelated
+    add_dependency(session, 1, b, a)
+    add_dependency(session, 1, c, b)
+    add_dependency(session, 1, unrelated, d)
+    before = _positions(session)
+    assert before[d] < before[a] < before[b] < before[c] < before[unrelated]
+
+    # c bloqueia d: d (e só o que está entre as duas posições) anda
+    add_dependency(session, 1, d, c)
+
+    after = _positions(session)
+    _assert_topological(session)
+    assert after[unrelated] == before[unrelated]
+    assert sorted(after[n] for n in (a, b, c, d)) == sorted(
+        before[n] for n in (a, b, c, d)
+    )
+
+
+def test_cycle_is_rejected_with_its_path(session, tasks):
+    a, b, c = tasks[:3]
+    add_dependency(session, 1, b, a)
+    add_dependency(session, 1, c, b)
+    session.commit()
+
+    with pytest.raises(DependencyCycle) as error:
+        add_dependency(session, 1, a, c)
+
+    # c bloqueia a, que bloqueia b, que bloqueia c
+    assert error.value.path == [c, a, b, c]
+    session.rollback()
+    assert (
+        session.scalar(select(TaskDependency).where(TaskDependency.task_id == a))
+        is None
+    )
+
+
+def test_task_cannot_block_itself(session, tasks):
+    with pytest.raises(DependencyCycle) as error:
+        add_dependency(session, 1, tasks[0], tasks[0])
+    assert error.value.path == [tasks[0], tasks[0]]
+
+
+def test_random_edges_match_full_traversal(session, tasks):
+    rng = random.Random(7)
+    edges = []
+    for _ in range(80):
+        blocker, task = rng.sample(tasks, 2)
+        if (blocker, task) in edges:
+            continue
+        closes_cycle = _reaches(edges, task, blocker)
+        savepoint = session.begin_nested()
+        try:
+            add_dependency(session, 1, task, blocker)
+        except DependencyCycle as error:
+            savepoint.rollback()
+            assert closes_cycle
+            path = error.path
+            assert path[0] == path[-1] == blocker and path[1] == task
+            assert all(pair in edges for pair in zip(path[1:], path[2:]))
+        else:
+            savepoint.commit()
+            assert not closes_cycle
+            edges.append((blocker, task))
+        _assert_topological(session)
@@ -0,0 +1,88 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from starlette.requests import Request
+
+from backend.models.users import Task, TaskPriority, TaskStatus
+from backend.services.encoding import (
+    TASK_FIELDS,
+    is_msgpack,
+    pack_rows,
+    pack_tasks,
+    packb,
+    unpackb,
+    wants_msgpack,
+)
+
+
+def _request(accept=None):
+    headers = [] if accept is None else [(b'accept', accept.encode())]
+    return Request({'type': 'http', 'headers': headers})
+
+
+@pytest.mark.parametrize(
+    ('accept', 'expected'),
+    [
+        (None, False),
+        ('application/json', False),
+        ('*/*', False),
+        ('application/msgpack', True),
+        ('application/x-msgpack', True),
+        ('application/json, application/msgpack', True),
+        ('application/msgpack;q=0.9, application/json', False),
+        ('application/msgpack, */*;q=0.1', True),
+        ('application/msgpack;q=0', False),
+        ('application/msgpack;q=abc', False),
+    ],
+)
+def test_accept_negotiation(accept, expected):
+    assert wants_msgpack(_request(accept)) is expected
+
+
+def test_content_type_ignores_parameters_and_case():
+    assert is_msgpack('Application/MsgPack; charset=binary')
+    assert not is_msgpack('application/json')
+    assert not is_msgpack(None)
+
+
+def test_dates_become_compact_timestamps():
+    local = timezone(timedelta(hours=-3))
+    moment = datetime(2025, 5, 10, 9, 30, 15, 123456)
+
+    naive, aware, day = unpackb(
+        packb([moment, moment.replace(tzinfo=local), date(2025, 5, 10)])
+    )
+
+    assert naive == moment.replace(tzinfo=timezone.utc)
+    assert aware == moment.replace(tzinfo=timezone.utc) + timedelta(hours=3)
+    assert day == datetime(2025, 5, 10, tzinfo=timezone.utc)
+    # Timestamp 64 (com micros): 10 bytes, contra 28 do ISO-8601 em JSON
+    assert len(packb(moment)) == 10
+
+
+def test_tasks_are_packed_with_output_fields():
+    task = Task(
+        title='Compacta',
+        user_id=1,
+        status=TaskStatus.PENDENTE,
+        priority=TaskPriority.ALTA,
+    )
+    task.id = 7
+
+    [data] = unpackb(pack_tasks([task]))
+
+    assert tuple(data) == TASK_FIELDS
+    assert data['id'] == 7
+    assert data['status'] == 'pendente'
+    assert data['priority'] == 'alta'
+    assert data['due_date'] is None
+
+
+def test_rows_and_orm_objects_pack_the_same():
+    task = Task(title='Igual', user_id=1, due_date=date(2025, 5, 10))
+    task.id = 1
+    task.created_at = task.updated_at = datetime(2025, 5, 1, 12)
+
+    row = tuple(getattr(task, field) for field in TASK_FIELDS)
+
+    assert pack_rows([row]) == pack_tasks([task])
@@ -0,0 +1,187 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, func, insert, select
+
+import backend.models.database as database
+from backend.app import create_app
+from backend.models.users import Task, User, table_registry
+from backend.services.auth import Auth
+from backend.services.group_commit import GroupCommitter
+from backend.settings import get_settings
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "group.db"}')
+    table_registry.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User).values(
+                name='Ada', email='ada@example.com', hashed_password='h'
+            )
+        )
+    commits = []
+    event.listen(engine, 'commit', lambda connection: commits.append(1))
+    engine.commits = commits
+    yield engine
+    engine.dispose()
+
+
+def _insert(title):
+    def write(session):
+        task = Task(title=title, user_id=1)
+        session.add(task)
+        session.flush()
+        return task.id
+
+    return write
+
+
+def test_concurrent_writes_share_one_commit(engine):
+    committer = GroupCommitter(engine, window=0.2, max_batch=8)
+    barrier = threading.Barrier(8)
+
+    def submit(i):
+        barrier.wait()
+        return committer.submit(_insert(f't{i}'))
+
+    with ThreadPoolExecutor(8) as pool:
+        ids = list(pool.map(submit, range(8)))
+    committer.close()
+
+    assert sorted(ids) == list(range(1, 9))
+    assert len(engine.commits) == 1
+
+
+def test_failed_operation_only_rolls_back_itself(engine):
+    committer = GroupCommitter(engine, window=0.2)
+    barrier = threading.Barrier(3)
+
+    def failing(session):
+        session.add(Task(title='desfeita', user_id=1))
+        session.flush()
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND)
+
+    def submit(write):
+        barrier.wait()
+        return committer.submit(write)
+
+    with ThreadPoolExecutor(3) as pool:
+        futures = [
+            pool.submit(submit, w) for w in (_insert('a'), failing, _insert('b'))
+        ]
+    committer.close()
+
+    assert futures[0].result() and futures[2].result()
+    with pytest.raises(HTTPException):
+        futures[1].result()
+    with engine.connect() as connection:
+        titles = connection.execute(select(Task.title)).scalars()
+        assert sorted(titles) == ['a', 'b']
+
+
+def test_commit_failure_reaches_every_caller(engine):
+    committer = GroupCommitter(engine, window=0)
+
+    def fail_commit(connection):
+        raise RuntimeError('disco cheio')
+
+    event.listen(engine, 'commit', fail_commit)
+    with pytest.raises(RuntimeError, match='disco cheio'):
+        committer.submit(_insert('x'))
+    committer.close()
+
+    # Outra conexão: a do lote ficou com a transação pendente no pool
+    other = create_engine(engine.url)
+    with other.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(Task)).scalar() == 0
+    other.dispose()
+
+
+def test_endpoints_use_group_commit(engine, monkeypatch):
+    with engine.begin() as connection:
+        connection.execute(
+            User.__table__.update().values(
+                hashed_password=Auth().hash_password('S3nh@F0rte')
+            )
+        )
+    monkeypatch.setattr(database, '_engine', engine)
+    settings = get_settings().model_copy(
+        update={'GROUP_COMMIT_ENABLED': True, 'GROUP_COMMIT_WINDOW_MS': 50}
+    )
+
+    with TestClient(create_app(settings)) as client:
+        resp = client.post(
+            '/api/auth/login',
+            json={'email': 'ada@example.com', 'password': 'S3nh@F0rte'},
+        )
+        headers = {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+        created = client.post('/api/tasks', json={'title': 'Nova'}, headers=headers)
+        assert created.status_code == HTTPStatus.CREATED
+        assert created.json()['created_at'] is not None
+        task_id = created.json()['id']
+
+        def toggle(status):
+            return client.patch(
+                f'/api/tasks/{task_id}/status', json={'status': status}, headers=headers
+            )
+
+        with ThreadPoolExecutor(4) as pool:
+            responses = list(pool.map(toggle, ['concluida', 'pendente'] * 2))
+        assert {r.status_code for r in responses} == {HTTPStatus.OK}
+
+        missing = client.patch(
+            '/api/tasks/999/status', json={'status': 'concluida'}, headers=headers
+        )
+        assert missing.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize('sqlite_tuned', [False, True])
+def test_concurrent_creates_above_pool_size(tmp_path, monkeypatch, sqlite_tuned):
+    # A requisição devolve a conexão da autenticação antes de esperar o lote:
+    # senão a thread do committer disputa com ela o pool (1 conexão no
+    # SQLite afinado) e todas estouram o pool_timeout
+    settings = get_settings().model_copy(
+        update={
+            'DATABASE_URL': f'sqlite:///{tmp_path / "pool.db"}',
+            'SQLITE_TUNED': sqlite_tuned,
+            'DATABASE_POOL_SIZE': 4,
+            'DATABASE_MAX_OVERFLOW': 0,
+            'DATABASE_POOL_TIMEOUT': 2.0,
+            'GROUP_COMMIT_ENABLED': True,
+            'GROUP_COMMIT_WINDOW_MS': 20,
+        }
+    )
+    engine = database.create_primary_engine(settings)
+    table_registry.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User).values(
+                name='Ada',
+                email='ada@example.com',
+                hashed_password=Auth().hash_password('S3nh@F0rte'),
+            )
+        )
+    monkeypatch.setattr(database, '_engine', engine)
+
+    with TestClient(create_app(settings)) as client:
+        resp = client.post(
+            '/api/auth/login',
+            json={'email': 'ada@example.com', 'password': 'S3nh@F0rte'},
+        )
+        headers = {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+
+        def create(i):
+            return client.post('/api/tasks', json={'title': f't{i}'}, headers=headers)
+
+        with ThreadPoolExecutor(8) as pool:
+            responses = list(pool.map(create, range(8)))
+    engine.dispose()
+
+    assert [r.status_code for r in responses] == [HTTPStatus.CREATED] * 8
+    assert len({r.json()['id'] for r in responses}) == 8
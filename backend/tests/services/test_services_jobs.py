@@ -0,0 +1,235 @@
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.orm import Session
+
+from backend.models.jobs import Job, JobStatus, utc_now
+from backend.models.users import Task, TaskStatus, User, table_registry
+from backend.services.jobs import (
+    HANDLERS,
+    JobFailed,
+    Worker,
+    claim,
+    enqueue,
+    handler,
+    requeue_stale,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "jobs.db"}')
+    table_registry.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User).values(
+                name='Ada', email='ada@example.com', hashed_password='h'
+            )
+        )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def flaky():
+    calls = []
+
+    @handler('test_flaky')
+    def run(context):
+        calls.append(context.job_id)
+        if context.params.get('fatal'):
+            raise JobFailed('sem conserto')
+        if len(calls) < context.params.get('fail_times', 0) + 1:
+            raise RuntimeError('instável')
+        context.progress(1, 2)
+        return {'calls': len(calls)}
+
+    yield calls
+    del HANDLERS['test_flaky']
+
+
+def _enqueue(engine, kind='test_flaky', params=None, **kwargs) -> int:
+    with Session(engine) as session:
+        job = enqueue(session, kind, 1, params, **kwargs)
+        session.commit()
+        return job.id
+
+
+def _job(engine, job_id) -> Job:
+    with Session(engine) as session:
+        return session.get(Job, job_id)
+
+
+def test_claim_takes_highest_priority_then_oldest(engine, flaky):
+    low = _enqueue(engine, priority=0)
+    high = _enqueue(engine, priority=5)
+    other_low = _enqueue(engine, priority=0)
+
+    claimed = [claim(engine, 'w1').id for _ in range(3)]
+
+    assert claimed == [high, low, other_low]
+    assert claim(engine, 'w1') is None
+    job = _job(engine, high)
+    assert job.status == JobStatus.EXECUTANDO
+    assert job.attempts == 1
+    assert job.locked_by == 'w1'
+
+
+def test_concurrent_claims_never_share_a_job(engine, flaky):
+    ids = {_enqueue(engine) for _ in range(20)}
+    claimed, lock = [], threading.Lock()
+
+    def take(worker_id):
+        while (job := claim(engine, worker_id)) is not None:
+            with lock:
+                claimed.append(job.id)
+
+    threads = [threading.Thread(target=take, args=(f'w{i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(ids)
+
+
+def test_enqueue_rejects_unknown_kind(engine):
+    with Session(engine) as session, pytest.raises(ValueError):
+        enqueue(session, 'nao_existe', 1)
+
+
+def test_enqueue_sets_run_after_in_utc(engine, flaky):
+    before = utc_now()
+    job = _job(engine, _enqueue(engine))
+
+    # Mesma referência com que o claim compara, qualquer que seja o fuso do banco
+    assert before <= job.run_after <= utc_now()
+
+
+def test_worker_runs_job_and_stores_result(engine, flaky):
+    job_id = _enqueue(engine)
+
+    assert Worker(engine, worker_id='w').run_once() is True
+    assert Worker(engine, worker_id='w').run_once() is False
+
+    job = _job(engine, job_id)
+    assert job.status == JobStatus.CONCLUIDO
+    assert job.progress == 100
+    assert job.result == {'calls': 1}
+    assert job.locked_by is None
+    assert job.finished_at is not None
+
+
+def test_failure_is_retried_with_backoff(engine, flaky):
+    job_id = _enqueue(engine, params={'fail_times': 1})
+    worker = Worker(engine, worker_id='w', backoff=60)
+
+    worker.run_once()
+    job = _job(engine, job_id)
+    assert job.status == JobStatus.AGUARDANDO
+    assert job.error == 'RuntimeError: instável'
+    assert job.run_after > datetime.utcnow() + timedelta(seconds=50)
+    # Ainda no backoff: a fila parece vazia
+    assert worker.run_once() is False
+
+    with engine.begin() as connection:
+        connection.execute(update(Job).values(run_after=datetime(2000, 1, 1)))
+    worker.run_once()
+    job = _job(engine, job_id)
+    assert job.status == JobStatus.CONCLUIDO
+    assert job.attempts == 2
+
+
+def test_gives_up_after_max_attempts_or_job_failed(engine, flaky):
+    exhausted = _enqueue(engine, params={'fail_times': 5}, max_attempts=2)
+    fatal = _enqueue(engine, params={'fatal': True})
+    worker = Worker(engine, worker_id='w', backoff=0)
+
+    while worker.run_once():
+        pass
+
+    assert _job(engine, exhausted).status == JobStatus.FALHOU
+    assert _job(engine, exhausted).attempts == 2
+    assert _job(engine, fatal).status == JobStatus.FALHOU
+    assert _job(engine, fatal).attempts == 1
+    assert _job(engine, fatal).error == 'JobFailed: sem conserto'
+
+
+def test_stale_jobs_go_back_to_queue(engine, flaky):
+    retry = _enqueue(engine)
+    last_try = _enqueue(engine, max_attempts=1)
+    claim(engine, 'morto')
+    claim(engine, 'morto')
+    with engine.begin() as connection:
+        connection.execute(update(Job).values(locked_at=datetime(2000, 1, 1)))
+
+    assert requeue_stale(engine, lease=60) == 1
+
+    assert _job(engine, retry).status == JobStatus.AGUARDANDO
+    assert _job(engine, retry).locked_by is None
+    assert _job(engine, last_try).status == JobStatus.FALHOU
+
+
+def test_export_and_delete_handlers(engine, tmp_path):
+    with Session(engine) as session:
+        session.add_all([
+            Task(title='a', user_id=1),
+            Task(title='b', user_id=1, status=TaskStatus.CONCLUIDA),
+            Task(title='c', user_id=1, status=TaskStatus.CONCLUIDA),
+        ])
+        session.commit()
+    export = _enqueue(engine, 'export_tasks')
+    cleanup = _enqueue(engine, 'delete_tasks', {'status': 'concluida'})
+    worker = Worker(engine, worker_id='w', export_dir=str(tmp_path))
+
+    while worker.run_once():
+        pass
+
+    # A lista vai para o arquivo; o resultado do job só aponta para ele
+    assert _job(engine, export).result == {
+        'count': 3,
+        'file': f'tasks-{export}.jsonl',
+    }
+    lines = (tmp_path / f'tasks-{export}.jsonl').read_text().splitlines()
+    assert [json.loads(line)['title'] for line in lines] == ['a', 'b', 'c']
+    assert not list(tmp_path.glob('*.part'))
+    assert _job(engine, cleanup).result == {'deleted': 2}
+    with Session(engine) as session:
+        assert session.scalars(select(Task.title)).all() == ['a']
+
+
+def test_run_stops_on_event(engine):
+    stop = threading.Event()
+    worker = Worker(engine, worker_id='w', poll_interval=0.01)
+    thread = threading.Thread(target=worker.run, args=(stop,))
+    thread.start()
+    stop.set()
+    thread.join(2)
+
+    assert not thread.is_alive()
+
+
+def test_rebalance_rewrites_long_ranks_in_same_order(engine):
+    ranks = ['a0', 'a0V', 'a0VV', 'a0VVV', 'a1']
+    with Session(engine) as session:
+        for title, rank in zip('edcba', reversed(ranks)):
+            task = Task(title=title, user_id=1)
+            task.rank = rank
+            session.add(task)
+        session.commit()
+        stamps = dict(session.execute(select(Task.title, Task.updated_at)).all())
+    job_id = _enqueue(engine, 'rebalance_ranks')
+
+    assert Worker(engine, worker_id='w').run_once() is True
+
+    assert _job(engine, job_id).result == {'tasks': 5}
+    with Session(engine) as session:
+        rows = session.execute(
+            select(Task.title, Task.rank, Task.updated_at).order_by(Task.rank)
+        ).all()
+    assert [title for title, _, _ in rows] == list('abcde')
+    assert max(len(rank) for _, rank, _ in rows) == 2
+    assert {title: updated for title, _, updated in rows} == stamps
@@ -0,0 +1,176 @@
+from datetime import timedelta
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+import backend.services.auth as auth_module
+from backend.services.auth import Auth
+from backend.services.keys import KeyRing
+
+
+def _private_pem(key) -> str:
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def _public_pem(key) -> str:
+    return (
+        key
+        .public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+
+
+@pytest.fixture
+def ed_keys():
+    return {
+        'k1': ed25519.Ed25519PrivateKey.generate(),
+        'k2': ed25519.Ed25519PrivateKey.generate(),
+    }
+
+
+@pytest.fixture
+def asymmetric_settings(monkeypatch, ed_keys):
+    class TestSettings:
+        JWT_ISSUER = 'test-issuer'
+        JWT_AUDIENCE = None
+        JWT_ALGORITHM = 'EdDSA'
+        JWT_SECRET = ''
+        JWT_TTL_MINUTES = 1
+        JWT_REVOKED_MAX = 100
+        JWT_PRIVATE_KEYS = {kid: _private_pem(k) for kid, k in ed_keys.items()}
+        JWT_PUBLIC_KEYS = {}
+        JWT_SIGNING_KID = 'k2'
+
+    monkeypatch.setattr(auth_module, 'get_settings', lambda: TestSettings())
+    return TestSettings
+
+
+def test_eddsa_token_carries_kid_and_verifies(asymmetric_settings):
+    auth = Auth()
+    token = auth.generate_token(subject='u1')['access_token']
+
+    assert jwt.get_unverified_header(token)['kid'] == 'k2'
+    assert jwt.get_unverified_header(token)['alg'] == 'EdDSA'
+
+    ok, payload, err = auth.verify_token(token)
+    assert ok is True, err
+    assert payload['sub'] == 'u1'
+
+
+def test_rotation_keeps_verifying_tokens_from_retired_key(asymmetric_settings, ed_keys):
+    old_token = Auth().generate_token(subject='u1')['access_token']
+
+    # k2 aposentada: sai das privadas e fica só a pública
+    asymmetric_settings.JWT_PRIVATE_KEYS = {'k1': _private_pem(ed_keys['k1'])}
+    asymmetric_settings.JWT_PUBLIC_KEYS = {'k2': _public_pem(ed_keys['k2'])}
+    asymmetric_settings.JWT_SIGNING_KID = 'k1'
+    auth = Auth()
+
+    new_token = auth.generate_token(subject='u2')['access_token']
+    assert jwt.get_unverified_header(new_token)['kid'] == 'k1'
+    assert auth.verify_token(old_token)[0] is True
+    assert auth.verify_token(new_token)[0] is True
+
+
+def test_unknown_kid_is_rejected(asymmetric_settings):
+    auth = Auth()
+    other = ed25519.Ed25519PrivateKey.generate()
+    token = jwt.encode(
+        {'sub': 'u1'}, other, algorithm='EdDSA', headers={'kid': 'forjada'}
+    )
+
+    ok, payload, err = auth.verify_token(token)
+    assert ok is False
+    assert payload is None
+    assert 'desconhecida' in err
+
+
+def test_token_signed_with_wrong_key_for_kid_is_rejected(asymmetric_settings):
+    auth = Auth()
+    forged = jwt.encode(
+        {'sub': 'u1'},
+        ed25519.Ed25519PrivateKey.generate(),
+        algorithm='EdDSA',
+        headers={'kid': 'k1'},
+    )
+    assert auth.verify_token(forged)[0] is False
+
+
+def test_verification_keys_are_parsed_once(ed_keys):
+    ring = KeyRing(
+        algorithm='EdDSA',
+        private_keys={'k1': _private_pem(ed_keys['k1'])},
+    )
+
+    first = ring.verification_key('k1')
+    assert ring.verification_key('k1') is first
+
+
+def test_pem_can_be_loaded_from_file(tmp_path, ed_keys):
+    pem_file = tmp_path / 'k1.pem'
+    pem_file.write_text(_private_pem(ed_keys['k1']))
+    ring = KeyRing(algorithm='EdDSA', private_keys={'k1': str(pem_file)})
+
+    kid, _, algorithm = ring.signing_key()
+    assert (kid, algorithm) == ('k1', 'EdDSA')
+
+
+def test_rs256_signing_and_jwks():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    ring = KeyRing(
+        algorithm='RS256',
+        private_keys={'rsa-1': _private_pem(key)},
+    )
+
+    kid, signing_key, algorithm = ring.signing_key()
+    token = jwt.encode({'sub': 'u1'}, signing_key, algorithm=algorithm)
+    verify_key, _ = ring.verification_key(kid)
+    assert jwt.decode(token, verify_key, algorithms=['RS256'])['sub'] == 'u1'
+
+    (jwk,) = ring.jwks()['keys']
+    assert jwk['kty'] == 'RSA'
+    assert jwk['kid'] == 'rsa-1'
+    assert jwk['alg'] == 'RS256'
+    assert 'd' not in jwk  # nunca expor material privado
+
+
+def test_jwks_lists_every_verification_key(asymmetric_settings, ed_keys):
+    asymmetric_settings.JWT_PUBLIC_KEYS = {
+        'old': _public_pem(ed25519.Ed25519PrivateKey.generate())
+    }
+    auth = Auth()
+    token = auth.generate_token(subject='u1')['access_token']
+
+    jwks = auth.jwks()
+    assert [k['kid'] for k in jwks['keys']] == ['k1', 'k2', 'old']
+    assert all(k['kty'] == 'OKP' and k['use'] == 'sig' for k in jwks['keys'])
+
+    # Um serviço de borda consegue validar apenas com o JWKS publicado
+    by_kid = {k['kid']: k for k in jwks['keys']}
+    public = jwt.PyJWK(by_kid[jwt.get_unverified_header(token)['kid']])
+    payload = jwt.decode(
+        token, public.key, algorithms=['EdDSA'], options={'verify_aud': False}
+    )
+    assert payload['sub'] == 'u1'
+
+
+def test_symmetric_mode_publishes_no_keys():
+    ring = KeyRing(algorithm='HS256', secret='s')
+    assert ring.jwks() == {'keys': []}
+    assert ring.signing_key() == (None, 's', 'HS256')
+
+
+def test_expired_asymmetric_token_reports_expired(asymmetric_settings):
+    auth = Auth()
+    token = auth._encode(sub='u1', ttl=timedelta(seconds=-1))
+    assert auth.verify_token(token) == (False, None, 'expired')
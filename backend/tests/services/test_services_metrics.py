@@ -0,0 +1,119 @@
+import os
+import subprocess
+import sys
+
+from backend.services import metrics
+from backend.services.auth import Auth
+from backend.services.metrics import (
+    MultiprocessStore,
+    Registry,
+    merge,
+    render,
+)
+
+
+def _value(text: str, series: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(series + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+
+def test_render_prometheus_text():
+    registry = Registry()
+    registry.counter('jobs_total', 'Jobs.', ('kind',)).labels('a"b').inc(2)
+    histogram = registry.histogram('wait_seconds', 'Espera.', buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(3)
+
+    text = render(registry.snapshot())
+
+    assert '# TYPE jobs_total counter' in text
+    assert 'jobs_total{kind="a\\"b"} 2' in text
+    assert 'wait_seconds_bucket{le="0.1"} 1' in text
+    assert 'wait_seconds_bucket{le="1"} 2' in text
+    assert 'wait_seconds_bucket{le="+Inf"} 3' in text
+    assert 'wait_seconds_count 3' in text
+    assert 'wait_seconds_sum 3.55' in text
+
+
+def test_requests_are_counted_by_route_template(client):
+    series = (
+        'http_requests_total{method="GET",route="/api/tasks/{task_id}",status="401"}'
+    )
+    before = _value(client.get('/metrics').text, series)
+
+    client.get('/api/tasks/1')
+    client.get('/api/tasks/2')
+    client.get('/nao-existe')
+
+    resp = client.get('/metrics')
+    assert resp.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert _value(resp.text, series) == before + 2
+    assert (
+        'http_requests_total{method="GET",route="<unmatched>",status="404"}'
+        in resp.text
+    )
+    assert (
+        'http_request_duration_seconds_bucket{method="GET",route="/api/tasks/{task_id}",le="+Inf"}'
+        in resp.text
+    )
+    assert 'http_response_size_bytes_count{method="GET",route="/metrics"}' in resp.text
+    assert 'http_requests_in_flight 1' in resp.text
+
+
+def test_auth_counters():
+    auth = Auth()
+    snapshot = lambda: render(metrics.REGISTRY.snapshot())  # noqa: E731
+    before = snapshot()
+
+    token = auth.generate_token(subject=1)['access_token']
+    auth.verify_token('lixo')
+    auth.revoke_token(token)
+    auth.verify_token(token)
+    auth.verify_password('x', auth.hash_password('y'))
+
+    after = snapshot()
+    for series, delta in (
+        ('auth_token_verify_failures_total{reason="invalid"}', 1),
+        ('auth_token_verify_failures_total{reason="revoked"}', 1),
+        ('auth_token_revocations_total', 1),
+        ('auth_password_hash_seconds_count{operation="hash"}', 1),
+        ('auth_password_hash_seconds_count{operation="verify"}', 1),
+    ):
+        assert _value(after, series) == _value(before, series) + delta, series
+
+
+def test_multiprocess_files_are_summed(tmp_path):
+    registry = Registry()
+    requests = registry.counter('req_total', 'Req.')
+    in_flight = registry.gauge('in_flight', 'Em andamento.')
+    store = MultiprocessStore(str(tmp_path), registry)
+
+    # Worker que já morreu: contador continua somando, gauge não
+    dead = subprocess.run(
+        [sys.executable, '-c', 'import os; print(os.getpid())'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    dead_pid = int(dead.stdout)
+    requests.inc(5)
+    in_flight.set(7)
+    store.flush()
+    os.replace(tmp_path / f'metrics-{os.getpid()}.json', tmp_path / 'x.json')
+    data = (
+        (tmp_path / 'x.json')
+        .read_text()
+        .replace(f'"pid": {os.getpid()}', f'"pid": {dead_pid}')
+    )
+    (tmp_path / f'metrics-{dead_pid}.json').write_text(data)
+    (tmp_path / 'x.json').unlink()
+
+    requests.inc(1)  # total local: 6
+    in_flight.set(2)
+
+    text = render(merge(store.collect()))
+    assert 'req_total 11' in text
+    assert 'in_flight 2' in text
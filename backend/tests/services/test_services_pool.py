@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from backend.models.database import engine_options
+from backend.services.pool import (
+    Histogram,
+    InstrumentedQueuePool,
+    instrument,
+    pool_status,
+    stats_for,
+)
+from backend.settings import get_settings
+
+
+@pytest.fixture
+def settings():
+    return get_settings().model_copy(
+        update={
+            'DATABASE_POOL_SIZE': 1,
+            'DATABASE_MAX_OVERFLOW': 0,
+            'DATABASE_POOL_TIMEOUT': 0.05,
+            'DATABASE_POOL_PRE_PING': True,
+        }
+    )
+
+
+@pytest.fixture
+def engine(tmp_path, settings, request):
+    url = f'sqlite:///{tmp_path / "pool.db"}'
+    engine = create_engine(
+        url, **engine_options(settings, url, label=request.node.name)
+    )
+    instrument(engine, request.node.name)
+    yield engine
+    engine.dispose()
+
+
+def test_engine_options_follow_settings(settings):
+    options = engine_options(settings, 'sqlite:///./x.db')
+    assert options['poolclass'] is InstrumentedQueuePool
+    assert options['pool_size'] == 1
+    assert options['max_overflow'] == 0
+    assert options['pool_timeout'] == 0.05
+    assert options['pool_pre_ping'] is True
+
+
+def test_memory_sqlite_skips_queue_pool_options(settings):
+    options = engine_options(settings, 'sqlite:///:memory:')
+    assert 'pool_size' not in options
+    assert 'poolclass' not in options
+
+
+def test_histogram_is_cumulative():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 5, 50):
+        histogram.observe(value)
+
+    snap = histogram.snapshot()
+    assert snap['buckets'] == {'1': 1, '10': 2, '+Inf': 3}
+    assert snap['count'] == 3
+    assert snap['sum'] == 55.5
+
+
+def test_pool_events_feed_stats(engine, request):
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+        busy = pool_status(engine, capacity=1)
+        assert busy['checked_out'] == 1
+        assert busy['saturated'] is True
+
+    status = pool_status(engine, capacity=1)
+    assert status['label'] == request.node.name
+    assert status['checked_out'] == 0
+    assert status['saturated'] is False
+    assert status['connects'] == 1
+    assert status['checkouts'] == 1
+    assert status['checkins'] == 1
+    assert status['checkout_wait_ms']['count'] == 1
+
+
+def test_checkout_timeout_is_counted(engine, request):
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = stats_for(request.node.name)
+    assert stats.checkout_timeouts == 1
+    assert stats.checkout_wait_ms.snapshot()['count'] == 2
+
+
+def test_stats_survive_dispose(engine, request):
+    with engine.connect():
+        pass
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    status = pool_status(engine)
+    assert status['connects'] == 2
+    assert status['closes'] == 1
@@ -0,0 +1,79 @@
+import json
+import pstats
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import create_app
+from backend.models.database import get_read_session, get_session
+from backend.services.auth import Auth
+from backend.services.profiling import ProfilingMiddleware
+from backend.settings import get_settings
+
+
+def _app(session, **settings):
+    app = create_app(get_settings().model_copy(update=settings))
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_read_session] = lambda: session
+    return app
+
+
+@pytest.fixture
+def headers(session):
+    from backend.models.users import User
+
+    user = User(name='Ada', email='ada@example.com', hashed_password='h')
+    session.add(user)
+    session.commit()
+    token = Auth().generate_token(subject=user.id, extra_claims={'email': user.email})[
+        'access_token'
+    ]
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_admin_header_profiles_request(session, headers, tmp_path):
+    # Sem cache: as três listagens precisam ir ao banco
+    app = _app(
+        session,
+        PROFILING_TOKEN='segredo',
+        PROFILING_DIR=str(tmp_path),
+        TASK_CACHE_ENABLED=False,
+    )
+
+    with TestClient(app) as client:
+        plain = client.get('/api/tasks', headers=headers)
+        wrong = client.get('/api/tasks', headers={**headers, 'X-Profile': 'x'})
+        resp = client.get('/api/tasks', headers={**headers, 'X-Profile': 'segredo'})
+
+    assert plain.status_code == wrong.status_code == resp.status_code == HTTPStatus.OK
+    assert 'x-profile-id' not in plain.headers
+    assert 'x-profile-id' not in wrong.headers
+
+    profile_id = resp.headers['x-profile-id']
+    (meta_path,) = tmp_path.glob(f'*{profile_id}.json')
+    metadata = json.loads(meta_path.read_text())
+    assert metadata['route'] == '/api/tasks'
+    assert metadata['user'] == 'user:1'
+    assert metadata['status'] == HTTPStatus.OK
+    assert metadata['sql']['count'] == len(metadata['sql']['statements']) == 2
+    assert 'FROM tasks' in metadata['sql']['statements'][1]['sql']
+    assert 'cumulative' in metadata['top_functions']
+
+    stats = pstats.Stats(str(meta_path.with_suffix('.prof')))
+    assert stats.total_calls > 0
+
+
+def test_sample_rate_profiles_without_header(session, tmp_path):
+    app = _app(session, PROFILING_SAMPLE_RATE=1.0, PROFILING_DIR=str(tmp_path))
+
+    with TestClient(app) as client:
+        resp = client.get('/api/health/live')
+
+    assert 'x-profile-id' in resp.headers
+    assert len(list(tmp_path.glob('*.prof'))) == 1
+
+
+def test_disabled_profiling_installs_nothing(session):
+    app = _app(session)
+    assert ProfilingMiddleware not in [m.cls for m in app.user_middleware]
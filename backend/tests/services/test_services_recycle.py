@@ -0,0 +1,46 @@
+from http import HTTPStatus
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.services.recycle import MaxRequestsMiddleware
+
+
+def _app(max_requests, jitter=0):
+    stops = []
+    app = FastAPI()
+    app.get('/ping')(lambda: {'ok': True})
+    app.add_middleware(
+        MaxRequestsMiddleware,
+        max_requests=max_requests,
+        jitter=jitter,
+        stop=lambda: stops.append(True),
+    )
+    return app, stops
+
+
+def test_worker_stops_once_after_limit():
+    app, stops = _app(3)
+
+    with TestClient(app) as client:
+        for _ in range(2):
+            assert client.get('/ping').status_code == HTTPStatus.OK
+        assert stops == []
+        # A requisição que atinge o limite ainda é respondida
+        assert client.get('/ping').status_code == HTTPStatus.OK
+        assert stops == [True]
+        client.get('/ping')
+
+    assert stops == [True]
+
+
+def test_jitter_spreads_limit():
+    limits = {
+        MaxRequestsMiddleware(
+            None, max_requests=100, jitter=50, stop=lambda: None
+        ).limit
+        for _ in range(50)
+    }
+
+    assert all(100 <= limit <= 150 for limit in limits)
+    assert len(limits) > 1
@@ -0,0 +1,112 @@
+import json
+import logging
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+
+from backend.app import create_app
+from backend.models.database import get_read_session, get_session
+from backend.models.users import Task, User
+from backend.services import sql_stats
+from backend.services.sql_stats import SQLStatsMiddleware, fingerprint
+from backend.settings import get_settings
+
+
+def _events(caplog, name):
+    return [
+        json.loads(record.getMessage())
+        for record in caplog.records
+        if record.name == 'backend.sql' and f'"event": "{name}"' in record.getMessage()
+    ]
+
+
+@pytest.fixture
+def debug_client(session):
+    app = create_app(get_settings().model_copy(update={'SQL_DEBUG': True}))
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_read_session] = lambda: session
+    app.state.task_events = None
+    with TestClient(app) as client:
+        yield client
+
+
+def test_fingerprint_normalizes_literals_and_params():
+    assert (
+        fingerprint(
+            "SELECT * FROM tasks\n  WHERE id IN (?, ?, ?) AND title = 'x''y' AND n > 10"
+        )
+        == 'SELECT * FROM tasks WHERE id IN (?+) AND title = ? AND n > ?'
+    )
+    assert fingerprint('SELECT a FROM t WHERE b = %(b_1)s AND c = $2') == (
+        'SELECT a FROM t WHERE b = ? AND c = ?'
+    )
+    assert fingerprint('SELECT x::int FROM tasks_1') == 'SELECT x::int FROM tasks_1'
+
+
+def test_debug_headers_count_statements(debug_client):
+    resp = debug_client.post(
+        '/api/auth/register',
+        json={'name': 'Ada', 'email': 'ada@example.com', 'password': 'S3nh@F0rte'},
+    )
+    headers = {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+
+    resp = debug_client.post('/api/tasks', json={'title': 'T'}, headers=headers)
+
+    # usuário, menor rank do dono (topo da lista), INSERT e refresh:
+    # atribuir task.user não carrega o backref
+    assert resp.headers['x-sql-count'] == '4'
+    assert float(resp.headers['x-sql-time-ms']) >= 0
+    assert resp.headers['server-timing'].startswith('db;dur=')
+    assert 'x-sql-n-plus-one' not in resp.headers
+
+
+def test_headers_are_off_without_debug(client):
+    resp = client.get('/api/health/live')
+    assert 'x-sql-count' not in resp.headers
+
+
+def test_lazy_loads_are_flagged_as_n_plus_one(session, caplog):
+    for i in range(3):
+        user = User(name=f'U{i}', email=f'u{i}@example.com', hashed_password='h')
+        session.add(user)
+        session.flush()
+        session.add(Task(title=f'T{i}', user_id=user.id))
+    session.commit()
+
+    app = FastAPI()
+    app.add_middleware(SQLStatsMiddleware, debug=True, n_plus_one_threshold=3)
+    sql_stats.install()
+
+    @app.get('/owners')
+    def owners(db=Depends(lambda: session)):
+        db.expire_all()
+        return [task.user.name for task in db.scalars(select(Task))]
+
+    with caplog.at_level(logging.WARNING, logger='backend.sql'):
+        resp = TestClient(app).get('/owners')
+
+    assert resp.json() == ['U0', 'U1', 'U2']
+    assert resp.headers['x-sql-count'] == '4'
+    assert resp.headers['x-sql-n-plus-one'] == '1'
+    (flagged,) = _events(caplog, 'n_plus_one')
+    assert flagged['executions'] == 3
+    assert flagged['path'] == '/owners'
+    assert flagged['fingerprint'].startswith('SELECT users.id')
+
+
+def test_slow_queries_are_logged_with_aggregates(session, caplog, monkeypatch):
+    sql_stats.install()
+    sql_stats.reset_query_stats()
+    monkeypatch.setattr(sql_stats, '_slow_query_ms', 0.0)
+
+    with caplog.at_level(logging.WARNING, logger='backend.sql'):
+        session.execute(text('SELECT 1 + 41'))
+        session.execute(text('SELECT 1 + 99'))
+
+    slow = _events(caplog, 'slow_query')
+    assert [entry['fingerprint'] for entry in slow] == ['SELECT ? + ?'] * 2
+    assert slow[-1]['stats']['count'] == 2
+    assert slow[-1]['path'] is None
+    assert sql_stats.query_stats()[0]['fingerprint'] == 'SELECT ? + ?'
@@ -0,0 +1,143 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import create_app
+from backend.models.database import get_read_session, get_session
+from backend.services import metrics
+from backend.services.auth import Auth
+from backend.services.task_cache import (
+    FileChannel,
+    LocalChannel,
+    TaskListCache,
+    create_task_cache,
+)
+from backend.settings import get_settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _hits(result):
+    for key, value in metrics.task_cache_requests.snapshot()['samples']:
+        if key == [result]:
+            return value
+    return 0.0
+
+
+def test_ttl_and_lru_eviction():
+    clock = FakeClock()
+    cache = TaskListCache(max_entries=2, ttl=10, clock=clock)
+    for user_id in (1, 2):
+        assert cache.put((user_id, ''), b'[]', cache.version(user_id))
+
+    hits = _hits('hit')
+    assert cache.get((1, '')) == b'[]'
+    assert _hits('hit') == hits + 1
+
+    # 1 foi usado por último: a LRU descarta o 2
+    cache.put((3, ''), b'[]', 0)
+    assert cache.get((2, '')) is None
+    assert len(cache) == 2
+
+    clock.now = 10
+    assert cache.get((1, '')) is None
+    assert len(cache) == 1
+
+
+def test_invalidation_wins_over_concurrent_fill():
+    cache = TaskListCache()
+    cache.put((1, ''), b'[velho]', cache.version(1))
+    cache.put((1, 'status=pendente'), b'[]', cache.version(1))
+
+    # Leitura começou antes da escrita e termina depois do invalidate
+    version = cache.version(1)
+    cache.invalidate(1)
+    assert cache.put((1, ''), b'[lido antes]', version) is False
+
+    assert cache.get((1, '')) is None
+    assert cache.get((1, 'status=pendente')) is None
+    assert cache.put((1, ''), b'[novo]', cache.version(1))
+    assert cache.get((1, '')) == b'[novo]'
+
+
+def test_oversized_bodies_are_not_cached():
+    cache = TaskListCache(max_entry_bytes=4)
+    assert cache.put((1, ''), b'12345', 0) is False
+    assert len(cache) == 0
+
+
+def test_file_channel_invalidates_other_workers(tmp_path):
+    # Dois caches com o mesmo diretório fazem o papel de dois workers
+    worker_a = TaskListCache(channel=FileChannel(str(tmp_path), slots=8))
+    worker_b = TaskListCache(channel=FileChannel(str(tmp_path), slots=8))
+    worker_a.put((1, ''), b'[a]', worker_a.version(1))
+    worker_b.put((1, ''), b'[b]', worker_b.version(1))
+    worker_b.put((2, ''), b'[b2]', worker_b.version(2))
+
+    worker_a.invalidate(1)
+
+    assert worker_a.get((1, '')) is None
+    assert worker_b.get((1, '')) is None
+    assert worker_b.get((2, '')) == b'[b2]'
+    assert worker_b.version(9) == worker_b.version(1)  # 9 % 8 colide com 1
+
+
+def test_local_channel_is_per_process():
+    channel = LocalChannel()
+    channel.invalidate(7)
+    assert channel.version(7) == 1
+    assert channel.version(8) == 0
+
+
+def test_cache_needs_shared_channel(tmp_path):
+    settings = get_settings().model_copy(update={'TASK_CACHE_ENABLED': True})
+
+    cache = create_task_cache(
+        settings.model_copy(update={'TASK_CACHE_CHANNEL_DIR': str(tmp_path)})
+    )
+    assert isinstance(cache.channel, FileChannel)
+    cache.channel.close()
+
+    # Invalidação só no próprio processo: os outros workers ficariam velhos
+    unshared = settings.model_copy(update={'TASK_CACHE_CHANNEL_DIR': None})
+    assert create_task_cache(unshared) is None
+
+
+@pytest.mark.parametrize('enabled', [True, False])
+def test_cache_switch_keeps_response(session, tmp_path, enabled):
+    from backend.models.users import Task, TaskPriority, User
+
+    user = User(name='Ada', email='ada@example.com', hashed_password='h')
+    session.add(user)
+    session.commit()
+    session.add(Task(title='T', user_id=user.id, priority=TaskPriority.ALTA))
+    session.commit()
+    token = Auth().generate_token(subject=user.id, extra_claims={'email': user.email})
+    headers = {'Authorization': f'Bearer {token["access_token"]}'}
+
+    app = create_app(
+        get_settings().model_copy(
+            update={
+                'TASK_CACHE_ENABLED': enabled,
+                'TASK_CACHE_CHANNEL_DIR': str(tmp_path),
+            }
+        )
+    )
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_read_session] = lambda: session
+    with TestClient(app) as client:
+        responses = [client.get('/api/tasks', headers=headers) for _ in range(2)]
+
+    assert (app.state.task_cache is not None) is enabled
+    assert [r.headers.get('x-cache') for r in responses] == (
+        ['miss', 'hit'] if enabled else [None, None]
+    )
+    body = responses[1].json()
+    assert body == responses[0].json()
+    assert body[0]['title'] == 'T'
+    assert body[0]['priority'] == 'alta'
@@ -0,0 +1,167 @@
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert, select
+
+import backend.models.database as database
+from backend.app import create_app
+from backend.models.events import TaskEvent
+from backend.models.users import TaskStatus, User, table_registry
+from backend.services.auth import Auth
+from backend.services.task_events import EventLog, diff
+from backend.settings import get_settings
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "events.db"}')
+    table_registry.metadata.create_all(engine)
+    inserts = []
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _count(connection, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO task_events'):
+            inserts.append(executemany)
+
+    engine.inserts = inserts
+    yield engine
+    engine.dispose()
+
+
+def _events(engine):
+    with engine.connect() as connection:
+        return connection.execute(select(TaskEvent).order_by(TaskEvent.id)).all()
+
+
+def test_diff_only_changed_fields_in_json_form():
+    before = {'title': 'a', 'status': TaskStatus.PENDENTE, 'due_date': None}
+    after = {'title': 'a', 'status': TaskStatus.CONCLUIDA, 'due_date': date(2025, 1, 2)}
+
+    assert diff(before, after) == {
+        'status': ['pendente', 'concluida'],
+        'due_date': [None, '2025-01-02'],
+    }
+
+
+def test_emits_are_written_in_one_batch(engine):
+    log = EventLog(lambda: engine, flush_interval=5.0, batch_size=3)
+    for task_id in range(1, 4):
+        log.emit(task_id, 1, 'created', {'title': [None, f't{task_id}']})
+    log.close()
+
+    rows = _events(engine)
+    assert [row.task_id for row in rows] == [1, 2, 3]
+    assert rows[0].changes == {'title': [None, 't1']}
+    assert engine.inserts == [True]
+
+
+def test_close_drains_queue(engine):
+    log = EventLog(lambda: engine, flush_interval=60.0)
+    for task_id in range(1, 6):
+        log.emit(task_id, 1, 'deleted', {'title': ['x', None]})
+    log.close()
+
+    assert len(_events(engine)) == 5
+
+
+def test_failed_write_goes_to_spool_and_is_replayed(engine, tmp_path):
+    broken = create_engine(f'sqlite:///{tmp_path / "sem_tabela.db"}')
+    log = EventLog(lambda: broken, flush_interval=0.01, spool_dir=tmp_path / 'spool')
+    log.emit(1, 1, 'created', {'title': [None, 'a']})
+    log.emit(2, 1, 'created', {'title': [None, 'b']})
+    log.close()
+    broken.dispose()
+
+    assert len(list((tmp_path / 'spool').glob('task-events-*.jsonl'))) == 1
+
+    replay = EventLog(lambda: engine, spool_dir=tmp_path / 'spool')
+    assert replay.replay_spool() == 2
+    assert [row.task_id for row in _events(engine)] == [1, 2]
+    assert list((tmp_path / 'spool').iterdir()) == []
+
+
+def test_full_queue_spools_instead_of_blocking(engine, tmp_path):
+    log = EventLog(lambda: engine, max_queue=1, spool_dir=tmp_path / 'spool')
+    # Thread ainda não iniciada: a fila enche no segundo evento
+    log._ensure_started = lambda: None
+    log.emit(1, 1, 'created', {'title': [None, 'a']})
+    log.emit(2, 1, 'created', {'title': [None, 'b']})
+
+    assert log.replay_spool() == 1
+    assert [row.task_id for row in _events(engine)] == [2]
+
+
+def test_task_endpoints_record_events(engine, monkeypatch):
+    password = Auth().hash_password('S3nh@F0rte')
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            [
+                {
+                    'name': 'Ada',
+                    'email': 'ada@example.com',
+                    'hashed_password': password,
+                },
+                {
+                    'name': 'Bob',
+                    'email': 'bob@example.com',
+                    'hashed_password': password,
+                },
+            ],
+        )
+    monkeypatch.setattr(database, '_engine', engine)
+    settings = get_settings().model_copy(
+        update={'TASK_EVENTS_ENABLED': True, 'TASK_EVENTS_SPOOL_DIR': None}
+    )
+    app = create_app(settings)
+
+    def login(client, email):
+        resp = client.post(
+            '/api/auth/login', json={'email': email, 'password': 'S3nh@F0rte'}
+        )
+        return {'Authorization': f'Bearer {resp.json()["access_token"]}'}
+
+    with TestClient(app) as client:
+        ada, bob = login(client, 'ada@example.com'), login(client, 'bob@example.com')
+        task_id = client.post('/api/tasks', json={'title': 'Nova'}, headers=ada).json()[
+            'id'
+        ]
+        other = client.post('/api/tasks', json={'title': 'Outra'}, headers=ada).json()[
+            'id'
+        ]
+        client.put(f'/api/tasks/{task_id}', json={'title': 'Nova 2'}, headers=ada)
+        # Sem mudança: não gera evento
+        client.put(f'/api/tasks/{task_id}', json={'title': 'Nova 2'}, headers=ada)
+        client.patch(
+            f'/api/tasks/{task_id}/status', json={'status': 'concluida'}, headers=ada
+        )
+        client.delete(f'/api/tasks/{task_id}', headers=ada)
+        app.state.task_events.close()
+
+        page = client.get('/api/tasks/events?limit=3', headers=ada)
+        assert page.status_code == HTTPStatus.OK
+        body = page.json()
+        assert [e['action'] for e in body['events']] == [
+            'created',
+            'created',
+            'updated',
+        ]
+        assert body['events'][0]['changes']['title'] == [None, 'Nova']
+        assert body['events'][2]['changes'] == {'title': ['Nova', 'Nova 2']}
+        assert body['has_more'] is True
+
+        rest = client.get(
+            f'/api/tasks/events?after={body["next_cursor"]}', headers=ada
+        ).json()
+        assert [e['action'] for e in rest['events']] == ['status_changed', 'deleted']
+        assert rest['events'][0]['changes'] == {'status': ['pendente', 'concluida']}
+        assert rest['has_more'] is False
+
+        only_other = client.get(
+            f'/api/tasks/events?task_id={other}', headers=ada
+        ).json()
+        assert [e['task_id'] for e in only_other['events']] == [other]
+
+        assert client.get('/api/tasks/events', headers=bob).json()['events'] == []
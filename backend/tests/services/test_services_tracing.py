@@ -0,0 +1,157 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import create_app
+from backend.models.database import get_read_session, get_session
+from backend.services.auth import Auth
+from backend.services.tracing import TracingMiddleware, parse_traceparent
+from backend.settings import get_settings
+
+PARENT = '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'
+
+
+def _app(session, **settings):
+    app = create_app(
+        get_settings().model_copy(update={'TRACING_ENABLED': True, **settings})
+    )
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_read_session] = lambda: session
+    return app
+
+
+def _exported(app, path):
+    (middleware,) = [m for m in app.user_middleware if m.cls is TracingMiddleware]
+    exporter = middleware.kwargs['exporter']
+    assert exporter.flush()
+    if not path.exists():
+        return []
+    return [
+        span
+        for line in path.read_text().splitlines()
+        for resource in json.loads(line)['resourceSpans']
+        for scope in resource['scopeSpans']
+        for span in scope['spans']
+    ]
+
+
+@pytest.fixture
+def headers(session):
+    from backend.models.users import User
+
+    user = User(name='Ada', email='ada@example.com', hashed_password='h')
+    session.add(user)
+    session.commit()
+    token = Auth().generate_token(subject=user.id, extra_claims={'email': user.email})[
+        'access_token'
+    ]
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        'lixo',
+        '00-00000000000000000000000000000000-00f067aa0ba902b7-01',
+        '00-4bf92f3577b34da6a3ce929d0e0e4736-0000000000000000-01',
+        'ff-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01',
+        PARENT + '-extra',
+    ],
+)
+def test_parse_traceparent_rejects_invalid(value):
+    assert parse_traceparent(value) is None
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(PARENT) == (
+        '4bf92f3577b34da6a3ce929d0e0e4736',
+        '00f067aa0ba902b7',
+        True,
+    )
+    # Versões futuras podem acrescentar campos
+    assert parse_traceparent('01' + PARENT[2:-2] + '00-x')[2] is False
+
+
+def test_list_tasks_phases_are_traced(session, headers, tmp_path):
+    path = tmp_path / 'spans.jsonl'
+    app = _app(session, TRACING_SAMPLE_RATE=1.0, TRACING_EXPORT_PATH=str(path))
+
+    with TestClient(app) as client:
+        resp = client.get('/api/tasks', headers=headers)
+
+    assert resp.status_code == HTTPStatus.OK
+    trace_id, root_id, sampled = parse_traceparent(resp.headers['traceresponse'])
+    assert sampled
+
+    spans = _exported(app, path)
+    by_name = {span['name']: span for span in spans}
+    assert {span['traceId'] for span in spans} == {trace_id}
+
+    root = by_name['GET /api/tasks']
+    assert root['spanId'] == root_id
+    assert 'parentSpanId' not in root
+    attributes = {a['key']: a['value'] for a in root['attributes']}
+    assert attributes['http.route'] == {'stringValue': '/api/tasks'}
+    assert attributes['http.status_code'] == {'intValue': '200'}
+
+    handler = by_name['handler list_tasks']
+    assert by_name['auth.verify_token']['parentSpanId'] == root_id
+    assert by_name['db.user_lookup']['parentSpanId'] == root_id
+    assert by_name['db.task_query']['parentSpanId'] == handler['spanId']
+    assert by_name['response.serialize']['parentSpanId'] == root_id
+    assert int(by_name['response.serialize']['startTimeUnixNano']) >= int(
+        handler['endTimeUnixNano']
+    )
+
+    sql = [span for span in spans if span['name'] == 'sql SELECT']
+    assert sorted(span['parentSpanId'] for span in sql) == sorted([
+        by_name['db.user_lookup']['spanId'],
+        by_name['db.task_query']['spanId'],
+    ])
+
+
+def test_incoming_traceparent_decides_sampling(session, headers, tmp_path):
+    path = tmp_path / 'spans.jsonl'
+    app = _app(session, TRACING_SAMPLE_RATE=0.0, TRACING_EXPORT_PATH=str(path))
+
+    with TestClient(app) as client:
+        unsampled = client.get('/api/tasks', headers=headers)
+        resp = client.get('/api/tasks', headers={**headers, 'traceparent': PARENT})
+
+    assert unsampled.headers['traceresponse'].endswith('-00')
+    assert resp.headers['traceresponse'].startswith(
+        '00-4bf92f3577b34da6a3ce929d0e0e4736-'
+    )
+
+    spans = _exported(app, path)
+    assert {span['traceId'] for span in spans} == {'4bf92f3577b34da6a3ce929d0e0e4736'}
+    (root,) = [span for span in spans if span['kind'] == 2]
+    assert root['parentSpanId'] == '00f067aa0ba902b7'
+
+
+def test_failed_verification_is_recorded(session, tmp_path):
+    path = tmp_path / 'spans.jsonl'
+    app = _app(session, TRACING_SAMPLE_RATE=1.0, TRACING_EXPORT_PATH=str(path))
+
+    with TestClient(app) as client:
+        resp = client.get('/api/tasks', headers={'Authorization': 'Bearer x.y.z'})
+
+    assert resp.status_code == HTTPStatus.UNAUTHORIZED
+    (verify,) = [s for s in _exported(app, path) if s['name'] == 'auth.verify_token']
+    assert {'key': 'auth.failure', 'value': {'stringValue': 'invalid'}} in verify[
+        'attributes'
+    ]
+
+
+def test_tracing_disabled_by_default(session, headers):
+    app = create_app(get_settings())
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_read_session] = lambda: session
+
+    with TestClient(app) as client:
+        resp = client.get('/api/tasks', headers=headers)
+
+    assert resp.status_code == HTTPStatus.OK
+    assert 'traceresponse' not in resp.headers
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+import backend.models.database as database
+import backend.services.auth as auth_module
+from backend.app import create_app
+from backend.settings import Settings
+
+
+def test_importing_app_module_is_cheap():
+    # Sem DATABASE_URL/JWT_*: o import não pode ler Settings nem criar engine
+    env = {k: v for k, v in os.environ.items() if not k.startswith(('DATABASE', 'JWT'))}
+    env['PYTHONPATH'] = os.pathsep.join(sys.path)
+    code = (
+        'import sys, backend.app, backend.models.database as db;'
+        'print(db._engine is None,'
+        " any(m in sys.modules for m in ('jwt', 'pwdlib', 'argon2')))"
+    )
+    out = subprocess.run(
+        [sys.executable, '-c', code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.split() == ['True', 'False']
+
+
+def test_create_app_returns_independent_apps():
+    assert create_app() is not create_app()
+
+
+def test_lifespan_creates_and_disposes_engine():
+    assert database._engine is None
+
+    with TestClient(create_app()):
+        assert database._engine is not None
+
+    assert database._engine is None
+
+
+def test_lifespan_builds_engine_and_auth_from_app_settings(tmp_path):
+    url = f'sqlite:///{tmp_path / "app.db"}'
+    settings = Settings(DATABASE_URL=url, JWT_TTL_MINUTES=7)
+
+    with TestClient(create_app(settings)):
+        assert database._engine.url.render_as_string() == url
+        assert database.get_replica_router().primary is database._engine
+        assert auth_module.get_auth().settings is settings
+
+    assert auth_module._auth_singleton is None
+    assert database.configured_settings() is not settings
+
+
+def test_async_lifespan_closes_event_log():
+    class FakeEventLog:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    app = create_app(Settings(DATABASE_ASYNC=True))
+    app.state.task_events = events = FakeEventLog()
+
+    with TestClient(app):
+        pass
+
+    assert events.closed
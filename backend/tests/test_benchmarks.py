@@ -0,0 +1,87 @@
+import json
+
+from sqlalchemy import create_engine, func, select
+
+from backend.models.users import Task, TaskStatus, User
+from benchmarks import bench_endpoints, compare
+from benchmarks.datagen import migrate, seed
+
+
+def test_seed_follows_distributions(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "seed.db"}')
+    migrate(engine)
+
+    summary = seed(engine, 200, 20, password_hash='h')
+
+    with engine.connect() as connection:
+        users = connection.scalar(select(func.count()).select_from(User))
+        tasks = connection.scalar(select(func.count()).select_from(Task))
+        done = connection.scalar(
+            select(func.count()).where(Task.status == TaskStatus.CONCLUIDA)
+        )
+    engine.dispose()
+
+    assert users == 200
+    assert tasks == summary['tasks']
+    # Exponencial com média 20: cauda longa, total perto de 200 * 20
+    assert 2000 < tasks < 6000
+    assert summary['max_tasks_per_user'] > 40
+    assert 0.25 < done / tasks < 0.45
+
+
+def test_endpoint_benchmark_writes_comparable_json(tmp_path):
+    output = tmp_path / 'endpoints.json'
+
+    bench_endpoints.main([
+        '--scales',
+        '5x2',
+        '--requests',
+        '4',
+        '--warmup',
+        '1',
+        '--only',
+        '/api/tasks',
+        '--output',
+        str(output),
+    ])
+
+    document = json.loads(output.read_text())
+    routes = document['results']['scales']['5x2']['routes']
+    assert set(routes) == {
+        'GET /api/tasks',
+        'POST /api/tasks',
+        'GET /api/tasks/{task_id}',
+        'PUT /api/tasks/{task_id}',
+        'PATCH /api/tasks/{task_id}',
+        'PATCH /api/tasks/{task_id}/status',
+        'DELETE /api/tasks/{task_id}',
+    }
+    assert routes['GET /api/tasks']['latency_ms']['count'] == 4
+
+    slower = json.loads(output.read_text())
+    slower['results']['scales']['5x2']['routes']['GET /api/tasks']['latency_ms'][
+        'p99'
+    ] *= 2
+    rows = compare.compare(document, slower, threshold=10)
+    regressions = [row['metric'] for row in rows if row['regression']]
+    assert regressions == ['scales/5x2/routes/GET /api/tasks/latency_ms/p99']
+
+
+def test_load_recorder_reports_windows_and_steps():
+    from benchmarks.loadgen import Recorder
+
+    recorder = Recorder()
+    recorder.samples = [
+        (0.5, 'login', 100.0, None),
+        (1.5, 'list_tasks', 10.0, None),
+        (2.5, 'list_tasks', 12.0, '503'),
+        (2.7, 'list_tasks', 14.0, None),
+    ]
+
+    summary = recorder.summary(elapsed=3.0, interval=2.0)
+
+    assert [row['requests_per_s'] for row in summary['timeline']] == [1.0, 1.0]
+    assert [row['error_rate'] for row in summary['timeline']] == [0.0, 0.5]
+    assert summary['steps']['list_tasks']['requests'] == 3
+    assert summary['steps']['list_tasks']['errors'] == {'503': 1}
+    assert summary['error_rate'] == 0.25
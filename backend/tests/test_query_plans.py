@@ -0,0 +1,61 @@
+import pytest
+
+from benchmarks.query_plans import (
+    endpoint_plans,
+    explain,
+    full_scans,
+    seeded_engine,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = seeded_engine(f'sqlite:///{tmp_path / "plans.db"}', 50, 20)
+    yield engine
+    engine.dispose()
+
+
+def test_no_endpoint_scans_tasks_or_users(engine):
+    plans = endpoint_plans(engine)
+
+    assert set(plans) >= {'GET /api/tasks', 'POST /api/auth/login'}
+    scans = {
+        f'{label}: {query["sql"]}': query['plan']
+        for label, queries in plans.items()
+        for query in queries
+        if query['full_scans']
+    }
+    assert scans == {}
+
+
+def test_due_date_views_use_partial_index(engine):
+    plans = endpoint_plans(engine)
+
+    for label in ('GET /api/tasks/overdue', 'GET /api/tasks/due-within'):
+        lines = [
+            line
+            for query in plans[label]
+            if 'FROM tasks' in query['sql']
+            for line in query['plan']
+        ]
+        assert any('ix_tasks_pending_due' in line for line in lines), lines
+
+
+def test_task_listing_needs_owner_index(engine):
+    with engine.begin() as connection:
+        # Os índices por dono (o da ordem manual e o anterior, por id)
+        connection.exec_driver_sql('DROP INDEX ix_tasks_user_rank')
+        connection.exec_driver_sql('DROP INDEX ix_tasks_user_id_id')
+
+    listing = endpoint_plans(engine)['GET /api/tasks']
+    assert ['tasks'] in [query['full_scans'] for query in listing]
+
+
+def test_full_scans_detects_sqlite_and_postgres_plans(engine):
+    plan = explain(engine, 'SELECT * FROM tasks WHERE title = ?', ('x',))
+
+    assert full_scans(plan) == ['tasks']
+    assert full_scans(['Seq Scan on users', 'Index Scan using pk on tasks']) == [
+        'users'
+    ]
+    assert full_scans(['SCAN sqlite_master']) == []
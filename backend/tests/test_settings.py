@@ -0,0 +1,65 @@
+import pytest
+from pydantic import ValidationError
+
+from backend.settings import Settings
+
+
+def _settings(**overrides) -> Settings:
+    values = {
+        'DATABASE_URL': 'sqlite://',
+        'JWT_ISSUER': 'test',
+        'JWT_AUDIENCE': 'aud',
+        'JWT_ALGORITHM': 'HS256',
+        'JWT_SECRET': 'secret',
+        'JWT_TTL_MINUTES': 30,
+        **overrides,
+    }
+    return Settings(_env_file=None, **values)
+
+
+@pytest.mark.parametrize('algorithm', ['HS256', 'hs512'])
+def test_hmac_algorithm_requires_secret(algorithm):
+    with pytest.raises(ValidationError, match='JWT_SECRET'):
+        _settings(JWT_ALGORITHM=algorithm, JWT_SECRET='')
+
+
+def test_asymmetric_algorithm_does_not_need_secret():
+    assert _settings(JWT_ALGORITHM='EdDSA', JWT_SECRET='').JWT_SECRET == ''
+
+
+def test_async_mode_rejects_features_it_does_not_implement():
+    with pytest.raises(ValidationError, match='TASK_CACHE_ENABLED, GROUP_COMMIT'):
+        _settings(
+            DATABASE_ASYNC=True,
+            TASK_CACHE_ENABLED=True,
+            GROUP_COMMIT_ENABLED=True,
+            TASK_EVENTS_ENABLED=False,
+        )
+
+    settings = _settings(
+        DATABASE_ASYNC=True, TASK_CACHE_ENABLED=False, TASK_EVENTS_ENABLED=False
+    )
+    assert settings.DATABASE_ASYNC
+
+
+def test_async_mode_rejects_shards():
+    # As rotas async não roteiam por shard: tarefas iriam para DATABASE_URL
+    with pytest.raises(ValidationError, match='DATABASE_SHARD_URLS'):
+        _settings(
+            DATABASE_ASYNC=True,
+            TASK_CACHE_ENABLED=False,
+            TASK_EVENTS_ENABLED=False,
+            DATABASE_SHARD_URLS={'a': 'sqlite:///a.db'},
+        )
+
+
+def test_async_mode_alone_turns_off_sync_only_defaults():
+    settings = _settings(DATABASE_ASYNC=True)
+    assert not settings.TASK_CACHE_ENABLED
+    assert not settings.TASK_EVENTS_ENABLED
+
+    assert _settings().TASK_EVENTS_ENABLED
+
+    # Pedidos explicitamente, seguem recusados
+    with pytest.raises(ValidationError, match='TASK_EVENTS_ENABLED'):
+        _settings(DATABASE_ASYNC=True, TASK_EVENTS_ENABLED=True)
@@ -0,0 +1,23 @@
+// components/ListTasks.tsx
+import type { DashboardTask } from './user'
+
+type Props = {
+  tasks: DashboardTask[]
+}
+
+export default function ListTasks({ tasks }: Props) {
+  return (
+    <ul className="flex flex-col gap-3">
+      {tasks.map((task) => (
+        <li key={task.id} className="rounded-xl border border-gray-200 px-4 py-3">
+          <p className="font-medium text-gray-900">{task.title}</p>
+          {task.description && <p className="mt-1 text-sm text-gray-600">{task.description}</p>}
+          <p className="mt-2 text-xs uppercase text-gray-500">
+            {task.status} · {task.priority}
+            {task.due_date && ` · ${task.due_date}`}
+          </p>
+        </li>
+      ))}
+    </ul>
+  )
+}
@@ -1,12 +1,30 @@
 "use client";
 
-import { useState } from 'react'
+import { useEffect, useState } from 'react'
+import { useRouter } from "next/navigation";
 import Sidebar from './sidebar'
 import EmptyState from './emptyState'
+import ListTasks from './listTasks'
 import { ModalTask } from './modalTask'
+import { bootstrapDashboard, type DashboardData } from './user'
 
 export default function Page() {
     const [open, setOpen] = useState(false);
+    const [dashboard, setDashboard] = useState<DashboardData | null>(null);
+    const router = useRouter();
+
+    useEffect(() => {
+        // Uma chamada traz usuário (sidebar) e primeira página de tarefas
+        async function loadDashboard() {
+            const data = await bootstrapDashboard()
+            if (!data) {
+                router.push("/login");
+                return;
+            }
+            setDashboard(data)
+        }
+        loadDashboard()
+    }, [])
 
     function handleSave(data: any) {
         // 
@@ -17,7 +35,7 @@ export default function Page() {
             <div className="w-full px-4 py-6 lg:px-8">
                 <div className="grid grid-cols-1 min-h-[calc(100vh-4rem)] gap-16 lg:grid-cols-[320px_1fr]">
                     <aside className="rounded-2xl h-auto bg-[#6FA4FF] text-white">
-                        <Sidebar />
+                        <Sidebar user={dashboard?.user ?? null} />
                     </aside>
                     <section className="flex flex-col">
                         <div className="flex items-start justify-between">
@@ -35,7 +53,9 @@ export default function Page() {
                         <div className="mt-8">
                             <div className="min-h-[calc(100vh-12rem)] rounded-xl border border-gray-200">
                                 <div className="p-10">
-                                    <EmptyState />
+                                    {dashboard && dashboard.tasks.length > 0
+                                        ? <ListTasks tasks={dashboard.tasks} />
+                                        : <EmptyState />}
                                 </div>
                             </div>
                         </div>
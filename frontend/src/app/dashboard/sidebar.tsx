@@ -1,27 +1,16 @@
 "use client";
-import { useEffect, useState } from 'react'
-
 import Image from 'next/image'
 import { useRouter } from "next/navigation";
 
 import NavButton from './navButton'
-import { infoUser, logoutUser } from './user'
+import { logoutUser } from './user'
 
-export default function Sidebar() {
-    const [user, setUser] = useState<{ name: string } | null>(null)
-    const router = useRouter();
+type Props = {
+    user: { name: string } | null
+}
 
-    useEffect(() => {
-        async function loadUser() {
-            const u = await infoUser()
-            if (!u) {
-                router.push("/login");
-                return;
-            }
-            setUser(u)
-        }
-        loadUser()
-    }, [])
+export default function Sidebar({ user }: Props) {
+    const router = useRouter();
 
     async function handleLogout() {
         const success = await logoutUser();
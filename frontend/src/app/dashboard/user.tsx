@@ -1,6 +1,26 @@
 import { readAuthToken, clearAuthToken} from "@/lib/auth"
 
-export async function infoUser() {
+export type DashboardTask = {
+    id: number
+    title: string
+    description: string | null
+    status: string
+    priority: string
+    due_date: string | null
+}
+
+export type DashboardData = {
+    user: { name: string, email: string }
+    tasks: DashboardTask[]
+    has_more: boolean
+    counts: {
+        total: number
+        by_status: Record<string, number>
+        by_priority: Record<string, number>
+    }
+}
+
+export async function bootstrapDashboard(limit = 20): Promise<DashboardData | null> {
     const apiUrl = process.env.NEXT_PUBLIC_API_URL;
     try {
         const storedAuth = await readAuthToken();
@@ -9,23 +29,24 @@ export async function infoUser() {
             throw new Error("Token de autenticação não encontrado.");
         }
 
-        const response = await fetch(`${apiUrl}/api/auth/userinfo`, {
+        // Usuário, primeira página de tarefas e contagens numa só chamada;
+        // "no-cache" revalida com o ETag em vez de baixar tudo de novo
+        const response = await fetch(`${apiUrl}/api/bootstrap?limit=${limit}`, {
             method: "GET",
             headers: {
                 "Authorization": `${storedAuth.token_type} ${storedAuth.access_token}`,
                 "Content-Type": "application/json",
             },
-            cache: "no-store"
+            cache: "no-cache"
         });
 
         if (!response.ok) {
-            throw new Error(`Erro ao buscar informações do usuário: ${response.status}`);
+            throw new Error(`Erro ao carregar o dashboard: ${response.status}`);
         }
 
-        const userData = await response.json();
-        return userData;
+        return await response.json();
     } catch (error) {
-        console.error("Erro em userInfor():", error);
+        console.error("Erro em bootstrapDashboard():", error);
         return null;
     }
 }